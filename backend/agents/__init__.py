@@ -7,6 +7,7 @@ from .market_regime_analyst import MarketRegimeAnalyst
 from .sector_scout import SectorScout
 from .stock_screener import StockScreener
 from .trade_plan_builder import TradePlanBuilder
+from .portfolio_plan_builder import PortfolioPlanBuilder
 from .devils_advocate import DevilsAdvocate
 
 __all__ = [
@@ -14,5 +15,6 @@ __all__ = [
     'SectorScout',
     'StockScreener',
     'TradePlanBuilder',
+    'PortfolioPlanBuilder',
     'DevilsAdvocate'
 ]
@@ -3,22 +3,36 @@ Agent Orchestrator
 5개 AI Agent를 순차적으로 실행하는 통합 오케스트레이터
 """
 
-from typing import Dict, List, Any
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple, Union
 from .market_regime_analyst import MarketRegimeAnalyst
 from .sector_scout import SectorScout
 from .stock_screener import StockScreener
 from .trade_plan_builder import TradePlanBuilder
+from .portfolio_plan_builder import PortfolioPlanBuilder
 from .devils_advocate import DevilsAdvocate
 
 
 class AgentOrchestrator:
     """AI Agent 통합 실행 오케스트레이터"""
     
-    def __init__(self):
+    # 포트폴리오 배분에 넣을 최대 리더 후보 수
+    MAX_PLAN_CANDIDATES = 100
+    
+    def __init__(self, price_history_loader: Optional[Callable] = None,
+                 stage_observer: Optional[Callable[[str, float], None]] = None):
+        """
+        Args:
+            price_history_loader: 종목 리스트 → (종목 리스트, 종가 행렬) - 포트폴리오 상관관계용
+            stage_observer: (단계 이름, 소요 초) 콜백 - 단계별 시간 메트릭용
+        """
+        self.stage_observer = stage_observer
         self.market_analyst = MarketRegimeAnalyst()
         self.sector_scout = SectorScout()
         self.stock_screener = StockScreener()
         self.trade_plan_builder = TradePlanBuilder()
+        self.portfolio_plan_builder = PortfolioPlanBuilder(price_history_loader)
         self.devils_advocate = DevilsAdvocate()
         
     def run_full_analysis(self, 
@@ -38,6 +52,33 @@ class AgentOrchestrator:
         Returns:
             전체 분석 결과
         """
+        result = {}
+        for stage, payload in self.iter_full_analysis(
+            market_data, sectors_data, stocks_data, user_profile
+        ):
+            if stage == "complete":
+                result = payload
+        return result
+    
+    def iter_full_analysis(self,
+                           market_data: Union[Dict[str, Any], Callable[[], Dict[str, Any]]],
+                           sectors_data: Union[List[Dict[str, Any]], Callable[[], List[Dict[str, Any]]]],
+                           stocks_data: Union[List[Dict[str, Any]], Callable[[], List[Dict[str, Any]]]],
+                           user_profile: Dict[str, Any] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        전체 분석 파이프라인을 단계별로 실행하며 결과를 순서대로 반환 (스트리밍용)
+        
+        데이터 인자는 값 또는 인자 없는 로더 함수를 받는다.
+        로더를 넘기면 해당 단계 직전에 호출되므로 앞 단계 결과를 먼저 내보낼 수 있다.
+        
+        Yields:
+            (stage, payload)
+            - ("market_regime", 시장 상태)
+            - ("ranked_sectors", 상위 10개 섹터)
+            - ("screened_stocks", 리더/팔로워 요약)
+            - ("recommendation", 매매 계획 + 반론) - 포트폴리오 선정 종목별 1회씩
+            - ("complete", run_full_analysis와 동일한 전체 결과)
+        """
         # 기본 사용자 프로필
         if user_profile is None:
             user_profile = {
@@ -48,44 +89,57 @@ class AgentOrchestrator:
         
         # ========== Step 1: Market Regime Analysis ==========
         print("🌍 Step 1: Analyzing market regime...")
-        market_regime = self.market_analyst.analyze(market_data)
+        market_data = self._load("market_data", market_data)
+        with self._stage("market_regime"):
+            market_regime = self.market_analyst.analyze(market_data)
+        yield "market_regime", market_regime
         
         # ========== Step 2: Sector Scouting ==========
         print("🔍 Step 2: Ranking sectors...")
-        ranked_sectors = self.sector_scout.rank_sectors(sectors_data)
+        sectors_data = self._load("sectors_data", sectors_data)
+        with self._stage("sector_scout"):
+            ranked_sectors = self.sector_scout.rank_sectors(sectors_data)
+        yield "ranked_sectors", ranked_sectors[:10]
         
         # ========== Step 3: Stock Screening ==========
         print("🎯 Step 3: Screening stocks...")
-        screened_stocks = self.stock_screener.screen_stocks(stocks_data)
+        stocks_data = self._load("stocks_data", stocks_data)
+        with self._stage("stock_screener"):
+            screened_stocks = self.stock_screener.screen_stocks(stocks_data)
+        screened_summary = {
+            "leaders": screened_stocks['leaders'][:10],
+            "followers": screened_stocks['followers'][:10],
+            "nogo_count": len(screened_stocks['nogo'])
+        }
+        yield "screened_stocks", screened_summary
         
-        # ========== Step 4: Trade Plan Building ==========
+        # ========== Step 4 + 5: Trade Plan Building & Devil's Advocate ==========
         print("📋 Step 4: Building trade plans...")
-        trade_plans = []
-        
-        # 리더와 팔로워 종목에 대해 매매 계획 생성
-        for stock in screened_stocks['leaders'][:5]:  # 상위 5개만
-            # 종목 데이터를 trade_plan_builder 형식으로 변환
-            stock_data_for_plan = self._prepare_stock_data_for_trade_plan(
-                stock, stocks_data
-            )
-            trade_plan = self.trade_plan_builder.build_trade_plan(
-                stock_data_for_plan, user_profile
-            )
-            trade_plans.append({
-                **stock,
-                "trade_plan": trade_plan
-            })
-        
-        # ========== Step 5: Devil's Advocate ==========
         print("😈 Step 5: Generating counter-arguments...")
         final_recommendations = []
         
-        for plan in trade_plans:
-            with_counter = self.devils_advocate.analyze_recommendation(
-                plan, 
-                additional_data=self._get_additional_data(plan, ranked_sectors)
+        # 리더 후보 전체를 한 번에 계획 + 포트폴리오 배분 (리스크 예산/섹터/상관관계)
+        leaders = screened_stocks['leaders'][:self.MAX_PLAN_CANDIDATES]
+        with self._stage("trade_plan"):
+            portfolio = self.portfolio_plan_builder.build_portfolio_plans(
+                [self._prepare_stock_data_for_trade_plan(stock, stocks_data) for stock in leaders],
+                user_profile
             )
+        leaders_by_ticker = {stock.get('ticker', ''): stock for stock in leaders}
+        
+        # 선정된 종목에 대해 바로 반론 검증
+        for trade_plan in portfolio['plans']:
+            plan = {
+                **leaders_by_ticker.get(trade_plan['ticker'], {}),
+                "trade_plan": trade_plan
+            }
+            with self._stage("devils_advocate"):
+                with_counter = self.devils_advocate.analyze_recommendation(
+                    plan, 
+                    additional_data=self._get_additional_data(plan, ranked_sectors)
+                )
             final_recommendations.append(with_counter)
+            yield "recommendation", with_counter
         
         # ========== Final Result ==========
         # Summary 생성 (원본 screened_stocks 사용)
@@ -93,20 +147,33 @@ class AgentOrchestrator:
             market_regime, ranked_sectors, screened_stocks, final_recommendations
         )
         
-        return {
+        yield "complete", {
             "timestamp": market_regime.get("sources", [{}])[0].get("timestamp", ""),
             "market_regime": market_regime,
             "ranked_sectors": ranked_sectors[:10],  # 상위 10개 섹터
             "recommendations": final_recommendations,  # 최종 추천 종목
-            "screened_stocks": {
-                "leaders": screened_stocks['leaders'][:10],
-                "followers": screened_stocks['followers'][:10],
-                "nogo_count": len(screened_stocks['nogo'])
-            },
-            "recommendations": final_recommendations,
+            "portfolio": portfolio['portfolio'],  # 포트폴리오 배분 요약
+            "screened_stocks": screened_summary,
             "summary": summary
         }
     
+    def _load(self, stage: str, data: Any) -> Any:
+        """값 또는 로더 함수 → 값 (로더 호출 시간은 stage로 기록)"""
+        if not callable(data):
+            return data
+        with self._stage(stage):
+            return data()
+    
+    @contextmanager
+    def _stage(self, stage: str):
+        """블록 실행 시간을 stage_observer에 전달"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.stage_observer:
+                self.stage_observer(stage, time.perf_counter() - started)
+    
     def run_quick_analysis(self,
                           market_data: Dict[str, Any],
                           stock_data: Dict[str, Any],
@@ -130,10 +197,12 @@ class AgentOrchestrator:
             }
         
         # Step 1: Market Regime
-        market_regime = self.market_analyst.analyze(market_data)
+        with self._stage("market_regime"):
+            market_regime = self.market_analyst.analyze(market_data)
         
         # Step 3: Stock Classification
-        stock_classification = self.stock_screener.classify_stock(stock_data)
+        with self._stage("stock_screener"):
+            stock_classification = self.stock_screener.classify_stock(stock_data)
         
         # 진입 가능한 종목인 경우만 매매 계획 생성
         trade_plan = None
@@ -141,16 +210,18 @@ class AgentOrchestrator:
             stock_data_for_plan = self._prepare_stock_data_for_trade_plan(
                 stock_classification, [stock_data]
             )
-            trade_plan = self.trade_plan_builder.build_trade_plan(
-                stock_data_for_plan, user_profile
-            )
+            with self._stage("trade_plan"):
+                trade_plan = self.trade_plan_builder.build_trade_plan(
+                    stock_data_for_plan, user_profile
+                )
         
         # Step 5: Devil's Advocate
         recommendation = {
             **stock_classification,
             "trade_plan": trade_plan
         }
-        final_result = self.devils_advocate.analyze_recommendation(recommendation)
+        with self._stage("devils_advocate"):
+            final_result = self.devils_advocate.analyze_recommendation(recommendation)
         
         return {
             "market_regime": market_regime,
@@ -172,6 +243,7 @@ class AgentOrchestrator:
         return {
             "ticker": ticker,
             "name": stock_result.get('name', ''),
+            "sector": original_data.get('sector', ''),
             "currency": stock_result.get('currency') or original_data.get('currency', 'KRW'),  # stock_result 우선, 없으면 original_data
             "current_price": original_data.get('current_price', 0),
             "support_levels": original_data.get('support_levels', []),
@@ -0,0 +1,317 @@
+"""
+Agent 4 (배치): Portfolio Plan Builder 📊
+역할: 후보 종목 전체의 손절·진입·목표가를 한 번에 계산하고
+      계좌 단위로 리스크 예산·섹터 집중도·상관관계를 반영해 비중 배분
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .trade_plan_builder import TradePlanBuilder
+
+
+# 성향별 포트폴리오 한도
+PORTFOLIO_LIMITS = {
+    # 거래당 리스크 / 전체 리스크 예산 / 섹터 최대 비중 / 계좌 없을 때 기본 비중(%)
+    '보수': {"trade_risk": 0.01, "risk_budget": 0.05, "sector_cap": 0.30, "default_percent": 20},
+    '중립': {"trade_risk": 0.02, "risk_budget": 0.10, "sector_cap": 0.40, "default_percent": 25},
+    '공격': {"trade_risk": 0.03, "risk_budget": 0.15, "sector_cap": 0.50, "default_percent": 30},
+}
+
+# 목표가 배수 (보수적 / 공격적)
+TARGET_MULTIPLIERS = {
+    '보수': (2.0, 3.0),
+    '중립': (2.5, 4.0),
+    '공격': (3.0, 5.0),
+}
+
+# 상관관계 계산에 필요한 최소 공통 수익률 개수
+MIN_CORRELATION_OBS = 20
+
+# user_profile에 max_positions가 없을 때 최대 선정 종목 수 (기존 상위 5개 추천과 동일)
+DEFAULT_MAX_POSITIONS = 5
+
+# 비중/리스크 비교 허용 오차
+_EPS = 1e-9
+
+
+class PortfolioPlanBuilder:
+    """포트폴리오 단위 매매 계획 생성 에이전트"""
+
+    def __init__(self, price_history_loader: Optional[Callable[[List[str]], Tuple[List[str], np.ndarray]]] = None):
+        """
+        Args:
+            price_history_loader: 종목 리스트 → (종목 리스트, 종가 행렬 (종목, 일자))
+                                  상관관계 계산용 (없으면 상관관계 할인 생략)
+        """
+        self.name = "Portfolio Plan Builder"
+        self.price_history_loader = price_history_loader
+        # 분할 계획 / Why 설명은 단일 종목 빌더와 동일한 형식 사용
+        self._single = TradePlanBuilder()
+
+    def build_portfolio_plans(self, candidates: List[Dict[str, Any]],
+                              user_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        후보 전체 매매 계획 + 포트폴리오 배분
+
+        Args:
+            candidates: 순위순 종목 데이터 리스트 (build_trade_plan의 stock_data 형식 + sector)
+            user_profile: period, risk_profile, account_size,
+                          max_positions(선택, 기본 DEFAULT_MAX_POSITIONS)
+
+        Returns:
+            {
+                "plans": [build_trade_plan과 같은 형식 + "allocation"] (선정 종목만, 순위순),
+                "portfolio": 리스크 예산/섹터 비중/상관관계 요약
+            }
+        """
+        if not candidates:
+            return {"plans": [], "portfolio": self._portfolio_summary([], np.array([]), np.array([]), {}, 0, 0)}
+
+        risk_profile = user_profile.get('risk_profile', '중립')
+        limits = PORTFOLIO_LIMITS.get(risk_profile, PORTFOLIO_LIMITS['중립'])
+        account_size = user_profile.get('account_size', 0) or 0
+        max_positions = int(user_profile.get('max_positions') or DEFAULT_MAX_POSITIONS)
+
+        # ========== 1) 입력 벡터화 ==========
+        price = self._column(candidates, 'current_price', 0.0)
+        ma20 = np.array([c.get('ma20', c.get('current_price', 0)) for c in candidates], dtype=float)
+        ma60 = np.array([c.get('ma60', c.get('current_price', 0)) for c in candidates], dtype=float)
+        atr = np.array([c.get('atr_20d', c.get('current_price', 0) * 0.03) for c in candidates], dtype=float)
+        supports = self._levels(candidates, 'support_levels')
+        resistances = self._levels(candidates, 'resistance_levels')
+
+        # ========== 2) 손절 / 진입 / 목표 (TradePlanBuilder와 같은 규칙) ==========
+        stop_loss = self._stop_loss(price, ma20, ma60, atr, supports[:, 0])
+        entry = {
+            "breakout": np.round(np.where(np.isnan(resistances[:, 0]), price * 1.02, resistances[:, 0] * 1.005), 0),
+            "pullback": np.round(ma20 * 1.005, 0),
+            "current": np.round(price, 0),
+        }
+        conservative, aggressive = self._targets(price, stop_loss, resistances, risk_profile)
+
+        # ========== 3) 포트폴리오 배분 ==========
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stop_pct = np.where(price > 0, (price - stop_loss) / price, np.nan)
+
+        corr = self._correlation_matrix([c.get('ticker', '') for c in candidates])
+
+        # 기준 포지션 비중 (계좌 대비)
+        if account_size > 0:
+            base_weight = np.nan_to_num(np.where(stop_pct > 0, limits["trade_risk"] / stop_pct, 0.0))
+        else:
+            base_weight = np.full(len(candidates), limits["default_percent"] / 100.0)
+
+        sectors = [c.get('sector', '') or '기타' for c in candidates]
+        weight, discount = self._allocate(
+            base_weight, np.nan_to_num(stop_pct), sectors, corr, limits, max_positions
+        )
+        selected = weight > 0
+
+        if account_size > 0:
+            shares = np.floor(weight * account_size / np.where(price > 0, price, np.inf)).astype(int)
+            amount = shares * price
+        else:
+            shares = np.zeros(len(candidates), dtype=int)
+            amount = np.zeros(len(candidates))
+
+        # ========== 4) 종목별 계획 조립 (선정 종목만) ==========
+        plans = []
+        for i in np.flatnonzero(selected):
+            stock_data = candidates[i]
+            entry_points = {k: float(v[i]) for k, v in entry.items()}
+            targets = {"conservative": float(conservative[i]), "aggressive": float(aggressive[i])}
+            position_size = {
+                "percent": round(float(weight[i]) * 100, 1),
+                "shares": int(shares[i]),
+                "amount": int(amount[i])
+            }
+            stop = float(stop_loss[i])
+            risk_per_share = price[i] - stop
+            reward = targets['aggressive'] - price[i]
+
+            plans.append({
+                "ticker": stock_data.get('ticker', ''),
+                "name": stock_data.get('name', ''),
+                "currency": stock_data.get('currency', 'KRW'),
+                "current_price": stock_data.get('current_price', 0),
+                "entry": entry_points,
+                "stop_loss": stop,
+                "targets": targets,
+                "position_size": position_size,
+                "split_plan": self._single._generate_split_plan(
+                    entry_points, stop, targets, position_size, user_profile
+                ),
+                "risk_reward_ratio": round(float(reward / risk_per_share), 2) if risk_per_share > 0 else 0,
+                "why": self._single._generate_why_reasons(stock_data, stop, targets, position_size),
+                "allocation": {
+                    "sector": sectors[i],
+                    "risk_percent": round(float(weight[i] * stop_pct[i]) * 100, 2),
+                    "correlation_discount": round(float(discount[i]), 3),
+                }
+            })
+
+        return {
+            "plans": plans,
+            "portfolio": self._portfolio_summary(
+                sectors, weight, np.nan_to_num(stop_pct), limits, len(candidates), len(plans), corr
+            )
+        }
+
+    # ========== 벡터 계산 ==========
+
+    @staticmethod
+    def _column(candidates: List[Dict[str, Any]], key: str, default: float) -> np.ndarray:
+        return np.array([c.get(key, default) or 0 for c in candidates], dtype=float)
+
+    @staticmethod
+    def _levels(candidates: List[Dict[str, Any]], key: str) -> np.ndarray:
+        """가변 길이 레벨 리스트 → (종목, 최대 개수) 행렬 (빈 칸은 NaN)"""
+        width = max(1, max(len(c.get(key) or []) for c in candidates))
+        levels = np.full((len(candidates), width), np.nan)
+        for i, c in enumerate(candidates):
+            values = c.get(key) or []
+            levels[i, :len(values)] = values
+        return levels
+
+    @staticmethod
+    def _stop_loss(price, ma20, ma60, atr, support0) -> np.ndarray:
+        """손절가: 추세/지지선 기준과 ATR 기준 중 가까운 값, 현재가 대비 3~10%"""
+        base = np.where(
+            ma20 > ma60,
+            ma20 * 0.98,
+            np.where(np.isnan(support0), price * 0.93, support0 * 0.97)
+        )
+        final = np.maximum(base, price - 2 * atr)
+        return np.maximum(price * 0.90, np.minimum(price * 0.97, final))
+
+    @staticmethod
+    def _targets(price, stop_loss, resistances, risk_profile) -> Tuple[np.ndarray, np.ndarray]:
+        """목표가: 손절폭 배수, 1차 목표는 처음 걸리는 저항선의 98%로 제한"""
+        cons_mult, aggr_mult = TARGET_MULTIPLIERS.get(risk_profile, TARGET_MULTIPLIERS['중립'])
+        risk = price - stop_loss
+        conservative = price + risk * cons_mult
+        aggressive = price + risk * aggr_mult
+
+        with np.errstate(invalid='ignore'):
+            capped = conservative[:, None] > resistances * 0.98
+        has_cap = capped.any(axis=1)
+        first = capped.argmax(axis=1)
+        cap_values = resistances[np.arange(len(price)), first] * 0.98
+        conservative = np.where(has_cap, cap_values, conservative)
+
+        return np.round(conservative, 0), np.round(aggressive, 0)
+
+    @staticmethod
+    def _allocate(base_weight, stop_pct, sectors, corr, limits, max_positions) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        순위순 탐욕 선정 - 한도에 걸린 종목은 건너뛰고 다음 순위 종목으로 계속
+
+        종목마다 (1) 이미 선정된 종목과의 양(+)의 상관관계만큼 할인
+        discount_i = 1 / (1 + Σ_{j 선정} max(corr_ij, 0)),
+        (2) 섹터 한도 / 총 노출 100% 남은 폭으로 자른 뒤,
+        (3) 자른 비중의 리스크가 남은 리스크 예산에 들어가면 선정.
+        섹터가 이미 한도면 건너뛰고, 선정 수가 max_positions가 되면 종료
+
+        Returns:
+            (비중, 상관관계 할인) - 선정되지 않은 종목 비중은 0
+        """
+        n = len(base_weight)
+        weight = np.zeros(n)
+        discount = np.ones(n)
+        positive_corr = np.clip(corr, 0, None) if corr is not None else None
+        sector_used: Dict[str, float] = {}
+        risk_left = limits["risk_budget"]
+        gross_left = 1.0
+        chosen: List[int] = []
+
+        for i in range(n):
+            if len(chosen) >= max_positions or gross_left <= _EPS:
+                break
+            if base_weight[i] <= 0 or stop_pct[i] <= 0:
+                continue
+
+            if positive_corr is not None and chosen:
+                discount[i] = 1.0 / (1.0 + positive_corr[i, chosen].sum())
+            sector_left = limits["sector_cap"] - sector_used.get(sectors[i], 0.0)
+            w = min(base_weight[i] * discount[i], sector_left, gross_left)
+            if w <= _EPS or w * stop_pct[i] > risk_left + _EPS:
+                continue
+
+            weight[i] = w
+            chosen.append(i)
+            sector_used[sectors[i]] = sector_used.get(sectors[i], 0.0) + w
+            risk_left -= w * stop_pct[i]
+            gross_left -= w
+
+        return weight, discount
+
+    def _correlation_matrix(self, tickers: List[str]) -> Optional[np.ndarray]:
+        """
+        후보 간 수익률 상관계수 행렬 (히스토리가 2종목 미만이면 None - 할인 생략)
+
+        히스토리가 없는 종목과의 상관계수는 0
+        """
+        n = len(tickers)
+        if not self.price_history_loader or n < 2:
+            return None
+
+        try:
+            loaded_tickers, closes = self.price_history_loader(tickers)
+        except Exception as e:
+            print(f"⚠️ 가격 히스토리 로드 실패 (상관관계 생략): {e}")
+            return None
+        if len(loaded_tickers) < 2:
+            return None
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(np.log(closes), axis=1)
+        corr = np.zeros((n, n))
+        pos = {t: i for i, t in enumerate(tickers)}
+        idx = np.array([pos[t] for t in loaded_tickers])
+        corr[np.ix_(idx, idx)] = self._pairwise_corr(returns)
+        return corr
+
+    @staticmethod
+    def _pairwise_corr(returns: np.ndarray) -> np.ndarray:
+        """NaN을 제외한 쌍별 상관계수 (공통 관측치 부족 시 0)"""
+        valid = ~np.isnan(returns)
+        x = np.where(valid, returns, 0.0)
+        v = valid.astype(float)
+
+        n_obs = v @ v.T
+        sum_x = x @ v.T                 # i의 합 (j와 공통 구간)
+        sum_xx = (x * x) @ v.T
+        sum_xy = x @ x.T
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_i = sum_x / n_obs
+            mean_j = sum_x.T / n_obs
+            cov = sum_xy / n_obs - mean_i * mean_j
+            var_i = sum_xx / n_obs - mean_i ** 2
+            var_j = sum_xx.T / n_obs - mean_j ** 2
+            corr = cov / np.sqrt(var_i * var_j)
+
+        corr = np.where((n_obs >= MIN_CORRELATION_OBS) & np.isfinite(corr), corr, 0.0)
+        np.fill_diagonal(corr, 1.0)
+        return np.clip(corr, -1.0, 1.0)
+
+    @staticmethod
+    def _portfolio_summary(sectors, weight, stop_pct, limits, n_candidates, n_selected, corr=None) -> Dict[str, Any]:
+        """배분 결과 요약"""
+        sector_exposure: Dict[str, float] = {}
+        for sector, w in zip(sectors, weight):
+            if w > 0:
+                sector_exposure[sector] = round(sector_exposure.get(sector, 0) + float(w) * 100, 1)
+
+        return {
+            "candidates": n_candidates,
+            "selected": n_selected,
+            "gross_exposure_percent": round(float(np.sum(weight)) * 100, 1),
+            "total_risk_percent": round(float(np.sum(weight * stop_pct)) * 100, 2),
+            "risk_budget_percent": round(limits.get("risk_budget", 0) * 100, 1),
+            "sector_cap_percent": round(limits.get("sector_cap", 0) * 100, 1),
+            "sector_exposure": sector_exposure,
+            "correlation_used": corr is not None,
+        }
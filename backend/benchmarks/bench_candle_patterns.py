@@ -0,0 +1,142 @@
+"""
+캔들 패턴 스캔 벤치마크
+기존 방식(봉마다 df.iloc 스칼라 접근) vs 벡터화 엔진(services.candle_patterns)
+
+사용법:
+    python benchmarks/bench_candle_patterns.py --tickers 200 --bars 250
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# 상위 디렉토리의 모듈 import
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.candle_patterns import PATTERNS, detect_pattern_masks, decode_mask, stack_ohlc
+
+# 기존 detect_candle_patterns가 다루던 패턴
+LEGACY_PATTERNS = PATTERNS[:6]
+
+
+def make_universe(n_tickers: int, n_bars: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """랜덤워크 OHLC 생성"""
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(n_tickers):
+        close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+        open_ = close * (1 + rng.normal(0, 0.01, n_bars))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n_bars)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n_bars)))
+        frames[f"{i:06d}"] = pd.DataFrame({"open": open_, "high": high, "low": low, "close": close})
+    return frames
+
+
+def legacy_patterns_at(df: pd.DataFrame, i: int) -> List[str]:
+    """기존 구현과 같은 스칼라 로직 (i번째 봉)"""
+    patterns = []
+    latest = df.iloc[i]
+    prev = df.iloc[i - 1]
+
+    open_price = latest['open']
+    close = latest['close']
+    high = latest['high']
+    low = latest['low']
+
+    body = abs(close - open_price)
+    upper_shadow = high - max(open_price, close)
+    lower_shadow = min(open_price, close) - low
+
+    if body < (high - low) * 0.1:
+        patterns.append('DOJI')
+    if (lower_shadow > body * 2) and (upper_shadow < body * 0.5) and close > open_price:
+        patterns.append('HAMMER')
+    if (upper_shadow > body * 2) and (lower_shadow < body * 0.5) and close > open_price:
+        patterns.append('INVERTED_HAMMER')
+    if (upper_shadow > body * 2) and (lower_shadow < body * 0.5) and close < open_price:
+        patterns.append('SHOOTING_STAR')
+    if (prev['close'] < prev['open'] and close > open_price and
+            close > prev['open'] and open_price < prev['close']):
+        patterns.append('BULLISH_ENGULFING')
+    if (prev['close'] > prev['open'] and close < open_price and
+            close < prev['open'] and open_price > prev['close']):
+        patterns.append('BEARISH_ENGULFING')
+    return patterns
+
+
+def run_legacy(frames: Dict[str, pd.DataFrame]) -> Dict[str, List[List[str]]]:
+    return {
+        ticker: [legacy_patterns_at(df, i) for i in range(1, len(df))]
+        for ticker, df in frames.items()
+    }
+
+
+def run_vectorized(frames: Dict[str, pd.DataFrame]):
+    tickers, o, h, l, c = stack_ohlc(frames)
+    return tickers, detect_pattern_masks(o, h, l, c)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='캔들 패턴 스캔 벤치마크')
+    parser.add_argument('--tickers', type=int, default=100, help='종목 수 (기본: 100)')
+    parser.add_argument('--bars', type=int, default=250, help='종목당 봉 수 (기본: 250)')
+    parser.add_argument('--repeat', type=int, default=3, help='벡터화 반복 횟수 (최소값 사용)')
+    parser.add_argument('--json', dest='json_path', type=str, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    frames = make_universe(args.tickers, args.bars)
+    total_bars = args.tickers * args.bars
+
+    start = time.perf_counter()
+    legacy = run_legacy(frames)
+    legacy_s = time.perf_counter() - start
+
+    vector_times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        tickers, masks = run_vectorized(frames)
+        vector_times.append(time.perf_counter() - start)
+    vector_s = min(vector_times)
+
+    # 기존 6개 패턴 결과 일치 확인
+    mismatches = 0
+    for row, ticker in enumerate(tickers):
+        for i, expected in enumerate(legacy[ticker], start=1):
+            got = [p for p in decode_mask(masks[row, i]) if p in LEGACY_PATTERNS]
+            if got != expected:
+                mismatches += 1
+
+    result = {
+        "tickers": args.tickers,
+        "bars": args.bars,
+        "legacy_s": round(legacy_s, 4),
+        "vectorized_s": round(vector_s, 4),
+        "speedup": round(legacy_s / vector_s, 1) if vector_s else None,
+        "legacy_patterns": len(LEGACY_PATTERNS),
+        "vectorized_patterns": len(PATTERNS),
+        "mismatches": mismatches,
+    }
+
+    print(f"\n{'='*70}")
+    print(f"📊 캔들 패턴 스캔: {args.tickers}종목 × {args.bars}봉 = {total_bars:,}봉")
+    print(f"{'='*70}\n")
+    print(f"기존 (df.iloc, {len(LEGACY_PATTERNS)}패턴):  {legacy_s:8.3f}s")
+    print(f"벡터화 ({len(PATTERNS)}패턴):        {vector_s:8.3f}s")
+    print(f"속도 향상: {result['speedup']}x")
+    print(f"기존 패턴 결과 불일치: {mismatches}건 {'✅' if mismatches == 0 else '❌'}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
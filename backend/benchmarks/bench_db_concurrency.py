@@ -0,0 +1,167 @@
+"""
+DB 동시성 벤치마크 (SQLite 임시 파일 DB)
+스케줄러형 쓰기(배치 INSERT + 커밋)와 API형 읽기(종목 기간 조회)를 동시에 실행
+
+    legacy: StaticPool 단일 커넥션 + journal_mode=DELETE, synchronous=FULL
+    tuned : 스레드별 커넥션 풀 + WAL, synchronous=NORMAL, mmap, 읽기 전용 세션 분리
+
+설정은 import 시점에 결정되므로 모드마다 하위 프로세스로 실행
+
+사용법:
+    python benchmarks/bench_db_concurrency.py --readers 8 --seconds 5
+"""
+
+import sys
+import os
+import argparse
+import json
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+MODES = {
+    "legacy": {"SQLITE_POOL": "static", "SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL"},
+    "tuned": {"SQLITE_POOL": "queue", "SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "NORMAL"},
+}
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_worker(args) -> dict:
+    """하위 프로세스: 현재 환경변수 설정으로 읽기/쓰기 동시 실행"""
+    sys.path.append(BACKEND_DIR)
+
+    from database import ReadSessionLocal, SessionLocal, init_db, pool_stats
+    from models.stock import StockPrice
+
+    init_db()
+
+    # 초기 데이터 (종목 × 일)
+    start_day = date(2020, 1, 1)
+    db = SessionLocal()
+    for t in range(args.tickers):
+        for d in range(args.days):
+            db.add(StockPrice(ticker=f"{t:06d}", market="KR", date=start_day + timedelta(days=d),
+                              close=10000.0 + d, source="bench"))
+    db.commit()
+    db.close()
+
+    stop = threading.Event()
+    read_latencies, errors = [], {"read": 0, "write": 0}
+    writes = [0]
+    lock = threading.Lock()
+
+    def writer():
+        day = args.days
+        while not stop.is_set():
+            db = SessionLocal()
+            try:
+                for t in range(args.tickers):
+                    db.add(StockPrice(ticker=f"{t:06d}", market="KR", date=start_day + timedelta(days=day),
+                                      close=10000.0 + day, source="bench"))
+                db.commit()
+                writes[0] += args.tickers
+                day += 1
+            except Exception:
+                db.rollback()
+                with lock:
+                    errors["write"] += 1
+            finally:
+                db.close()
+            time.sleep(args.write_interval)
+
+    def reader(seed: int):
+        i = seed
+        while not stop.is_set():
+            ticker = f"{i % args.tickers:06d}"
+            i += 7
+            started = time.perf_counter()
+            db = ReadSessionLocal()
+            try:
+                rows = db.query(StockPrice.date, StockPrice.close).filter(
+                    StockPrice.ticker == ticker,
+                    StockPrice.date >= start_day,
+                    StockPrice.date <= start_day + timedelta(days=120)
+                ).all()
+                assert rows
+                elapsed = time.perf_counter() - started
+                with lock:
+                    read_latencies.append(elapsed)
+            except Exception:
+                with lock:
+                    errors["read"] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(i,)) for i in range(args.readers)
+    ]
+    for th in threads:
+        th.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for th in threads:
+        th.join()
+
+    read_latencies.sort()
+    n = len(read_latencies)
+    return {
+        "reads_per_s": round(n / args.seconds, 1),
+        "read_p50_ms": round(read_latencies[n // 2] * 1000, 2) if n else None,
+        "read_p95_ms": round(read_latencies[max(0, int(n * 0.95) - 1)] * 1000, 2) if n else None,
+        "rows_written_per_s": round(writes[0] / args.seconds, 1),
+        "read_errors": errors["read"],
+        "write_errors": errors["write"],
+        "max_connections_out": max(p.get("max_checked_out", 0) for p in pool_stats().values()),
+    }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='DB 동시성 벤치마크 (스케줄러 쓰기 + API 읽기)')
+    parser.add_argument('--readers', type=int, default=8, help='읽기 스레드 수 (기본: 8)')
+    parser.add_argument('--seconds', type=float, default=5, help='측정 시간 (기본: 5초)')
+    parser.add_argument('--tickers', type=int, default=50, help='종목 수 (기본: 50)')
+    parser.add_argument('--days', type=int, default=250, help='초기 일수 (기본: 250)')
+    parser.add_argument('--write-interval', type=float, default=0.05, help='쓰기 배치 간격 초 (기본: 0.05)')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--json', dest='json_path', type=str, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    results = {}
+    for mode in args.modes:
+        tmp_dir = tempfile.mkdtemp(prefix=f"bench_db_{mode}_")
+        env = {**os.environ, **MODES[mode],
+               "DATABASE_URL": f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"}
+        env.pop("DATABASE_READ_URL", None)
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker",
+               "--readers", str(args.readers), "--seconds", str(args.seconds),
+               "--tickers", str(args.tickers), "--days", str(args.days),
+               "--write-interval", str(args.write_interval)]
+        output = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"\n{'='*70}")
+    print(f"📊 DB 동시성: 쓰기 1 + 읽기 {args.readers} 스레드, {args.seconds}초")
+    print(f"{'='*70}\n")
+    print(f"{'mode':>7} {'read/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'write rows/s':>13} {'errors r/w':>11} {'conns':>6}")
+    for mode, r in results.items():
+        print(f"{mode:>7} {r['reads_per_s']:>8} {r['read_p50_ms']:>8} {r['read_p95_ms']:>8} "
+              f"{r['rows_written_per_s']:>13} {str(r['read_errors']) + '/' + str(r['write_errors']):>11} "
+              f"{r['max_connections_out']:>6}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
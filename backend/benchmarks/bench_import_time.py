@@ -0,0 +1,129 @@
+"""
+서버 import 시간 측정 + 예산 검사 (python -X importtime)
+새 인터프리터에서 모듈을 import해 누적 시간이 큰 모듈을 출력하고, 예산 초과 시 종료 코드 1
+
+사용법:
+    python benchmarks/bench_import_time.py --budget-ms 1000
+    python benchmarks/bench_import_time.py --module scheduler --top 20
+"""
+
+import sys
+import os
+import argparse
+import json
+import re
+import subprocess
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:  self [us] | cumulative | imported package"
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# import 시점에 로드되면 안 되는 무거운 모듈 (첫 사용/예열 때 로드)
+DEFERRED_MODULES = ("pandas", "yfinance", "bs4", "agents.orchestrator", "services.agent_data_provider")
+
+# 앱이 반드시 쓰는 프레임워크 - 이 모듈들의 import 시간은 앱 코드로 줄일 수 없음
+FRAMEWORK_MODULES = ("fastapi", "sqlalchemy")
+
+# import 시간 예산 (tests/test_import_time.py와 공유)
+#   전체: 실행 환경 속도에 따라 달라짐 (IMPORT_BUDGET_MS)
+#   앱 자체: 전체 - 프레임워크 import 시간 (IMPORT_OWN_BUDGET_MS)
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+OWN_BUDGET_MS = float(os.getenv("IMPORT_OWN_BUDGET_MS", "500"))
+
+
+def measure(module: str) -> dict:
+    """새 프로세스에서 module import 1회 측정 (임시 SQLite DB 사용)"""
+    tmp_dir = tempfile.mkdtemp(prefix="bench_import_")
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"}
+    env.pop("DATABASE_READ_URL", None)
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} 실패:\n{proc.stderr[-2000:]}")
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            modules.append({
+                "module": m.group(4),
+                "self_ms": int(m.group(1)) / 1000,
+                "cumulative_ms": int(m.group(2)) / 1000,
+                "depth": len(m.group(3)) // 2,
+            })
+
+    top = next((m for m in modules if m["module"] == module), None)
+    loaded = {m["module"] for m in modules}
+    framework_ms = sum(m["cumulative_ms"] for m in modules if m["module"] in FRAMEWORK_MODULES)
+    return {
+        "module": module,
+        "total_ms": round(top["cumulative_ms"], 1) if top else None,
+        "framework_ms": round(framework_ms, 1),
+        "own_ms": round(top["cumulative_ms"] - framework_ms, 1) if top else None,
+        "modules": modules,
+        "deferred_loaded": [name for name in DEFERRED_MODULES if name in loaded],
+    }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='서버 import 시간 측정 (예산 검사)')
+    parser.add_argument('--module', type=str, default='server_v2', help='측정할 모듈 (기본: server_v2)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'import 시간 예산 ms (기본: {DEFAULT_BUDGET_MS:.0f})')
+    parser.add_argument('--own-budget-ms', type=float, default=OWN_BUDGET_MS,
+                        help=f'프레임워크 제외 import 시간 예산 ms (기본: {OWN_BUDGET_MS:.0f})')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 측정 횟수 (최소값 사용)')
+    parser.add_argument('--top', type=int, default=15, help='출력할 상위 패키지 수 (기본: 15)')
+    parser.add_argument('--json', dest='json_path', type=str, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda r: r["total_ms"])
+
+    # 최상위 패키지 단위(들여쓰기 1단계)로 누적 시간 정렬
+    direct = [m for m in best["modules"] if m["depth"] == 1]
+    direct.sort(key=lambda m: m["cumulative_ms"], reverse=True)
+
+    over_budget = best["total_ms"] > args.budget_ms or best["own_ms"] > args.own_budget_ms
+    summary = {
+        "module": args.module,
+        "total_ms": best["total_ms"],
+        "framework_ms": best["framework_ms"],
+        "own_ms": best["own_ms"],
+        "runs_ms": [r["total_ms"] for r in runs],
+        "budget_ms": args.budget_ms,
+        "own_budget_ms": args.own_budget_ms,
+        "within_budget": not over_budget,
+        "deferred_loaded": best["deferred_loaded"],
+        "top": [{"module": m["module"], "cumulative_ms": round(m["cumulative_ms"], 1)}
+                for m in direct[:args.top]],
+    }
+
+    print(f"\n{'='*70}")
+    print(f"📊 import {args.module}: {best['total_ms']:.0f}ms (예산 {args.budget_ms:.0f}ms, {args.repeat}회 중 최소)")
+    print(f"  프레임워크({', '.join(FRAMEWORK_MODULES)}) {best['framework_ms']:.0f}ms / "
+          f"앱 자체 {best['own_ms']:.0f}ms (예산 {args.own_budget_ms:.0f}ms)")
+    print(f"{'='*70}\n")
+    for m in summary["top"]:
+        print(f"  {m['cumulative_ms']:>8.1f}ms  {m['module']}")
+
+    if best["deferred_loaded"]:
+        print(f"\n⚠️  지연 로드 대상이 import 시점에 로드됨: {', '.join(best['deferred_loaded'])}")
+    print(f"\n{'❌ 예산 초과' if over_budget else '✅ 예산 이내'}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json_path}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,431 @@
+"""
+server_v2 부하 테스트 (실제 사용 패턴 비율 재현)
+동시 사용자 수를 단계적으로 늘리며 단계별 처리량 / 지연 시간 / 이벤트 루프 지연 측정 → 포화 지점 확인
+
+    quote    GET /api/price/{ticker}                           시세 폴링
+    chart    GET /api/chart/{ticker}                           차트 로드 (받은 ETag로 재검증)
+    analyze  POST /api/agent/analyze                           Agent 분석 (종목 조합이 겹치면 결과 캐시 적중)
+    auth     POST /api/auth/login → GET /me → POST /logout     로그인 흐름 (bcrypt 검증 포함)
+
+가상 사용자는 --mix 비율로 동작을 고르고 --think-ms(지수 분포 평균)만큼 쉬었다가 반복 (closed loop)
+포화: 처리량 증가가 +5% 미만으로 멈추거나 p95가 --slo-ms 초과 또는 오류율 1% 초과인 첫 단계
+예상 동시 접속자 = 포화 전 최대 처리량 × (--plan-think-s + 평균 응답 시간)  (Little의 법칙)
+
+전송 방식 (--transport):
+    inprocess  httpx ASGITransport로 앱 직접 호출 - 소켓 / HTTP 파싱 제외, 부하 생성기와 같은 이벤트 루프
+    localhost  uvicorn을 백그라운드 스레드로 띄우고 127.0.0.1로 요청 - 루프 지연은 서버 루프에서 측정
+
+업스트림(Kiwoom, yfinance 등)은 upstream_replay의 fixture 재생 + --upstream-latency-ms 지연
+DB / 캐시 파일은 bench_offline과 같이 임시 디렉토리 사용
+
+사용법:
+    python benchmarks/bench_load.py --steps 1,5,10,25,50 --duration 10
+    python benchmarks/bench_load.py --mix quote=70,chart=20,analyze=5,auth=5 --upstream-latency-ms 150
+    python benchmarks/bench_load.py --transport localhost --slo-ms 500 --json load.json
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import random
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 상위 디렉토리의 모듈 import
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_offline import prepare_environment, redirect_data_files, seed_quote_cache
+from upstream_replay import UpstreamReplay
+
+# fixture가 있는 종목 (KR: Kiwoom + yfinance .KS, US: yfinance)
+TICKERS = {
+    "005930": "삼성전자",
+    "000660": "SK하이닉스",
+    "012450": "한화에어로스페이스",
+    "AAPL": "Apple Inc.",
+    "MSFT": "Microsoft Corporation",
+    "NVDA": "NVIDIA Corporation",
+}
+ANALYZE_TICKERS = ["005930", "000660", "AAPL", "NVDA"]
+
+LOAD_USER = {"username": "loadtest01", "email": "loadtest01@example.com", "password": "LoadTest1234"}
+
+DEFAULT_MIX = "quote=60,chart=25,analyze=5,auth=10"
+LAG_INTERVAL = 0.01  # 이벤트 루프 지연 측정 주기 (초)
+PLATEAU_GAIN = 0.05  # 이 비율 미만으로 처리량이 늘면 포화
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    """'quote=60,chart=25' → {"quote": 60.0, "chart": 25.0}"""
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ACTIONS:
+            raise ValueError(f"알 수 없는 동작: {name} (가능: {', '.join(ACTIONS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("비율 합계가 0")
+    return mix
+
+
+# ========== 측정 ==========
+
+class StepStats:
+    """단계 1개의 요청별 지연 / 오류"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def add(self, label: str, seconds: float, error: bool):
+        self.latencies.setdefault(label, []).append(seconds)
+        if error:
+            self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self, elapsed: float, lags: List[float]) -> Dict:
+        def pct(values, q):
+            return round(float(np.percentile(values, q)) * 1000, 1) if len(values) else None
+
+        everything = [s for values in self.latencies.values() for s in values]
+        errors = sum(self.errors.values())
+        return {
+            "requests": len(everything),
+            "rps": round(len(everything) / elapsed, 1) if elapsed else 0.0,
+            "errors": errors,
+            "error_rate": round(errors / len(everything), 4) if everything else 0.0,
+            "mean_ms": round(float(np.mean(everything)) * 1000, 1) if everything else None,
+            "p50_ms": pct(everything, 50),
+            "p95_ms": pct(everything, 95),
+            "p99_ms": pct(everything, 99),
+            "loop_lag_p50_ms": pct(lags, 50),
+            "loop_lag_p99_ms": pct(lags, 99),
+            "loop_lag_max_ms": round(max(lags) * 1000, 1) if lags else None,
+            "by_request": {
+                label: {"count": len(values), "errors": self.errors.get(label, 0),
+                        "p50_ms": pct(values, 50), "p95_ms": pct(values, 95), "p99_ms": pct(values, 99)}
+                for label, values in sorted(self.latencies.items())
+            },
+        }
+
+
+async def _measure_loop_lag(stop: threading.Event, lags: List[float]):
+    """이벤트 루프 지연 측정 (예정 시각 대비 실제 깨어난 시각)"""
+    while not stop.is_set():
+        expected = time.perf_counter() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _send(client, stats: StepStats, label: str, method: str, url: str, **kwargs):
+    """요청 1건 + 지연 / 오류 기록 (예외, 4xx/5xx는 오류 - 304는 정상)"""
+    started = time.perf_counter()
+    response = None
+    try:
+        response = await client.request(method, url, **kwargs)
+    except Exception:
+        pass
+    stats.add(label, time.perf_counter() - started, response is None or response.status_code >= 400)
+    return response
+
+
+# ========== 동작 ==========
+
+async def action_quote(client, stats: StepStats, rng: random.Random, state: Dict):
+    await _send(client, stats, "quote", "GET", f"/api/price/{rng.choice(list(TICKERS))}")
+
+
+async def action_chart(client, stats: StepStats, rng: random.Random, state: Dict):
+    ticker = rng.choice(list(TICKERS))
+    etags = state.setdefault("etags", {})
+    headers = {"If-None-Match": etags[ticker]} if ticker in etags else {}
+    response = await _send(client, stats, "chart", "GET", f"/api/chart/{ticker}", headers=headers)
+    if response is not None and response.headers.get("etag"):
+        etags[ticker] = response.headers["etag"]
+
+
+async def action_analyze(client, stats: StepStats, rng: random.Random, state: Dict):
+    body = {"tickers": rng.sample(ANALYZE_TICKERS, 2), "period": rng.choice(["단기", "중기"])}
+    await _send(client, stats, "analyze", "POST", "/api/agent/analyze", json=body)
+
+
+async def action_auth(client, stats: StepStats, rng: random.Random, state: Dict):
+    credentials = {"username": LOAD_USER["username"], "password": LOAD_USER["password"]}
+    response = await _send(client, stats, "auth.login", "POST", "/api/auth/login", json=credentials)
+    if response is None or response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    await _send(client, stats, "auth.me", "GET", "/api/auth/me", headers=headers)
+    await _send(client, stats, "auth.logout", "POST", "/api/auth/logout", headers=headers)
+
+
+ACTIONS = {
+    "quote": action_quote,
+    "chart": action_chart,
+    "analyze": action_analyze,
+    "auth": action_auth,
+}
+
+
+async def virtual_user(client, stats: StepStats, mix: Dict[str, float], deadline: float,
+                       think_ms: float, seed: int):
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    state: Dict = {}
+    while time.perf_counter() < deadline:
+        await ACTIONS[rng.choices(names, weights)[0]](client, stats, rng, state)
+        if think_ms > 0:
+            await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+
+# ========== 대상 서버 ==========
+
+class InProcessTarget:
+    """ASGITransport로 앱 직접 호출 (lifespan 포함)"""
+
+    name = "inprocess"
+
+    def __init__(self, app):
+        self.app = app
+        self.lags: List[float] = []
+        self._stop = threading.Event()
+        self._lifespan = None
+        self._lag_task = None
+        self.client = None
+
+    async def __aenter__(self):
+        import httpx
+
+        self._lifespan = self.app.router.lifespan_context(self.app)
+        await self._lifespan.__aenter__()
+        transport = httpx.ASGITransport(app=self.app, raise_app_exceptions=False)
+        self.client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60)
+        self._lag_task = asyncio.create_task(_measure_loop_lag(self._stop, self.lags))
+        return self
+
+    async def __aexit__(self, *exc):
+        self._stop.set()
+        await self._lag_task
+        await self.client.aclose()
+        await self._lifespan.__aexit__(*exc)
+
+
+class LocalhostTarget:
+    """uvicorn 백그라운드 스레드 + 127.0.0.1 HTTP (루프 지연은 서버 루프에서 측정)"""
+
+    name = "localhost"
+
+    def __init__(self, app, max_connections: int):
+        self.app = app
+        self.max_connections = max_connections
+        self.lags: List[float] = []
+        self._stop = threading.Event()
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self.client = None
+
+    def _serve(self):
+        async def serve():
+            lag_task = asyncio.create_task(_measure_loop_lag(self._stop, self.lags))
+            await self._server.serve()
+            self._stop.set()
+            await lag_task
+
+        asyncio.run(serve())
+
+    async def __aenter__(self):
+        import httpx
+        import uvicorn
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning",
+                                access_log=False, lifespan="on")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._serve, name="load-test-server", daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("uvicorn 시작 실패")
+            await asyncio.sleep(0.05)
+
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        self.client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+        self._server.should_exit = True
+        await asyncio.to_thread(self._thread.join, 30)
+
+
+# ========== 실행 ==========
+
+async def _prepare_user(client) -> Optional[str]:
+    """로그인 흐름용 계정 생성 (이미 있으면 그대로 사용) - 실패 시 오류 메시지"""
+    body = {**LOAD_USER, "password_confirm": LOAD_USER["password"]}
+    try:
+        response = await client.post("/api/auth/signup", json=body)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    if response.status_code >= 500:
+        return f"signup HTTP {response.status_code}"
+    return None
+
+
+async def run_steps(target, mix: Dict[str, float], steps: List[int], duration: float,
+                    warmup: float, think_ms: float) -> List[Dict]:
+    """예열 후 동시 사용자 단계별 측정"""
+    results = []
+    async with target:
+        signup_error = await _prepare_user(target.client)
+        if signup_error and "auth" in mix:
+            print(f"⚠️ 로그인 계정 준비 실패 - auth 요청은 오류로 집계됨 ({signup_error})", file=sys.__stdout__)
+
+        if warmup > 0:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(virtual_user(target.client, StepStats(), mix, deadline, think_ms, seed=-i)
+                                   for i in range(steps[0])))
+
+        for users in steps:
+            stats = StepStats()
+            target.lags.clear()
+            started = time.perf_counter()
+            deadline = started + duration
+            await asyncio.gather(*(virtual_user(target.client, stats, mix, deadline, think_ms, seed=users * 1000 + i)
+                                   for i in range(users)))
+            elapsed = time.perf_counter() - started
+            result = {"users": users, "elapsed_s": round(elapsed, 2), **stats.summary(elapsed, list(target.lags))}
+            results.append(result)
+            print(f"  {users:4d}명  {result['rps']:8.1f} req/s  p95 {result['p95_ms']}ms  "
+                  f"오류 {result['error_rate']:.1%}  루프 지연 p99 {result['loop_lag_p99_ms']}ms", file=sys.__stdout__)
+    return results
+
+
+def find_saturation(results: List[Dict], slo_ms: float, max_error_rate: float, plan_think_s: float) -> Dict:
+    """
+    포화 지점 (SLO / 오류율을 지키는 최대 처리량 + 처리량이 멈춘 첫 단계)
+
+    Returns:
+        {"max_rps", "at_users", "saturated_at_users", "reason", "estimated_concurrent_users"}
+    """
+    best, saturated_at, reason = None, None, None
+    for i, step in enumerate(results):
+        if step["error_rate"] > max_error_rate:
+            saturated_at, reason = step["users"], f"error_rate {step['error_rate']:.1%}"
+            break
+        if step["p95_ms"] is not None and step["p95_ms"] > slo_ms:
+            saturated_at, reason = step["users"], f"p95 {step['p95_ms']}ms > {slo_ms:.0f}ms"
+            break
+        if i > 0 and step["rps"] < results[i - 1]["rps"] * (1 + PLATEAU_GAIN):
+            saturated_at, reason = step["users"], "throughput plateau"
+            if best is None or step["rps"] > best["rps"]:
+                best = step
+            break
+        best = step
+
+    estimate = None
+    if best and best["mean_ms"] is not None:
+        estimate = int(best["rps"] * (plan_think_s + best["mean_ms"] / 1000))
+    return {
+        "max_rps": best["rps"] if best else None,
+        "at_users": best["users"] if best else None,
+        "saturated_at_users": saturated_at,
+        "reason": reason or "not saturated (add larger --steps)",
+        "plan_think_s": plan_think_s,
+        "estimated_concurrent_users": estimate,
+    }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='server_v2 부하 테스트')
+    parser.add_argument('--mix', type=str, default=DEFAULT_MIX, help=f'동작 비율 (기본: {DEFAULT_MIX})')
+    parser.add_argument('--steps', type=str, default='1,2,5,10,20,50', help='동시 사용자 단계 (기본: 1,2,5,10,20,50)')
+    parser.add_argument('--duration', type=float, default=10, help='단계별 측정 시간 초 (기본: 10)')
+    parser.add_argument('--warmup', type=float, default=3, help='측정 전 예열 시간 초 (기본: 3)')
+    parser.add_argument('--think-ms', type=float, default=0, help='사용자 동작 간 평균 대기 (기본: 0 = 최대 부하)')
+    parser.add_argument('--transport', choices=['inprocess', 'localhost'], default='inprocess', help='전송 방식')
+    parser.add_argument('--upstream-latency-ms', type=float, default=50, help='업스트림 응답 지연 평균 (기본: 50)')
+    parser.add_argument('--upstream-jitter', type=float, default=0.5, help='업스트림 지연 ± 비율 (기본: 0.5)')
+    parser.add_argument('--slo-ms', type=float, default=1000, help='p95 목표 (기본: 1000)')
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help='허용 오류율 (기본: 0.01)')
+    parser.add_argument('--plan-think-s', type=float, default=15, help='용량 추정용 실사용자 요청 간격 초 (기본: 15 = 시세 폴링 주기)')
+    parser.add_argument('--json', dest='json_path', type=str, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+        steps = sorted({int(s) for s in args.steps.split(",") if s.strip()})
+    except ValueError as e:
+        parser.error(str(e))
+
+    work_dir = tempfile.mkdtemp(prefix="bench-load-")
+    prepare_environment(work_dir, record=False)
+    redirect_data_files(work_dir)
+    seed_quote_cache(10_000, TICKERS)  # 종목명만 채운 만료 캐시 → 첫 조회 후 저장
+
+    print(f"\n{'='*70}")
+    print(f"🚦 부하 테스트: {args.transport}, 단계 {steps} × {args.duration:.0f}s, 비율 {args.mix}")
+    print(f"   업스트림 지연 {args.upstream_latency_ms:.0f}ms ±{args.upstream_jitter:.0%}, think {args.think_ms:.0f}ms")
+    print(f"{'='*70}\n")
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            import server_v2
+
+        target = (LocalhostTarget(server_v2.app, max(steps)) if args.transport == "localhost"
+                  else InProcessTarget(server_v2.app))
+        with UpstreamReplay(latency_ms=args.upstream_latency_ms, jitter=args.upstream_jitter) as replay, \
+                contextlib.redirect_stdout(io.StringIO()):
+            results = asyncio.run(run_steps(target, mix, steps, args.duration, args.warmup, args.think_ms))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    saturation = find_saturation(results, args.slo_ms, args.max_error_rate, args.plan_think_s)
+
+    print(f"\n{'사용자':>6s} {'req/s':>9s} {'오류율':>7s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'루프p99':>9s} {'루프max':>9s}")
+    for r in results:
+        print(f"{r['users']:6d} {r['rps']:9.1f} {r['error_rate']:7.1%} {r['p50_ms'] or 0:7.1f}ms {r['p95_ms'] or 0:7.1f}ms "
+              f"{r['p99_ms'] or 0:7.1f}ms {r['loop_lag_p99_ms'] or 0:7.1f}ms {r['loop_lag_max_ms'] or 0:7.1f}ms")
+
+    print(f"\n포화: {saturation['reason']} (사용자 {saturation['saturated_at_users']}명)")
+    print(f"최대 처리량: {saturation['max_rps']} req/s (사용자 {saturation['at_users']}명)")
+    print(f"예상 동시 접속자 (요청 간격 {args.plan_think_s:.0f}s): {saturation['estimated_concurrent_users']}명 / 프로세스")
+
+    summary = {
+        "generated_at": datetime.now().astimezone().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "transport": args.transport, "mix": mix, "steps": steps, "duration_s": args.duration,
+            "think_ms": args.think_ms, "upstream_latency_ms": args.upstream_latency_ms,
+            "upstream_jitter": args.upstream_jitter, "slo_ms": args.slo_ms,
+        },
+        "upstream_calls": replay.stats(),
+        "steps": results,
+        "saturation": saturation,
+    }
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
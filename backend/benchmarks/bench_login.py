@@ -0,0 +1,188 @@
+"""
+로그인 동시 처리량 벤치마크 (POST /api/auth/login)
+인증 라우터를 httpx ASGITransport로 직접 호출 - 사용자 조회, bcrypt 검증, 세션 저장까지 실제 경로
+
+    pool    password_hasher.run_in_pool (현재 동작 - 검증을 작업 풀에서 실행)
+    inline  run_in_pool을 직접 호출로 교체 (이전 동작 - 검증이 이벤트 루프를 막음)
+
+사용법:
+    python benchmarks/bench_login.py --concurrency 32 --requests 200
+    python benchmarks/bench_login.py --rounds 10 --workers 4 --modes pool
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List
+
+# 상위 디렉토리의 모듈 import
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+USERNAME = "bench_login"
+PASSWORD = "Benchmark1234"
+MODES = ("inline", "pool")
+
+
+def prepare_environment(work_dir: str, rounds: int, workers: int):
+    """
+    backend 모듈 import 전에 호출 - bcrypt rounds / 작업 풀 크기 / DB 경로가 import 시점에 결정됨
+    """
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(work_dir, 'bench_login.db')}?check_same_thread=False",
+        "BCRYPT_ROUNDS": str(rounds),
+        "PASSWORD_HASH_WORKERS": str(workers),
+    })
+    logging.disable(logging.WARNING)
+
+
+def build_app():
+    """인증 라우터만 올린 앱 (로그인 경로 외 미들웨어 비용 제외)"""
+    from fastapi import FastAPI
+    from routers.auth import router
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def create_user():
+    """벤치마크 계정 생성"""
+    from database import SessionLocal, init_db
+    from services.user_service import UserService
+
+    init_db()
+    db = SessionLocal()
+    try:
+        ok, message, _ = UserService.register_user(
+            db, username=USERNAME, email=f"{USERNAME}@example.com", password=PASSWORD
+        )
+    finally:
+        db.close()
+    if not ok:
+        raise SystemExit(f"❌ 벤치마크 계정 생성 실패: {message}")
+
+
+@contextmanager
+def inline_hashing():
+    """이전 동작 재현 - 해싱을 작업 풀 없이 이벤트 루프에서 실행"""
+    from services import password_hasher
+
+    async def run_inline(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    original = password_hasher.run_in_pool
+    password_hasher.run_in_pool = run_inline
+    try:
+        yield
+    finally:
+        password_hasher.run_in_pool = original
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float, lags: List[float]):
+    """이벤트 루프 지연 측정 (예정 시각 대비 실제 깨어난 시각)"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _run(app, concurrency: int, total: int) -> Dict:
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    lags: List[float] = []
+    body = {"username": USERNAME, "password": PASSWORD}
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def login():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/api/auth/login", json=body)
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_measure_loop_lag(stop, 0.01, lags))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await lag_task
+
+    latencies.sort()
+    ok = len(latencies)
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(ok / elapsed, 1),
+        "p50_ms": round(latencies[ok // 2] * 1000, 1) if ok else None,
+        "p95_ms": round(latencies[max(0, int(ok * 0.95) - 1)] * 1000, 1) if ok else None,
+        "max_loop_lag_ms": round(max(lags, default=0.0) * 1000, 1),
+        "errors": {str(code): n for code, n in statuses.items() if code != 200},
+    }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='로그인 처리량 벤치마크 (POST /api/auth/login)')
+    parser.add_argument('--concurrency', type=int, default=32, help='동시 로그인 수 (기본: 32)')
+    parser.add_argument('--requests', type=int, default=200, help='모드별 총 로그인 수 (기본: 200)')
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt rounds (기본: 12)')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help='해싱 작업 풀 크기')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help='비교할 모드')
+    parser.add_argument('--json', dest='json_path', type=str, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_login_")
+    prepare_environment(work_dir, args.rounds, args.workers)
+
+    from services import password_hasher
+
+    app = build_app()
+    create_user()
+
+    results = []
+    for mode in args.modes:
+        if mode == "inline":
+            with inline_hashing():
+                result = asyncio.run(_run(app, args.concurrency, args.requests))
+        else:
+            result = asyncio.run(_run(app, args.concurrency, args.requests))
+        result.update({"mode": mode, "rounds": args.rounds,
+                       "workers": password_hasher.HASH_WORKERS if mode == "pool" else 1})
+        results.append(result)
+
+    print(f"\n{'='*70}")
+    print("📊 로그인 처리량 (POST /api/auth/login)")
+    print(f"{'='*70}\n")
+    print(f"{'rounds':>6} {'mode':>7} {'workers':>7} {'login/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'loop lag ms':>12}  errors")
+    for r in results:
+        print(f"{r['rounds']:>6} {r['mode']:>7} {r['workers']:>7} {r['logins_per_s']:>9} "
+              f"{r['p50_ms']!s:>8} {r['p95_ms']!s:>8} {r['max_loop_lag_ms']:>12}  {r['errors'] or '-'}")
+
+    if any(r["errors"] for r in results):
+        print("\n⚠️ 실패 응답 포함 (503 = 해싱 대기열 초과, PASSWORD_HASH_MAX_PENDING)")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
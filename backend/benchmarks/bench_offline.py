@@ -0,0 +1,426 @@
+"""
+오프라인 벤치마크 (업스트림 fixture 재생)
+네트워크 없이 주요 경로의 처리량 / 지연 시간 측정 - 이전 결과 JSON과 비교해 회귀 확인
+
+    price.*    GET /api/price/{ticker}         cold: 캐시 만료 → Kiwoom / yfinance 재생, warm: 캐시 적중
+    chart.*    GET /api/chart/{ticker}         cold: chart_memo 비움 → 일봉 조회 + 지표, warm: 메모 적중
+    analyze    POST /api/agent/analyze         no_cache - 데이터 수집 + Agent 파이프라인 전체
+    ingest     scheduler.update_daily_charts   Kiwoom 일봉 → DB 저장 → 피처 재계산 → 버전 게시
+    hts.*      tools/convert_hts_*.py          cp949 HTS CSV → 표준 CSV
+    monthly    screener run_monthly            HTS 변환 결과 + universe / 지수 / 뉴스 CSV
+
+업스트림은 benchmarks/upstream_replay.py가 fixture로 대신 응답 (fixture 없는 요청은 연결 오류)
+DB / 시세 캐시 / 데이터 버전 / HTS·스크리너 파일은 모두 임시 디렉토리 사용 (저장소 data/는 그대로)
+
+사용법:
+    python benchmarks/bench_offline.py --iterations 20 --json offline.json
+    python benchmarks/bench_offline.py --only price,chart --baseline offline.json
+    python benchmarks/bench_offline.py --record     # 네트워크 + API 키 환경: 실제 응답으로 fixture 갱신
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.dirname(BACKEND_DIR)
+
+# 상위 디렉토리의 모듈 import
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.join(ROOT_DIR, "screener"))
+sys.path.append(os.path.join(ROOT_DIR, "tools"))
+
+from upstream_replay import FIXTURE_DIR, KIWOOM_SYMBOLS, UpstreamReplay
+
+KR_TICKER = "005930"
+US_TICKER = "AAPL"
+QUOTE_NAMES = {"005930": "삼성전자", "AAPL": "Apple Inc."}
+ANALYZE_BODY = {"tickers": ["005930", "000660", "AAPL", "NVDA"], "period": "단기", "no_cache": True}
+
+# 스크리너 합성 데이터 규모
+SCREENER_TICKERS = 60
+SCREENER_DAYS = 250
+SCREENER_THEMES = ["defense", "energy", "semiconductor"]
+
+SCENARIOS = [
+    "price.kr.cold", "price.us.cold", "price.warm",
+    "chart.kr.cold", "chart.us.cold", "chart.warm",
+    "analyze", "ingest", "hts.prices", "hts.flows", "monthly",
+]
+
+
+def prepare_environment(work_dir: str, record: bool):
+    """
+    backend 모듈 import 전에 호출 - 설정이 import 시점에 결정되므로 환경변수로 임시 경로 지정
+    """
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(work_dir, 'bench.db')}",
+        "ACCESS_STATS_DIR": os.path.join(work_dir, "access_stats"),
+        "PROFILE_DIR": os.path.join(work_dir, "profiles"),
+        "STARTUP_WARMUP": "eager",        # Agent 초기화는 측정에서 제외
+        "HOT_SET_WARMUP": "0",
+        "KIWOOM_RATE_LIMIT_SECONDS": "0",
+    })
+    if not record:
+        os.environ.setdefault("KIWOOM_APP_ID", "replay")
+        os.environ.setdefault("KIWOOM_SECRET_KEY", "replay")
+    logging.disable(logging.WARNING)  # 측정 중 로그 출력 비용 제외 (오류는 결과로 확인)
+
+
+def redirect_data_files(work_dir: str):
+    """모듈 상수로 고정된 파일 경로를 임시 디렉토리로 교체"""
+    from services import data_version, quote_service
+
+    quote_service.CACHE_FILE = os.path.join(work_dir, "stock_prices_cache.json")
+    data_version.VERSION_FILE = os.path.join(work_dir, "data_version.json")
+    data_version.EPOCHS_DIR = os.path.join(work_dir, "epochs")
+    data_version.EPOCH_INDEX_FILE = os.path.join(work_dir, "epochs", "index.json")
+
+
+def summarize(latencies: list) -> dict:
+    """지연 시간 목록(초) → 통계 (ms)"""
+    ms = np.array(latencies) * 1000
+    return {
+        "iterations": len(latencies),
+        "ops_per_s": round(len(latencies) / (ms.sum() / 1000), 2) if ms.sum() else None,
+        "mean_ms": round(float(ms.mean()), 2),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+def measure(func, iterations: int, setup=None, warmup: int = 1) -> dict:
+    """
+    setup(측정 제외) → func 반복 실행
+
+    Returns:
+        summarize() 결과 + detail (마지막 func 반환값)
+    """
+    latencies, detail = [], None
+    for i in range(warmup + iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            detail = func()
+        if i >= warmup:
+            latencies.append(time.perf_counter() - start)
+
+    result = summarize(latencies)
+    if detail is not None:
+        result["detail"] = detail
+    return result
+
+
+def _ok(response) -> dict:
+    """HTTP 응답 검증 (2xx/304가 아니면 시나리오 실패)"""
+    if response.status_code >= 400:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+    return {"status": response.status_code, "bytes": len(response.content)}
+
+
+# ========== 데이터 준비 ==========
+
+def seed_quote_cache(age_minutes: float, names: dict = QUOTE_NAMES):
+    """
+    시세 캐시 파일을 age_minutes 전 시각으로 기록 (cold: 만료, warm: 적중)
+
+    Args:
+        names: {종목코드: 종목명} - 이름이 있어야 Kiwoom 조회 결과도 캐시에 저장됨
+    """
+    from services import quote_service
+
+    stamp = (datetime.utcnow() - timedelta(minutes=age_minutes)).isoformat() + "Z"
+    cache = {"korean_stocks": {}, "us_stocks": {}}
+    for ticker, name in names.items():
+        section, currency = ("korean_stocks", "KRW") if ticker.isdigit() else ("us_stocks", "USD")
+        cache[section][ticker] = {"name": name, "current_price": 1.0, "previous_close": 1.0,
+                                  "currency": currency, "timestamp": stamp}
+    with open(quote_service.CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+
+def seed_price_history():
+    """
+    ingest 전 과거 일봉 적재 (Kiwoom fixture 재생 → 마지막 거래일 제외 전체)
+
+    Returns:
+        {종목코드: 마지막 거래일} - 측정마다 이 날짜 행을 지우고 다시 적재
+    """
+    from database import SessionLocal
+    from models.stock import StockPrice
+    from services import quote_service
+
+    kiwoom = quote_service.get_kiwoom_client()
+    latest = {}
+    db = SessionLocal()
+    try:
+        for ticker, _, _ in KIWOOM_SYMBOLS:
+            bars = kiwoom.get_daily_chart(ticker) or []
+            if not bars:
+                continue
+            latest[ticker] = bars[-1]["date"]
+            db.query(StockPrice).filter(StockPrice.ticker == ticker, StockPrice.market == "KR").delete()
+            db.bulk_insert_mappings(StockPrice, [
+                {"ticker": ticker, "market": "KR", "date": datetime.strptime(b["date"], "%Y-%m-%d").date(),
+                 "open": b["open"], "high": b["high"], "low": b["low"], "close": b["close"],
+                 "volume": b["volume"], "source": "bench"}
+                for b in bars[:-1]
+            ])
+        db.commit()
+    finally:
+        db.close()
+    return latest
+
+
+def drop_latest_bars(latest: dict):
+    """update_daily_charts가 다시 저장하도록 마지막 거래일 행 삭제"""
+    from database import SessionLocal
+    from models.stock import StockPrice
+
+    db = SessionLocal()
+    try:
+        for ticker, day in latest.items():
+            db.query(StockPrice).filter(
+                StockPrice.ticker == ticker, StockPrice.market == "KR",
+                StockPrice.date == datetime.strptime(day, "%Y-%m-%d").date()
+            ).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_screener_dataset(work_dir: str) -> dict:
+    """
+    HTS 원본 CSV(cp949) + 스크리너 입력 CSV 생성 (seed 고정)
+
+    Returns:
+        {"hts_prices", "hts_flows", "screener", "asof"} 경로 / 기준일
+    """
+    rng = np.random.default_rng(7)
+    hts_prices = Path(work_dir) / "hts_raw" / "prices"
+    hts_flows = Path(work_dir) / "hts_raw" / "flows"
+    screener = Path(work_dir) / "screener"
+    for path in (hts_prices, hts_flows, screener / "raw"):
+        path.mkdir(parents=True, exist_ok=True)
+
+    days = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=SCREENER_DAYS)
+    universe = []
+    for i in range(SCREENER_TICKERS):
+        ticker = f"{100000 + i * 37:06d}"
+        theme = SCREENER_THEMES[i % len(SCREENER_THEMES)]
+        universe.append({"ticker": ticker, "name": f"종목{i:02d}", "theme": theme,
+                         "chain": ("prime", "midstream", "downstream")[i % 3]})
+
+        close = 20000 * np.exp(np.cumsum(rng.normal(0.002, 0.02, SCREENER_DAYS)))
+        open_ = close * (1 + rng.normal(0, 0.005, SCREENER_DAYS))
+        pd.DataFrame({
+            "일자": days.strftime("%Y-%m-%d"), "종목코드": int(ticker),  # HTS 내보내기는 앞자리 0이 빠짐
+            "시가": open_.round(), "고가": (np.maximum(open_, close) * 1.01).round(),
+            "저가": (np.minimum(open_, close) * 0.99).round(), "종가": close.round(),
+            "거래량": rng.integers(100_000, 5_000_000, SCREENER_DAYS),
+        }).to_csv(hts_prices / f"{ticker}.csv", index=False, encoding="cp949")
+        pd.DataFrame({
+            "일자": days.strftime("%Y-%m-%d"), "종목코드": int(ticker),
+            "외국인순매수": rng.integers(-50_000, 80_000, SCREENER_DAYS),
+            "기관순매수": rng.integers(-50_000, 80_000, SCREENER_DAYS),
+        }).to_csv(hts_flows / f"{ticker}.csv", index=False, encoding="cp949")
+
+    raw = screener / "raw"
+    pd.DataFrame(universe).to_csv(raw / "universe.csv", index=False, encoding="utf-8-sig")
+    pd.DataFrame({
+        "date": days.strftime("%Y-%m-%d"),
+        "close": 2500 * np.exp(np.cumsum(rng.normal(0.001, 0.008, SCREENER_DAYS))),
+    }).to_csv(raw / "index_kospi.csv", index=False, encoding="utf-8-sig")
+    pd.DataFrame([{
+        "date": (days[-1] - pd.Timedelta(days=10 * k)).strftime("%Y-%m-%d"), "theme": theme,
+        "confirmed": 1, "duration_months": 6, "affects_earnings": 1, "industry_wide": 1,
+        "rumor": 0, "one_off": 0, "notes": "bench",
+    } for k in range(4) for theme in SCREENER_THEMES])  # 테마당 4건 → 뉴스 점수 20 (전 종목 점수 계산).to_csv(raw / "news_events.csv", index=False, encoding="utf-8-sig")
+
+    return {"hts_prices": hts_prices, "hts_flows": hts_flows, "screener": screener,
+            "asof": days[-1].strftime("%Y-%m-%d")}
+
+
+# ========== 시나리오 ==========
+
+def run_scenarios(selected: list, iterations: int, work_dir: str, replay: UpstreamReplay) -> dict:
+    """선택한 시나리오 실행 → {이름: 통계 + upstream 재생 횟수}"""
+    from fastapi.testclient import TestClient
+
+    import convert_hts_flows
+    import convert_hts_prices
+    import main_monthly
+    import scheduler
+    import server_v2
+
+    results = {}
+    dataset = build_screener_dataset(work_dir)
+    convert_hts_prices.HTS_DIR, convert_hts_prices.OUT_FILE = (
+        dataset["hts_prices"], dataset["screener"] / "raw" / "prices_daily.csv")
+    convert_hts_flows.HTS_DIR, convert_hts_flows.OUT_FILE = (
+        dataset["hts_flows"], dataset["screener"] / "raw" / "flows_daily.csv")
+    main_monthly.DATA_DIR = dataset["screener"]
+
+    def monthly_setup():
+        if not convert_hts_prices.OUT_FILE.exists() or not convert_hts_flows.OUT_FILE.exists():
+            with contextlib.redirect_stdout(io.StringIO()):
+                convert_hts_prices.convert()
+                convert_hts_flows.convert()
+
+    def run_monthly():
+        out = main_monthly.run_monthly(asof=dataset["asof"])
+        return {"candidates": 0 if out is None else len(out)}
+
+    with contextlib.redirect_stdout(io.StringIO()), TestClient(server_v2.app) as client:
+        ingest_latest = {}
+
+        def ingest_setup():
+            if not ingest_latest:
+                ingest_latest.update(seed_price_history())
+            drop_latest_bars(ingest_latest)
+
+        plans = {
+            "price.kr.cold": (lambda: _ok(client.get(f"/api/price/{KR_TICKER}")), lambda: seed_quote_cache(10_000)),
+            "price.us.cold": (lambda: _ok(client.get(f"/api/price/{US_TICKER}")), lambda: seed_quote_cache(10_000)),
+            "price.warm": (lambda: _ok(client.get(f"/api/price/{US_TICKER}")), lambda: seed_quote_cache(0)),
+            "chart.kr.cold": (lambda: _ok(client.get(f"/api/chart/{KR_TICKER}")), server_v2.chart_memo.clear),
+            "chart.us.cold": (lambda: _ok(client.get(f"/api/chart/{US_TICKER}")), server_v2.chart_memo.clear),
+            "chart.warm": (lambda: _ok(client.get(f"/api/chart/{US_TICKER}")), None),
+            "analyze": (lambda: _ok(client.post("/api/agent/analyze", json=ANALYZE_BODY)), None),
+            "ingest": (scheduler.update_daily_charts, ingest_setup),
+            "hts.prices": (convert_hts_prices.convert, None),
+            "hts.flows": (convert_hts_flows.convert, None),
+            "monthly": (run_monthly, monthly_setup),
+        }
+
+        for name in selected:
+            func, setup = plans[name]
+            replay.reset_stats()
+            started = time.perf_counter()
+            try:
+                result = measure(func, iterations, setup=setup)
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            result["upstream"] = replay.stats()
+            results[name] = result
+            print(f"  {name:15s} {time.perf_counter() - started:6.1f}s", file=sys.__stdout__)
+
+    return results
+
+
+def record_fixtures(selected: list, work_dir: str) -> list:
+    """실제 업스트림으로 시나리오 1회 실행 → 응답을 fixture로 저장"""
+    with UpstreamReplay(record=True) as replay:
+        run_scenarios(selected, 1, work_dir, replay)
+    return replay.save()
+
+
+def compare(results: dict, baseline_path: str, tolerance: float) -> list:
+    """
+    이전 결과 대비 p50 회귀 (tolerance 비율 초과 시)
+
+    Returns:
+        [{"scenario", "baseline_p50_ms", "p50_ms", "change"}, ...]
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f).get("scenarios", {})
+
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get("p50_ms")
+        after = result.get("p50_ms")
+        if before and after and after > before * (1 + tolerance):
+            regressions.append({"scenario": name, "baseline_p50_ms": before, "p50_ms": after,
+                                "change": f"+{(after / before - 1) * 100:.0f}%"})
+    return regressions
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='오프라인 벤치마크 (업스트림 fixture 재생)')
+    parser.add_argument('--iterations', type=int, default=20, help='시나리오별 반복 횟수 (기본: 20)')
+    parser.add_argument('--only', type=str, help=f'실행할 시나리오 (쉼표 구분, 접두어 가능: price,chart) - {", ".join(SCENARIOS)}')
+    parser.add_argument('--baseline', type=str, help='비교할 이전 결과 JSON (p50 회귀 시 종료 코드 1)')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='회귀 판정 비율 (기본: 0.25 = 25%%)')
+    parser.add_argument('--record', action='store_true', help='실제 업스트림 응답으로 fixture 갱신')
+    parser.add_argument('--json', dest='json_path', type=str, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    selected = SCENARIOS
+    if args.only:
+        prefixes = [p.strip() for p in args.only.split(",") if p.strip()]
+        selected = [s for s in SCENARIOS if any(s == p or s.startswith(p + ".") for p in prefixes)]
+        if not selected:
+            parser.error(f"알 수 없는 시나리오: {args.only}")
+
+    work_dir = tempfile.mkdtemp(prefix="bench-offline-")
+    prepare_environment(work_dir, args.record)
+    redirect_data_files(work_dir)
+
+    try:
+        if args.record:
+            for path in record_fixtures(selected, work_dir):
+                print(f"✅ fixture 기록: {path}")
+            return
+
+        print(f"\n{'='*70}")
+        print(f"📊 오프라인 벤치마크: {len(selected)}개 시나리오 × {args.iterations}회 (fixture: {FIXTURE_DIR})")
+        print(f"{'='*70}\n")
+
+        with UpstreamReplay() as replay:
+            results = run_scenarios(selected, args.iterations, work_dir, replay)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"\n{'시나리오':15s} {'ops/s':>9s} {'p50':>9s} {'p95':>9s} {'p99':>9s}  upstream")
+    for name, r in results.items():
+        if "error" in r:
+            print(f"{name:15s} ❌ {r['error'][:60]}")
+            continue
+        upstream = ", ".join(f"{k}={v}" for k, v in sorted(r["upstream"].items())) or "-"
+        print(f"{name:15s} {r['ops_per_s']:9.1f} {r['p50_ms']:8.1f}ms {r['p95_ms']:8.1f}ms "
+              f"{r['p99_ms']:8.1f}ms  {upstream}")
+
+    summary = {
+        "generated_at": datetime.now().astimezone().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "scenarios": results,
+    }
+
+    failed = [name for name, r in results.items() if "error" in r]
+    if args.baseline:
+        summary["baseline"] = args.baseline
+        summary["regressions"] = compare(results, args.baseline, args.tolerance)
+        print(f"\n기준 대비 p50 회귀 (>{args.tolerance:.0%}): {len(summary['regressions'])}건")
+        for r in summary["regressions"]:
+            print(f"  ⚠️ {r['scenario']}: {r['baseline_p50_ms']}ms → {r['p50_ms']}ms ({r['change']})")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json_path}")
+
+    if failed or summary.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
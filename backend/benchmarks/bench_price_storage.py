@@ -0,0 +1,152 @@
+"""
+시세 저장 방식 벤치마크 (SQLite 임시 DB)
+ORM(stock_prices, 행마다 객체) vs 시계열(stock_prices_ts, Core executemany + NumPy 읽기)
+
+사용법:
+    python benchmarks/bench_price_storage.py --tickers 200 --days 2500
+    python benchmarks/bench_price_storage.py --tickers 2500 --days 2500 --skip-orm
+"""
+
+import sys
+import os
+import argparse
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+# 임시 DB를 쓰도록 database import 전에 설정
+_tmp_dir = tempfile.mkdtemp(prefix="bench_price_storage_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+# 상위 디렉토리의 모듈 import
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal, engine, init_db
+from models.stock import StockPrice
+from services import price_store
+
+
+def make_rows(n_tickers: int, n_days: int, seed: int = 42):
+    """(ticker, market, date, o, h, l, c, v) 랜덤워크 행 생성"""
+    rng = np.random.default_rng(seed)
+    start = date(2015, 1, 1)
+    dates = [start + timedelta(days=i) for i in range(n_days)]
+    for t in range(n_tickers):
+        close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        for d, c in zip(dates, close):
+            c = float(c)
+            yield (f"{t:06d}", "KR", d, c, c * 1.01, c * 0.99, c, 1000000)
+
+
+def load_orm(n_tickers: int, n_days: int) -> float:
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        for i, (ticker, market, d, o, h, l, c, v) in enumerate(make_rows(n_tickers, n_days)):
+            db.add(StockPrice(ticker=ticker, market=market, date=d, open=o, high=h, low=l,
+                              close=c, volume=v, source="bench"))
+            if i % 5000 == 4999:
+                db.commit()
+        db.commit()
+    finally:
+        db.close()
+    return time.perf_counter() - start
+
+
+def read_orm(tickers, start_date: date, end_date: date) -> float:
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        for ticker in tickers:
+            rows = db.query(StockPrice).filter(
+                StockPrice.ticker == ticker,
+                StockPrice.date >= start_date,
+                StockPrice.date <= end_date
+            ).order_by(StockPrice.date).all()
+            np.array([r.close for r in rows])
+    finally:
+        db.close()
+    return time.perf_counter() - start
+
+
+def read_ts(tickers, start_date: date, end_date: date) -> float:
+    start = time.perf_counter()
+    for ticker in tickers:
+        price_store.load_ohlcv(ticker, start_date, end_date, columns=("close",))
+    return time.perf_counter() - start
+
+
+def table_size(table: str) -> int:
+    """테이블 + 인덱스 페이지 크기 (dbstat 미지원 빌드면 -1)"""
+    try:
+        with engine.connect() as conn:
+            return int(conn.exec_driver_sql(
+                f"SELECT SUM(pgsize) FROM dbstat WHERE name = '{table}' OR name IN "
+                f"(SELECT name FROM sqlite_master WHERE tbl_name = '{table}' AND type = 'index')"
+            ).scalar() or 0)
+    except Exception:
+        return -1
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='시세 저장 방식 벤치마크 (ORM vs 시계열)')
+    parser.add_argument('--tickers', type=int, default=100, help='종목 수 (기본: 100)')
+    parser.add_argument('--days', type=int, default=2500, help='종목당 일수 (기본: 2500 ≈ 10년)')
+    parser.add_argument('--reads', type=int, default=50, help='기간 조회할 종목 수 (기본: 50)')
+    parser.add_argument('--skip-orm', action='store_true', help='ORM 적재/조회 생략 (대규모 측정용)')
+    parser.add_argument('--json', dest='json_path', type=str, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    init_db()
+    total_rows = args.tickers * args.days
+
+    start = time.perf_counter()
+    price_store.upsert_rows(make_rows(args.tickers, args.days))
+    ts_load_s = time.perf_counter() - start
+
+    read_tickers = [f"{t:06d}" for t in range(min(args.reads, args.tickers))]
+    range_start, range_end = date(2016, 1, 1), date(2016, 12, 31)
+    ts_read_s = read_ts(read_tickers, range_start, range_end)
+
+    result = {
+        "tickers": args.tickers,
+        "days": args.days,
+        "rows": total_rows,
+        "timeseries_load_s": round(ts_load_s, 2),
+        "timeseries_rows_per_s": round(total_rows / ts_load_s),
+        "timeseries_read_ms_per_ticker": round(ts_read_s / len(read_tickers) * 1000, 2),
+        "timeseries_bytes": table_size("stock_prices_ts"),
+    }
+
+    if not args.skip_orm:
+        orm_load_s = load_orm(args.tickers, args.days)
+        orm_read_s = read_orm(read_tickers, range_start, range_end)
+        result.update({
+            "orm_load_s": round(orm_load_s, 2),
+            "orm_rows_per_s": round(total_rows / orm_load_s),
+            "orm_read_ms_per_ticker": round(orm_read_s / len(read_tickers) * 1000, 2),
+            "orm_bytes": table_size("stock_prices"),
+        })
+
+    print(f"\n{'='*70}")
+    print(f"📊 시세 저장 벤치마크: {args.tickers}종목 × {args.days}일 = {total_rows:,}행")
+    print(f"{'='*70}\n")
+    print(f"{'':12} {'적재 s':>9} {'행/s':>10} {'1년 조회 ms':>12} {'크기 MB':>9}")
+    print(f"{'시계열':12} {result['timeseries_load_s']:>9} {result['timeseries_rows_per_s']:>10,} "
+          f"{result['timeseries_read_ms_per_ticker']:>12} {result['timeseries_bytes'] / 1e6:>9.1f}")
+    if not args.skip_orm:
+        print(f"{'ORM':12} {result['orm_load_s']:>9} {result['orm_rows_per_s']:>10,} "
+              f"{result['orm_read_ms_per_ticker']:>12} {result['orm_bytes'] / 1e6:>9.1f}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+매매 계획 몬테카를로 시뮬레이터 벤치마크
+계획 1개 지연 시간 + 여러 계획 일괄 처리(순차 vs 프로세스 풀)
+
+사용법:
+    python benchmarks/bench_trade_simulator.py --paths 10000 --horizon 60
+    python benchmarks/bench_trade_simulator.py --plans 32 --workers 4
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+
+import numpy as np
+
+# 상위 디렉토리의 모듈 import
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.trade_simulator import simulate_plan, simulate_batch
+
+# 단기 계획 (TradePlanBuilder._generate_split_plan 형식)
+PLAN = {
+    'current_price': 10000,
+    'split_plan': [
+        {'action': '진입', 'percent': 60, 'price': 9800},
+        {'action': '추가', 'percent': 40, 'price': 9604},
+        {'action': '손절', 'percent': 100, 'price': 9000},
+        {'action': '익절', 'percent': 50, 'price': 11000},
+        {'action': '익절', 'percent': 50, 'price': 12000},
+    ],
+}
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='매매 계획 시뮬레이터 벤치마크')
+    parser.add_argument('--paths', type=int, default=10000, help='경로 수 (기본: 10000)')
+    parser.add_argument('--horizon', type=int, default=60, help='보유 기간 거래일 (기본: 60)')
+    parser.add_argument('--plans', type=int, default=16, help='일괄 처리 계획 수 (기본: 16)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='프로세스 수')
+    parser.add_argument('--repeat', type=int, default=5, help='단일 계획 반복 횟수 (최소값 사용)')
+    parser.add_argument('--json', dest='json_path', type=str, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    # 3년치 일간 수익률 (변동성 2%)
+    returns = np.random.default_rng(42).normal(0.0005, 0.02, 750)
+
+    single_times = []
+    for i in range(args.repeat):
+        start = time.perf_counter()
+        result = simulate_plan(PLAN, returns, args.paths, args.horizon, seed=i)
+        single_times.append(time.perf_counter() - start)
+    single_s = min(single_times)
+
+    plans = [PLAN] * args.plans
+    rets = [returns] * args.plans
+
+    start = time.perf_counter()
+    serial = simulate_batch(plans, rets, args.paths, args.horizon, seed=1, max_workers=1)
+    serial_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pooled = simulate_batch(plans, rets, args.paths, args.horizon, seed=1, max_workers=args.workers)
+    pool_s = time.perf_counter() - start
+
+    summary = {
+        "paths": args.paths,
+        "horizon": args.horizon,
+        "single_plan_ms": round(single_s * 1000, 1),
+        "plans": args.plans,
+        "workers": args.workers,
+        "batch_serial_s": round(serial_s, 3),
+        "batch_pool_s": round(pool_s, 3),
+        "speedup": round(serial_s / pool_s, 1) if pool_s else None,
+        "reproducible": serial == pooled,
+    }
+
+    print(f"\n{'='*70}")
+    print(f"📊 매매 계획 시뮬레이션: {args.paths:,}경로 × {args.horizon}일")
+    print(f"{'='*70}\n")
+    print(f"계획 1개:                 {summary['single_plan_ms']:8.1f}ms")
+    print(f"{args.plans}개 순차:               {serial_s:8.3f}s")
+    print(f"{args.plans}개 프로세스 풀({args.workers}): {pool_s:8.3f}s  ({summary['speedup']}x)")
+    print(f"순차/풀 결과 일치: {'✅' if summary['reproducible'] else '❌'}")
+    print(f"\n예시 결과: 기대수익 {result['expected_return']}%, "
+          f"손절 {result['hit_rates']['stop_loss']}%, 1차 목표 {result['hit_rates']['target_1']}%")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,464 @@
+"""
+업스트림 응답 재생 (오프라인 벤치마크용)
+
+benchmarks/fixtures/upstream/*.json에 기록된 응답을 로컬 대역(stand-in)으로 돌려줌
+- HTTP 클라이언트 (Kiwoom, NH, KRX, Naver, DART, Alpha Vantage):
+  requests.Session.request 교체 → requests.get/post, 클라이언트별 Session 모두 같은 경로
+- yfinance: yf.Ticker / yf.download 교체 (내부 HTTP가 requests를 거치지 않음)
+
+fixture에 없는 HTTP 요청은 ConnectionError (네트워크 없는 환경과 동일한 폴백 경로)
+일봉 날짜는 기록 시점 → 최근 거래일로 주 단위 이동 (요일 유지, "오늘 기준 N일" 조회가 그대로 동작)
+latency_ms를 주면 응답마다 그만큼 대기 (실제 호출처럼 호출 스레드를 막음, ±jitter 비율 균등 분포)
+
+    with UpstreamReplay() as replay:
+        quote_service.get_quote("005930")
+    replay.stats()   # {"kiwoom": 2, "unmatched": 0}
+
+기록 (네트워크 있는 환경에서 실제 응답으로 fixture 교체):
+    with UpstreamReplay(record=True) as replay:
+        ...
+    replay.save()
+
+합성 fixture 생성 (결정적, seed 고정):
+    python benchmarks/upstream_replay.py --synthesize
+"""
+
+import os
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.structures import CaseInsensitiveDict
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "upstream")
+
+# 호스트 → 공급자 (통계 / 기록 파일 이름)
+PROVIDER_HOSTS = {
+    "api.kiwoom.com": "kiwoom",
+    "mockapi.kiwoom.com": "kiwoom",
+    "openapi.koreainvestment.com": "nh",
+    "data.krx.co.kr": "krx",
+    "finance.naver.com": "naver",
+    "m.stock.naver.com": "naver",
+    "opendart.fss.or.kr": "dart",
+    "www.alphavantage.co": "alphavantage",
+}
+
+_YF_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _rebase_offset(last_day: date, today: Optional[date] = None) -> timedelta:
+    """기록 마지막 거래일을 오늘 이전 1주일 안으로 옮기는 주 단위 이동량"""
+    today = today or date.today()
+    weeks = (today - timedelta(days=1) - last_day).days // 7
+    return timedelta(days=7 * weeks)
+
+
+def _period_days(period: Optional[str]) -> Optional[int]:
+    """yfinance period → 달력 일수 (max / 미지정은 None)"""
+    if not period or period in ("max", "ytd"):
+        return None
+    units = {"d": 1, "wk": 7, "mo": 31, "y": 366}
+    for suffix, days in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return int(period[:-len(suffix)]) * days
+    return None
+
+
+def _body_text(kwargs: Dict[str, Any]) -> str:
+    """요청 본문 + 쿼리 파라미터 (fixture match 비교용)"""
+    parts = []
+    if kwargs.get("json") is not None:
+        parts.append(json.dumps(kwargs["json"], ensure_ascii=False, sort_keys=True))
+    for key in ("params", "data"):
+        value = kwargs.get(key)
+        if isinstance(value, dict):
+            parts.append(json.dumps(value, ensure_ascii=False, sort_keys=True))
+        elif value:
+            parts.append(str(value))
+    return " ".join(parts)
+
+
+class UpstreamReplay:
+    """requests / yfinance를 fixture 재생 대역으로 교체하는 컨텍스트"""
+
+    def __init__(self, fixture_dir: str = FIXTURE_DIR, record: bool = False, rebase_dates: bool = True,
+                 latency_ms: float = 0.0, jitter: float = 0.5):
+        self.fixture_dir = fixture_dir
+        self.record = record
+        self.rebase_dates = rebase_dates
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._calls: Counter = Counter()
+        self._http: List[Dict[str, Any]] = []         # HTTP 응답 fixture
+        self._yf: Dict[str, Dict[str, Any]] = {}      # yfinance 심볼 → {timezone, info, bars}
+        self._recorded: Dict[str, List[Dict[str, Any]]] = {}
+        self._originals: Dict[str, Any] = {}
+        if not record:
+            self._load()
+
+    # ========== fixture ==========
+
+    def _load(self):
+        if not os.path.isdir(self.fixture_dir):
+            return
+        for name in sorted(os.listdir(self.fixture_dir)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.fixture_dir, name), "r", encoding="utf-8") as f:
+                fixture = json.load(f)
+            if fixture.get("provider") == "yfinance":
+                self._yf.update(fixture.get("symbols", {}))
+            else:
+                for entry in fixture.get("responses", []):
+                    self._http.append({**entry, "provider": fixture.get("provider", "")})
+
+    def _match(self, method: str, url: str, body: str) -> Optional[Dict[str, Any]]:
+        parts = urlsplit(url)
+        for entry in self._http:
+            if (entry.get("method", "GET") == method and entry.get("host") == parts.hostname
+                    and entry.get("path") == parts.path
+                    and (not entry.get("match") or entry["match"] in body)):
+                return entry
+        return None
+
+    def _delay(self):
+        """업스트림 응답 지연 흉내"""
+        if self.latency_ms > 0:
+            spread = self.latency_ms * self.jitter
+            time.sleep(max(0.0, random.uniform(self.latency_ms - spread, self.latency_ms + spread)) / 1000)
+
+    def _rebased_json(self, entry: Dict[str, Any]) -> Any:
+        """fixture JSON (dates 지정 시 날짜 필드를 최근 거래일 기준으로 이동)"""
+        payload = entry.get("json")
+        spec = entry.get("dates")
+        if not (self.rebase_dates and spec and payload):
+            return payload
+
+        rows = payload.get(spec["list"], [])
+        fmt = spec.get("format", "%Y%m%d")
+        days = [datetime.strptime(r[spec["field"]], fmt).date() for r in rows if r.get(spec["field"])]
+        if not days:
+            return payload
+        offset = _rebase_offset(max(days))
+        shifted = [
+            {**r, spec["field"]: (datetime.strptime(r[spec["field"]], fmt) + offset).strftime(fmt)}
+            if r.get(spec["field"]) else r
+            for r in rows
+        ]
+        return {**payload, spec["list"]: shifted}
+
+    # ========== requests 대역 ==========
+
+    def _request(self, session, method, url, **kwargs):
+        method = method.upper()
+        host = urlsplit(url).hostname or ""
+        provider = PROVIDER_HOSTS.get(host, host)
+
+        if self.record:
+            response = self._originals["request"](session, method, url, **kwargs)
+            self._record_http(provider, method, url, kwargs, response)
+            return response
+
+        entry = self._match(method, url, _body_text(kwargs))
+        with self._lock:
+            self._calls[entry["provider"] if entry else "unmatched"] += 1
+        self._delay()
+        if entry is None:
+            raise requests.exceptions.ConnectionError(f"offline replay: no fixture for {method} {url}")
+
+        response = requests.models.Response()
+        response.status_code = entry.get("status", 200)
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        if "json" in entry:
+            response._content = json.dumps(self._rebased_json(entry), ensure_ascii=False).encode("utf-8")
+            response.headers.setdefault("content-type", "application/json")
+        else:
+            response._content = entry.get("text", "").encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+    def _record_http(self, provider: str, method: str, url: str, kwargs: Dict[str, Any], response):
+        parts = urlsplit(url)
+        entry = {
+            "method": method, "host": parts.hostname, "path": parts.path,
+            "match": _body_text(kwargs) or None,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "cont-yn", "next-key")},
+        }
+        try:
+            entry["json"] = response.json()
+        except ValueError:
+            entry["text"] = response.text
+        with self._lock:
+            self._recorded.setdefault(provider, []).append(entry)
+
+    # ========== yfinance 대역 ==========
+
+    def _frame(self, symbol: str, days: Optional[int], tz_aware: bool) -> pd.DataFrame:
+        """fixture 일봉 → yfinance DataFrame (마지막 거래일 기준 최근 days일)"""
+        with self._lock:
+            self._calls["yfinance" if symbol in self._yf else "unmatched"] += 1
+        self._delay()
+        fixture = self._yf.get(symbol)
+        if not fixture:
+            return pd.DataFrame(columns=_YF_COLUMNS)
+
+        bars = fixture["bars"]
+        index = pd.to_datetime(bars["date"])
+        if self.rebase_dates:
+            index = index + _rebase_offset(index[-1].date())
+        if tz_aware:
+            index = index.tz_localize(fixture.get("timezone", "America/New_York"))
+        frame = pd.DataFrame({col: bars[col.lower()] for col in _YF_COLUMNS}, index=index)
+        frame.index.name = "Date"
+        if days is not None:
+            frame = frame[frame.index >= frame.index[-1] - pd.Timedelta(days=days)]
+        return frame
+
+    def _ticker_class(self):
+        replay = self
+        real_ticker = self._originals["Ticker"]
+
+        class ReplayTicker:
+            """yf.Ticker 대역 (history / info)"""
+
+            def __init__(self, ticker, session=None, **kwargs):
+                self.ticker = ticker.upper()
+                self._real = real_ticker(ticker, session=session) if replay.record else None
+
+            def history(self, period="1mo", interval="1d", start=None, end=None, **kwargs):
+                if self._real is not None:
+                    frame = self._real.history(period=period, interval=interval, start=start, end=end, **kwargs)
+                    replay._record_bars(self.ticker, frame)
+                    return frame
+                days = _period_days(period)
+                if start is not None:
+                    days = (pd.Timestamp(end or datetime.now()) - pd.Timestamp(start)).days
+                frame = replay._frame(self.ticker, days, tz_aware=True)
+                frame["Dividends"] = 0.0
+                frame["Stock Splits"] = 0.0
+                return frame
+
+            @property
+            def info(self):
+                if self._real is not None:
+                    info = self._real.info
+                    replay._yf.setdefault(self.ticker, {})["info"] = info
+                    return info
+                with replay._lock:
+                    replay._calls["yfinance"] += 1
+                replay._delay()
+                return dict(replay._yf.get(self.ticker, {}).get("info", {}))
+
+        return ReplayTicker
+
+    def _download(self, tickers, start=None, end=None, period=None, **kwargs):
+        """yf.download 대역 (단일 심볼, 시간대 없는 인덱스)"""
+        if self.record:
+            frame = self._originals["download"](tickers, start=start, end=end, period=period, **kwargs)
+            if isinstance(tickers, str) and frame is not None and len(frame):
+                if isinstance(frame.columns, pd.MultiIndex):
+                    frame = frame.xs(tickers, axis=1, level=-1)
+                self._record_bars(tickers.upper(), frame)
+            return frame
+        days = _period_days(period)
+        if start is not None:
+            days = (pd.Timestamp(end or datetime.now()) - pd.Timestamp(start)).days
+        return self._frame(str(tickers).upper(), days, tz_aware=False)
+
+    def _record_bars(self, symbol: str, frame: pd.DataFrame):
+        if frame is None or not len(frame):
+            return
+        tz = getattr(frame.index, "tz", None)
+        with self._lock:
+            fixture = self._yf.setdefault(symbol, {})
+            fixture["timezone"] = str(tz) if tz else fixture.get("timezone", "America/New_York")
+            fixture["bars"] = {
+                "date": [d.strftime("%Y-%m-%d") for d in frame.index],
+                **{col.lower(): [float(v) for v in frame[col]] for col in _YF_COLUMNS},
+            }
+
+    # ========== 설치 / 해제 ==========
+
+    def __enter__(self):
+        import yfinance as yf
+
+        self._originals = {
+            "request": requests.sessions.Session.request,
+            "Ticker": yf.Ticker,
+            "download": yf.download,
+        }
+        replay = self
+
+        def request(session, method, url, **kwargs):
+            return replay._request(session, method, url, **kwargs)
+
+        requests.sessions.Session.request = request
+        yf.Ticker = self._ticker_class()
+        yf.download = self._download
+        return self
+
+    def __exit__(self, *exc):
+        import yfinance as yf
+
+        requests.sessions.Session.request = self._originals["request"]
+        yf.Ticker = self._originals["Ticker"]
+        yf.download = self._originals["download"]
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        """공급자별 재생 횟수 (fixture 없는 요청은 unmatched)"""
+        with self._lock:
+            return dict(self._calls)
+
+    def reset_stats(self):
+        with self._lock:
+            self._calls.clear()
+
+    def save(self, fixture_dir: Optional[str] = None) -> List[str]:
+        """기록 모드 결과를 공급자별 fixture 파일로 저장"""
+        fixture_dir = fixture_dir or self.fixture_dir
+        os.makedirs(fixture_dir, exist_ok=True)
+        written = []
+        fixtures = {p: {"provider": p, "responses": r} for p, r in self._recorded.items()}
+        if self._yf:
+            fixtures["yfinance"] = {"provider": "yfinance", "symbols": self._yf}
+        for provider, fixture in fixtures.items():
+            fixture["recorded_at"] = datetime.now().astimezone().isoformat()
+            path = os.path.join(fixture_dir, f"{provider}.json")
+            _write_fixture(path, fixture)
+            written.append(path)
+        return written
+
+
+def _write_fixture(path: str, fixture: Dict[str, Any]):
+    """fixture 저장 (들여쓰기 - 재기록 시 diff 확인용)"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, ensure_ascii=False, indent=1, separators=(",", ": "))
+        f.write("\n")
+
+
+# ========== 합성 fixture ==========
+
+# Kiwoom ka10081: (종목코드, 시작가, 일간 변동성) - scheduler.update_daily_charts 대상 종목
+KIWOOM_SYMBOLS = [
+    ("012450", 310000, 0.025),
+    ("079550", 240000, 0.022),
+    ("005930", 72000, 0.015),
+    ("000660", 185000, 0.021),
+    ("207940", 980000, 0.017),
+]
+# yfinance: (심볼, 이름, 시작가, 일간 변동성, 시간대)
+YF_SYMBOLS = [
+    ("AAPL", "Apple Inc.", 190.0, 0.014, "America/New_York"),
+    ("MSFT", "Microsoft Corporation", 410.0, 0.013, "America/New_York"),
+    ("NVDA", "NVIDIA Corporation", 120.0, 0.028, "America/New_York"),
+    ("005930.KS", "Samsung Electronics Co., Ltd.", 72000, 0.015, "Asia/Seoul"),
+    ("000660.KS", "SK hynix Inc.", 185000, 0.021, "Asia/Seoul"),
+    ("012450.KS", "Hanwha Aerospace Co., Ltd.", 310000, 0.025, "Asia/Seoul"),
+]
+SYNTHETIC_BARS = 250
+SYNTHETIC_LAST_DAY = date(2026, 10, 16)  # 금요일
+
+
+def _synthetic_bars(seed: int, start_price: float, vol: float, n: int = SYNTHETIC_BARS) -> Dict[str, list]:
+    """기하 브라운 운동 일봉 (평일만)"""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(end=SYNTHETIC_LAST_DAY, periods=n)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0004, vol, n)))
+    open_ = close * (1 + rng.normal(0, vol / 3, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, n)))
+    volume = rng.integers(500_000, 20_000_000, n)
+    return {"date": [d.strftime("%Y-%m-%d") for d in days],
+            "open": open_.tolist(), "high": high.tolist(), "low": low.tolist(),
+            "close": close.tolist(), "volume": volume.tolist()}
+
+
+def synthesize(fixture_dir: str = FIXTURE_DIR) -> List[str]:
+    """
+    응답 형식만 실제와 같은 합성 fixture 생성 (기록된 응답이 없을 때)
+
+    Returns:
+        작성한 파일 경로
+    """
+    os.makedirs(fixture_dir, exist_ok=True)
+
+    kiwoom = [{
+        "method": "POST", "host": "api.kiwoom.com", "path": "/oauth2/token",
+        "json": {"access_token": "replay-token", "token_type": "bearer", "expires_in": 86400,
+                 "return_code": 0, "return_msg": "정상적으로 처리되었습니다"},
+    }]
+    for seed, (ticker, price, vol) in enumerate(KIWOOM_SYMBOLS):
+        bars = _synthetic_bars(seed, price, vol)
+        rows = [{
+            "dt": d.replace("-", ""),
+            "cur_prc": str(round(c)), "open_pric": str(round(o)),
+            "high_pric": str(round(h)), "low_pric": str(round(l)),
+            "trde_qty": str(v), "trde_prica": str(round(c * v / 1_000_000)),
+        } for d, o, h, l, c, v in zip(*(bars[k] for k in ("date", "open", "high", "low", "close", "volume")))]
+        kiwoom.append({
+            "method": "POST", "host": "api.kiwoom.com", "path": "/api/dostk/chart",
+            "match": f'"stk_cd": "{ticker}"',
+            "headers": {"content-type": "application/json;charset=UTF-8", "cont-yn": "N", "next-key": ""},
+            "dates": {"list": "stk_dt_pole_chart_qry", "field": "dt", "format": "%Y%m%d"},
+            "json": {"stk_cd": ticker, "stk_dt_pole_chart_qry": rows[::-1],  # 최신순 (실제 응답과 동일)
+                     "return_code": "0", "return_msg": "정상적으로 처리되었습니다"},
+        })
+
+    symbols = {}
+    for seed, (symbol, name, price, vol, tz) in enumerate(YF_SYMBOLS, start=100):
+        bars = _synthetic_bars(seed, price, vol)
+        last, prev = bars["close"][-1], bars["close"][-2]
+        symbols[symbol] = {
+            "timezone": tz,
+            "info": {"symbol": symbol, "longName": name, "shortName": name,
+                     "currentPrice": round(last, 2), "regularMarketPrice": round(last, 2),
+                     "previousClose": round(prev, 2), "regularMarketChangePercent": round((last / prev - 1) * 100, 2),
+                     "open": round(bars["open"][-1], 2), "dayHigh": round(bars["high"][-1], 2),
+                     "dayLow": round(bars["low"][-1], 2), "volume": bars["volume"][-1],
+                     "marketCap": round(last * 15_000_000_000), "currency": "KRW" if tz == "Asia/Seoul" else "USD"},
+            "bars": {k: ([round(v, 4) for v in vals] if k not in ("date", "volume") else vals)
+                     for k, vals in bars.items()},
+        }
+
+    synthetic = "synthetic (seeded GBM) - replace with `--record` output from a live run"
+    paths = []
+    for provider, fixture in (
+        ("kiwoom", {"provider": "kiwoom", "source": synthetic, "responses": kiwoom}),
+        ("yfinance", {"provider": "yfinance", "source": synthetic, "symbols": symbols}),
+    ):
+        path = os.path.join(fixture_dir, f"{provider}.json")
+        _write_fixture(path, fixture)
+        paths.append(path)
+    return paths
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='업스트림 fixture 관리')
+    parser.add_argument('--synthesize', action='store_true', help='합성 fixture 생성')
+    parser.add_argument('--dir', default=FIXTURE_DIR, help=f'fixture 디렉토리 (기본: {FIXTURE_DIR})')
+    args = parser.parse_args()
+
+    if args.synthesize:
+        for path in synthesize(args.dir):
+            print(f"✅ fixture 생성: {path}")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
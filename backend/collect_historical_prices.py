@@ -18,8 +18,9 @@ import time
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from services.krx_stock_api import KRXStockAPI
-from database import SessionLocal
+from database import write_session
 from models.stock import StockPrice
+from services import price_store
 
 
 class HistoricalPriceCollector:
@@ -27,7 +28,6 @@ class HistoricalPriceCollector:
     
     def __init__(self):
         self.krx_api = KRXStockAPI()
-        self.db = SessionLocal()
     
     def get_trading_days(self, start_date: datetime, end_date: datetime) -> List[str]:
         """
@@ -84,72 +84,86 @@ class HistoricalPriceCollector:
         collected = 0
         failed = 0
         skipped = 0  # 이미 DB에 있는 데이터
+        timeseries = price_store.timeseries_enabled()  # stock_prices 대신 stock_prices_ts에 씀
+        pending = []  # 시계열 저장 모드에서 다음 커밋 때 upsert할 행
         
-        for idx, date_str in enumerate(trading_days, 1):
-            try:
-                # 진행 상황 표시
-                if idx % batch_size == 0 or idx == 1:
-                    print(f"[{idx:3d}/{total_days}] {date_str} 조회 중...", end=' ')
-                
-                # 이미 DB에 있는 데이터 확인
-                existing = self.db.query(StockPrice).filter(
-                    StockPrice.ticker == ticker,
-                    StockPrice.date == date_str,
-                    StockPrice.market == 'KR'
-                ).first()
-                
-                if existing:
-                    print(f"[스킵] 이미 저장됨")
-                    skipped += 1
-                    continue
-                
-                # KRX API 호출
-                price_data = self.krx_api.get_daily_price(ticker, date_str)
-                
-                if price_data:
-                    # DB 저장
-                    stock_price = StockPrice(
-                        ticker=price_data['ticker'],
-                        market='KR',
-                        date=price_data['date'],
-                        open=price_data['open'],
-                        high=price_data['high'],
-                        low=price_data['low'],
-                        close=price_data['close'],
-                        volume=price_data['volume'],
-                        source=price_data['source']
-                    )
-                    self.db.add(stock_price)
-                    collected += 1
-                    
-                    if idx % batch_size == 0 or idx == total_days:
-                        self.db.commit()
-                        print(f"[✅ 저장] {price_data['close']:,}원")
+        # 종목 단위 세션 (수집기 수명 동안 커넥션을 붙잡지 않음)
+        with write_session() as db:
+            for idx, date_str in enumerate(trading_days, 1):
+                try:
+                    # 진행 상황 표시
+                    if idx % batch_size == 0 or idx == 1:
+                        print(f"[{idx:3d}/{total_days}] {date_str} 조회 중...", end=' ')
+
+                    # 이미 DB에 있는 데이터 확인
+                    if timeseries:
+                        existing = price_store.has_row(ticker, 'KR', date_str, conn=db.connection())
+                    else:
+                        existing = db.query(StockPrice).filter(
+                            StockPrice.ticker == ticker,
+                            StockPrice.date == date_str,
+                            StockPrice.market == 'KR'
+                        ).first()
+
+                    if existing:
+                        print(f"[스킵] 이미 저장됨")
+                        skipped += 1
+                        continue
+
+                    # KRX API 호출
+                    price_data = self.krx_api.get_daily_price(ticker, date_str)
+
+                    if price_data:
+                        # DB 저장
+                        if timeseries:
+                            pending.append(price_store.make_row(price_data['ticker'], 'KR', price_data))
+                        else:
+                            stock_price = StockPrice(
+                                ticker=price_data['ticker'],
+                                market='KR',
+                                date=price_data['date'],
+                                open=price_data['open'],
+                                high=price_data['high'],
+                                low=price_data['low'],
+                                close=price_data['close'],
+                                volume=price_data['volume'],
+                                source=price_data['source']
+                            )
+                            db.add(stock_price)
+                        collected += 1
+
+                        if idx % batch_size == 0 or idx == total_days:
+                            price_store.upsert_rows(pending, conn=db.connection())
+                            pending = []
+                            db.commit()
+                            print(f"[✅ 저장] {price_data['close']:,}원")
+                        else:
+                            print("[임시]", end=' ')
                     else:
-                        print("[임시]", end=' ')
-                else:
-                    print(f"[❌ 실패] 응답 없음")
+                        print(f"[❌ 실패] 응답 없음")
+                        failed += 1
+
+                    # Rate limit 방지
+                    if idx % batch_size == 0 and idx < total_days:
+                        print(f"⏰ {delay}초 대기 중...")
+                        time.sleep(delay)
+
+                except Exception as e:
+                    print(f"[❌ 에러] {str(e)[:40]}")
                     failed += 1
-                
-                # Rate limit 방지
-                if idx % batch_size == 0 and idx < total_days:
-                    print(f"⏰ {delay}초 대기 중...")
-                    time.sleep(delay)
-                
+
+                # 50번 요청마다 프로그레스 리포트
+                if idx % 50 == 0:
+                    print(f"\n💾 진행 상황: {collected}개 저장, {failed}개 실패, {skipped}개 스킵\n")
+
+            # 최종 커밋
+            try:
+                price_store.upsert_rows(pending, conn=db.connection())
+                db.commit()
             except Exception as e:
-                print(f"[❌ 에러] {str(e)[:40]}")
-                failed += 1
-            
-            # 50번 요청마다 프로그레스 리포트
-            if idx % 50 == 0:
-                print(f"\n💾 진행 상황: {collected}개 저장, {failed}개 실패, {skipped}개 스킵\n")
-        
-        # 최종 커밋
-        try:
-            self.db.commit()
-        except:
-            self.db.rollback()
-        
+                print(f"[❌ 최종 커밋 실패] {str(e)[:40]}")
+                db.rollback()
+
         print(f"\n{'='*70}")
         print(f"[완료] {ticker}")
         print(f"  ✅ 저장: {collected}개 레코드")
@@ -214,11 +228,6 @@ class HistoricalPriceCollector:
                 results[ticker] = (0, -1)  # -1은 심각한 에러 표시
         
         return results
-    
-    def __del__(self):
-        """정리"""
-        if self.db:
-            self.db.close()
 
 
 def main():
@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from database import SessionLocal
 from models.stock import StockPrice
+from services import price_store
 from services.naver_stock_scraper import NaverStockScraper
 from services.us_stock_service import USStockService
 
@@ -31,6 +32,20 @@ US_STOCKS = [
     ('NEE', 'NextEra Energy'),
 ]
 
+def _replace_prices(db, record):
+    """
+    종목의 기존 시세를 지우고 최신 레코드 1건만 저장 (한 트랜잭션)
+    시계열 저장 모드면 stock_prices 대신 stock_prices_ts에 씀
+    """
+    if price_store.timeseries_enabled():
+        conn = db.connection()
+        price_store.delete_tickers([record.ticker], conn=conn)
+        price_store.upsert_rows([price_store.orm_row(record)], conn=conn)
+    else:
+        db.query(StockPrice).filter(StockPrice.ticker == record.ticker).delete()
+        db.add(record)
+    db.commit()
+
 def collect_kr_prices():
     """한국 주식 데이터 수집"""
     print("\n" + "="*70)
@@ -49,9 +64,6 @@ def collect_kr_prices():
                 print(f"  ❌ 데이터 없음")
                 continue
             
-            # 기존 데이터는 최신 레코드만 유지
-            db.query(StockPrice).filter(StockPrice.ticker == ticker).delete()
-            
             price = data['current_price']
             change = data.get('change', 0)
             prev_close = price - change if change else price * 0.98
@@ -69,8 +81,7 @@ def collect_kr_prices():
                 created_at=datetime.now(),
                 updated_at=datetime.now()
             )
-            db.add(record)
-            db.commit()
+            _replace_prices(db, record)
             
             print(f"  ✅ {name}: ₩{price:,} (변동: {change:+.0f})")
             
@@ -98,9 +109,6 @@ def collect_us_prices():
                 print(f"  ❌ 데이터 없음")
                 continue
             
-            # 기존 데이터는 최신 레코드만 유지
-            db.query(StockPrice).filter(StockPrice.ticker == ticker).delete()
-            
             price = data['price']
             change = data.get('change', 0)
             prev_close = price - change if change else price * 0.98
@@ -118,8 +126,7 @@ def collect_us_prices():
                 created_at=datetime.now(),
                 updated_at=datetime.now()
             )
-            db.add(record)
-            db.commit()
+            _replace_prices(db, record)
             
             print(f"  ✅ {name}: ${price:.2f} (변동: {change:+.2f})")
             
@@ -2,10 +2,14 @@
 SQLAlchemy 데이터베이스 설정
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+from contextlib import contextmanager
+from typing import Dict, Iterator
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,24 +20,153 @@ DATABASE_URL = os.getenv(
     "sqlite:///./stock_radar.db?timeout=30&check_same_thread=False"
 )
 
-# SQLite인지 확인
-if DATABASE_URL.startswith("sqlite"):
-    # SQLite 설정 (개발용)
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"timeout": 30, "check_same_thread": False},
-        poolclass=StaticPool,
-        echo=False
-    )
+# 읽기 전용 URL (PostgreSQL 읽기 복제본 등, 없으면 DATABASE_URL)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", DATABASE_URL)
+
+# 커넥션 풀 (SQLite 파일 DB / PostgreSQL 공통)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+# SQLite 풀: queue (스레드별 커넥션) | static (단일 커넥션 공유, 기존 방식)
+SQLITE_POOL = os.getenv("SQLITE_POOL", "queue").lower()
+
+# SQLite PRAGMA
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # WAL에서는 NORMAL로 충분
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# PostgreSQL 문장 캐시
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1000"))  # SQLAlchemy 컴파일 캐시
+PG_PREPARE_THRESHOLD = int(os.getenv("PG_PREPARE_THRESHOLD", "5"))   # psycopg3 서버측 prepared statement
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or ":memory:" in url
+
+
+def _create_engine(url: str, read_only: bool = False):
+    """
+    엔진 생성
+
+    - SQLite 파일 DB: QueuePool (스레드마다 자기 커넥션을 빌려 씀) + WAL/mmap/busy_timeout PRAGMA
+      (메모리 DB는 커넥션마다 별개 DB가 되므로 StaticPool 유지)
+    - PostgreSQL: QueuePool + 컴파일 캐시, psycopg3이면 서버측 prepared statement
+    - read_only: SQLite는 query_only, PostgreSQL은 기본 트랜잭션을 읽기 전용으로
+    """
+    if url.startswith("sqlite"):
+        if _is_sqlite_memory(url) or SQLITE_POOL == "static":
+            pool_args = {"poolclass": StaticPool}
+        else:
+            pool_args = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW,
+                         "pool_timeout": DB_POOL_TIMEOUT}
+        new_engine = create_engine(
+            url,
+            connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000, "check_same_thread": False},
+            echo=False,
+            **pool_args
+        )
+        _install_sqlite_pragmas(new_engine, read_only)
+    else:
+        connect_args = {}
+        if read_only:
+            connect_args["options"] = "-c default_transaction_read_only=on"
+        if url.startswith("postgresql+psycopg:") or url.startswith("postgresql+psycopg://"):
+            connect_args["prepare_threshold"] = PG_PREPARE_THRESHOLD
+        new_engine = create_engine(
+            url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+            query_cache_size=DB_QUERY_CACHE_SIZE,
+            connect_args=connect_args,
+            echo=False
+        )
+    _install_pool_metrics(new_engine, "read" if read_only else "write")
+    return new_engine
+
+
+def _install_sqlite_pragmas(target_engine, read_only: bool):
+    """커넥션 생성 시 SQLite PRAGMA 적용"""
+    @event.listens_for(target_engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+            if read_only:
+                cursor.execute("PRAGMA query_only = ON")
+        finally:
+            cursor.close()
+
+
+# ========== 풀 지표 ==========
+
+_pool_metrics: Dict[str, Dict] = {}
+_metrics_lock = threading.Lock()
+
+
+def _install_pool_metrics(target_engine, name: str):
+    """checkout/checkin 이벤트로 커넥션 사용량 집계"""
+    metrics = {"connects": 0, "checkouts": 0, "checked_out": 0, "max_checked_out": 0,
+               "hold_seconds_total": 0.0}
+    _pool_metrics[name] = metrics
+
+    @event.listens_for(target_engine, "connect")
+    def _on_connect(_dbapi_conn, _record):
+        with _metrics_lock:
+            metrics["connects"] += 1
+
+    @event.listens_for(target_engine, "checkout")
+    def _on_checkout(_dbapi_conn, record, _proxy):
+        record.info["checkout_at"] = time.perf_counter()
+        with _metrics_lock:
+            metrics["checkouts"] += 1
+            metrics["checked_out"] += 1
+            metrics["max_checked_out"] = max(metrics["max_checked_out"], metrics["checked_out"])
+
+    @event.listens_for(target_engine, "checkin")
+    def _on_checkin(_dbapi_conn, record):
+        started = record.info.pop("checkout_at", None)
+        with _metrics_lock:
+            metrics["checked_out"] = max(0, metrics["checked_out"] - 1)
+            if started is not None:
+                metrics["hold_seconds_total"] += time.perf_counter() - started
+
+
+def pool_stats() -> Dict[str, Dict]:
+    """엔진별 커넥션 풀 상태 (/api/status 용)"""
+    stats = {}
+    for name, target_engine in (("write", engine), ("read", read_engine)):
+        if name == "read" and read_engine is engine:
+            continue
+        with _metrics_lock:
+            metrics = dict(_pool_metrics.get(name, {}))
+        pool = target_engine.pool
+        metrics["pool"] = type(pool).__name__
+        metrics["status"] = pool.status()
+        if metrics.get("checkouts"):
+            metrics["avg_hold_ms"] = round(metrics["hold_seconds_total"] / metrics["checkouts"] * 1000, 2)
+        metrics["hold_seconds_total"] = round(metrics.get("hold_seconds_total", 0.0), 3)
+        stats[name] = metrics
+    return stats
+
+
+engine = _create_engine(DATABASE_URL)
+
+# SQLite 메모리 DB / 단일 커넥션 모드에서는 커넥션을 공유해야 하므로 엔진도 공유
+if DATABASE_READ_URL == DATABASE_URL and IS_SQLITE and (_is_sqlite_memory(DATABASE_URL) or SQLITE_POOL == "static"):
+    read_engine = engine
 else:
-    # PostgreSQL 설정 (프로덕션)
-    engine = create_engine(
-        DATABASE_URL,
-        pool_size=10,
-        max_overflow=20,
-        pool_recycle=3600,
-        echo=False
-    )
+    read_engine = _create_engine(DATABASE_READ_URL, read_only=True)
 
 # 세션 팩토리
 SessionLocal = sessionmaker(
@@ -42,6 +175,14 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# 읽기 전용 세션 (쓰기 시도 시 DB 오류, 객체는 커밋 후에도 만료되지 않음)
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=read_engine
+)
+
 
 def get_db() -> Session:
     """데이터베이스 세션 제공"""
@@ -52,15 +193,102 @@ def get_db() -> Session:
         db.close()
 
 
+@contextmanager
+def write_session() -> Iterator[Session]:
+    """
+    쓰기 세션 범위 - 정상 종료 시 커밋, 예외 시 롤백, 항상 반환
+
+        with write_session() as db:
+            db.add(...)
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@contextmanager
+def read_session() -> Iterator[Session]:
+    """읽기 전용 세션 범위 (항상 반환)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def init_db():
     """데이터베이스 초기화 (테이블 생성)"""
-    from models import Base, User, StockPrice  # 모든 모델 임포트
+    from models import Base, User, StockPrice, StockFeature, SchedulerTask  # 모든 모델 임포트
     
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns(Base)
+    _drop_retired_indexes()
+    
+    # 시계열 테이블 파티션/BRIN (PostgreSQL만)
+    from services.price_store import ensure_partitions
+    ensure_partitions()
     print("✅ 데이터베이스 초기화 완료")
     print("   📊 테이블:")
     print(f"      - users")
     print(f"      - stock_prices")
+    print(f"      - stock_prices_ts (시계열)")
+    print(f"      - stock_features")
+    print(f"      - scheduler_tasks")
+
+
+
+# 모델에서 제거된 인덱스 (기존 DB에서 삭제) - stock_prices의 종목별 조회는
+# 유니크 제약 인덱스 (ticker, date, market)가 담당
+RETIRED_INDEXES = [
+    ("stock_prices", "ix_stock_prices_ticker"),
+    ("stock_prices", "idx_ticker_date"),
+]
+
+
+def _drop_retired_indexes():
+    """모델에서 뺀 인덱스를 기존 DB에서도 삭제 (create_all은 인덱스를 지우지 않음)"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        for table_name, index_name in RETIRED_INDEXES:
+            if table_name not in existing_tables:
+                continue
+            if index_name in {i["name"] for i in inspector.get_indexes(table_name)}:
+                conn.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+                print(f"   ➖ {table_name}.{index_name} 인덱스 삭제")
+
+
+def _add_missing_columns(Base):
+    """
+    기존 테이블에 새로 추가된 nullable 컬럼 반영
+    (create_all은 이미 있는 테이블을 변경하지 않음)
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'))
+                print(f"   ➕ {table.name}.{column.name} 컬럼 추가")
+                if column.index or column.unique:
+                    conn.execute(text(
+                        f'CREATE {"UNIQUE " if column.unique else ""}INDEX IF NOT EXISTS '
+                        f'ix_{table.name}_{column.name} ON {table.name} ({column.name})'
+                    ))
 
 
 if __name__ == "__main__":
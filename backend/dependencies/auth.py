@@ -8,61 +8,87 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from services.jwt_service import JWTService
-from services.user_service import UserService, SessionService
+from services.user_service import UserService
+from services.auth_cache import user_cache, revoked_tokens
 from models.user import User
-from database import get_db as _get_db
+from database import ReadSessionLocal, get_db as _get_db
 
 
 # HTTP Bearer 보안 스킴
 security = HTTPBearer()
 
 
-async def get_db() -> Session:
+def get_db() -> Session:
     """
     데이터베이스 세션 의존성
     """
-    async for db in _get_db():
-        yield db
+    yield from _get_db()
+
+
+def _load_user(user_id: int) -> Optional[User]:
+    """
+    활성 사용자 조회 - 캐시 우선, 미스일 때만 DB 조회
+    """
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    
+    db = ReadSessionLocal()
+    try:
+        user = UserService.get_user_by_id(db, user_id)
+        if user and user.is_active:
+            user_cache.put(user)
+        return user
+    finally:
+        db.close()
+
+
+def _authenticate(token: str) -> Optional[User]:
+    """
+    토큰 → 사용자 (캐시 히트 시 DB 조회 없음)
+    
+    서명/만료 검증 → jti 폐기 여부(메모리) → 사용자 캐시
+    """
+    claims = JWTService.verify_access_token(token)
+    
+    if claims is None or revoked_tokens.is_revoked(claims["jti"]):
+        return None
+    
+    user = _load_user(claims["user_id"])
+    
+    if not user or not user.is_active:
+        return None
+    
+    return user
 
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
     """
     현재 사용자 가져오기 (인증 필수)
     
+    반환되는 User는 캐시에서 만든 객체일 수 있으므로 수정은
+    UserService(db, user.id, ...)를 통해 수행
+    
     사용 방법:
         @app.get("/api/profile")
         async def get_profile(user: User = Depends(get_current_user)):
             ...
     """
-    token = credentials.credentials
-    
-    # 토큰 검증
-    user_id = JWTService.verify_token(token)
+    user = _authenticate(credentials.credentials)
     
-    if user_id is None:
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="토큰이 유효하지 않습니다"
         )
     
-    # 사용자 조회
-    user = UserService.get_user_by_id(db, user_id)
-    
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="사용자를 찾을 수 없습니다"
-        )
-    
     return user
 
 
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
 ) -> Optional[User]:
     """
     현재 사용자 가져오기 (선택사항)
@@ -77,18 +103,4 @@ async def get_current_user_optional(
     if credentials is None:
         return None
     
-    token = credentials.credentials
-    
-    # 토큰 검증
-    user_id = JWTService.verify_token(token)
-    
-    if user_id is None:
-        return None
-    
-    # 사용자 조회
-    user = UserService.get_user_by_id(db, user_id)
-    
-    if not user or not user.is_active:
-        return None
-    
-    return user
+    return _authenticate(credentials.credentials)
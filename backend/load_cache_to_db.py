@@ -11,6 +11,33 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from database import SessionLocal
 from models.stock import StockPrice
+from services import data_version, price_store
+
+
+def _upsert_price(db, ticker, market, values, ts_rows):
+    """
+    (ticker, date, market) 기준 upsert
+    종목의 과거 일봉은 그대로 두고 당일 행만 제자리 갱신
+    (DB 행은 에폭별로 보관하지 않음 - 고정된 요청도 갱신된 당일 행을 읽음)
+    시계열 저장 모드면 ORM 행 대신 ts_rows에 모아 stock_prices_ts에 한 번에 upsert
+    """
+    if price_store.timeseries_enabled():
+        ts_rows.append(price_store.make_row(ticker, market, values))
+        return
+    
+    record = db.query(StockPrice).filter(
+        StockPrice.ticker == ticker,
+        StockPrice.date == values['date'],
+        StockPrice.market == market
+    ).first()
+    
+    if record is None:
+        db.add(StockPrice(ticker=ticker, market=market, created_at=datetime.now(), **values))
+        return
+    
+    for key, value in values.items():
+        setattr(record, key, value)
+
 
 def load_cache_to_db():
     """캐시 JSON 파일을 DB에 로드"""
@@ -26,6 +53,8 @@ def load_cache_to_db():
         cache_data = json.load(f)
     
     db = SessionLocal()
+    loaded = 0
+    ts_rows = []  # 시계열 저장 모드용 (stock_prices_ts)
     
     # 한국 주식
     print("\n" + "="*70)
@@ -33,27 +62,20 @@ def load_cache_to_db():
     print("="*70)
     
     for ticker, data in cache_data.get('korean_stocks', {}).items():
-        # 기존 데이터 삭제
-        db.query(StockPrice).filter(StockPrice.ticker == ticker).delete()
-        
         price = data['current_price']
         prev_price = data.get('previous_close', price * 0.98)
         
-        record = StockPrice(
-            ticker=ticker,
-            market='KR',
-            date=datetime.now().date(),
-            open=prev_price,
-            high=price * 1.02,
-            low=price * 0.98,
-            close=price,
-            volume=1000000,
-            source='Cached Real Data (2026-02-22)',
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
-        db.add(record)
-        db.commit()
+        _upsert_price(db, ticker, 'KR', {
+            'date': datetime.now().date(),
+            'open': prev_price,
+            'high': price * 1.02,
+            'low': price * 0.98,
+            'close': price,
+            'volume': 1000000,
+            'source': 'Cached Real Data (2026-02-22)',
+            'updated_at': datetime.now()
+        }, ts_rows)
+        loaded += 1
         print(f"  ✅ {data['name']:20} ({ticker}): ₩{price:>10,}")
     
     # 미국 주식
@@ -62,33 +84,37 @@ def load_cache_to_db():
     print("="*70)
     
     for ticker, data in cache_data.get('us_stocks', {}).items():
-        # 기존 데이터 삭제
-        db.query(StockPrice).filter(StockPrice.ticker == ticker).delete()
-        
         price = data['current_price']
         prev_price = data.get('previous_close', price * 0.98)
         
-        record = StockPrice(
-            ticker=ticker,
-            market='US',
-            date=datetime.now().date(),
-            open=prev_price,
-            high=price * 1.02,
-            low=price * 0.98,
-            close=price,
-            volume=50000000,
-            source='Cached Real Data (2026-02-22)',
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
-        db.add(record)
-        db.commit()
+        _upsert_price(db, ticker, 'US', {
+            'date': datetime.now().date(),
+            'open': prev_price,
+            'high': price * 1.02,
+            'low': price * 0.98,
+            'close': price,
+            'volume': 50000000,
+            'source': 'Cached Real Data (2026-02-22)',
+            'updated_at': datetime.now()
+        }, ts_rows)
+        loaded += 1
         print(f"  ✅ {data['name']:20} ({ticker}): ${price:>10.2f}")
     
-    db.close()
+    # 한 번에 커밋 → 읽는 쪽은 이전 스냅샷 또는 새 스냅샷만 봄
+    try:
+        if ts_rows:
+            price_store.upsert_rows(ts_rows, conn=db.connection())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    
+    epoch = data_version.publish("load_cache_to_db", {"loaded": loaded})
     
     print("\n" + "="*70)
-    print("✅ 실제 데이터 로드 완료! (Cached Real Data)")
+    print(f"✅ 실제 데이터 로드 완료! (Cached Real Data, {loaded}개, 버전 {epoch})")
     print("="*70)
 
 if __name__ == '__main__':
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from database import SessionLocal
 from models.stock import StockPrice
+from services import price_store
 
 # 샘플 주가 데이터 (실제 데이터 기반)
 SAMPLE_STOCKS = [
@@ -66,13 +67,18 @@ SAMPLE_STOCKS = [
 def load_sample_data():
     """샘플 주가 데이터를 DB에 로드"""
     db = SessionLocal()
+    timeseries = price_store.timeseries_enabled()  # stock_prices 대신 stock_prices_ts에 씀
+    rows = []
     
     for stock in SAMPLE_STOCKS:
         ticker = stock['ticker']
         prices = stock['prices']
         
         # 기존 데이터 삭제
-        db.query(StockPrice).filter(StockPrice.ticker == ticker).delete()
+        if timeseries:
+            price_store.delete_tickers([ticker], conn=db.connection())
+        else:
+            db.query(StockPrice).filter(StockPrice.ticker == ticker).delete()
         
         # 새 데이터 생성 (최근 5일)
         base_date = datetime.now().date()
@@ -98,10 +104,15 @@ def load_sample_data():
                 created_at=datetime.now(),
                 updated_at=datetime.now()
             )
-            db.add(record)
+            if timeseries:
+                rows.append(price_store.orm_row(record))
+            else:
+                db.add(record)
         
         print(f"✅ {ticker} ({stock['name']}): {len(prices)}일 데이터 로드 완료")
     
+    if rows:
+        price_store.upsert_rows(rows, conn=db.connection())
     db.commit()
     db.close()
     
@@ -3,6 +3,7 @@ SQLAlchemy ORM 모델
 """
 
 from models.user import User, Base
-from models.stock import StockPrice
+from models.stock import StockPrice, StockFeature, stock_prices_ts
+from models.scheduler import SchedulerTask
 
-__all__ = ['User', 'StockPrice', 'Base']
+__all__ = ['User', 'StockPrice', 'StockFeature', 'stock_prices_ts', 'SchedulerTask', 'Base']
@@ -0,0 +1,45 @@
+"""
+스케줄러 작업 큐 모델
+SQLAlchemy ORM - 수동 갱신 요청 (리더 프로세스가 처리)
+"""
+
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index
+from datetime import datetime
+from models.user import Base  # user.py의 Base 사용
+
+
+class SchedulerTask(Base):
+    """
+    수동 갱신 요청 1건 - API 프로세스가 queued로 넣고 스케줄러 리더가 실행
+    (워커가 여러 개여도 업스트림 호출은 리더 1곳에서만 발생)
+    """
+
+    __tablename__ = "scheduler_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job = Column(String(50), nullable=False)  # 실행할 작업 (price_update, daily_chart)
+    status = Column(String(20), nullable=False, default="queued")  # queued | running | done | failed
+    requested_by = Column(String(100), nullable=True)  # 요청 프로세스 (host:pid)
+    error = Column(Text, nullable=True)
+
+    requested_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('idx_scheduler_task_status', 'status', 'job'),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "job": self.job,
+            "status": self.status,
+            "error": self.error,
+            "requested_at": self.requested_at.isoformat() if self.requested_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self):
+        return f"<SchedulerTask {self.id} {self.job}: {self.status}>"
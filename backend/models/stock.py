@@ -3,7 +3,10 @@
 SQLAlchemy ORM - 일별 시세 저장
 """
 
-from sqlalchemy import Column, String, DateTime, Float, Integer, Date, UniqueConstraint, Index
+from sqlalchemy import (
+    Column, String, DateTime, Float, Integer, BigInteger, Date,
+    UniqueConstraint, Index, PrimaryKeyConstraint, Table
+)
 from datetime import datetime
 from models.user import Base  # user.py의 Base 사용
 
@@ -15,7 +18,7 @@ class StockPrice(Base):
     
     # 기본 정보
     id = Column(Integer, primary_key=True, index=True)
-    ticker = Column(String(10), index=True, nullable=False)  # 종목코드 (예: 079550)
+    ticker = Column(String(10), nullable=False)  # 종목코드 (예: 079550)
     market = Column(String(10), nullable=False, default="KR")  # KR or US
     date = Column(Date, nullable=False, index=True)  # 거래 날짜 (YYYY-MM-DD)
     
@@ -31,12 +34,68 @@ class StockPrice(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     source = Column(String(50), nullable=True)  # 데이터 소스 (KRX, Yahoo 등)
     
-    # 복합 인덱스: ticker + date (일자별 조회 성능 최적화)
+    # 종목별 기간 조회는 유니크 제약 인덱스 (ticker, date, market)가 담당
     __table_args__ = (
         UniqueConstraint('ticker', 'date', 'market', name='unique_ticker_date_market'),
-        Index('idx_ticker_date', 'ticker', 'date'),
         Index('idx_market_date', 'market', 'date'),
     )
     
     def __repr__(self):
         return f"<StockPrice {self.ticker} {self.date}: {self.close}>"
+
+
+# 시계열 저장 모드 (PRICE_STORAGE=timeseries) - ORM 객체 없이 Core/SQL로 읽고 씀
+#   - PK (ticker, market, date): 종목별 기간 조회가 PK 범위 스캔 하나로 끝남
+#   - SQLite: WITHOUT ROWID → 행이 PK 순서로 클러스터링 (별도 rowid/인덱스 없음)
+#   - PostgreSQL: date 기준 연도별 RANGE 파티션 + date BRIN 인덱스 (services/price_store.py)
+stock_prices_ts = Table(
+    "stock_prices_ts",
+    Base.metadata,
+    Column("ticker", String(10), nullable=False),
+    Column("market", String(10), nullable=False),
+    Column("date", Date, nullable=False),
+    Column("open", Float),
+    Column("high", Float),
+    Column("low", Float),
+    Column("close", Float),
+    Column("volume", BigInteger),
+    PrimaryKeyConstraint("ticker", "market", "date", name="pk_stock_prices_ts"),
+    sqlite_with_rowid=False,
+    postgresql_partition_by="RANGE (date)",
+)
+
+
+class StockFeature(Base):
+    """
+    Agent 입력 피처 - 종목별 1행 (일봉 갱신 직후 stock_prices에서 계산)
+    AgentDataProvider가 요청 시 외부 호출 없이 조회
+    """
+    
+    __tablename__ = "stock_features"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ticker = Column(String(10), nullable=False)
+    market = Column(String(10), nullable=False, default="KR")
+    name = Column(String(100), nullable=True)
+    as_of = Column(Date, nullable=False)  # 계산에 사용한 마지막 거래일
+    bars = Column(Integer, nullable=False)  # 사용한 일봉 수
+    
+    # 기술적 지표
+    current_price = Column(Float, nullable=False)  # 마지막 종가
+    ma20 = Column(Float, nullable=False)
+    ma60 = Column(Float, nullable=False)
+    atr_20d = Column(Float, nullable=False)
+    volatility = Column(Float, nullable=False)  # 일간 변동성 (%)
+    support_1 = Column(Float, nullable=False)
+    support_2 = Column(Float, nullable=False)
+    resistance_1 = Column(Float, nullable=False)
+    resistance_2 = Column(Float, nullable=False)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('ticker', 'market', name='unique_feature_ticker_market'),
+    )
+    
+    def __repr__(self):
+        return f"<StockFeature {self.ticker} {self.as_of}: {self.current_price}>"
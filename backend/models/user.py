@@ -7,14 +7,15 @@ from sqlalchemy import Column, String, DateTime, Boolean, Integer
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 from passlib.context import CryptContext
+import os
 
 Base = declarative_base()
 
-# 비밀번호 해싱
+# 비밀번호 해싱 (BCRYPT_ROUNDS 변경 시 기존 해시는 다음 로그인 때 재해싱)
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
-    bcrypt__rounds=12
+    bcrypt__rounds=int(os.getenv("BCRYPT_ROUNDS", "12"))
 )
 
 
@@ -55,6 +56,18 @@ class User(Base):
         """비밀번호 검증"""
         return pwd_context.verify(password, self.hashed_password)
     
+    def verify_and_update_password(self, password: str) -> bool:
+        """
+        비밀번호 검증 + 해시 설정(rounds 등)이 바뀌었으면 재해싱
+        
+        Returns:
+            검증 성공 여부 (재해싱 시 hashed_password 갱신 - 커밋은 호출자)
+        """
+        valid, new_hash = pwd_context.verify_and_update(password, self.hashed_password)
+        if valid and new_hash:
+            self.hashed_password = new_hash
+        return valid
+    
     def __repr__(self) -> str:
         return f"<User {self.username} ({self.email})>"
 
@@ -67,6 +80,7 @@ class UserSession(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, index=True, nullable=False)
     token = Column(String(500), unique=True, nullable=False)
+    jti = Column(String(32), unique=True, index=True, nullable=True)  # JWT ID (폐기 목록 키)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     expires_at = Column(DateTime, nullable=False)
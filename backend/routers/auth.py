@@ -4,6 +4,7 @@ FastAPI 라우터
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
@@ -15,12 +16,24 @@ from schemas.auth import (
 from models.user import User
 from services.user_service import UserService, SessionService
 from services.jwt_service import JWTService
-from dependencies.auth import get_current_user, get_db
+from services import password_hasher
+from dependencies.auth import get_current_user, get_db, security
 
 # 라우터 생성
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
 
+async def _hash_pool(func, *args, **kwargs):
+    """비밀번호 해싱이 포함된 UserService 호출을 작업 풀에서 실행"""
+    try:
+        return await password_hasher.run_in_pool(func, *args, **kwargs)
+    except password_hasher.HashPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많습니다. 잠시 후 다시 시도해주세요"
+        )
+
+
 @router.post("/signup", response_model=AuthResponse)
 async def signup(
     request: UserRegisterRequest,
@@ -37,7 +50,8 @@ async def signup(
     - full_name: 전체 이름 (선택)
     - phone_number: 전화번호 (선택)
     """
-    success, message, user = UserService.register_user(
+    success, message, user = await _hash_pool(
+        UserService.register_user,
         db,
         username=request.username,
         email=request.email,
@@ -73,7 +87,8 @@ async def login(
     
     Response: JWT 토큰 + 사용자 정보
     """
-    success, message, user = UserService.login(
+    success, message, user = await _hash_pool(
+        UserService.login,
         db,
         username=request.username,
         password=request.password
@@ -88,8 +103,9 @@ async def login(
     # 액세스 토큰 생성
     token, expires_at = JWTService.create_access_token(user.id)
     
-    # 세션 저장 (선택)
-    SessionService.create_session(db, user.id, token, expires_at)
+    # 세션 저장 (jti는 로그아웃 시 폐기 목록 키)
+    jti = JWTService.verify_access_token(token)["jti"]
+    SessionService.create_session(db, user.id, token, expires_at, jti=jti)
     
     return TokenResponse(
         access_token=token,
@@ -102,7 +118,7 @@ async def login(
 @router.post("/logout", response_model=AuthResponse)
 async def logout(
     user: User = Depends(get_current_user),
-    credentials = None,  # HTTP Bearer 토큰
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     """
@@ -111,8 +127,10 @@ async def logout(
     Header:
     - Authorization: Bearer <token>
     """
-    # 세션 무효화 (optional)
-    # SessionService.invalidate_session(db, token)
+    # 토큰 폐기 (jti 기준, 이후 요청은 메모리 폐기 목록에서 차단)
+    claims = JWTService.verify_access_token(credentials.credentials)
+    if claims and claims["jti"]:
+        SessionService.revoke_session(db, claims["jti"], claims["expires_at"])
     
     return AuthResponse(
         success=True,
@@ -203,7 +221,8 @@ async def change_password(
     - new_password: 새 비밀번호
     - new_password_confirm: 새 비밀번호 확인
     """
-    success, message = UserService.change_password(
+    success, message = await _hash_pool(
+        UserService.change_password,
         db,
         user.id,
         request.old_password,
@@ -1,10 +1,12 @@
 """
 매일 오후 6시 주가 자동 업데이트 스케줄러
-- 현재가: NH투자증권 API / KRX API / Yahoo Finance
+- 현재가: NH투자증권 API / KRX API / Yahoo Finance (provider_router - 공급자별 서킷 브레이커)
 - 일봉 데이터: 키움 Open API (ka10081)
+- 장중: 조회 상위 종목 현재가 선제 갱신 (quote_service 캐시)
 """
 
 from apscheduler.schedulers.background import BackgroundScheduler
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
 import os
@@ -14,13 +16,16 @@ import time
 # 상위 디렉토리의 services 모듈 import
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from services.nh_investment_api import NHInvestmentAPI
-from services.nh_stock_api import NHStockAPI
-from services.krx_stock_api import KRXStockAPI
-from services.us_stock_service import USStockService
-from services.kiwoom_openapi import KiwoomOpenAPI
-from database import SessionLocal
+from database import SessionLocal, read_session, write_session
 from models.stock import StockPrice
+from models.scheduler import SchedulerTask
+from services import data_version
+from services import feature_store
+from services import price_store
+from services import access_stats, market_calendar, provider_router, quote_service
+from services.provider_router import Provider, ProviderRouter
+from services.startup import LazyService
+from services.leader_election import LeaderElection, process_id
 
 # 모든 종목 리스트
 STOCK_LIST = {
@@ -53,50 +58,62 @@ STOCK_LIST = {
     ]
 }
 
-# 서비스 인스턴스 (전역)
-kr_api = None
-us_service = None
-kiwoom_api = None  # 키움 Open API
+# 서비스 인스턴스 (작업이 처음 실행될 때 생성 - 시세 제공자 SDK import 포함)
+def _build_kiwoom_api():
+    from services.kiwoom_openapi import KiwoomOpenAPI
+    return KiwoomOpenAPI(is_mock=False)
+
+
+def _build_nh_api():
+    from services.nh_investment_api import NHInvestmentAPI
+    return NHInvestmentAPI()
+
+
+def _build_krx_api():
+    from services.krx_stock_api import KRXStockAPI
+    return KRXStockAPI()
+
+
+def _build_nh_stock_api():
+    from services.nh_stock_api import NHStockAPI
+    return NHStockAPI()
+
+
+def _build_us_service():
+    from services.us_stock_service import USStockService
+    return USStockService()
+
+
+kiwoom_service = LazyService("kiwoom_api", _build_kiwoom_api)    # 일봉 데이터
+us_stock_service = LazyService("us_service", _build_us_service)   # 미국 현재가
+
+# 한국 현재가: NH투자증권 API → KRX API → NH Stock API
+# (기동 시 하나를 고정하지 않고 종목마다 provider_router로 건강한 공급자부터 시도)
+KR_PRICE_SERVICES = (
+    ("nh", LazyService("nh_api", _build_nh_api)),
+    ("krx", LazyService("krx_api", _build_krx_api)),
+    ("nh_stock", LazyService("nh_stock_api", _build_nh_stock_api)),
+)
+
+
+def _current_price_fetcher(service: LazyService):
+    return lambda ticker: service.get().get_current_price(ticker)
+
+
+kr_price_router = ProviderRouter("kr_current_price", [
+    Provider(name, _current_price_fetcher(service), available=lambda service=service: service.get() is not None)
+    for name, service in KR_PRICE_SERVICES
+])
+
+KIWOOM_RATE_LIMIT_SECONDS = float(os.getenv("KIWOOM_RATE_LIMIT_SECONDS", "0.5"))  # 일봉 조회 종목 간 대기
 
 
 def init_services():
-    """API 서비스 초기화"""
-    global kr_api, us_service, kiwoom_api
-    
-    # 일봉 데이터: 키움 Open API 우선
-    try:
-        kiwoom_api = KiwoomOpenAPI(is_mock=False)
-        print("✅ 키움 Open API 초기화 완료 (일봉 데이터)")
-    except Exception as e:
-        print(f"⚠️  키움 API 초기화 실패: {e}")
-        kiwoom_api = None
-    
-    # 한국 주식: NH투자증권 API 우선
-    try:
-        kr_api = NHInvestmentAPI()
-        print("✅ NH투자증권 API 초기화 완료")
-    except Exception as e:
-        print(f"⚠️  NH API 초기화 실패: {e}")
-        # KRX API로 fallback
-        try:
-            kr_api = KRXStockAPI()
-            print("✅ 한국거래소(KRX) API 초기화 완료 (fallback)")
-        except Exception as e2:
-            print(f"⚠️  KRX API 초기화 실패: {e2}")
-            # NH Stock API로 최종 fallback
-            try:
-                kr_api = NHStockAPI()
-                print("✅ NH Stock API 초기화 완료 (최종 fallback)")
-            except Exception as e3:
-                print(f"⚠️  모든 한국 API 초기화 실패")
-                kr_api = None
-    
-    try:
-        us_service = USStockService()
-        print("✅ 미국 주식 서비스 초기화 완료")
-    except Exception as e:
-        print(f"⚠️  미국 주식 서비스 초기화 실패: {e}")
-        us_service = None
+    """API 서비스 즉시 초기화 (수동 실행용 - 스케줄러 작업은 첫 실행 때 필요한 것만 생성)"""
+    kr_services = [service for _, service in KR_PRICE_SERVICES]
+    for service in (kiwoom_service, *kr_services, us_stock_service):
+        if service.get() is None:
+            print(f"⚠️  {service.name} 초기화 실패: {service.status()['error']}")
 
 
 def update_daily_charts():
@@ -111,9 +128,11 @@ def update_daily_charts():
     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 일봉 데이터 갱신 시작")
     print(f"{'='*70}\n")
     
+    kiwoom_api = kiwoom_service.get()
     if not kiwoom_api:
+        # 예외로 알림 → 수동 갱신 요청은 failed로 기록 (아무것도 안 하고 done이 되지 않도록)
         print("⚠️  키움 API 사용 불가 (초기화 실패)")
-        return
+        raise RuntimeError("키움 API 사용 불가 (초기화 실패)")
     
     # 어제 날짜 (거래일 기준)
     today = datetime.now()
@@ -138,6 +157,8 @@ def update_daily_charts():
     success_count = 0
     fail_count = 0
     skip_count = 0
+    timeseries = price_store.timeseries_enabled()  # stock_prices 대신 stock_prices_ts에 씀
+    ts_rows = []  # 시계열 저장 모드용 (stock_prices_ts)
     
     try:
         print(f"📅 기준일: {yesterday.strftime('%Y-%m-%d')} (YYYYMMDD: {yesterday_str})\n")
@@ -145,11 +166,14 @@ def update_daily_charts():
         for ticker, name in tickers_to_update:
             try:
                 # 이미 DB에 있는지 확인
-                existing = db.query(StockPrice).filter(
-                    StockPrice.ticker == ticker,
-                    StockPrice.date == yesterday.strftime('%Y-%m-%d'),
-                    StockPrice.market == 'KR'
-                ).first()
+                if timeseries:
+                    existing = price_store.has_row(ticker, 'KR', yesterday, conn=db.connection())
+                else:
+                    existing = db.query(StockPrice).filter(
+                        StockPrice.ticker == ticker,
+                        StockPrice.date == yesterday.strftime('%Y-%m-%d'),
+                        StockPrice.market == 'KR'
+                    ).first()
                 
                 if existing:
                     print(f"  ⏭️  {name:20s} [{ticker}]: 이미 저장됨")
@@ -167,18 +191,21 @@ def update_daily_charts():
                 # 가장 최근 거래일 기준 데이터 저장
                 latest = chart[-1]  # 정렬되어 있으므로 마지막이 최신
                 if latest['date'] <= yesterday.strftime('%Y-%m-%d'):
-                    stock_price = StockPrice(
-                        ticker=ticker,
-                        market='KR',
-                        date=latest['date'],
-                        open=latest['open'],
-                        high=latest['high'],
-                        low=latest['low'],
-                        close=latest['close'],
-                        volume=latest['volume'],
-                        source='Kiwoom'
-                    )
-                    db.add(stock_price)
+                    if timeseries:
+                        ts_rows.append(price_store.make_row(ticker, 'KR', latest))
+                    else:
+                        stock_price = StockPrice(
+                            ticker=ticker,
+                            market='KR',
+                            date=latest['date'],
+                            open=latest['open'],
+                            high=latest['high'],
+                            low=latest['low'],
+                            close=latest['close'],
+                            volume=latest['volume'],
+                            source='Kiwoom'
+                        )
+                        db.add(stock_price)
                     print(f"  ✅ {name:20s} [{ticker}]: "
                           f"종가 {latest['close']:>10,.0f}원 | "
                           f"거래량 {latest['volume']:>10,}")
@@ -188,15 +215,21 @@ def update_daily_charts():
                     fail_count += 1
                 
                 # Rate limit 방지
-                time.sleep(0.5)
+                time.sleep(KIWOOM_RATE_LIMIT_SECONDS)
             
             except Exception as e:
                 print(f"  ❌ {name:20s} [{ticker}]: 오류 - {str(e)[:30]}")
                 fail_count += 1
         
-        # 커밋
+        # 커밋 (시계열 행도 같은 트랜잭션)
+        if ts_rows:
+            price_store.upsert_rows(ts_rows, conn=db.connection())
         db.commit()
         
+        # 새 데이터 게시 → 분석 결과 캐시 무효화
+        if success_count > 0:
+            data_version.publish("daily_chart_update", {"saved": success_count})
+        
         print(f"\n{'='*70}")
         print(f"일봉 데이터 갱신 완료")
         print(f"  ✅ 저장: {success_count}개")
@@ -207,9 +240,26 @@ def update_daily_charts():
     except Exception as e:
         db.rollback()
         print(f"❌ 일괄 오류: {e}")
+        raise
     
     finally:
         db.close()
+    
+    # Agent 입력 피처 재계산 (요청 시 yfinance 조회 대신 사용)
+    build_agent_features(dict(tickers_to_update))
+
+
+def build_agent_features(names=None):
+    """stock_prices → stock_features 전체 재계산"""
+    names = dict(names or {})
+    for market_stocks in STOCK_LIST.values():
+        for stock in market_stocks:
+            names.setdefault(stock["ticker"], stock["name"])
+    
+    try:
+        feature_store.build_features(names=names)
+    except Exception as e:
+        print(f"❌ Agent 피처 계산 실패: {e}")
 
 
 def update_stock_prices():
@@ -223,6 +273,14 @@ def update_stock_prices():
     success_count = 0
     fail_count = 0
     
+    us_service = us_stock_service.get()
+    kr_available = any(service.get() is not None for _, service in KR_PRICE_SERVICES)
+    
+    if not us_service and not kr_available:
+        # 빈 시세로 파일을 덮어쓰거나 새 버전을 게시하지 않음 (수동 갱신 요청은 failed)
+        print("⚠️  미국/한국 주식 서비스 모두 사용 불가 (API 초기화 실패)\n")
+        raise RuntimeError("미국/한국 주식 서비스 모두 사용 불가 (API 초기화 실패)")
+    
     # 미국 주식 조회
     if us_service:
         print("📊 미국 주식 조회 중...")
@@ -248,13 +306,15 @@ def update_stock_prices():
         print("⚠️  미국 주식 서비스 사용 불가 (API 초기화 실패)\n")
     
     # 한국 주식 조회
-    if kr_api:
+    if kr_available:
         print("📊 한국 주식 조회 중...")
         for stock in STOCK_LIST["KR"]:
             ticker = stock["ticker"]
             name = stock["name"]
             try:
-                data = kr_api.get_current_price(ticker)
+                provider, data = kr_price_router.call(ticker)
+                if data is None:
+                    raise RuntimeError("모든 한국 API 실패 또는 차단 중")
                 price = int(data['price'])
                 prices[ticker] = price
                 stock_info[ticker] = {
@@ -262,7 +322,7 @@ def update_stock_prices():
                     "market": "KR",
                     "price": price
                 }
-                print(f"  ✅ {name:30s} ({ticker:6s}): ₩{price:>10,}")
+                print(f"  ✅ {name:30s} ({ticker:6s}): ₩{price:>10,} [{provider}]")
                 success_count += 1
             except Exception as e:
                 print(f"  ❌ {name:30s} ({ticker:6s}): 조회 실패 - {e}")
@@ -288,6 +348,9 @@ def update_stock_prices():
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     
+    # 새 데이터 게시 → 분석 결과 캐시 무효화
+    data_version.publish("daily_price_update", {"success": success_count, "fail": fail_count})
+    
     print(f"{'='*60}")
     print(f"📁 저장 위치: {output_path}")
     print(f"✅ 성공: {success_count}개")
@@ -297,49 +360,300 @@ def update_stock_prices():
     print(f"{'='*60}\n")
 
 
-def start_scheduler():
-    """스케줄러 시작"""
-    init_services()
+# ========== 장중 인기 종목 선제 갱신 ==========
+
+INTRADAY_REFRESH_SECONDS = int(os.getenv("INTRADAY_REFRESH_SECONDS", "60"))
+INTRADAY_HOT_TICKERS = int(os.getenv("INTRADAY_HOT_TICKERS", "20"))  # 시장별
+INTRADAY_WORKERS = int(os.getenv("INTRADAY_WORKERS", "4"))
+
+_post_close_refreshed = {}  # 시장 → 마감 후 갱신을 마친 장 마감 시각
+_intraday_stats = {}
+
+
+def _refresh_quote(ticker: str, max_age_minutes: float) -> bool:
+    try:
+        return quote_service.get_quote(ticker, max_age_minutes=max_age_minutes) is not None
+    except Exception as e:
+        print(f"  ❌ 선제 갱신 실패 ({ticker}): {e}")
+        return False
+
+
+def refresh_hot_quotes():
+    """
+    인기 종목 현재가 선제 갱신 (요청 경로의 업스트림 호출 제거)
+    
+    - 정규장 중: 조회 빈도 상위 종목을 INTRADAY_REFRESH_SECONDS마다 갱신
+    - 장 마감 후: 종가 확정(QUOTE_SETTLE_MINUTES) 뒤 1회 갱신, 이후 다음 개장까지 대기
+    - 휴장일: 갱신 없음 (캐시는 직전 마감분이 유효)
+    """
+    now = datetime.now().astimezone()
+    for market in market_calendar.MARKETS:
+        if market_calendar.is_open(market, now):
+            max_age = INTRADAY_REFRESH_SECONDS / 60
+        else:
+            closed_at = market_calendar.last_close(market, now)
+            if (closed_at is None or _post_close_refreshed.get(market) == closed_at
+                    or now < closed_at + timedelta(minutes=quote_service.QUOTE_SETTLE_MINUTES)):
+                continue
+            _post_close_refreshed[market] = closed_at
+            max_age = 0  # 마감 확정분으로 저장된 캐시만 재사용
+        
+        tickers = access_stats.hot_tickers(market, INTRADAY_HOT_TICKERS)
+        if not tickers:
+            continue
+        
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=INTRADAY_WORKERS) as pool:
+            results = list(pool.map(lambda t: _refresh_quote(t, max_age), tickers))
+        
+        _intraday_stats[market] = {
+            "at": now.isoformat(),
+            "session": "open" if max_age else "post_close",
+            "tickers": len(tickers),
+            "ok": sum(results),
+            "seconds": round(time.time() - started, 2)
+        }
+
+
+# ========== 리더 스케줄러 ==========
+
+# sqlalchemy: 작업/다음 실행 시각을 DB(apscheduler_jobs)에 저장 → 리더가 바뀌어도 놓친 실행 1회 보정
+SCHEDULER_JOBSTORE = os.getenv("SCHEDULER_JOBSTORE", "sqlalchemy").lower()
+SCHEDULER_MISFIRE_GRACE = int(os.getenv("SCHEDULER_MISFIRE_GRACE", "3600"))  # 초
+SCHEDULER_QUEUE_POLL_SECONDS = int(os.getenv("SCHEDULER_QUEUE_POLL_SECONDS", "5"))
+
+# 수동 갱신 요청으로 실행 가능한 작업
+QUEUE_JOBS = {
+    "price_update": update_stock_prices,
+    "daily_chart": update_daily_charts,
+}
+
+_election = None
+_scheduler = None
+
+
+def _create_scheduler():
+    """리더용 BackgroundScheduler (예약 작업은 영속 저장소, 큐 폴링은 메모리)"""
+    from apscheduler.jobstores.memory import MemoryJobStore
+    
+    jobstores = {"queue": MemoryJobStore()}
+    if SCHEDULER_JOBSTORE == "sqlalchemy":
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+        from database import engine
+        jobstores["default"] = SQLAlchemyJobStore(engine=engine)
+    else:
+        jobstores["default"] = MemoryJobStore()
+    
+    return BackgroundScheduler(
+        jobstores=jobstores,
+        job_defaults={
+            "coalesce": True,  # 여러 번 놓쳤어도 1회만 실행
+            "max_instances": 1,
+            "misfire_grace_time": SCHEDULER_MISFIRE_GRACE
+        }
+    )
+
+
+def _ensure_job(scheduler, func, trigger: str, job_id: str, **trigger_args):
+    """
+    예약 작업이 저장소에 없을 때만 등록
+    
+    replace_existing=True로 다시 등록하면 next_run_time이 지금 기준으로 재계산되어
+    리더 교체 중 놓친 실행이 사라지므로, 저장된 작업은 그대로 둠
+    """
+    if scheduler.get_job(job_id) is None:
+        scheduler.add_job(func, trigger, id=job_id, **trigger_args)
+
+
+def _start_leader_scheduler():
+    """리더로 선출되면 예약 작업 시작"""
+    global _scheduler
+    
+    _requeue_interrupted_tasks()
+    scheduler = _create_scheduler()
     
-    scheduler = BackgroundScheduler()
+    # 영속 저장소의 작업은 start() 후에 보이므로 일시정지 상태로 시작해 등록 여부를 확인
+    scheduler.start(paused=True)
+    _scheduler = scheduler
     
     # 1. 매일 오후 5시: 일봉 데이터 갱신 (키움 API)
+    _ensure_job(scheduler, update_daily_charts, 'cron', hour=17, minute=0, job_id='daily_chart_update')
+    
+    # 2. 매일 오후 6시: 현재가 조회 및 JSON 갱신
+    _ensure_job(scheduler, update_stock_prices, 'cron', hour=18, minute=0, job_id='daily_price_update')
+    
+    # 3. 인기 종목 현재가 선제 갱신 (장중 짧은 주기, 마감 후 1회, 휴장일 없음)
     scheduler.add_job(
-        update_daily_charts,
-        'cron',
-        hour=17,
-        minute=0,
-        id='daily_chart_update',
+        refresh_hot_quotes,
+        'interval',
+        seconds=INTRADAY_REFRESH_SECONDS,
+        id='intraday_quote_refresh',
+        jobstore='queue',
         replace_existing=True
     )
     
-    # 2. 매일 오후 6시: 현재가 조회 및 JSON 갱신
+    # 4. 수동 갱신 요청 처리 (다른 워커가 scheduler_tasks에 넣은 요청)
     scheduler.add_job(
-        update_stock_prices,
-        'cron',
-        hour=18,
-        minute=0,
-        id='daily_price_update',
+        process_task_queue,
+        'interval',
+        seconds=SCHEDULER_QUEUE_POLL_SECONDS,
+        id='task_queue_poll',
+        jobstore='queue',
         replace_existing=True
     )
     
-    scheduler.start()
+    # 놓친 예약 실행(이전 리더 종료 중 도래)은 재개 시 misfire 규칙에 따라 1회 실행
+    scheduler.resume()
     
     print(f"\n{'='*70}")
-    print("🕐 스케줄러 시작됨")
+    print("🕐 스케줄러 시작됨 (리더)")
     print("\n📅 실행 일정:")
     print("   ┌─ 오후 5시 (17:00): 일봉 데이터 갱신 (키움 API)")
     print("   │  - 저장 위치: StockPrice 테이블")
     print("   │  - 대상: 한국 주식 (120일 누적)")
+    print("   │  - 완료 후 Agent 입력 피처 계산 (stock_features)")
+    print("   │")
+    print("   ├─ 오후 6시 (18:00): 현재가 조회 (NH/KRX/Yahoo)")
+    print("   │  - 저장 위치: stock_prices.json")
     print("   │")
-    print("   └─ 오후 6시 (18:00): 현재가 조회 (NH/KRX/Yahoo)")
-    print("      - 저장 위치: stock_prices.json")
+    print(f"   └─ 장중 {INTRADAY_REFRESH_SECONDS}초마다: 조회 상위 {INTRADAY_HOT_TICKERS}개 종목 현재가 선제 갱신")
+    print("      - KRX/NYSE 정규장 기준, 마감 후 1회, 휴장일 제외")
     print(f"\n📊 대상 종목:")
     print(f"   - 미국 주식: {len(STOCK_LIST['US'])}개")
     print(f"   - 한국 주식: {len(STOCK_LIST['KR'])}개 (주석 해제 시)")
+    print(f"\n📮 수동 갱신 큐: {SCHEDULER_QUEUE_POLL_SECONDS}초마다 확인")
     print(f"{'='*70}\n")
+
+
+def _stop_leader_scheduler():
+    """리더 잠금을 잃으면 예약 작업 중단 (다른 프로세스가 승계)"""
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.shutdown(wait=False)
+        _scheduler = None
+        print("🛑 스케줄러 중단 (리더 해제)")
+
+
+def start_scheduler():
+    """
+    스케줄러 시작 (모든 워커에서 호출해도 됨)
+    
+    리더 잠금을 잡은 프로세스 1개만 예약 작업을 실행하고,
+    나머지는 대기하다가 리더가 종료되면 승계 (API 서비스는 각 작업이 처음 실행될 때 초기화)
+    
+    Returns:
+        LeaderElection 인스턴스
+    """
+    global _election
+    
+    if _election is None:
+        _election = LeaderElection(on_elected=_start_leader_scheduler, on_lost=_stop_leader_scheduler)
+        if not _election.start():
+            print(f"⏸️  스케줄러 대기 (다른 프로세스가 리더, {_election.lock.backend} 잠금)")
+    return _election
+
+
+def stop_scheduler():
+    """스케줄러 종료 (리더면 잠금 해제 → 다른 워커가 승계)"""
+    global _election
+    if _election is not None:
+        _election.stop()
+        _election = None
+
+
+def scheduler_status() -> dict:
+    """리더 여부 + (리더일 때) 다음 실행 시각"""
+    status = _election.status() if _election else {"leader": False, "lock": None}
+    if _scheduler is not None:
+        status["jobs"] = [
+            {"id": job.id, "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None}
+            for job in _scheduler.get_jobs()
+        ]
+        status["intraday_refresh"] = dict(_intraday_stats)
+    status["markets"] = market_calendar.status()
+    status["providers"] = provider_router.status()
+    return status
+
+
+# ========== 수동 갱신 큐 ==========
+
+def enqueue_task(job: str = "price_update") -> dict:
+    """
+    수동 갱신 요청 등록 (요청 처리 프로세스에서 호출, 실행은 리더가 담당)
+    같은 작업이 이미 대기 중이면 새로 만들지 않고 기존 요청 반환
+    
+    Args:
+        job: QUEUE_JOBS 키
     
-    return scheduler
+    Returns:
+        SchedulerTask dict
+    """
+    if job not in QUEUE_JOBS:
+        raise ValueError(f"Unknown job: {job}")
+    
+    with write_session() as db:
+        task = db.query(SchedulerTask).filter(
+            SchedulerTask.job == job, SchedulerTask.status == "queued"
+        ).order_by(SchedulerTask.id).first()
+        if task is None:
+            task = SchedulerTask(job=job, status="queued", requested_by=process_id())
+            db.add(task)
+            db.flush()
+        return task.to_dict()
+
+
+def get_task(task_id: int):
+    """수동 갱신 요청 상태 (없으면 None)"""
+    with read_session() as db:
+        task = db.get(SchedulerTask, task_id)
+        return task.to_dict() if task else None
+
+
+def _requeue_interrupted_tasks():
+    """이전 리더가 실행 도중 종료된 요청(running)을 다시 대기 상태로"""
+    with write_session() as db:
+        count = db.query(SchedulerTask).filter(SchedulerTask.status == "running").update(
+            {"status": "queued", "started_at": None}, synchronize_session=False
+        )
+    if count:
+        print(f"🔁 중단된 수동 갱신 요청 {count}건 재등록")
+
+
+def process_task_queue():
+    """
+    대기 중인 수동 갱신 요청 실행 (리더 전용, 큐 폴링 작업)
+    같은 작업의 대기 요청은 한 번 실행으로 모두 완료 처리
+    """
+    with write_session() as db:
+        queued = db.query(SchedulerTask).filter(SchedulerTask.status == "queued").all()
+        batches = {}
+        for task in queued:
+            batches.setdefault(task.job, []).append(task.id)
+    
+    for job, task_ids in batches.items():
+        # queued → running 선점 (다른 리더와 겹쳐도 한 번만 실행)
+        with write_session() as db:
+            claimed = db.query(SchedulerTask).filter(
+                SchedulerTask.id.in_(task_ids), SchedulerTask.status == "queued"
+            ).update({"status": "running", "started_at": datetime.utcnow()}, synchronize_session=False)
+        if not claimed:
+            continue
+        
+        error = None
+        try:
+            QUEUE_JOBS[job]()
+        except Exception as e:
+            error = str(e)
+            print(f"❌ 수동 갱신 실패 ({job}): {e}")
+        
+        with write_session() as db:
+            db.query(SchedulerTask).filter(
+                SchedulerTask.id.in_(task_ids), SchedulerTask.status == "running"
+            ).update({
+                "status": "failed" if error else "done",
+                "error": error,
+                "finished_at": datetime.utcnow()
+            }, synchronize_session=False)
 
 
 # 수동 실행용 함수
@@ -362,7 +676,7 @@ if __name__ == "__main__":
     manual_update()
     
     print("\n2. 스케줄러 시작...")
-    scheduler = start_scheduler()
+    start_scheduler()
     
     print("3. 스케줄러 대기 중... (Ctrl+C로 종료)")
     try:
@@ -370,5 +684,5 @@ if __name__ == "__main__":
             time.sleep(1)
     except (KeyboardInterrupt, SystemExit):
         print("\n스케줄러 종료 중...")
-        scheduler.shutdown()
+        stop_scheduler()
         print("✅ 스케줄러 종료 완료")
@@ -2,8 +2,8 @@
 Decision Stream API Server
 백엔드 목업 데이터 제공 서버 + 주가 자동 업데이트
 """
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -47,17 +47,16 @@ def verify_key(key: str = Query(...)):
 
 # ========== 스케줄러 통합 ==========
 try:
-    from scheduler import start_scheduler, manual_update
+    from scheduler import start_scheduler, stop_scheduler, scheduler_status, enqueue_task, get_task
     SCHEDULER_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️  스케줄러 import 실패: {e}")
     SCHEDULER_AVAILABLE = False
     start_scheduler = None
-    manual_update = None
 
 @app.on_event("startup")
 async def startup_event():
-    """서버 시작 시 스케줄러 시작"""
+    """서버 시작 시 스케줄러 시작 (워커가 여러 개면 리더 1개만 작업 실행)"""
     print("\n🚀 서버 시작 중...")
     if SCHEDULER_AVAILABLE:
         try:
@@ -69,25 +68,114 @@ async def startup_event():
         print("⚠️  스케줄러 사용 불가 (import 실패)\n")
 
 
-@app.post("/api/prices/refresh")
+@app.on_event("shutdown")
+async def shutdown_event():
+    """리더 잠금 해제 → 남은 워커가 스케줄러 승계"""
+    if SCHEDULER_AVAILABLE:
+        stop_scheduler()
+
+
+@app.post("/api/prices/refresh", status_code=202)
 async def refresh_prices(key: str = Query(...)):
     """
-    주가 수동 새로고침
+    주가 수동 새로고침 요청
     (매일 오후 6시 자동 업데이트 외에 수동 실행 가능)
+    
+    요청 처리 중에 직접 조회하지 않고 스케줄러 리더의 큐에 등록 →
+    GET /api/prices/refresh/{task_id}로 진행 상태 확인
     """
     verify_key(key)
     
-    if not SCHEDULER_AVAILABLE or manual_update is None:
+    if not SCHEDULER_AVAILABLE:
         raise HTTPException(status_code=503, detail="스케줄러 사용 불가")
     
     try:
-        manual_update()
-        return {
-            "message": "주가 업데이트 완료",
-            "timestamp": datetime.now().isoformat()
-        }
+        task = enqueue_task("price_update")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"주가 업데이트 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"주가 업데이트 요청 실패: {str(e)}")
+    
+    return {
+        "message": "주가 업데이트 요청 등록",
+        "task": task,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/api/prices/refresh/{task_id}")
+async def refresh_status(task_id: int, key: str = Query(...)):
+    """주가 수동 새로고침 진행 상태 (queued | running | done | failed)"""
+    verify_key(key)
+    
+    if not SCHEDULER_AVAILABLE:
+        raise HTTPException(status_code=503, detail="스케줄러 사용 불가")
+    
+    task = get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없음")
+    return task
+
+
+@app.get("/api/scheduler/status")
+async def get_scheduler_status(key: str = Query(...)):
+    """이 프로세스의 스케줄러 리더 여부 / 예약 작업 다음 실행 시각"""
+    verify_key(key)
+    
+    if not SCHEDULER_AVAILABLE:
+        raise HTTPException(status_code=503, detail="스케줄러 사용 불가")
+    return scheduler_status()
+
+
+# ========== 메트릭 ==========
+from services import metrics
+
+
+@app.get("/metrics")
+def prometheus_metrics(request: Request, key: Optional[str] = Query(None)):
+    """Prometheus 스크레이프 - 스케줄러 작업의 업스트림 호출 포함 (로컬은 키 없이)"""
+    if not (request.client and request.client.host in ("127.0.0.1", "::1", "localhost")):
+        verify_key(key)
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+# ========== 매매 계획 시뮬레이터 ==========
+try:
+    from services import trade_simulator
+    from agents.trade_plan_builder import TradePlanBuilder
+    SIMULATOR_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️  시뮬레이터 import 실패: {e}")
+    SIMULATOR_AVAILABLE = False
+    trade_simulator = None
+    TradePlanBuilder = None
+
+# generate 응답에 붙이는 시뮬레이션 경로 수 (요청당 지연을 작게 유지)
+PLAN_SIMULATION_PATHS = int(os.getenv("PLAN_SIMULATION_PATHS", "5000"))
+
+
+def _build_split_plan(entry_price: float, stop_loss: float, target_1: float,
+                      target_2: float, period: str) -> List[Dict[str, Any]]:
+    """TradePlanBuilder와 같은 분할 매매 계획"""
+    return TradePlanBuilder()._generate_split_plan(
+        {'pullback': entry_price},
+        stop_loss,
+        {'conservative': target_1, 'aggressive': target_2},
+        {},
+        {'period': period}
+    )
+
+
+def _run_plan_simulation(ticker: str, name: str, plan: Dict[str, Any],
+                         n_paths: int, horizon: int, block_size: int,
+                         seed: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    저장된 시세로 계획 시뮬레이션 (시세 표본이 없으면 None)
+    """
+    returns = trade_simulator.load_daily_returns(ticker)
+    if returns is None:
+        return None
+    result = trade_simulator.simulate_plan(plan, returns, n_paths, horizon, block_size, seed)
+    trade_simulator.record_result(ticker, name, result)
+    return result
 
 
 # ========== Models ==========
@@ -167,6 +255,23 @@ class TradePlanDetailResponse(BaseModel):
     checklist: List[Dict[str, Any]]
     risk_warning: str
     total_score: int
+    simulation: Optional[Dict[str, Any]] = None
+
+
+class TradeSimulationRequest(BaseModel):
+    ticker: str
+    name: str = ""
+    current_price: float
+    entry_price: float
+    stop_loss: float
+    target_1: float
+    target_2: float
+    period: str = "단기"  # 단기 or 중기 (split_plan이 없을 때 분할 계획 구성용)
+    split_plan: Optional[List[Dict[str, Any]]] = None
+    paths: int = 10000
+    horizon: int = 60
+    block_size: int = 5
+    seed: Optional[int] = None
 
 
 class SimulationHistoryResponse(BaseModel):
@@ -551,6 +656,22 @@ def generate_trade_plan(request: TradePlanRequest, key: str = Query(...)):
     else:
         risk_warning = '🚫 진입 조건 미달! 관망을 권장합니다.'
     
+    # 저장된 시세 기반 몬테카를로 검증 (시세가 없거나 DB 미연결이면 생략)
+    simulation = None
+    if SIMULATOR_AVAILABLE:
+        try:
+            plan = {
+                'current_price': request.current_price,
+                'split_plan': _build_split_plan(entry_price, stop_loss, target_1, target_2, request.period),
+            }
+            simulation = _run_plan_simulation(
+                request.ticker, request.name, plan,
+                PLAN_SIMULATION_PATHS, 60 if request.period == '단기' else 120,
+                trade_simulator.DEFAULT_BLOCK_SIZE
+            )
+        except Exception as e:
+            print(f"⚠️  매매 계획 시뮬레이션 실패 ({request.ticker}): {e}")
+    
     return TradePlanDetailResponse(
         entry_price=entry_price,
         stop_loss=stop_loss,
@@ -564,10 +685,50 @@ def generate_trade_plan(request: TradePlanRequest, key: str = Query(...)):
         risk_reward_ratio=risk_reward_ratio,
         checklist=checklist_items,
         risk_warning=risk_warning,
-        total_score=total_score
+        total_score=total_score,
+        simulation=simulation
     )
 
 
+@app.post("/trade_plan/simulate")
+def simulate_trade_plan(request: TradeSimulationRequest, key: str = Query(...)):
+    """
+    매매 계획 몬테카를로 시뮬레이션
+    stock_prices의 일간 수익률을 블록 부트스트랩해 목표 도달/손절 확률, 수익률·낙폭 분포 계산
+    """
+    verify_key(key)
+    
+    if not SIMULATOR_AVAILABLE:
+        raise HTTPException(status_code=503, detail="시뮬레이터 사용 불가")
+    if not (1 <= request.paths <= 100000) or not (1 <= request.horizon <= 250):
+        raise HTTPException(status_code=400, detail="paths는 1~100000, horizon은 1~250 범위여야 합니다")
+    
+    plan = {
+        'current_price': request.current_price,
+        'split_plan': request.split_plan or _build_split_plan(
+            request.entry_price, request.stop_loss, request.target_1, request.target_2, request.period
+        ),
+    }
+    
+    try:
+        result = _run_plan_simulation(
+            request.ticker, request.name, plan,
+            request.paths, request.horizon, request.block_size, request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"{request.ticker} 시세 이력이 부족합니다")
+    
+    return {
+        'ticker': request.ticker,
+        'name': request.name,
+        'split_plan': plan['split_plan'],
+        **result
+    }
+
+
 @app.get("/trade_plan/stocks")
 def get_stocks_by_sector(
     sector: str = Query(..., description="섹터 이름"),
@@ -623,26 +784,14 @@ def get_stocks_by_sector(
 def get_simulation_stats(key: str = Query(...)):
     """
     시뮬레이션 통계 조회
+    최근 몬테카를로 시뮬레이션 결과 집계 (승률 = 경로 기준 수익 확률의 평균)
     """
     verify_key(key)
     
-    # Mock statistics
-    return {
-        'total_simulations': random.randint(10, 50),
-        'win_rate': round(random.uniform(45, 65), 1),
-        'avg_return': round(random.uniform(2, 12), 1),
-        'profit_ratio': round(random.uniform(1.5, 2.8), 1),
-        'best_trade': {
-            'ticker': '012450',
-            'name': '한화에어로스페이스',
-            'return': 28.5
-        },
-        'worst_trade': {
-            'ticker': '000000',
-            'name': '샘플종목',
-            'return': -8.2
-        }
-    }
+    if not SIMULATOR_AVAILABLE:
+        raise HTTPException(status_code=503, detail="시뮬레이터 사용 불가")
+    
+    return trade_simulator.get_stats()
 
 
 # ========== Technical Analysis Endpoints ==========
@@ -1,7 +1,18 @@
-from fastapi import FastAPI, Request, Depends
+from services.startup import StartupProfiler, LazyService, start_warmup, overall_state
+
+# 기동 단계 시간 측정 (import 비용 포함)
+startup_profiler = StartupProfiler()
+
+from fastapi import FastAPI, Request, Depends, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.datastructures import MutableHeaders
 import os
+import json
+import asyncio
+import time
 from datetime import date, datetime
 import traceback
 import logging
@@ -10,18 +21,25 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# AI Agent imports
-from agents.orchestrator import AgentOrchestrator
-from services.agent_data_provider import AgentDataProvider
-from services.krx_stock_api import KRXStockAPI
+# AI Agent / 시세 제공자(pandas, yfinance 등)는 LazyService에서 첫 사용 시 import
+from services import data_version
+from services.result_cache import AnalysisResultCache, normalize_analysis_request
+from services import quote_service, chart_service, response_encoding, http_cache
+from services.quote_hub import QuoteHub
+from services import auth_cache, access_stats, metrics, profiling, provider_router
+from services.fetch_context import FetchContext, fetch_scope
+from services.cache_warmup import HotSetWarmer
 
 # Database imports
-from database import init_db, get_db
+from sqlalchemy import text
+from database import init_db, read_session, pool_stats
 
 # Router imports
 from routers.auth import router as auth_router
 from dependencies.auth import get_current_user
 
+startup_profiler.mark("imports")
+
 # -----------------------
 # Config
 # -----------------------
@@ -44,33 +62,199 @@ app = FastAPI(
 )
 
 # -----------------------
-# Database 초기화
+# 인증 라우터 마운트
 # -----------------------
-try:
-    init_db()
-    logger.info("✅ 데이터베이스 초기화 완료")
-except Exception as e:
-    logger.error(f"⚠️ 데이터베이스 초기화 실패: {e}")
+app.include_router(auth_router)
 
 # -----------------------
-# 인증 라우터 마운트
+# AI Agent 초기화 (지연 생성 + 백그라운드 예열)
 # -----------------------
-app.include_router(auth_router)
+def _build_agents():
+    from agents.orchestrator import AgentOrchestrator
+    from services import price_history
+    from services.agent_data_provider import AgentDataProvider
+
+    orchestrator = AgentOrchestrator(
+        price_history_loader=price_history.load_close_matrix,
+        stage_observer=metrics.observe_agent_stage
+    )
+    provider = AgentDataProvider(use_real_us_data=True)  # 실시간 미국 주식 데이터 사용
+    return orchestrator, provider
+
+
+agent_services = LazyService("ai_agents", _build_agents)
+WARMUP_SERVICES = [agent_services]
+
+
+def _agents():
+    """(AgentOrchestrator, AgentDataProvider) - 첫 호출 시 생성, 실패하면 (None, None)"""
+    return agent_services.get() or (None, None)
+
 
 # -----------------------
-# AI Agent 초기화
+# Database 초기화 + 예열 시작
 # -----------------------
-try:
-    agent_orchestrator = AgentOrchestrator()
-    agent_data_provider = AgentDataProvider(use_real_us_data=True)  # 실시간 미국 주식 데이터 사용
-    krx_api = KRXStockAPI()  # 한국거래소 API (20분 지연)
-    logger.info("✅ AI Agent 시스템 초기화 완료")
-    logger.info("✅ KRX API 초기화 완료 (한국 주식 20분 지연 시세)")
-except Exception as e:
-    logger.error(f"⚠️ AI Agent 초기화 실패: {e}")
-    agent_orchestrator = None
-    agent_data_provider = None
-    krx_api = None
+@app.on_event("startup")
+def start_services():
+    with startup_profiler.phase("init_db"):
+        try:
+            init_db()
+            logger.info("✅ 데이터베이스 초기화 완료")
+        except Exception as e:
+            logger.error(f"⚠️ 데이터베이스 초기화 실패: {e}")
+    with startup_profiler.phase("warmup_start"):
+        start_warmup(WARMUP_SERVICES)
+
+# -----------------------
+# 분석 결과 캐시
+# -----------------------
+_cache_disk = os.getenv("ANALYSIS_CACHE_DISK", "")
+analysis_cache = AnalysisResultCache(
+    max_entries=int(os.getenv("ANALYSIS_CACHE_SIZE", "128")),
+    ttl_seconds=int(os.getenv("ANALYSIS_CACHE_TTL", "600")),
+    disk_dir=(os.path.join(BASE_DIR, "data", "cache", "analysis") if _cache_disk == "1" else _cache_disk) or None
+)
+data_version.subscribe(analysis_cache.invalidate_all)
+
+# -----------------------
+# 실시간 시세 허브 (공유 폴러)
+# -----------------------
+QUOTE_POLL_INTERVAL = float(os.getenv("QUOTE_POLL_INTERVAL", "15"))
+quote_hub = QuoteHub(
+    # 폴링 주기보다 오래된 캐시는 업스트림에서 다시 조회
+    fetcher=lambda t: quote_service.get_quote(t, max_age_minutes=QUOTE_POLL_INTERVAL / 60),
+    interval_seconds=QUOTE_POLL_INTERVAL,
+    queue_size=int(os.getenv("QUOTE_QUEUE_SIZE", "32"))
+)
+
+
+@app.on_event("startup")
+async def start_quote_hub():
+    quote_hub.start()
+
+
+@app.on_event("shutdown")
+async def stop_quote_hub():
+    await quote_hub.stop()
+
+
+# -----------------------
+# 인증 세션 정리 (만료 세션 삭제 + 토큰 폐기 목록 동기화)
+# -----------------------
+session_cleanup_scheduler = None
+
+
+@app.on_event("startup")
+def start_session_cleanup():
+    global session_cleanup_scheduler
+    try:
+        session_cleanup_scheduler = auth_cache.start_session_cleanup()
+    except Exception as e:
+        logger.error(f"⚠️ 세션 정리 작업 시작 실패: {e}")
+
+
+@app.on_event("shutdown")
+def stop_session_cleanup():
+    if session_cleanup_scheduler:
+        session_cleanup_scheduler.shutdown(wait=False)
+
+# -----------------------
+# HTTP 캐시 (ETag / Cache-Control)
+# -----------------------
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))      # 브라우저
+HTTP_CACHE_S_MAXAGE = int(os.getenv("HTTP_CACHE_S_MAXAGE", "300"))   # CDN (Vercel 등)
+CHART_CACHE_TTL = int(os.getenv("CHART_CACHE_TTL", "300"))           # 실시간 차트 재조회 주기
+AGENT_SECTORS_TTL = int(os.getenv("AGENT_SECTORS_TTL", "300"))       # 실시간 섹터 분석 재실행 주기
+
+DATA_CACHE_CONTROL = http_cache.cache_control(
+    HTTP_CACHE_MAX_AGE, s_maxage=HTTP_CACHE_S_MAXAGE, stale_while_revalidate=HTTP_CACHE_S_MAXAGE
+)
+STATIC_CACHE_CONTROL = http_cache.cache_control(0, s_maxage=HTTP_CACHE_MAX_AGE)
+
+response_memo = http_cache.VersionedMemo()
+chart_memo = http_cache.VersionedMemo(ttl_seconds=CHART_CACHE_TTL)
+data_version.subscribe(response_memo.clear)
+data_version.subscribe(chart_memo.clear)
+
+# -----------------------
+# 인기 종목 캐시 예열 (시작 직후 + 장 개장 직전)
+# -----------------------
+def _warm_quotes(tickers: list):
+    for ticker in tickers:
+        quote_service.get_quote(ticker)
+
+
+def _warm_charts(tickers: list):
+    version = data_version.current_version()
+    for ticker in tickers:
+        if chart_memo.get(ticker, version) is None:
+            try:
+                _chart_entry(ticker)
+            except chart_service.ChartDataNotFound:
+                pass
+
+
+def _warm_features(tickers: list):
+    from services import feature_store
+    feature_store.get_features(tickers)
+
+
+hot_set_warmer = HotSetWarmer({
+    "quote": _warm_quotes,
+    "chart": _warm_charts,
+    "features": _warm_features,
+})
+
+
+@app.on_event("startup")
+def start_hot_set_warmer():
+    hot_set_warmer.start()
+
+
+@app.on_event("shutdown")
+def stop_hot_set_warmer():
+    hot_set_warmer.stop()
+    access_stats.flush()
+
+
+def _versioned_json(request: Request, key: str, build, ttl_seconds: int = 0):
+    """
+    데이터 버전 기반 조건부 응답
+    
+    ETag = (key, 데이터 버전, 날짜) → 같으면 304, 아니면 버전별로 메모한 본문 재사용
+    ttl_seconds를 주면 그 주기로 시간 구간도 버전에 포함 (게시 없이도 바뀌는 실시간 결과용)
+    build()가 Response를 돌려주면(오류 등) 캐시하지 않고 그대로 반환
+    """
+    version = f"{data_version.current_version()}:{date.today()}"
+    if ttl_seconds:
+        version += f":{int(time.time() // ttl_seconds)}"
+    etag = http_cache.strong_etag(key, version)
+    headers = {"ETag": etag, "Cache-Control": DATA_CACHE_CONTROL}
+    
+    if http_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    body = response_memo.get(key, version)
+    metrics.cache_result("response_memo", hit=body is not None)
+    if body is None:
+        result = build()
+        if isinstance(result, Response):
+            return result
+        body = response_encoding.dumps_json(result)
+        response_memo.set(key, version, body)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _static_file(request: Request, path: str):
+    """정적 파일 조건부 응답 (ETag = 변경 시각 + 크기)"""
+    etag = http_cache.file_etag(path)
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": STATIC_CACHE_CONTROL}
+    if http_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers)
 
 # -----------------------
 # CORS
@@ -99,29 +283,136 @@ async def keycheck(req: Request, call_next):
     # Allow public APIs without key
     if req.url.path.startswith("/api/"):
         return await call_next(req)
+    
+    # Allow local metrics scrape without key
+    if req.url.path == "/metrics" and req.client and req.client.host in ("127.0.0.1", "::1", "localhost"):
+        return await call_next(req)
 
     client_key = req.query_params.get("key")
     if client_key != ACCESS_KEY:
         return JSONResponse(status_code=403, content={"error": "Invalid API key"})
     return await call_next(req)
 
+# -----------------------
+# Data Epoch Pinning
+# -----------------------
+class PinDataEpochMiddleware:
+    """
+    요청 1건 동안 데이터 버전/에폭 고정
+    처리 도중 스케줄러가 새 데이터를 게시해도 캐시 키와 응답이 한 스냅샷 기준으로 유지됨
+    (DB 테이블은 에폭별로 보관하지 않음 - data_version 참고)
+
+    순수 ASGI 미들웨어 - 응답 본문 전송(스트리밍 포함)이 끝나거나 전송이 실패할 때까지
+    pinned() 블록 안에 있으므로 어느 경로로 끝나도 에폭 고정이 해제됨
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with data_version.pinned() as (version, epoch):
+            async def send_with_version(message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-Data-Version"] = version
+                    if epoch:
+                        headers["X-Data-Epoch"] = epoch
+                await send(message)
+
+            await self.app(scope, receive, send_with_version)
+
+
+app.add_middleware(PinDataEpochMiddleware)
+
+# -----------------------
+# Access Stats + Metrics (라우트별 응답 시간, 인기 종목/엔드포인트/섹터 → 캐시 예열 대상)
+# -----------------------
+@app.middleware("http")
+async def track_access(req: Request, call_next):
+    """
+    라우팅 결과 기준 집계 (라우트 템플릿, 경로의 {ticker}, ?sector=)
+    스트리밍 응답은 헤더 전송까지의 시간
+    종목/섹터는 성공 응답만 집계 (잘못된 종목이 인기 종목 → 예열 대상이 되지 않도록)
+    """
+    started = time.perf_counter()
+    response = await call_next(req)
+    route = getattr(req.scope.get("route"), "path", None)
+    metrics.HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - started,
+        method=req.method, route=route or "unmatched", status=response.status_code
+    )
+    if route:
+        access_stats.count("endpoint", f"{req.method} {route}")
+        if response.status_code < 400:
+            if req.path_params.get("ticker"):
+                access_stats.record(req.path_params["ticker"])
+            access_stats.count("sector", req.query_params.get("sector", ""))
+    return response
+
+
+# -----------------------
+# Server-Timing + 샘플링 프로파일러 (X-Profile: <PROFILE_KEY> 또는 ?profile=<PROFILE_KEY>)
+# -----------------------
+@app.middleware("http")
+async def server_timing(req: Request, call_next):
+    """
+    모든 응답에 Server-Timing 헤더 (구간: agent.*, upstream.*, chart.*, encode 등 + total)
+    관리자 키가 있으면 요청 동안 스택 샘플링 → X-Profile 헤더로 folded stack 다운로드 경로 전달
+    """
+    profiler = None
+    if profiling.is_authorized(req.headers.get("x-profile") or req.query_params.get("profile")):
+        profiler = profiling.SamplingProfiler()
+        if not profiler.start():
+            profiler = None  # 다른 요청을 프로파일링 중
+    
+    started = time.perf_counter()
+    try:
+        with profiling.timing_scope() as timing:
+            response = await call_next(req)
+    finally:
+        if profiler:
+            profiler.stop()
+    
+    response.headers["Server-Timing"] = timing.header(time.perf_counter() - started)
+    if profiler:
+        name = await run_in_threadpool(profiler.save, f"{req.method} {req.url.path}")
+        response.headers["X-Profile"] = f"/api/profiles/{name}"
+    return response
+
+
+def _record_access(tickers: list):
+    """본문/쿼리로 받은 종목 조회 빈도 기록 (경로 {ticker}는 미들웨어에서 기록)"""
+    for ticker in tickers:
+        access_stats.record(ticker)
+
+
+def _record_analysis_request(normalized: dict):
+    """분석 요청의 종목/섹터 기록"""
+    _record_access(normalized["tickers"])
+    for sector in normalized["sectors"]:
+        access_stats.count("sector", sector)
+
 # -----------------------
 # Index & Static HTML
 # -----------------------
 @app.get("/")
-def root():
+def root(request: Request):
     index_path = os.path.join(WEB_DIR, "index.html")
-    if not os.path.exists(index_path):
-        return JSONResponse(status_code=404, content={"error": "index.html not found"})
-    return FileResponse(index_path)
+    return _static_file(request, index_path) or JSONResponse(
+        status_code=404, content={"error": "index.html not found"}
+    )
 
 @app.get("/agent_test.html")
-def agent_test():
+def agent_test(request: Request):
     """AI Agent 테스트 페이지"""
     agent_test_path = os.path.join(WEB_DIR, "agent_test.html")
-    if not os.path.exists(agent_test_path):
-        return JSONResponse(status_code=404, content={"error": "agent_test.html not found"})
-    return FileResponse(agent_test_path)
+    return _static_file(request, agent_test_path) or JSONResponse(
+        status_code=404, content={"error": "agent_test.html not found"}
+    )
 
 # -----------------------
 # Utils / Mock Data
@@ -175,38 +466,60 @@ async def health_check():
     - 데이터베이스 상태
     - Agent 시스템 상태
     - API 서비스 상태
+    Agent 초기화를 일으키지 않음 - 예열 중이면 status="warming"
     """
-    db_ok = False
-    agent_ok = agent_orchestrator is not None
-    
-    try:
-        db = next(get_db())
-        db.execute("SELECT 1")
-        db_ok = True
-        db.close()
-    except:
-        db_ok = False
+    db_ok = await run_in_threadpool(_ping_database)
+    agent_state = overall_state(WARMUP_SERVICES)
     
-    all_ok = db_ok and agent_ok
-    status_code = "healthy" if all_ok else "degraded"
+    if not db_ok or agent_state == "failed":
+        status_code = "degraded"
+    elif agent_state == "warming":
+        status_code = "warming"
+    else:
+        status_code = "healthy"
     
     return {
         "status": status_code,
         "timestamp": datetime.utcnow().isoformat(),
         "services": {
             "database": "ok" if db_ok else "error",
-            "ai_agents": "ok" if agent_ok else "error",
+            "ai_agents": {"ready": "ok", "failed": "error"}.get(agent_state, agent_state),
             "api_server": "ok"
         }
     }
 
 
+@app.get("/api/ready")
+async def readiness_check():
+    """
+    준비 상태 (로드밸런서/배포 체크용) - Agent 예열 중이거나 실패면 503
+    STARTUP_WARMUP=lazy 에서는 첫 요청에서 초기화하므로 cold도 준비 상태로 간주
+    """
+    agent_state = overall_state(WARMUP_SERVICES)
+    ready = agent_state in ("ready", "cold")
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "ai_agents": agent_state}
+    )
+
+
+def _ping_database() -> bool:
+    try:
+        with read_session() as db:
+            db.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
 @app.get("/api/status")
 async def status():
     """
     시스템 상태 상세 정보
     베타테스터 모니터링용
     """
+    agents_ready = agent_services.peek() is not None
+    access_top = await run_in_threadpool(access_stats.status)  # 워커별 통계 파일 읽기
     return {
         "app_name": "Stock Radar Spark",
         "version": "1.0.0-beta",
@@ -215,29 +528,90 @@ async def status():
         "active_users": "베타테스터 5명 제한",
         "database": {
             "type": "SQLite (development)" if "sqlite" in os.getenv("DATABASE_URL", "") else "PostgreSQL",
-            "status": "running"
+            "status": "running",
+            "pools": pool_stats()
         },
         "ai_agents": {
-            "market_regime": agent_orchestrator is not None,
-            "sector_scout": agent_orchestrator is not None,
-            "stock_screener": agent_orchestrator is not None,
-            "trade_plan_builder": agent_orchestrator is not None,
-            "devils_advocate": agent_orchestrator is not None
+            "market_regime": agents_ready,
+            "sector_scout": agents_ready,
+            "stock_screener": agents_ready,
+            "trade_plan_builder": agents_ready,
+            "devils_advocate": agents_ready
         },
         "data_sources": {
             "yahoo_finance": "active",
             "opendart_api": bool(os.getenv("OPENDART_API_KEY")),
             "krx_api": "20분 지연"
-        }
+        },
+        "startup": {
+            **startup_profiler.report(),
+            "services": {s.name: s.status() for s in (agent_services,)}
+        },
+        "analysis_cache": analysis_cache.stats(),
+        "quote_hub": quote_hub.stats(),
+        "auth_cache": {**auth_cache.user_cache.stats(), "revoked_tokens": len(auth_cache.revoked_tokens)},
+        "data_epochs": data_version.pin_stats(),
+        "access_stats": access_top,
+        "hot_set_warmup": hot_set_warmer.status(),
+        "providers": provider_router.status()
+    }
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Prometheus 스크레이프 (로컬은 키 없이, 외부는 ?key= 필요)"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/api/profiles/{name}")
+def download_profile(name: str, request: Request):
+    """저장된 샘플링 프로파일 (folded stack - flamegraph.pl / speedscope로 열기)"""
+    if not profiling.is_authorized(request.headers.get("x-profile") or request.query_params.get("profile")):
+        return JSONResponse(status_code=403, content={"error": "Profiling key required"})
+    path = profiling.profile_path(name)
+    if path is None:
+        return JSONResponse(status_code=404, content={"error": "Profile not found"})
+    return FileResponse(path, media_type="text/plain; charset=utf-8")
+
+
+@app.get("/api/epochs")
+def list_epochs():
+    """
+    보관 중인 데이터 에폭 목록 (최신 순)
+    재현 분석 시 X-Data-Epoch 응답 헤더의 에폭을 기준으로 사용 (stock_prices.json 사본만 보관, DB 테이블은 최신값)
+    """
+    epochs = list(reversed(data_version.list_epochs()))
+    return {
+        "current": data_version.current_epoch(),
+        "retention_days": data_version.EPOCH_RETENTION_DAYS,
+        "epochs": epochs
     }
 
+
+@app.get("/api/epochs/{epoch_id}/{filename}")
+def get_epoch_file(epoch_id: str, filename: str, request: Request):
+    """에폭 시점의 스냅샷 파일 (예: stock_prices.json) - 내용이 불변이므로 장기 캐시"""
+    path = data_version.epoch_file(epoch_id, filename)
+    if path is None:
+        return JSONResponse(status_code=404, content={"error": f"Epoch file not found: {epoch_id}/{filename}"})
+    
+    etag = http_cache.strong_etag(epoch_id, filename)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if http_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers)
+
 # -----------------------
 # Core APIs
 # -----------------------
 
 @app.get("/regime")
-def regime():
+def regime(request: Request):
     """Market Regime API"""
+    return _versioned_json(request, "regime", _regime_payload)
+
+
+def _regime_payload():
     return {
         "date": str(date.today()),
         "state": "RISK_ON",
@@ -259,8 +633,12 @@ def regime():
 
 
 @app.get("/sectors")
-def sectors():
+def sectors(request: Request):
     """Sector Heatmap API"""
+    return _versioned_json(request, "sectors", _sectors_payload)
+
+
+def _sectors_payload():
     out = []
     for s in SECTORS:
         sc = score(s)
@@ -384,8 +762,8 @@ def nogo_report(ticker: str, sector: str):
 @app.get("/market_intelligence")
 def market_intelligence():
     """Market Intelligence (시장 해설) API"""
-    r = regime()
-    s = sectors()
+    r = _regime_payload()
+    s = _sectors_payload()
     
     surge_sectors = [x for x in s if x["flow_signal"] == "SURGE"]
     
@@ -404,8 +782,8 @@ def market_intelligence():
 @app.get("/generate_ds_anchor_script")
 def generate_ds_anchor_script():
     """DS-Anchor 대본 생성 (10분 뉴스+교육 톤)"""
-    r = regime()
-    s = sectors()
+    r = _regime_payload()
+    s = _sectors_payload()
 
     surge_sectors = [x for x in s if x["flow_signal"] == "SURGE"]
     top_sectors = surge_sectors[:2] if surge_sectors else s[:2]
@@ -511,9 +889,12 @@ async def agent_full_analysis(request: Request):
         "sectors": ["반도체", "방산"],              // 선택
         "period": "단기",                           // 단기 | 중기
         "risk_profile": "중립",                    // 보수 | 중립 | 공격
-        "account_size": 10000000                   // 선택 (원)
+        "account_size": 10000000,                  // 선택 (원)
+        "max_positions": 5                         // 선택 (포트폴리오 최대 종목 수, 1~100)
     }
     """
+    with profiling.phase("agent.init"):
+        agent_orchestrator, agent_data_provider = await run_in_threadpool(_agents)
     if not agent_orchestrator or not agent_data_provider:
         return JSONResponse(
             status_code=503,
@@ -523,22 +904,42 @@ async def agent_full_analysis(request: Request):
     try:
         body = await request.json()
         
-        # 1. 데이터 수집
-        market_data = agent_data_provider.get_market_data()
-        
-        # 섹터 데이터
-        sectors_param = body.get("sectors", ["반도체", "방산", "2차전지"])
-        sectors_data = agent_data_provider.get_sectors_data(sectors_param)
+        # 0. 결과 캐시 확인 (요청 + 데이터 버전 기준)
+        normalized = normalize_analysis_request(body)
+        _record_analysis_request(normalized)
+        version = data_version.current_version()
+        cache_key = AnalysisResultCache.make_key(normalized, version)
+        bypass = body.get("no_cache", False) or "no-cache" in request.headers.get("cache-control", "")
+        
+        if not bypass:
+            with profiling.phase("cache"):
+                entry, tier = analysis_cache.get(cache_key)
+            if entry:
+                # 같은 결과는 한 번만 파일로 저장
+                if body.get("save_result", False) and not entry.get("saved_path"):
+                    saved_path = agent_data_provider.save_analysis_result(entry["result"])
+                    analysis_cache.mark_saved(cache_key, saved_path)
+                return JSONResponse(
+                    content=jsonable_encoder(entry["result"]),
+                    headers={"X-Cache": "HIT", "X-Cache-Tier": tier, "X-Data-Version": version}
+                )
         
-        # 종목 데이터
-        tickers = body.get("tickers", ["005930", "000660", "012450"])
-        stocks_data = agent_data_provider.get_stocks_data(tickers)
+        # 1. 데이터 수집 (분석 1회 동안 같은 업스트림 조회는 한 번만)
+        with profiling.phase("agent.data"), fetch_scope():
+            market_data = agent_data_provider.get_market_data()
+            
+            # 섹터 데이터
+            sectors_data = agent_data_provider.get_sectors_data(normalized["sectors"])
+            
+            # 종목 데이터
+            stocks_data = agent_data_provider.get_stocks_data(normalized["tickers"])
         
         # 2. 사용자 프로필
         user_profile = {
-            "period": body.get("period", "단기"),
-            "risk_profile": body.get("risk_profile", "중립"),
-            "account_size": body.get("account_size", 0)
+            "period": normalized["period"],
+            "risk_profile": normalized["risk_profile"],
+            "account_size": normalized["account_size"],
+            "max_positions": normalized["max_positions"]
         }
         
         # 3. Agent 실행
@@ -550,10 +951,17 @@ async def agent_full_analysis(request: Request):
         )
         
         # 4. 결과 저장 (선택)
+        saved_path = None
         if body.get("save_result", False):
-            agent_data_provider.save_analysis_result(result)
+            saved_path = agent_data_provider.save_analysis_result(result)
         
-        return result
+        analysis_cache.set(cache_key, result, version, saved_path=saved_path)
+        
+        with profiling.phase("encode"):
+            return JSONResponse(
+                content=jsonable_encoder(result),
+                headers={"X-Cache": "BYPASS" if bypass else "MISS", "X-Data-Version": version}
+            )
         
     except Exception as e:
         print(f"❌ Agent 분석 오류: {e}")
@@ -564,6 +972,114 @@ async def agent_full_analysis(request: Request):
         )
 
 
+def _format_stream_event(stage: str, payload, fmt: str) -> str:
+    """스트리밍 이벤트 직렬화 (SSE 또는 NDJSON)"""
+    if fmt == "ndjson":
+        return json.dumps({"stage": stage, "data": jsonable_encoder(payload)}, ensure_ascii=False) + "\n"
+    data = json.dumps(jsonable_encoder(payload), ensure_ascii=False)
+    return f"event: {stage}\ndata: {data}\n\n"
+
+
+@app.get("/api/agent/analyze/stream")
+@app.post("/api/agent/analyze/stream")
+async def agent_full_analysis_stream(request: Request):
+    """
+    전체 AI Agent 분석 파이프라인 - 단계별 스트리밍
+    
+    각 단계가 끝나는 즉시 이벤트 전송:
+    market_regime → ranked_sectors → screened_stocks → recommendation(종목별) → complete
+    
+    - POST: /api/agent/analyze와 같은 Request Body
+    - GET: EventSource용 쿼리 (?tickers=005930,000660&sectors=반도체,방산&period=단기)
+    - 형식: 기본 SSE(text/event-stream), ?format=ndjson 또는 Accept: application/x-ndjson
+    """
+    agent_orchestrator, agent_data_provider = await run_in_threadpool(_agents)
+    if not agent_orchestrator or not agent_data_provider:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "AI Agent system not initialized"}
+        )
+    
+    if request.method == "POST":
+        body = await request.json()
+    else:
+        params = request.query_params
+        body = {k: params[k] for k in ("period", "risk_profile", "account_size", "max_positions") if k in params}
+        for list_key in ("tickers", "sectors"):
+            if params.get(list_key):
+                body[list_key] = [x for x in params[list_key].split(",") if x]
+    
+    fmt = request.query_params.get("format", "")
+    if not fmt:
+        fmt = "ndjson" if "application/x-ndjson" in request.headers.get("accept", "") else "sse"
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "text/event-stream"
+    
+    normalized = normalize_analysis_request(body)
+    _record_analysis_request(normalized)
+    version = data_version.current_version()
+    cache_key = AnalysisResultCache.make_key(normalized, version)
+    entry, _tier = analysis_cache.get(cache_key)
+    
+    user_profile = {
+        "period": normalized["period"],
+        "risk_profile": normalized["risk_profile"],
+        "account_size": normalized["account_size"],
+        "max_positions": normalized["max_positions"]
+    }
+    
+    def event_stream():
+        """동기 제너레이터 - StreamingResponse가 스레드풀에서 순회"""
+        try:
+            if entry:
+                # 캐시 결과는 같은 단계 순서로 즉시 재생
+                cached = entry["result"]
+                yield _format_stream_event("market_regime", cached["market_regime"], fmt)
+                yield _format_stream_event("ranked_sectors", cached["ranked_sectors"], fmt)
+                yield _format_stream_event("screened_stocks", cached["screened_stocks"], fmt)
+                for rec in cached["recommendations"]:
+                    yield _format_stream_event("recommendation", rec, fmt)
+                yield _format_stream_event("complete", cached, fmt)
+                return
+            
+            # 데이터는 로더로 넘겨 각 단계 직전에 수집 (첫 이벤트까지의 시간 단축)
+            # 제너레이터는 스레드풀에서 next()마다 다른 스레드로 돌 수 있으므로
+            # 스코프는 로더 호출 안에서만 열고, 조회 메모(fetch_ctx)는 로더 간에 공유
+            fetch_ctx = FetchContext()
+
+            def in_scope(loader):
+                def load():
+                    with fetch_scope(fetch_ctx):
+                        return loader()
+                return load
+
+            stages = agent_orchestrator.iter_full_analysis(
+                in_scope(agent_data_provider.get_market_data),
+                in_scope(lambda: agent_data_provider.get_sectors_data(normalized["sectors"])),
+                in_scope(lambda: agent_data_provider.get_stocks_data(normalized["tickers"])),
+                user_profile
+            )
+            for stage, payload in stages:
+                if stage == "complete":
+                    analysis_cache.set(cache_key, payload, version)
+                yield _format_stream_event(stage, payload, fmt)
+        
+        except Exception as e:
+            print(f"❌ Agent 스트리밍 분석 오류: {e}")
+            traceback.print_exc()
+            yield _format_stream_event("error", {"error": str(e)}, fmt)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type=media_type,
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 프록시 버퍼링 방지
+            "X-Cache": "HIT" if entry else "MISS",
+            "X-Data-Version": version
+        }
+    )
+
+
 @app.post("/api/agent/quick-analyze")
 async def agent_quick_analysis(request: Request):
     """
@@ -577,6 +1093,7 @@ async def agent_quick_analysis(request: Request):
         "account_size": 10000000
     }
     """
+    agent_orchestrator, agent_data_provider = await run_in_threadpool(_agents)
     if not agent_orchestrator or not agent_data_provider:
         return JSONResponse(
             status_code=503,
@@ -593,15 +1110,18 @@ async def agent_quick_analysis(request: Request):
                 content={"error": "ticker is required"}
             )
         
-        # 데이터 수집
-        market_data = agent_data_provider.get_market_data()
-        stocks_data = agent_data_provider.get_stocks_data([ticker])
+        # 데이터 수집 (분류 + 매매 계획에 쓰는 필드만)
+        from services.agent_data_provider import TRADE_PLAN_FIELDS
+        with fetch_scope():
+            market_data = agent_data_provider.get_market_data()
+            stocks_data = agent_data_provider.get_stocks_data([ticker], fields=TRADE_PLAN_FIELDS)
         
         if not stocks_data:
             return JSONResponse(
                 status_code=404,
                 content={"error": f"Stock data not found for {ticker}"}
             )
+        _record_access([ticker])  # 찾은 종목만 (없는 종목은 예열 대상이 되지 않도록)
         
         stock_data = stocks_data[0]
         
@@ -635,6 +1155,7 @@ def agent_market_regime():
     """
     시장 상태만 빠르게 조회
     """
+    agent_orchestrator, agent_data_provider = _agents()
     if not agent_orchestrator or not agent_data_provider:
         return JSONResponse(
             status_code=503,
@@ -654,10 +1175,15 @@ def agent_market_regime():
 
 
 @app.get("/api/agent/sectors")
-def agent_sectors():
+def agent_sectors(request: Request):
     """
     AI Agent가 실시간 섹터 분석 (Sector Scout)
     """
+    return _versioned_json(request, "agent_sectors", _agent_sectors_payload, ttl_seconds=AGENT_SECTORS_TTL)
+
+
+def _agent_sectors_payload():
+    agent_orchestrator, agent_data_provider = _agents()
     if not agent_orchestrator or not agent_data_provider:
         return JSONResponse(
             status_code=503,
@@ -700,6 +1226,7 @@ def agent_funnel(sector: str):
     AI Agent가 섹터별 종목 분류 (Stock Screener)
     Leader, Follower, No-Go 실시간 분류
     """
+    agent_orchestrator, agent_data_provider = _agents()
     if not agent_orchestrator or not agent_data_provider:
         return JSONResponse(
             status_code=503,
@@ -720,8 +1247,9 @@ def agent_funnel(sector: str):
         if not tickers:
             return {"leader": [], "follower": [], "no_go": []}
         
-        # 종목 데이터 수집
-        stocks_data = agent_data_provider.get_stocks_data(tickers)
+        # 종목 데이터 수집 (분류에 쓰는 필드만 - 일봉 조회 생략)
+        from services.agent_data_provider import SCREENER_FIELDS
+        stocks_data = agent_data_provider.get_stocks_data(tickers, fields=SCREENER_FIELDS)
         
         # Stock Screener Agent 실행
         result = agent_orchestrator.stock_screener.screen_stocks(stocks_data)
@@ -777,6 +1305,7 @@ def agent_market_intelligence():
     """
     AI Agent가 생성하는 시장 해설 (Market Analyst)
     """
+    agent_orchestrator, agent_data_provider = _agents()
     if not agent_orchestrator or not agent_data_provider:
         return JSONResponse(
             status_code=503,
@@ -785,9 +1314,10 @@ def agent_market_intelligence():
     
     try:
         # 시장 데이터 수집
-        market_data = agent_data_provider.get_market_data()
-        sectors = ["방산", "헬스케어", "AI 반도체", "전력", "에너지"]
-        sectors_data = agent_data_provider.get_sectors_data(sectors)
+        with fetch_scope():
+            market_data = agent_data_provider.get_market_data()
+            sectors = ["방산", "헬스케어", "AI 반도체", "전력", "에너지"]
+            sectors_data = agent_data_provider.get_sectors_data(sectors)
         
         # Market Analyst에서 상세 해설 생성
         regime_result = agent_orchestrator.market_analyst.analyze(market_data)
@@ -845,371 +1375,196 @@ async def get_price(ticker: str):
     빠른 가격 조회 - 캐시 먼저, 오래되면 자동 갱신
     """
     try:
-        import json
-        import yfinance as yf
-        from datetime import datetime, timedelta
-        
-        ticker_upper = ticker.upper()
-        is_korean_stock = ticker.isdigit() and len(ticker) == 6
-        
-        # ✅ 1단계: 캐시 파일 확인
-        cache_file = os.path.join(os.path.dirname(__file__), 'data', 'stock_prices_cache.json')
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                if is_korean_stock:
-                    stock_data = cache_data.get('korean_stocks', {}).get(ticker)
-                else:
-                    stock_data = cache_data.get('us_stocks', {}).get(ticker_upper)
-                
-                if stock_data:
-                    # 타임스탐프 확인 - 30분 이상 지났으면 업데이트
-                    cache_time = datetime.fromisoformat(stock_data.get('timestamp', '2000-01-01T00:00:00Z').replace('Z', '+00:00'))
-                    now = datetime.now(cache_time.tzinfo)
-                    age_minutes = (now - cache_time).total_seconds() / 60
-                    
-                    if age_minutes < 30:  # 30분 이내면 캐시 사용
-                        return {
-                            "ticker": ticker,
-                            "name": stock_data.get("name", ""),
-                            "price": stock_data.get("current_price"),
-                            "previous_close": stock_data.get("previous_close"),
-                            "currency": stock_data.get("currency", ""),
-                            "source": "Cache (KRX)" if is_korean_stock else "Cache (20분지연)"
-                        }
-                    else:
-                        # 30분 이상 지났으면 Yahoo에서 업데이트
-                        logger.info(f"🔄 캐시 갱신: {ticker} (나이: {age_minutes:.0f}분)")
-            except Exception as e:
-                logger.warning(f"⚠️ Cache load error: {str(e)}")
-        
-        # ✅ 2단계: 캐시 없거나 오래됨 → Kiwoom API 또는 Yahoo Finance에서 조회
-        logger.info(f"📡 실시간 조회: {ticker}")
-        
-        # 🔑 한국 주식: 먼저 Kiwoom API 시도
-        if is_korean_stock:
-            try:
-                from services.kiwoom_openapi import KiwoomOpenAPI
-                kiwoom = KiwoomOpenAPI()
-                kiwoom_data = kiwoom.get_daily_chart(ticker_upper)
-                
-                if kiwoom_data and len(kiwoom_data) > 0:
-                    latest = kiwoom_data[-1]
-                    return {
-                        "ticker": ticker,
-                        "name": stock_data.get("name", "Unknown") if 'stock_data' in locals() else "Unknown",
-                        "price": float(latest.get('close', 0)),
-                        "previous_close": float(latest.get('open', latest.get('close', 0))),
-                        "currency": "KRW",
-                        "source": "Kiwoom API"
-                    }
-            except Exception as e:
-                logger.warning(f"⚠️ Kiwoom API 실패 ({ticker}): {str(e)[:50]}")
-        
-        # 💬 Kiwoom 실패 시 YahooFinance로 폴백
-        if is_korean_stock:
-            stock = yf.Ticker(f"{ticker}.KS")
-        else:
-            stock = yf.Ticker(ticker_upper)
-        
-        # 5일 데이터 조회
-        hist = stock.history(period='5d')
-        
-        if hist.empty or len(hist) == 0:
-            # Yahoo 실패 시 캐시 반환
-            if os.path.exists(cache_file) and stock_data:
-                return {
-                    "ticker": ticker,
-                    "name": stock_data.get("name", ""),
-                    "price": stock_data.get("current_price"),
-                    "previous_close": stock_data.get("previous_close"),
-                    "currency": stock_data.get("currency", ""),
-                    "source": "Cache (Fallback)" if is_korean_stock else "Cache (Fallback)"
-                }
+        quote = await run_in_threadpool(quote_service.get_quote, ticker)
+        if not quote:
             return JSONResponse(status_code=404, content={"error": "No data found"})
-        
-        # 실시간 데이터 추출
-        current_price = float(hist['Close'].iloc[-1])
-        previous_close = float(hist['Close'].iloc[-2]) if len(hist) >= 2 else current_price
-        
-        # ✅ 3단계: 캐시 파일에 자동 저장
-        try:
-            cache_file = os.path.join(os.path.dirname(__file__), 'data', 'stock_prices_cache.json')
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # 새 데이터 업데이트
-            if is_korean_stock:
-                if 'korean_stocks' not in cache_data:
-                    cache_data['korean_stocks'] = {}
-                
-                # 기존 이름이 있으면 사용, 없으면 티커 사용
-                name = stock_data.get('name', f'Stock {ticker}') if stock_data else stock.info.get('longName', f'Stock {ticker}')
-                
-                cache_data['korean_stocks'][ticker] = {
-                    "name": name,
-                    "current_price": int(current_price),
-                    "previous_close": int(previous_close),
-                    "currency": "KRW",
-                    "timestamp": datetime.now().isoformat() + 'Z'
-                }
-            else:
-                if 'us_stocks' not in cache_data:
-                    cache_data['us_stocks'] = {}
-                
-                name = stock_data.get('name', stock.info.get('longName', f'Stock {ticker_upper}')) if stock_data else stock.info.get('longName', f'Stock {ticker_upper}')
-                
-                cache_data['us_stocks'][ticker_upper] = {
-                    "name": name,
-                    "current_price": round(current_price, 2),
-                    "previous_close": round(previous_close, 2),
-                    "currency": "USD",
-                    "timestamp": datetime.now().isoformat() + 'Z'
-                }
-            
-            # 캐시 파일에 저장
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-            
-            logger.info(f"✅ 캐시 저장: {ticker}")
-        except Exception as e:
-            logger.warning(f"⚠️ Cache save error: {str(e)}")
-        
-        return {
-            "ticker": ticker,
-            "name": cache_data.get('korean_stocks', {}).get(ticker, {}).get('name', '') or cache_data.get('us_stocks', {}).get(ticker_upper, {}).get('name', f'Stock {ticker}'),
-            "price": int(current_price) if is_korean_stock else round(current_price, 2),
-            "previous_close": int(previous_close) if is_korean_stock else round(previous_close, 2),
-            "currency": "KRW" if is_korean_stock else "USD",
-            "source": "Yahoo Finance (Updated)"
-        }
+        return quote
     
     except Exception as e:
         logger.error(f"❌ API 오류: {str(e)}")
         traceback.print_exc()
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+
+# -----------------------
+# Live Quotes (WebSocket / SSE)
+# -----------------------
+def _parse_ticker_list(raw: str) -> list:
+    return [t for t in (raw or "").split(",") if t.strip()]
+
+
+@app.websocket("/api/ws/quotes")
+async def quotes_websocket(websocket: WebSocket):
+    """
+    실시간 시세 구독 (WebSocket)
+    
+    - 접속: /api/ws/quotes?tickers=005930,AAPL
+    - 구독 변경: {"action": "subscribe" | "unsubscribe", "tickers": [...]}
+    - 수신: {"type": "quote", "ticker", "name", "price", "previous_close", "currency", "source", "ts"}
+      (가격이 바뀐 경우에만 전송)
+    """
+    await websocket.accept()
+    initial = _parse_ticker_list(websocket.query_params.get("tickers", ""))
+    _record_access(initial)
+    sub = quote_hub.subscribe(initial)
+    
+    async def sender():
+        while True:
+            message = await sub.queue.get()
+            await websocket.send_json(message)
+    
+    send_task = asyncio.create_task(sender())
+    try:
+        while True:
+            command = await websocket.receive_json()
+            tickers = command.get("tickers", [])
+            if isinstance(tickers, str):
+                tickers = _parse_ticker_list(tickers)
+            if command.get("action") == "unsubscribe":
+                quote_hub.update(sub, remove=tickers)
+            else:
+                _record_access(tickers)
+                quote_hub.update(sub, add=tickers)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"⚠️ 시세 WebSocket 종료: {e}")
+    finally:
+        send_task.cancel()
+        quote_hub.unsubscribe(sub)
+
+
+@app.get("/api/quotes/stream")
+async def quotes_stream(request: Request, tickers: str):
+    """
+    실시간 시세 구독 (SSE) - WebSocket을 쓸 수 없는 환경용
+    
+    - /api/quotes/stream?tickers=005930,AAPL
+    - 이벤트: quote (가격 변경 시), 15초마다 keep-alive 주석
+    """
+    ticker_list = _parse_ticker_list(tickers)
+    _record_access(ticker_list)
+    sub = quote_hub.subscribe(ticker_list)
+    
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(sub.queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: quote\ndata: {json.dumps(message, ensure_ascii=False)}\n\n"
+        finally:
+            quote_hub.unsubscribe(sub)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _chart_entry(ticker: str):
+    """차트 페이로드 + 본문 ETag 생성 후 메모 (요청 경로 / 캐시 예열 공용)"""
+    version = data_version.current_version()
+    payload = chart_service.build_chart_payload(ticker)
+    entry = (payload, http_cache.content_etag(response_encoding.dumps_json(payload)))
+    chart_memo.set(ticker, version, entry)
+    return entry
+
+
+# 차트 응답 포맷 (?format= 또는 Accept 헤더로 협상)
+CHART_MEDIA_TYPES = {
+    "json": "application/json",
+    "columnar": "application/json",
+    "binary": "application/octet-stream",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def _negotiate_chart_format(request: Request) -> str:
+    fmt = request.query_params.get("format", "").lower()
+    if fmt:
+        return fmt
+    accept = request.headers.get("accept", "")
+    if CHART_MEDIA_TYPES["arrow"] in accept:
+        return "arrow"
+    if CHART_MEDIA_TYPES["binary"] in accept:
+        return "binary"
+    return "json"
+
+
 @app.get("/api/chart/{ticker}")
-async def get_chart_data(ticker: str):
+async def get_chart_data(ticker: str, request: Request, since: str = None):
     """
     차트 분석용 실제 주가 데이터 제공
     - 한국 주식: 키움 API 과거 데이터 (정확한 히스토리)
     - 미국 주식: YahooFinance 실제 히스토리 데이터
+    
+    응답 포맷 (?format= 또는 Accept):
+    - json (기본): 기존 응답 형태 그대로
+    - columnar: 날짜 경과 일수 + 반올림된 컬럼 배열
+    - binary: packed float32 (application/octet-stream)
+    - arrow: Arrow IPC stream (pyarrow 설치 시)
+    
+    ?since=YYYY-MM-DD 지정 시 그 이후 봉만 전송. gzip/br 압축은 Accept-Encoding으로 협상
     """
-    if not agent_data_provider:
-        return JSONResponse(
-            status_code=503,
-            content={"error": "Agent system not initialized"}
-        )
+    fmt = _negotiate_chart_format(request)
+    if fmt not in CHART_MEDIA_TYPES:
+        return JSONResponse(status_code=400, content={"error": f"Unknown format: {fmt}"})
+    if fmt == "arrow" and not chart_service.ARROW_AVAILABLE:
+        return JSONResponse(status_code=406, content={"error": "Arrow format unavailable (pyarrow not installed)"})
+    if since:
+        # ETag 비교(304)와 차트 조회보다 먼저 검증 - 잘못된 since는 항상 400
+        try:
+            since = date.fromisoformat(since).isoformat()
+        except ValueError:
+            return JSONResponse(status_code=400, content={"error": f"Invalid since: {since}"})
     
     try:
-        import json
-        import yfinance as yf
-        from datetime import datetime, timedelta
-        
-        is_korean_stock = ticker.isdigit() and len(ticker) == 6
-        chart_data = None
-        data_source = "캐시 폴백"
-        
-        # ✅ 1단계: 한국 주식 - 키움 API 과거 데이터 조회
-        if is_korean_stock:
-            try:
-                from services.kiwoom_openapi import KiwoomOpenAPI
-                kiwoom = KiwoomOpenAPI()
-                kiwoom_data = kiwoom.get_daily_chart(ticker)
-                
-                if kiwoom_data and len(kiwoom_data) > 0:
-                    logger.info(f"✅ 키움 과거 데이터: {ticker} ({len(kiwoom_data)}일)")
-                    chart_data = kiwoom_data
-                    data_source = "키움 과거"
-            except Exception as e:
-                logger.warning(f"⚠️ 키움 API 오류 ({ticker}): {str(e)[:50]}")
-        
-        # ✅ 2단계: 미국 주식 - YahooFinance 조회
-        if not chart_data and not is_korean_stock:
-            try:
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=130)
-                
-                yf_data = yf.download(ticker, start=start_date, end=end_date, progress=False)
-                
-                if yf_data is not None and len(yf_data) > 0:
-                    logger.info(f"✅ YahooFinance: {ticker} ({len(yf_data)}일)")
-                    
-                    chart_data = []
-                    for date, row in yf_data.iterrows():
-                        chart_data.append({
-                            'date': date.strftime('%Y-%m-%d'),
-                            'open': float(row['Open']),
-                            'high': float(row['High']),
-                            'low': float(row['Low']),
-                            'close': float(row['Close']),
-                            'volume': int(row['Volume'])
-                        })
-                    data_source = "YahooFinance"
-            except Exception as e:
-                logger.warning(f"⚠️ YF 오류 ({ticker}): {str(e)[:50]}")
-        
-        # ✅ 3단계: API 실패 시 캐시 기반 폴백
-        if not chart_data:
-            logger.info(f"📌 캐시 폴백: {ticker}")
-            
-            cache_file = os.path.join(os.path.dirname(__file__), 'data', 'stock_prices_cache.json')
-            cached_price = None
-            
-            if os.path.exists(cache_file):
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    if is_korean_stock and ticker in cache_data.get('korean_stocks', {}):
-                        cached_price = cache_data['korean_stocks'][ticker]
-                    elif not is_korean_stock and ticker in cache_data.get('us_stocks', {}):
-                        cached_price = cache_data['us_stocks'][ticker]
-                except Exception as e:
-                    logger.warning(f"⚠️ Cache load error: {str(e)}")
-            
-            if not cached_price:
-                return JSONResponse(
-                    status_code=404,
-                    content={"error": f"No data for {ticker}"}
-                )
-            
-            # 현재가 기반 현실적인 데이터 생성
-            current_price = cached_price.get('current_price', 0)
-            previous_close = cached_price.get('previous_close', current_price)
-            
-            import random
-            random.seed(int(ticker) if is_korean_stock else hash(ticker) % 100)
-            
-            dates = []
-            prices = []
-            base_price = previous_close
-            
-            for i in range(120):
-                date = datetime(2026, 2, 23) - timedelta(days=120-i)
-                dates.append(date.strftime("%Y-%m-%d"))
-                
-                if i < 119:
-                    change = random.uniform(-0.025, 0.025)
-                    base_price = base_price * (1 + change)
-                else:
-                    base_price = float(current_price)
-                
-                prices.append(round(base_price, 2 if not is_korean_stock else 0))
-            
-            chart_data = [{"date": d, "close": p} for d, p in zip(dates, prices)]
-            data_source = "캐시 폴백"
-        
-        # ✅ 차트 데이터 처리
-        dates = []
-        prices = []
-        
-        for item in chart_data:
-            dates.append(item.get('date', ''))
-            prices.append(float(item.get('close', 0)))
-        
-        if not prices:
-            return JSONResponse(
-                status_code=404,
-                content={"error": f"No valid price data for {ticker}"}
-            )
-        
-        # ✅ MA 계산
-        ma5 = []
-        ma20 = []
-        ma60 = []
-        
-        for i in range(len(prices)):
-            if i >= 4:
-                ma5.append(sum(prices[i-4:i+1]) / 5)
-            else:
-                ma5.append(prices[i])
-            
-            if i >= 19:
-                ma20.append(sum(prices[i-19:i+1]) / 20)
-            else:
-                ma20.append(prices[i])
-            
-            if i >= 59:
-                ma60.append(sum(prices[i-59:i+1]) / 60)
-            else:
-                ma60.append(prices[i])
-        
-        # ✅ RSI 계산
-        gains = []
-        losses = []
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change >= 0:
-                gains.append(change)
-                losses.append(0)
+        # 실시간 조회 결과는 데이터 버전 + TTL 동안 재사용, ETag는 본문 해시
+        cached = chart_memo.get(ticker, data_version.current_version())
+        metrics.cache_result("chart_memo", hit=cached is not None)
+        if cached is None:
+            cached = await run_in_threadpool(_chart_entry, ticker)
+        payload, payload_etag = cached
+        
+        accept_encoding = request.headers.get("accept-encoding", "")
+        etag = http_cache.strong_etag(
+            payload_etag, fmt, since or "", response_encoding.negotiate_encoding(accept_encoding) or ""
+        )
+        headers = {
+            "X-Chart-Format": fmt,
+            "Vary": "Accept, Accept-Encoding",
+            "ETag": etag,
+            "Cache-Control": http_cache.cache_control(HTTP_CACHE_MAX_AGE, s_maxage=CHART_CACHE_TTL)
+        }
+        if http_cache.etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
+        if since:
+            payload = chart_service.slice_since(payload, since)
+        
+        with profiling.phase("chart.encode"):
+            if fmt == "binary":
+                body = chart_service.to_packed_binary(payload)
+            elif fmt == "arrow":
+                body = chart_service.to_arrow_ipc(payload)
+            elif fmt == "columnar":
+                body = response_encoding.dumps_json(chart_service.to_columnar(payload))
             else:
-                gains.append(0)
-                losses.append(-change)
-        
-        avg_gain = sum(gains[-14:]) / 14 if len(gains) >= 14 else 50
-        avg_loss = sum(losses[-14:]) / 14 if len(losses) >= 14 else 50
-        rs = avg_gain / avg_loss if avg_loss != 0 else 1
-        rsi = 100 - (100 / (1 + rs))
+                body = response_encoding.dumps_json(payload)
         
-        # ✅ 지지선/저항선
-        support = min(prices[-20:]) if len(prices) >= 20 else min(prices)
-        resistance = max(prices[-20:]) if len(prices) >= 20 else max(prices)
+        with profiling.phase("compress"):
+            body, content_encoding = response_encoding.compress(body, accept_encoding)
+        if content_encoding:
+            headers["Content-Encoding"] = content_encoding
         
-        # ✅ 주식 정보 조회
-        stock_name = f'Stock {ticker}'
-        currency = 'KRW' if is_korean_stock else 'USD'
-        
-        cache_file = os.path.join(os.path.dirname(__file__), 'data', 'stock_prices_cache.json')
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                if is_korean_stock and ticker in cache_data.get('korean_stocks', {}):
-                    stock_info = cache_data['korean_stocks'][ticker]
-                    stock_name = stock_info.get('name', stock_name)
-                    currency = stock_info.get('currency', 'KRW')
-                elif not is_korean_stock and ticker in cache_data.get('us_stocks', {}):
-                    stock_info = cache_data['us_stocks'][ticker]
-                    stock_name = stock_info.get('name', stock_name)
-                    currency = stock_info.get('currency', 'USD')
-            except:
-                pass
-        
-        # ✅ 신호 생성
-        previous_close_val = prices[-2] if len(prices) > 1 else prices[-1]
-        macd_signal = "매수" if prices[-1] > previous_close_val else "매도"
-        short_trend = "상승" if prices[-1] > (prices[-5] if len(prices) >= 5 else prices[0]) else "하락"
-        mid_trend = "상승" if prices[-1] > (prices[-20] if len(prices) >= 20 else prices[0]) else "하락"
-        
-        return {
-            "ticker": ticker,
-            "name": stock_name,
-            "currency": currency,
-            "dates": dates,
-            "prices": prices,
-            "ma5": ma5,
-            "ma20": ma20,
-            "ma60": ma60,
-            "indicators": {
-                "current_price": prices[-1] if prices else 0,
-                "ma20": ma20[-1] if ma20 else prices[-1] if prices else 0,
-                "ma60": ma60[-1] if ma60 else prices[-1] if prices else 0,
-                "rsi": round(rsi, 2),
-                "macd": macd_signal,
-                "short_trend": short_trend,
-                "mid_trend": mid_trend,
-                "support": round(support, 2),
-                "resistance": round(resistance, 2),
-                "patterns": []
-            },
-            "signal": "BUY" if prices[-1] > previous_close_val else "HOLD",
-            "summary": f"{stock_name} - 현재: {int(prices[-1]) if is_korean_stock else round(prices[-1], 2)} {currency} (데이터: {data_source})"
-        }
+        return Response(content=body, media_type=CHART_MEDIA_TYPES[fmt], headers=headers)
     
+    except chart_service.ChartDataNotFound as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
     except Exception as e:
         logger.error(f"❌ 차트 API 오류: {str(e)}")
         traceback.print_exc()
@@ -1226,7 +1581,7 @@ async def health_check():
 
 @app.get("/health")
 def health():
-    agent_status = "ok" if agent_orchestrator and agent_data_provider else "unavailable"
+    agent_status = {"ready": "ok", "failed": "unavailable"}.get(overall_state(WARMUP_SERVICES), "warming")
     
     return {
         "status": "ok",
@@ -1240,7 +1595,7 @@ def health():
 # Catch-all HTML Route (MUST BE LAST)
 # -----------------------
 @app.get("/{filename}")
-def serve_html(filename: str):
+def serve_html(filename: str, request: Request):
     """정적 파일 제공 (HTML, CSS, JS, JSON)"""
     # API 라우트는 이미 처리됨
     if filename.startswith("api/"):
@@ -1256,10 +1611,9 @@ def serve_html(filename: str):
     else:
         filepath = os.path.join(WEB_DIR, filename)
     
-    if os.path.exists(filepath):
-        return FileResponse(filepath)
-    
-    return JSONResponse(status_code=404, content={"error": f"{filename} not found"})
+    return _static_file(request, filepath) or JSONResponse(
+        status_code=404, content={"error": f"{filename} not found"}
+    )
 
 
 if __name__ == "__main__":
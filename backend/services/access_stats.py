@@ -0,0 +1,238 @@
+"""
+조회 빈도 집계 (종목 / 엔드포인트 / 섹터) - 캐시 예열과 장중 선제 갱신 대상 선정
+
+종류(kind)별로 지수 감쇠 top-K 카운터(반감기 ACCESS_HALF_LIFE_SECONDS)를 유지.
+키 수가 ACCESS_TOP_K를 넘으면 점수가 가장 낮은 키를 내보내므로 임의 종목 코드가 쏟아져도 메모리 일정.
+워커 프로세스마다 집계해 data/access_stats/<host-pid>.json에 주기적으로 기록하고,
+조회 시 모든 파일을 합산 (재배포 직후에도 이전 프로세스 기록으로 상위 종목을 알 수 있음)
+
+    access_stats.record("005930")                       # 종목 조회 1회
+    access_stats.count("endpoint", "GET /api/chart/{ticker}")
+    access_stats.hot_tickers("KR", limit=20)            # 예열 / 선제 갱신 대상
+    access_stats.top("endpoint", limit=10)              # [(키, 점수), ...]
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from services.leader_election import process_id
+from services.market_calendar import market_of
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ACCESS_STATS_DIR = os.getenv("ACCESS_STATS_DIR", os.path.join(BASE_DIR, "data", "access_stats"))
+
+ACCESS_HALF_LIFE_SECONDS = float(os.getenv("ACCESS_HALF_LIFE_SECONDS", "3600"))
+ACCESS_FLUSH_SECONDS = float(os.getenv("ACCESS_FLUSH_SECONDS", "30"))
+ACCESS_TOP_K = int(os.getenv("ACCESS_TOP_K", "500"))  # 종류별 최대 키 수
+
+KINDS = ("ticker", "endpoint", "sector")
+
+# 이 점수 아래로 감쇠한 키는 기록에서 제외
+_MIN_SCORE = 0.01
+
+# 기준 시각 이후 이만큼 반감기가 지나면 점수를 다시 정규화 (float 범위 유지)
+_RESCALE_HALF_LIVES = 64
+
+
+def _decay(score: float, since: float, now: float) -> float:
+    return score * math.pow(0.5, (now - since) / ACCESS_HALF_LIFE_SECONDS)
+
+
+class DecayingTopK:
+    """
+    지수 감쇠 top-K 카운터 (Space-Saving)
+
+    점수는 기준 시각(landmark) 값으로 저장 - 새 조회일수록 큰 가중치(2^(경과/반감기))를 더하므로
+    키 간 순서가 시간이 지나도 바뀌지 않고 매번 모든 키를 감쇠시킬 필요가 없음.
+    가득 차면 최저 점수 키를 내보내고 새 키가 그 점수를 물려받음 (상위 키는 과소평가되지 않음)
+    """
+
+    def __init__(self, capacity: int = ACCESS_TOP_K, half_life: float = ACCESS_HALF_LIFE_SECONDS):
+        self.capacity = capacity
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        self._landmark = time.time()
+        self._scores: Dict[str, float] = {}
+
+    def _scale(self, now: float) -> float:
+        return math.pow(2.0, (now - self._landmark) / self.half_life)
+
+    def add(self, key: str, weight: float = 1.0, now: Optional[float] = None):
+        now = now or time.time()
+        with self._lock:
+            if (now - self._landmark) / self.half_life > _RESCALE_HALF_LIVES:
+                factor = 1.0 / self._scale(now)
+                self._scores = {k: s * factor for k, s in self._scores.items()}
+                self._landmark = now
+
+            base = self._scores.get(key)
+            if base is None:
+                base = 0.0
+                if len(self._scores) >= self.capacity:
+                    evicted = min(self._scores, key=self._scores.get)
+                    base = self._scores.pop(evicted)
+            self._scores[key] = base + weight * self._scale(now)
+
+    def scores(self, now: Optional[float] = None) -> Dict[str, float]:
+        """현재 시각 기준 점수"""
+        now = now or time.time()
+        with self._lock:
+            factor = 1.0 / self._scale(now)
+            return {k: s * factor for k, s in self._scores.items()}
+
+    def prune(self, now: Optional[float] = None):
+        """_MIN_SCORE 아래로 감쇠한 키 제거"""
+        now = now or time.time()
+        with self._lock:
+            threshold = _MIN_SCORE * self._scale(now)
+            self._scores = {k: s for k, s in self._scores.items() if s >= threshold}
+
+
+_counters: Dict[str, DecayingTopK] = {kind: DecayingTopK() for kind in KINDS}
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+
+
+def _own_file() -> str:
+    return os.path.join(ACCESS_STATS_DIR, process_id().replace(":", "-") + ".json")
+
+
+def count(kind: str, key: str, weight: float = 1.0):
+    """
+    조회 1회 기록 (ACCESS_FLUSH_SECONDS마다 파일로 내보냄)
+
+    Args:
+        kind: 'ticker' / 'endpoint' / 'sector'
+        key: 종목 코드, 라우트 경로 등
+        weight: 가중치
+    """
+    if not key:
+        return
+    _counters[kind].add(key, weight)
+    if time.time() - _last_flush >= ACCESS_FLUSH_SECONDS and not _flush_lock.locked():
+        flush_in_background()
+
+
+def record(ticker: str, weight: float = 1.0):
+    """종목 조회 1회 기록"""
+    count("ticker", ticker.strip().upper(), weight)
+
+
+def snapshot(kind: str = "ticker", now: Optional[float] = None) -> Dict[str, float]:
+    """이 프로세스의 현재 점수 (감쇠 반영)"""
+    return _counters[kind].scores(now)
+
+
+def flush():
+    """이 프로세스 점수를 공유 디렉토리에 기록 (원자적 교체)"""
+    global _last_flush
+
+    if not _flush_lock.acquire(blocking=False):
+        return  # 다른 스레드가 기록 중
+    try:
+        now = time.time()
+        _last_flush = now
+        counters = {}
+        for kind, counter in _counters.items():
+            counter.prune(now)
+            counters[kind] = {k: round(s, 4) for k, s in counter.scores(now).items()}
+
+        os.makedirs(ACCESS_STATS_DIR, exist_ok=True)
+        path = _own_file()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"at": now, "counters": counters}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ 조회 통계 저장 실패: {e}")
+    finally:
+        _flush_lock.release()
+
+
+def flush_in_background():
+    """flush를 별도 스레드에서 실행 (요청 처리 중인 이벤트 루프에서 파일 쓰기를 하지 않음)"""
+    global _last_flush
+
+    _last_flush = time.time()  # 기록이 끝나기 전 다음 조회가 스레드를 또 띄우지 않도록
+    threading.Thread(target=flush, name="access-stats-flush", daemon=True).start()
+
+
+def _peer_files(now: float) -> List[Dict]:
+    """다른 워커가 기록한 점수 파일 (반감기 10배 이상 지난 파일은 삭제)"""
+    own = _own_file()
+    peers = []
+
+    if os.path.isdir(ACCESS_STATS_DIR):
+        for name in os.listdir(ACCESS_STATS_DIR):
+            path = os.path.join(ACCESS_STATS_DIR, name)
+            if not name.endswith(".json") or path == own:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if now - data.get("at", 0) > ACCESS_HALF_LIFE_SECONDS * 10:
+                try:
+                    os.remove(path)  # 종료된 워커
+                except OSError:
+                    pass
+                continue
+            peers.append(data)
+
+    return peers
+
+
+def merged_scores(kind: str = "ticker", now: Optional[float] = None,
+                  peers: Optional[List[Dict]] = None) -> Dict[str, float]:
+    """
+    모든 워커 점수 합계 (오래된 파일은 감쇠로 자연히 작아짐)
+
+    Args:
+        peers: 이미 읽은 _peer_files() 결과 (여러 종류를 합산할 때 파일을 한 번만 읽도록)
+    """
+    now = now or time.time()
+    if peers is None:
+        peers = _peer_files(now)
+    totals = snapshot(kind, now)
+
+    for data in peers:
+        for key, score in data.get("counters", {}).get(kind, {}).items():
+            totals[key] = totals.get(key, 0.0) + _decay(score, data["at"], now)
+
+    return totals
+
+
+def top(kind: str = "ticker", limit: int = 20, now: Optional[float] = None,
+        peers: Optional[List[Dict]] = None) -> List[Tuple[str, float]]:
+    """모든 워커 합산 상위 키 [(키, 점수), ...] (점수 내림차순)"""
+    scores = merged_scores(kind, now, peers)
+    ranked = sorted(((k, s) for k, s in scores.items() if s >= _MIN_SCORE), key=lambda x: x[1], reverse=True)
+    return [(k, round(s, 2)) for k, s in ranked[:limit]]
+
+
+def hot_tickers(market: Optional[str] = None, limit: int = 20) -> List[str]:
+    """
+    최근 조회가 많은 종목 (점수 내림차순)
+
+    Args:
+        market: 'KR' / 'US' (None이면 전체)
+        limit: 최대 개수
+    """
+    scores = merged_scores("ticker")
+    ranked = sorted(
+        (t for t, s in scores.items() if s >= _MIN_SCORE and (market is None or market_of(t) == market)),
+        key=lambda t: scores[t], reverse=True
+    )
+    return ranked[:limit]
+
+
+def status(limit: int = 10) -> Dict[str, List[Tuple[str, float]]]:
+    """종류별 상위 키 (모니터링용, 워커 파일은 한 번만 읽음)"""
+    now = time.time()
+    peers = _peer_files(now)
+    return {kind: top(kind, limit, now, peers) for kind in KINDS}
@@ -3,7 +3,7 @@ Agent Data Provider
 AI Agent를 위한 데이터 수집 및 가공 서비스
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 from datetime import datetime, timedelta
 import json
 import os
@@ -14,6 +14,40 @@ try:
 except ImportError:
     from .us_stock_service import USStockService
 
+# 분석 1회 동안 같은 업스트림 조회는 한 번만 (server_v2 Agent 라우트가 fetch_scope()를 엶)
+try:
+    from services.fetch_context import current as fetch_context, scoped
+except ImportError:
+    from .fetch_context import current as fetch_context, scoped
+
+# 사전 계산 피처 (stock_features) - DB 미설정 환경에서는 사용 안 함
+try:
+    from services import feature_store
+except ImportError:
+    feature_store = None
+
+# 일봉 조회가 필요한 필드 (이 필드를 요청하지 않으면 3개월 일봉 조회 생략)
+PRICE_FIELDS = frozenset({
+    'current_price', 'support_levels', 'resistance_levels',
+    'ma20', 'ma60', 'atr_20d', 'volatility',
+})
+
+# 호출 경로별 필드 (get_stocks_data(tickers, fields=...))
+SCREENER_FIELDS = frozenset({
+    'ticker', 'name', 'sector', 'currency',
+    'flow_score', 'cycle_fit', 'quality_score', 'governance_score', 'narrative_score',
+    'risk_score', 'time_fit', 'value_score', 'momentum_quality',
+    'gap_up_with_distribution', 'single_rumor', 'late_theme', 'no_structure', 'retail_dominance',
+})
+TRADE_PLAN_FIELDS = SCREENER_FIELDS | PRICE_FIELDS
+
+
+def _project(data: Optional[Dict[str, Any]], fields: Optional[frozenset]) -> Optional[Dict[str, Any]]:
+    """요청 필드만 남김 (ticker는 항상 포함)"""
+    if data is None or fields is None:
+        return data
+    return {k: v for k, v in data.items() if k == 'ticker' or k in fields}
+
 
 class AgentDataProvider:
     """Agent를 위한 데이터 제공자"""
@@ -90,25 +124,45 @@ class AgentDataProvider:
         
         return sectors_data
     
-    def get_stocks_data(self, tickers: List[str]) -> List[Dict[str, Any]]:
+    @scoped
+    def get_stocks_data(self, tickers: List[str],
+                        fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
         """
         종목 데이터 수집
         
         Args:
             tickers: 종목 코드 리스트
+            fields: 필요한 필드 (None이면 전체) - 요청하지 않은 필드의 외부 조회는 생략
+                (예: SCREENER_FIELDS는 일봉 조회 없이 종목명만 조회)
             
         Returns:
-            Stock Screener에 필요한 종목 데이터 리스트
+            Stock Screener에 필요한 종목 데이터 리스트 (fields 지정 시 ticker + 요청 필드만)
         """
+        fields = None if fields is None else frozenset(fields)
         stocks_data = []
+        features = self._get_precomputed_features(tickers)
         
         for ticker in tickers:
-            stock_data = self._get_stock_data(ticker)
+            if ticker in features:
+                stock_data = self._get_stock_data_from_features(ticker, features[ticker])
+            else:
+                stock_data = self._get_stock_data(ticker, fields)
+            stock_data = _project(stock_data, fields)
             if stock_data:
                 stocks_data.append(stock_data)
         
         return stocks_data
     
+    def _get_precomputed_features(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """일봉 갱신 후 계산해 둔 피처 조회 (실패 시 빈 dict → 실시간 조회)"""
+        if feature_store is None:
+            return {}
+        try:
+            return feature_store.get_features(tickers)
+        except Exception as e:
+            print(f"⚠️ Precomputed features unavailable: {e}")
+            return {}
+    
     def _get_sector_data(self, sector: str) -> Optional[Dict[str, Any]]:
         """섹터 데이터 생성"""
         # TODO: 실제 데이터 수집 로직 구현
@@ -186,7 +240,7 @@ class AgentDataProvider:
             **config
         }
     
-    def _get_stock_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def _get_stock_data(self, ticker: str, fields: Optional[frozenset] = None) -> Optional[Dict[str, Any]]:
         """종목 데이터 생성"""
         # 한국 주식 감지 (6자리 숫자)
         is_korean_stock = ticker and ticker.isdigit() and len(ticker) == 6
@@ -199,10 +253,10 @@ class AgentDataProvider:
             try:
                 if is_korean_stock:
                     # 한국 주식: Yahoo Finance (.KS)
-                    return self._get_kr_stock_data_real(ticker)
+                    return self._get_kr_stock_data_real(ticker, fields)
                 else:
                     # 미국 주식: Yahoo Finance
-                    return self._get_us_stock_data_real(ticker)
+                    return self._get_us_stock_data_real(ticker, fields)
             except Exception as e:
                 print(f"⚠️ Failed to fetch real data for {ticker}: {e}")
                 print("   Falling back to mock data...")
@@ -210,44 +264,10 @@ class AgentDataProvider:
         # Mock 데이터 사용 (실패 시)
         return self._get_stock_data_mock(ticker)
     
-    def _get_us_stock_data_real(self, ticker: str) -> Dict[str, Any]:
-        """미국 주식 실제 데이터 조회 (Yahoo Finance)"""
-        # 일봉 데이터 가져오기 (전일 종가용)
-        daily_data = self.us_stock_service.get_daily_data(ticker, period="3mo")
-        
-        if not daily_data or len(daily_data) == 0:
-            raise Exception(f"No data available for {ticker}")
-        
-        # 전일 종가 = 일봉 데이터의 마지막 close
-        last_close = daily_data[-1]['close']
-        
-        # 종목명 가져오기
-        try:
-            price_data = self.us_stock_service.get_current_price(ticker)
-            stock_name = price_data['name']
-        except:
-            stock_name = ticker
-        
-        # 기술적 지표 계산
-        closes = [d['close'] for d in daily_data[-60:]] if len(daily_data) >= 60 else []
-        ma20 = sum(closes[-20:]) / 20 if len(closes) >= 20 else last_close * 0.97
-        ma60 = sum(closes) / 60 if len(closes) >= 60 else last_close * 0.95
-        
-        # ATR 계산 (간단 버전)
-        highs = [d['high'] for d in daily_data[-20:]] if len(daily_data) >= 20 else []
-        lows = [d['low'] for d in daily_data[-20:]] if len(daily_data) >= 20 else []
-        if highs and lows:
-            ranges = [h - l for h, l in zip(highs, lows)]
-            atr_20d = sum(ranges) / len(ranges)
-        else:
-            atr_20d = last_close * 0.03
-        
-        # Volatility 계산
-        if len(closes) >= 20:
-            returns = [(closes[i] - closes[i-1]) / closes[i-1] for i in range(1, len(closes))]
-            volatility = (sum(r**2 for r in returns) / len(returns)) ** 0.5 * 100
-        else:
-            volatility = 3.0
+    def _get_us_stock_data_real(self, ticker: str, fields: Optional[frozenset] = None) -> Dict[str, Any]:
+        """미국 주식 실제 데이터 조회 (Yahoo Finance) - fields에 필요한 조회만 수행"""
+        prices = self._get_price_fields(ticker, ticker, digits=2, fields=fields)
+        stock_name = self._get_stock_name(ticker, ticker, fields)
         
         # Agent가 필요한 형식으로 변환
         return {
@@ -255,19 +275,7 @@ class AgentDataProvider:
             "name": stock_name,
             "sector": self._guess_sector(ticker),  # 섹터는 추정
             "currency": "USD",
-            "current_price": round(last_close, 2),  # 전일 종가
-            "support_levels": [
-                round(last_close * 0.97, 2),
-                round(last_close * 0.94, 2)
-            ],
-            "resistance_levels": [
-                round(last_close * 1.03, 2),
-                round(last_close * 1.06, 2)
-            ],
-            "ma20": round(ma20, 2),
-            "ma60": round(ma60, 2),
-            "atr_20d": round(atr_20d, 2),
-            "volatility": round(volatility, 1),
+            **prices,
             # 나머지는 기본값 (추후 실제 데이터로 대체 가능)
             "flow_score": 85,
             "cycle_fit": True,
@@ -290,13 +298,35 @@ class AgentDataProvider:
             "retail_dominance": 0.3
         }
     
-    def _get_kr_stock_data_real(self, ticker: str) -> Dict[str, Any]:
-        """한국 주식 실제 데이터 조회 (Yahoo Finance .KS)"""
-        # Yahoo Finance는 한국 주식에 .KS 접미사 사용
-        yahoo_ticker = f"{ticker}.KS"
+    def _get_stock_name(self, ticker: str, yahoo_ticker: str, fields: Optional[frozenset]) -> str:
+        """종목명 조회 (Yahoo Finance info 호출 - 요청 필드에 name이 없으면 생략)"""
+        if fields is not None and 'name' not in fields:
+            return ticker
+        try:
+            quote = fetch_context().fetch(
+                "yfinance.quote", yahoo_ticker, None,
+                lambda: self.us_stock_service.get_current_price(yahoo_ticker)
+            )
+            return quote['name']
+        except:
+            return ticker
+    
+    def _get_price_fields(self, ticker: str, yahoo_ticker: str, digits: int,
+                          fields: Optional[frozenset]) -> Dict[str, Any]:
+        """
+        3개월 일봉 → 가격/기술적 지표 필드 (요청 필드가 PRICE_FIELDS와 겹치지 않으면 조회 생략)
+        
+        Args:
+            digits: 가격 반올림 자릿수 (USD 2, KRW 0)
+        """
+        if fields is not None and fields.isdisjoint(PRICE_FIELDS):
+            return {}
         
         # 일봉 데이터 가져오기 (전일 종가용)
-        daily_data = self.us_stock_service.get_daily_data(yahoo_ticker, period="3mo")
+        daily_data = fetch_context().fetch(
+            "yfinance.daily", yahoo_ticker, "3mo",
+            lambda: self.us_stock_service.get_daily_data(yahoo_ticker, period="3mo")
+        )
         
         if not daily_data or len(daily_data) == 0:
             raise Exception(f"No data available for {ticker}")
@@ -304,13 +334,6 @@ class AgentDataProvider:
         # 전일 종가 = 일봉 데이터의 마지막 close
         last_close = daily_data[-1]['close']
         
-        # 종목명 가져오기
-        try:
-            price_data = self.us_stock_service.get_current_price(yahoo_ticker)
-            stock_name = price_data['name']
-        except:
-            stock_name = ticker
-        
         # 기술적 지표 계산
         closes = [d['close'] for d in daily_data[-60:]] if len(daily_data) >= 60 else []
         ma20 = sum(closes[-20:]) / 20 if len(closes) >= 20 else last_close * 0.97
@@ -332,25 +355,37 @@ class AgentDataProvider:
         else:
             volatility = 3.0
         
+        return {
+            "current_price": round(last_close, digits),  # 전일 종가
+            "support_levels": [
+                round(last_close * 0.97, digits),
+                round(last_close * 0.94, digits)
+            ],
+            "resistance_levels": [
+                round(last_close * 1.03, digits),
+                round(last_close * 1.06, digits)
+            ],
+            "ma20": round(ma20, digits),
+            "ma60": round(ma60, digits),
+            "atr_20d": round(atr_20d, digits),
+            "volatility": round(volatility, 1)
+        }
+    
+    def _get_kr_stock_data_real(self, ticker: str, fields: Optional[frozenset] = None) -> Dict[str, Any]:
+        """한국 주식 실제 데이터 조회 (Yahoo Finance .KS) - fields에 필요한 조회만 수행"""
+        # Yahoo Finance는 한국 주식에 .KS 접미사 사용
+        yahoo_ticker = f"{ticker}.KS"
+        
+        prices = self._get_price_fields(ticker, yahoo_ticker, digits=0, fields=fields)
+        stock_name = self._get_stock_name(ticker, yahoo_ticker, fields)
+        
         # Agent가 필요한 형식으로 변환 (한국 주식은 KRW)
         return {
             "ticker": ticker,
             "name": stock_name,
             "sector": self._guess_sector_kr(ticker),  # 한국 주식 섹터 추정
             "currency": "KRW",
-            "current_price": round(last_close, 0),  # 전일 종가
-            "support_levels": [
-                round(last_close * 0.97, 0),
-                round(last_close * 0.94, 0)
-            ],
-            "resistance_levels": [
-                round(last_close * 1.03, 0),
-                round(last_close * 1.06, 0)
-            ],
-            "ma20": round(ma20, 0),
-            "ma60": round(ma60, 0),
-            "atr_20d": round(atr_20d, 0),
-            "volatility": round(volatility, 1),
+            **prices,
             # 나머지는 기본값
             "flow_score": 85,
             "cycle_fit": True,
@@ -373,6 +408,44 @@ class AgentDataProvider:
             "retail_dominance": 0.3
         }
     
+    def _get_stock_data_from_features(self, ticker: str, feature: Dict[str, Any]) -> Dict[str, Any]:
+        """사전 계산 피처 → Agent 입력 형식 (외부 호출 없음)"""
+        is_korean_stock = feature["market"] == "KR"
+        
+        return {
+            "ticker": ticker,
+            "name": feature["name"] or ticker,
+            "sector": self._guess_sector_kr(ticker) if is_korean_stock else self._guess_sector(ticker),
+            "currency": "KRW" if is_korean_stock else "USD",
+            "current_price": feature["current_price"],  # 전일 종가
+            "support_levels": list(feature["support_levels"]),
+            "resistance_levels": list(feature["resistance_levels"]),
+            "ma20": feature["ma20"],
+            "ma60": feature["ma60"],
+            "atr_20d": feature["atr_20d"],
+            "volatility": feature["volatility"],
+            # 나머지는 기본값 (실시간 조회와 동일)
+            "flow_score": 85,
+            "cycle_fit": True,
+            "quality_score": 90,
+            "governance_score": 85,
+            "narrative_score": 80,
+            "risk_score": 18,
+            "time_fit": True,
+            "value_score": 70,
+            "momentum_quality": {
+                "sector_sync": True,
+                "inst_participation": True,
+                "news_type": "fundamental",
+                "group_rally": True
+            },
+            "gap_up_with_distribution": False,
+            "single_rumor": False,
+            "late_theme": False,
+            "no_structure": False,
+            "retail_dominance": 0.3
+        }
+    
     def _guess_sector(self, ticker: str) -> str:
         """티커로 섹터 추정 (간단 버전)"""
         sector_map = {
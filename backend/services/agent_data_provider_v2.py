@@ -3,7 +3,7 @@ Agent Data Provider v2 - 통합 데이터 수집 서비스
 Yahoo Finance + 네이버 크롤링 + OpenDART API 조합
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 from datetime import datetime, timedelta
 import yfinance as yf
 import os
@@ -14,17 +14,50 @@ try:
     from services.naver_stock_scraper import NaverStockScraper
     from services.market_breadth_calculator import MarketBreadthCalculator
     from services.us_stock_service import USStockService
+    from services.fetch_context import fetch_scope, scoped, current as fetch_context, slice_history, slice_list
+    from services import metrics
 except ImportError:
     from .naver_stock_scraper import NaverStockScraper
     from .market_breadth_calculator import MarketBreadthCalculator
     from .us_stock_service import USStockService
+    from .fetch_context import fetch_scope, scoped, current as fetch_context, slice_history, slice_list
+    from . import metrics
 
 # .env 로드
 load_dotenv()
 
+# get_stock_data 필드 → 필요한 업스트림 (나머지 필드는 외부 호출 없음)
+STOCK_FIELD_SOURCES = {
+    'name': 'overview',
+    'current_price': 'overview',
+    'per': 'overview',
+    'pbr': 'overview',
+    'value_score': 'overview',
+    'ma20': 'history',
+    'ma60': 'history',
+    'atr_20d': 'history',
+    'volatility': 'history',
+    'supply_demand': 'supply_demand',
+    'news_count_7d': 'news',
+    'disclosure_count': 'disclosure',
+}
+
+# 호출 경로별 필드 (get_stock_data(ticker, fields=...))
+SCREENER_FIELDS = frozenset({
+    'ticker', 'name', 'sector', 'current_price',
+    'flow_score', 'cycle_fit', 'quality_score', 'governance_score',
+    'narrative_score', 'risk_score', 'time_fit', 'value_score',
+})
+TRADE_FIELDS = frozenset({'current_price', 'atr_20d', 'volatility', 'ma20', 'ma60', 'risk_score'})
+
 
 class AgentDataProviderV2:
-    """5개 AI Agent를 위한 통합 데이터 제공자"""
+    """
+    5개 AI Agent를 위한 통합 데이터 제공자
+
+    업스트림 조회는 fetch_context로 메모 - 분석 전체를 fetch_scope()로 감싸면
+    Agent 간에 같은 종목 조회가 공유됨 (메서드 단독 호출도 호출 1회 동안은 공유)
+    """
     
     def __init__(self):
         self.naver_scraper = NaverStockScraper()
@@ -32,8 +65,49 @@ class AgentDataProviderV2:
         self.us_service = USStockService()
         self.opendart_api_key = os.getenv('OPENDART_API_KEY', '')
     
+    def fetch_scope(self):
+        """분석 1회 조회 메모 스코프 (with provider.fetch_scope() as ctx: ... ctx.stats())"""
+        return fetch_scope()
+    
+    # ========== 업스트림 조회 (요청 단위 메모) ==========
+    
+    def _history(self, ticker: str, days: int):
+        """yfinance 일봉 - 같은 종목은 가장 긴 기간 1회 조회 후 잘라서 사용"""
+        return fetch_context().fetch_window(
+            "yfinance.history", ticker, days,
+            lambda n: metrics.call("yfinance", yf.Ticker(ticker).history, period=f"{n}d"),
+            slice_history
+        )
+    
+    def _overview(self, ticker: str) -> Dict[str, Any]:
+        return fetch_context().fetch(
+            "naver.overview", ticker, (),
+            lambda: self.naver_scraper.get_stock_overview(ticker)
+        )
+    
+    def _supply_demand(self, ticker: str, days: int) -> Dict[str, Any]:
+        return fetch_context().fetch_window(
+            "naver.supply_demand", ticker, days,
+            lambda n: self.naver_scraper.get_supply_demand(ticker, days=n),
+            lambda supply, n: {**supply, 'period': n, 'data': supply.get('data', [])[:n]}
+        )
+    
+    def _news(self, ticker: str, limit: int) -> List[Dict[str, Any]]:
+        return fetch_context().fetch_window(
+            "naver.news", ticker, limit,
+            lambda n: self.naver_scraper.get_news(ticker, limit=n),
+            slice_list
+        )
+    
+    def _disclosure(self, ticker: str, days: int) -> List[Dict[str, Any]]:
+        return fetch_context().fetch(
+            "naver.disclosure", ticker, days,
+            lambda: self.naver_scraper.get_disclosure(ticker, days=days)
+        )
+    
     # ========== Market Regime Analyst용 데이터 ==========
     
+    @scoped
     def get_market_data(self) -> Dict[str, Any]:
         """
         Market Regime Analyst에 필요한 시장 데이터
@@ -60,9 +134,9 @@ class AgentDataProviderV2:
         
         try:
             # Yahoo Finance 데이터
-            vix = yf.Ticker("^VIX").history(period="1d")['Close'].iloc[-1]
-            kospi = yf.Ticker("^KS11").history(period="100d")
-            sp500 = yf.Ticker("^GSPC").history(period="100d")
+            vix = self._history("^VIX", 1)['Close'].iloc[-1]
+            kospi = self._history("^KS11", 100)
+            sp500 = self._history("^GSPC", 100)
             
             market_data['vix'] = round(vix, 2)
             
@@ -87,14 +161,16 @@ class AgentDataProviderV2:
             market_data['sp500_vs_ma60'] = round(sp500_price / sp500_ma60, 3)
             
             # 시장 폭
-            breadth = self.breadth_calc.calculate_kospi_breadth()
+            breadth = fetch_context().fetch(
+                "breadth", "KOSPI", (), self.breadth_calc.calculate_kospi_breadth
+            )
             market_data['kospi_advancers'] = breadth['advancers']
             market_data['kospi_decliners'] = breadth['decliners']
             market_data['breadth_ratio'] = breadth['breadth_ratio']
             
             # 환율 (선택)
             try:
-                usdkrw = yf.Ticker("USDKRW=X").history(period="1d")['Close'].iloc[-1]
+                usdkrw = self._history("USDKRW=X", 1)['Close'].iloc[-1]
                 market_data['usd_krw'] = round(usdkrw, 2)
             except:
                 market_data['usd_krw'] = None
@@ -108,6 +184,7 @@ class AgentDataProviderV2:
     
     # ========== Sector Scout용 데이터 ==========
     
+    @scoped
     def get_sectors_data(self, sectors: List[str] = None) -> List[Dict[str, Any]]:
         """
         Sector Scout에 필요한 섹터 데이터
@@ -157,7 +234,7 @@ class AgentDataProviderV2:
         for ticker in tickers:
             try:
                 # 수급 정보
-                supply = self.naver_scraper.get_supply_demand(ticker, days=5)
+                supply = self._supply_demand(ticker, days=5)
                 if supply.get('data'):
                     total_inst = sum(d['inst_net'] for d in supply['data'])
                     total_foreign = sum(d['foreign_net'] for d in supply['data'])
@@ -167,11 +244,11 @@ class AgentDataProviderV2:
                     }
                 
                 # 뉴스
-                news = self.naver_scraper.get_news(ticker, limit=5)
+                news = self._news(ticker, limit=5)
                 news_count += len(news)
                 
                 # 공시
-                disclosure = self.naver_scraper.get_disclosure(ticker, days=7)
+                disclosure = self._disclosure(ticker, days=7)
                 disclosure_count += len(disclosure)
             except:
                 pass
@@ -196,56 +273,29 @@ class AgentDataProviderV2:
     
     # ========== Stock Screener용 데이터 ==========
     
-    def get_stock_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+    @scoped
+    def get_stock_data(self, ticker: str, fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Stock Screener에 필요한 단일 종목 데이터
         
         Args:
             ticker: 종목 코드 (예: '005930')
+            fields: 필요한 필드 (None이면 전체) - 이 필드에 필요한 업스트림만 조회
+                (예: SCREENER_FIELDS는 네이버 개요 1회, 뉴스/공시/수급/일봉 생략)
         
         Returns:
-            종목 상세 데이터
+            종목 상세 데이터 (fields 지정 시 ticker + 요청 필드만)
         """
+        fields = None if fields is None else frozenset(fields)
+        sources = set(STOCK_FIELD_SOURCES.values()) if fields is None else {
+            STOCK_FIELD_SOURCES[f] for f in fields if f in STOCK_FIELD_SOURCES
+        }
+        
         try:
-            # 종목 개요 (네이버)
-            overview = self.naver_scraper.get_stock_overview(ticker)
-            
-            if not overview:
-                return None
-            
-            # 기술적 지표 (Yahoo Finance)
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="180d")
-            
-            if hist.empty:
-                return None
-            
-            # MA, ATR 계산
-            close = hist['Close']
-            ma20 = close.iloc[-20:].mean()
-            ma60 = close.iloc[-60:].mean()
-            
-            # ATR 계산
-            high = hist['High']
-            low = hist['Low']
-            tr = (high - low).max()
-            atr = tr / ma20 * 100  # 백분율
-            
-            # 수급 정보
-            supply = self.naver_scraper.get_supply_demand(ticker, days=5)
-            
-            return {
+            data = {
                 'ticker': ticker,
-                'name': overview.get('name'),
                 'sector': self._get_sector_by_ticker(ticker),
                 
-                # 가격 정보
-                'current_price': overview.get('current_price'),
-                'ma20': int(ma20),
-                'ma60': int(ma60),
-                'atr_20d': int(tr * 100),  # 원 단위
-                'volatility': round(hist['Close'].pct_change().std() * 100, 1),
-                
                 # 9요소 점수 (TODO: 실제 계산 필요)
                 'flow_score': 75,
                 'cycle_fit': True,
@@ -254,19 +304,62 @@ class AgentDataProviderV2:
                 'narrative_score': 65,
                 'risk_score': 20,
                 'time_fit': True,
-                'value_score': overview.get('per', 0) if overview.get('per', 0) > 0 else 60,
+            }
+            
+            if 'overview' in sources:
+                # 종목 개요 (네이버)
+                overview = self._overview(ticker)
                 
-                # PER/PBR
-                'per': overview.get('per', 0),
-                'pbr': overview.get('pbr', 0),
+                if not overview:
+                    return None
                 
-                # 수급
-                'supply_demand': supply,
+                data.update({
+                    'name': overview.get('name'),
+                    'current_price': overview.get('current_price'),
+                    'value_score': overview.get('per', 0) if overview.get('per', 0) > 0 else 60,
+                    
+                    # PER/PBR
+                    'per': overview.get('per', 0),
+                    'pbr': overview.get('pbr', 0),
+                })
+            
+            if 'history' in sources:
+                # 기술적 지표 (Yahoo Finance)
+                hist = self._history(ticker, 180)
                 
-                # 뉴스
-                'news_count_7d': len(self.naver_scraper.get_news(ticker, limit=20)),
-                'disclosure_count': len(self.naver_scraper.get_disclosure(ticker, days=7))
-            }
+                if hist.empty:
+                    return None
+                
+                # MA, ATR 계산
+                close = hist['Close']
+                ma20 = close.iloc[-20:].mean()
+                ma60 = close.iloc[-60:].mean()
+                
+                # ATR 계산
+                high = hist['High']
+                low = hist['Low']
+                tr = (high - low).max()
+                
+                data.update({
+                    'ma20': int(ma20),
+                    'ma60': int(ma60),
+                    'atr_20d': int(tr * 100),  # 원 단위
+                    'volatility': round(hist['Close'].pct_change().std() * 100, 1),
+                })
+            
+            # 수급
+            if 'supply_demand' in sources:
+                data['supply_demand'] = self._supply_demand(ticker, days=5)
+            
+            # 뉴스/공시
+            if 'news' in sources:
+                data['news_count_7d'] = len(self._news(ticker, limit=20))
+            if 'disclosure' in sources:
+                data['disclosure_count'] = len(self._disclosure(ticker, days=7))
+            
+            if fields is None:
+                return data
+            return {k: v for k, v in data.items() if k == 'ticker' or k in fields}
         
         except Exception as e:
             print(f"❌ Stock data fetch failed for {ticker}: {e}")
@@ -274,6 +367,7 @@ class AgentDataProviderV2:
     
     # ========== Trade Plan Builder용 데이터 ==========
     
+    @scoped
     def get_trade_data(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
         Trade Plan Builder에 필요한 거래 계획 데이터
@@ -284,13 +378,12 @@ class AgentDataProviderV2:
         Returns:
             거래 계획 관련 데이터
         """
-        stock_data = self.get_stock_data(ticker)
+        stock_data = self.get_stock_data(ticker, fields=TRADE_FIELDS)
         if not stock_data:
             return None
         
-        # 지지/저항선 (Yahoo Finance 데이터로 계산)
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period="60d")
+        # 지지/저항선 (get_stock_data가 받은 180일 일봉에서 60일만 사용)
+        hist = self._history(ticker, 60)
         
         if hist.empty:
             return None
@@ -320,6 +413,7 @@ class AgentDataProviderV2:
     
     # ========== Devil's Advocate용 데이터 ==========
     
+    @scoped
     def get_valuation_data(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
         Devil's Advocate에 필요한 밸류에이션 기준 데이터
@@ -337,7 +431,7 @@ class AgentDataProviderV2:
                 'price_gap': 1.15  # 현재가 대비 이격도
             }
         """
-        overview = self.naver_scraper.get_stock_overview(ticker)
+        overview = self._overview(ticker)
         
         if not overview:
             return None
@@ -384,40 +478,48 @@ class AgentDataProviderV2:
 if __name__ == '__main__':
     provider = AgentDataProviderV2()
     
-    print("=" * 60)
-    print("Agent Data Provider V2 테스트")
-    print("=" * 60)
-    
-    # 1. 시장 데이터
-    print("\n[1] Market Regime Analyst용 시장 데이터")
-    market = provider.get_market_data()
-    print(f"  VIX: {market.get('vix')}")
-    print(f"  코스피: {market.get('kospi')}")
-    print(f"  상승/하락 비율: {market.get('breadth_ratio')}")
-    
-    # 2. 섹터 데이터
-    print("\n[2] Sector Scout용 섹터 데이터")
-    sectors = provider.get_sectors_data(['반도체'])
-    for s in sectors:
-        print(f"  {s['sector']}: 뉴스 {s['news_count_7d']}건, 공시 {s['disclosure_count']}건")
-    
-    # 3. 종목 데이터
-    print("\n[3] Stock Screener용 종목 데이터")
-    stock = provider.get_stock_data('005930')
-    if stock:
-        print(f"  {stock['name']}: {stock['current_price']}원")
-        print(f"  PER: {stock['per']}, PBR: {stock['pbr']}")
-    
-    # 4. 거래 데이터
-    print("\n[4] Trade Plan Builder용 거래 데이터")
-    trade = provider.get_trade_data('005930')
-    if trade:
-        print(f"  현재가: {trade['current_price']}원")
-        print(f"  지지선: {trade['support_levels']}")
-        print(f"  저항선: {trade['resistance_levels']}")
-    
-    # 5. 밸류에이션 데이터
-    print("\n[5] Devil's Advocate용 밸류에이션 데이터")
-    val = provider.get_valuation_data('005930')
-    if val:
-        print(f"  PER: {val['per']} (섹터평균: {val['sector_avg_per']})")
+    # 아래 조회 전체를 분석 1회로 묶어 업스트림 호출 수 확인
+    with provider.fetch_scope() as ctx:
+        print("=" * 60)
+        print("Agent Data Provider V2 테스트")
+        print("=" * 60)
+        
+        # 1. 시장 데이터
+        print("\n[1] Market Regime Analyst용 시장 데이터")
+        market = provider.get_market_data()
+        print(f"  VIX: {market.get('vix')}")
+        print(f"  코스피: {market.get('kospi')}")
+        print(f"  상승/하락 비율: {market.get('breadth_ratio')}")
+        
+        # 2. 섹터 데이터
+        print("\n[2] Sector Scout용 섹터 데이터")
+        sectors = provider.get_sectors_data(['반도체'])
+        for s in sectors:
+            print(f"  {s['sector']}: 뉴스 {s['news_count_7d']}건, 공시 {s['disclosure_count']}건")
+        
+        # 3. 종목 데이터
+        print("\n[3] Stock Screener용 종목 데이터")
+        stock = provider.get_stock_data('005930')
+        if stock:
+            print(f"  {stock['name']}: {stock['current_price']}원")
+            print(f"  PER: {stock['per']}, PBR: {stock['pbr']}")
+        
+        # 4. 거래 데이터
+        print("\n[4] Trade Plan Builder용 거래 데이터")
+        trade = provider.get_trade_data('005930')
+        if trade:
+            print(f"  현재가: {trade['current_price']}원")
+            print(f"  지지선: {trade['support_levels']}")
+            print(f"  저항선: {trade['resistance_levels']}")
+        
+        # 5. 밸류에이션 데이터
+        print("\n[5] Devil's Advocate용 밸류에이션 데이터")
+        val = provider.get_valuation_data('005930')
+        if val:
+            print(f"  PER: {val['per']} (섹터평균: {val['sector_avg_per']})")
+        
+        # 6. 업스트림 호출 수
+        stats = ctx.stats()
+        print(f"\n[6] 업스트림 호출 {stats['upstream_calls']}회, 메모 적중 {stats['memo_hits']}회")
+        for source, counts in stats['by_source'].items():
+            print(f"  {source}: 호출 {counts['calls']}, 적중 {counts['hits']}")
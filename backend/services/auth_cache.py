@@ -0,0 +1,210 @@
+"""
+인증 fast path 캐시
+- 활성 사용자 캐시 (TTL + LRU) → 인증된 요청마다 users 조회 생략
+- 토큰 폐기 목록 (jti → 만료 시각) → 로그아웃 확인에 user_sessions 조회 생략
+- 만료 세션 정리 주기 작업
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from models.user import User
+from services import metrics
+
+USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))  # 다른 워커의 변경이 반영되는 최대 지연 (초)
+SESSION_CLEANUP_MINUTES = int(os.getenv("AUTH_SESSION_CLEANUP_MINUTES", "30"))
+REVOCATION_REFRESH_SECONDS = int(os.getenv("AUTH_REVOCATION_REFRESH_SECONDS", "60"))
+
+# 캐시에 보관하는 컬럼 (hashed_password 제외)
+_USER_FIELDS = [
+    "id", "username", "email", "full_name", "phone_number",
+    "is_active", "is_verified", "risk_profile", "account_size", "investment_period",
+    "created_at", "updated_at", "last_login",
+]
+
+
+class UserCache:
+    """활성 사용자 캐시 (TTL + LRU)"""
+
+    def __init__(self, max_entries: int = USER_CACHE_SIZE, ttl_seconds: int = USER_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, user_id: int) -> Optional[User]:
+        """
+        캐시된 사용자 조회
+
+        Returns:
+            DB 세션에 연결되지 않은 User 객체 (읽기 전용으로 사용) 또는 None
+        """
+        with self._lock:
+            item = self._items.get(user_id)
+            if item and time.time() - item[0] <= self.ttl_seconds:
+                self._items.move_to_end(user_id)
+                self._stats["hits"] += 1
+                metrics.cache_result("user", hit=True)
+                return User(**item[1])
+            if item:
+                del self._items[user_id]
+            self._stats["misses"] += 1
+        metrics.cache_result("user", hit=False)
+        return None
+
+    def put(self, user: User):
+        """활성 사용자만 저장"""
+        if not user.is_active:
+            self.invalidate(user.id)
+            return
+        fields = {name: getattr(user, name) for name in _USER_FIELDS}
+        with self._lock:
+            self._items[user.id] = (time.time(), fields)
+            self._items.move_to_end(user.id)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        """프로필 변경 / 비활성화 / 비밀번호 변경 시 호출"""
+        with self._lock:
+            self._items.pop(user_id, None)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [uid for uid, (ts, _) in self._items.items() if now - ts > self.ttl_seconds]
+            for uid in expired:
+                del self._items[uid]
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._items)}
+
+
+class RevokedTokens:
+    """폐기된 토큰 jti 목록 (토큰 만료 시각까지만 보관)"""
+
+    def __init__(self):
+        self._items: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: datetime):
+        with self._lock:
+            self._items[jti] = _to_epoch(expires_at)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        with self._lock:
+            return jti in self._items
+
+    def load(self, entries: Iterable[Tuple[str, datetime]]):
+        """
+        DB의 폐기 목록 병합 (다른 워커의 로그아웃 반영)
+
+        교체하지 않음 - 세션 행이 없거나 커밋에 실패해 메모리에만 있는 폐기가 사라지면
+        로그아웃한 토큰이 다시 유효해짐. 메모리 항목은 토큰 만료 시각에만 제거
+        """
+        loaded = {jti: _to_epoch(exp) for jti, exp in entries if jti}
+        now = time.time()
+        with self._lock:
+            items = {jti: exp for jti, exp in self._items.items() if exp >= now}
+            items.update(loaded)
+            self._items = items
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [jti for jti, exp in self._items.items() if exp < now]
+            for jti in expired:
+                del self._items[jti]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def _to_epoch(value: datetime) -> float:
+    """naive UTC datetime(JWT exp, expires_at) → epoch"""
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+# 프로세스 공용 인스턴스
+user_cache = UserCache()
+revoked_tokens = RevokedTokens()
+
+
+# ========== 주기 작업 ==========
+
+def refresh_revocations():
+    """DB에서 폐기 목록 다시 로드 (다른 워커의 로그아웃 반영)"""
+    from database import ReadSessionLocal
+    from services.user_service import SessionService
+
+    db = ReadSessionLocal()
+    try:
+        revoked_tokens.load(SessionService.get_revoked_jtis(db))
+    finally:
+        db.close()
+    revoked_tokens.purge_expired()
+
+
+def cleanup_sessions():
+    """만료 세션 삭제 + 캐시 정리"""
+    from database import SessionLocal
+    from services.user_service import SessionService
+
+    db = SessionLocal()
+    try:
+        deleted = SessionService.cleanup_expired_sessions(db)
+    finally:
+        db.close()
+
+    revoked_tokens.purge_expired()
+    user_cache.purge_expired()
+    if deleted:
+        print(f"🧹 만료 세션 {deleted}개 정리")
+
+
+def start_session_cleanup(interval_minutes: int = SESSION_CLEANUP_MINUTES,
+                          refresh_seconds: int = REVOCATION_REFRESH_SECONDS):
+    """
+    세션 정리 / 폐기 목록 동기화 주기 작업 시작 (APScheduler)
+
+    Returns:
+        BackgroundScheduler 인스턴스 (종료 시 shutdown 호출)
+    """
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    try:
+        refresh_revocations()
+    except Exception as e:
+        print(f"⚠️ 토큰 폐기 목록 로드 실패: {e}")
+
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(
+        cleanup_sessions,
+        'interval',
+        minutes=interval_minutes,
+        id='auth_session_cleanup',
+        name='만료 세션 정리',
+        replace_existing=True
+    )
+    scheduler.add_job(
+        refresh_revocations,
+        'interval',
+        seconds=refresh_seconds,
+        id='auth_revocation_refresh',
+        name='토큰 폐기 목록 동기화',
+        replace_existing=True
+    )
+    scheduler.start()
+    print(f"✅ 세션 정리 작업 시작 ({interval_minutes}분 주기)")
+    return scheduler
@@ -0,0 +1,119 @@
+"""
+인기 종목 캐시 예열 (재시작 직후 / 장 개장 직전)
+
+access_stats 상위 종목에 대해 단계(step)별 예열 함수를 실행.
+단계는 앱이 등록 - 캐시가 프로세스마다 따로 있으므로 각 워커가 자기 캐시를 예열
+
+    warmer = HotSetWarmer({
+        "quote": lambda tickers: [quote_service.get_quote(t) for t in tickers],
+        "features": feature_store.get_features,
+    })
+    warmer.start()          # 시작 직후 1회 + 시장별 개장 PREWARM_LEAD_MINUTES 전
+    warmer.status()
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from services import access_stats, market_calendar
+
+HOT_SET_SIZE = int(os.getenv("HOT_SET_SIZE", "20"))  # 시장별
+HOT_SET_WARMUP = os.getenv("HOT_SET_WARMUP", "1") == "1"
+PREWARM_LEAD_MINUTES = float(os.getenv("PREWARM_LEAD_MINUTES", "3"))
+
+
+class HotSetWarmer:
+    """상위 종목 예열 - 시작 시 1회, 이후 시장별 개장 직전마다"""
+
+    def __init__(self, steps: Dict[str, Callable[[List[str]], object]], limit: int = HOT_SET_SIZE,
+                 lead_minutes: float = PREWARM_LEAD_MINUTES):
+        self.steps = steps
+        self.limit = limit
+        self.lead = timedelta(minutes=lead_minutes)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._warmed_opens: Dict[str, datetime] = {}  # 시장 → 예열을 마친 개장 시각
+        self._runs: List[Dict] = []
+
+    def warm(self, market: Optional[str] = None, reason: str = "manual") -> Dict:
+        """
+        상위 종목 예열 1회
+
+        Args:
+            market: 'KR' / 'US' (None이면 전체 시장)
+            reason: 기록용 (startup / pre_open / manual)
+
+        Returns:
+            {"tickers": n, "steps": {단계: {"seconds", "error"}}}
+        """
+        markets = [market] if market else list(market_calendar.MARKETS)
+        tickers = [t for m in markets for t in access_stats.hot_tickers(m, self.limit)]
+        run = {"at": datetime.now().astimezone().isoformat(), "reason": reason,
+               "market": market, "tickers": len(tickers), "steps": {}}
+
+        if tickers:
+            for name, step in self.steps.items():
+                started = time.time()
+                error = None
+                try:
+                    step(tickers)
+                except Exception as e:
+                    error = str(e)
+                    print(f"⚠️ 캐시 예열 실패 ({name}): {e}")
+                run["steps"][name] = {"seconds": round(time.time() - started, 2), "error": error}
+            print(f"🔥 캐시 예열 ({reason}, {market or 'ALL'}): {len(tickers)}종목 {list(run['steps'])}")
+
+        self._runs = (self._runs + [run])[-10:]
+        return run
+
+    def _next_due(self) -> Optional[tuple]:
+        """(예열 시각, 시장, 개장 시각) - 가장 가까운 개장 기준"""
+        due = None
+        for market in market_calendar.MARKETS:
+            opens_at = market_calendar.next_open(market)
+            if opens_at is not None and self._warmed_opens.get(market) == opens_at:
+                opens_at = market_calendar.next_open(market, opens_at)
+            if opens_at is None:
+                continue
+            candidate = (opens_at - self.lead, market, opens_at)
+            if due is None or candidate[0] < due[0]:
+                due = candidate
+        return due
+
+    def _run(self):
+        self.warm(reason="startup")
+        while not self._stop.is_set():
+            due = self._next_due()
+            if due is None:
+                self._stop.wait(3600)
+                continue
+            warm_at, market, opens_at = due
+            wait = (warm_at - datetime.now(warm_at.tzinfo)).total_seconds()
+            if wait > 0:
+                # 시계 변경/절전 대비 최대 1시간 단위로 다시 계산
+                self._stop.wait(min(wait, 3600))
+                continue
+            self._warmed_opens[market] = opens_at
+            self.warm(market, reason="pre_open")
+
+    def start(self):
+        """백그라운드 예열 시작 (HOT_SET_WARMUP=0이면 수동 warm()만)"""
+        if not HOT_SET_WARMUP or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="hot-set-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> Dict:
+        due = self._next_due()
+        return {
+            "enabled": HOT_SET_WARMUP,
+            "limit": self.limit,
+            "next_pre_open": {"market": due[1], "at": due[0].isoformat()} if due else None,
+            "recent_runs": list(self._runs),
+        }
@@ -0,0 +1,230 @@
+"""
+캔들 패턴 엔진 (NumPy 벡터화)
+여러 종목의 전체 OHLC 히스토리에서 패턴을 한 번에 계산해 봉별 비트마스크로 반환
+
+    masks = detect_pattern_masks(open_, high, low, close)   # (종목, 봉) 또는 (봉,)
+    decode_mask(masks[..., -1])                             # 오늘 패턴 이름
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 비트 순서 = 반환 순서 (앞 6개는 기존 detect_candle_patterns와 동일)
+PATTERNS = [
+    'DOJI',
+    'HAMMER',
+    'INVERTED_HAMMER',
+    'SHOOTING_STAR',
+    'BULLISH_ENGULFING',
+    'BEARISH_ENGULFING',
+    'HANGING_MAN',
+    'BULLISH_HARAMI',
+    'BEARISH_HARAMI',
+    'PIERCING_LINE',
+    'DARK_CLOUD_COVER',
+    'MORNING_STAR',
+    'EVENING_STAR',
+    'THREE_WHITE_SOLDIERS',
+    'THREE_BLACK_CROWS',
+    'BULLISH_MARUBOZU',
+    'BEARISH_MARUBOZU',
+]
+
+PATTERN_BITS = {name: np.uint32(1 << i) for i, name in enumerate(PATTERNS)}
+
+# 방향성: 1=상승 신호, -1=하락 신호, 0=중립
+PATTERN_BIAS = {
+    'DOJI': 0,
+    'HAMMER': 1,
+    'INVERTED_HAMMER': 1,
+    'SHOOTING_STAR': -1,
+    'BULLISH_ENGULFING': 1,
+    'BEARISH_ENGULFING': -1,
+    'HANGING_MAN': -1,
+    'BULLISH_HARAMI': 1,
+    'BEARISH_HARAMI': -1,
+    'PIERCING_LINE': 1,
+    'DARK_CLOUD_COVER': -1,
+    'MORNING_STAR': 1,
+    'EVENING_STAR': -1,
+    'THREE_WHITE_SOLDIERS': 1,
+    'THREE_BLACK_CROWS': -1,
+    'BULLISH_MARUBOZU': 1,
+    'BEARISH_MARUBOZU': -1,
+}
+
+
+def _shift(a: np.ndarray, k: int) -> np.ndarray:
+    """마지막 축 기준 k봉 이전 값 (앞부분은 NaN → 모든 비교가 False)"""
+    out = np.full_like(a, np.nan)
+    out[..., k:] = a[..., :-k]
+    return out
+
+
+def detect_pattern_masks(open_, high, low, close) -> np.ndarray:
+    """
+    봉별 패턴 비트마스크 계산
+
+    Args:
+        open_, high, low, close: 같은 shape의 배열 (봉,) 또는 (종목, 봉)
+            - 마지막 축이 시간 순서
+            - 데이터가 없는 칸은 NaN (해당 봉은 패턴 없음)
+
+    Returns:
+        uint32 배열 (입력과 같은 shape), 비트 i = PATTERNS[i]
+    """
+    o = np.asarray(open_, dtype=np.float64)
+    h = np.asarray(high, dtype=np.float64)
+    l = np.asarray(low, dtype=np.float64)
+    c = np.asarray(close, dtype=np.float64)
+
+    with np.errstate(invalid='ignore'):
+        body = np.abs(c - o)
+        rng = h - l
+        top = np.maximum(o, c)
+        bottom = np.minimum(o, c)
+        upper_shadow = h - top
+        lower_shadow = bottom - l
+        bull = c > o
+        bear = c < o
+
+        # 직전 봉 / 2봉 전
+        o1, c1, h1, l1 = _shift(o, 1), _shift(c, 1), _shift(h, 1), _shift(l, 1)
+        o2, c2 = _shift(o, 2), _shift(c, 2)
+        body1, body2 = np.abs(c1 - o1), np.abs(c2 - o2)
+        bull1, bear1 = c1 > o1, c1 < o1
+        bull2, bear2 = c2 > o2, c2 < o2
+        mid1 = (o1 + c1) / 2
+        mid2 = (o2 + c2) / 2
+
+        # 단기 추세 (3봉 전 종가 대비)
+        rising = c1 > _shift(c, 4)
+
+        long_lower = (lower_shadow > body * 2) & (upper_shadow < body * 0.5)
+        long_upper = (upper_shadow > body * 2) & (lower_shadow < body * 0.5)
+
+        conditions = {
+            'DOJI': body < rng * 0.1,
+            'HAMMER': long_lower & bull,
+            'INVERTED_HAMMER': long_upper & bull,
+            'SHOOTING_STAR': long_upper & bear,
+            'BULLISH_ENGULFING': bear1 & bull & (c > o1) & (o < c1),
+            'BEARISH_ENGULFING': bull1 & bear & (c < o1) & (o > c1),
+            'HANGING_MAN': long_lower & bear & rising,
+            'BULLISH_HARAMI': bear1 & bull & (top < o1) & (bottom > c1),
+            'BEARISH_HARAMI': bull1 & bear & (top < c1) & (bottom > o1),
+            'PIERCING_LINE': bear1 & bull & (o < l1) & (c > mid1) & (c < o1),
+            'DARK_CLOUD_COVER': bull1 & bear & (o > h1) & (c < mid1) & (c > o1),
+            'MORNING_STAR': bear2 & (body1 < body2 * 0.3) & bull & (c > mid2),
+            'EVENING_STAR': bull2 & (body1 < body2 * 0.3) & bear & (c < mid2),
+            'THREE_WHITE_SOLDIERS': (bull & bull1 & bull2 & (c > c1) & (c1 > c2)
+                                     & (o > o1) & (o < c1) & (o1 > o2) & (o1 < c2)),
+            'THREE_BLACK_CROWS': (bear & bear1 & bear2 & (c < c1) & (c1 < c2)
+                                  & (o < o1) & (o > c1) & (o1 < o2) & (o1 > c2)),
+            'BULLISH_MARUBOZU': bull & (rng > 0) & (body >= rng * 0.95),
+            'BEARISH_MARUBOZU': bear & (rng > 0) & (body >= rng * 0.95),
+        }
+
+    masks = np.zeros(c.shape, dtype=np.uint32)
+    for name, cond in conditions.items():
+        masks |= np.where(cond, PATTERN_BITS[name], np.uint32(0))
+    return masks
+
+
+def decode_mask(mask) -> List[str]:
+    """비트마스크 1개 → 패턴 이름 목록 (PATTERNS 순서)"""
+    mask = int(mask)
+    return [name for i, name in enumerate(PATTERNS) if mask & (1 << i)]
+
+
+def pattern_bias(patterns: Sequence[str]) -> int:
+    """패턴 목록의 방향성 합계"""
+    return sum(PATTERN_BIAS.get(p, 0) for p in patterns)
+
+
+# ========== 여러 종목 일괄 처리 ==========
+
+def stack_ohlc(frames: Dict[str, pd.DataFrame], length: Optional[int] = None
+               ) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    종목별 DataFrame(open/high/low/close) → (종목, 봉) 배열
+
+    마지막 봉(오늘)을 기준으로 오른쪽 정렬, 히스토리가 짧은 종목은 앞을 NaN으로 채움
+
+    Args:
+        frames: {ticker: DataFrame} (날짜 오름차순)
+        length: 사용할 최근 봉 수 (None이면 가장 긴 히스토리)
+    """
+    tickers = [t for t, df in frames.items() if df is not None and len(df) > 0]
+    if length is None:
+        length = max((len(frames[t]) for t in tickers), default=0)
+
+    shape = (len(tickers), length)
+    arrays = {col: np.full(shape, np.nan) for col in ('open', 'high', 'low', 'close')}
+
+    for row, ticker in enumerate(tickers):
+        df = frames[ticker].tail(length)
+        n = len(df)
+        for col, arr in arrays.items():
+            arr[row, length - n:] = df[col].to_numpy(dtype=np.float64)
+
+    return tickers, arrays['open'], arrays['high'], arrays['low'], arrays['close']
+
+
+def scan_latest(frames: Dict[str, pd.DataFrame], lookback: int = 5) -> Dict[str, List[str]]:
+    """
+    전체 종목의 오늘 패턴 (한 번의 벡터 연산)
+
+    Args:
+        lookback: 패턴 계산에 필요한 최근 봉 수 (3봉 패턴 + 추세 확인 = 5)
+
+    Returns:
+        {ticker: ['HAMMER', ...]} - 패턴이 있는 종목만
+    """
+    tickers, o, h, l, c = stack_ohlc(frames, length=lookback)
+    if not tickers:
+        return {}
+    latest = detect_pattern_masks(o, h, l, c)[:, -1]
+    return {
+        ticker: decode_mask(mask)
+        for ticker, mask in zip(tickers, latest) if mask
+    }
+
+
+def pattern_hit_rates(masks: np.ndarray, close: np.ndarray, horizon: int = 5) -> Dict[str, Dict]:
+    """
+    패턴 적중률 백테스트
+
+    패턴 발생 봉 종가 대비 horizon봉 후 수익률로 평가.
+    상승 패턴은 수익률 > 0, 하락 패턴은 < 0이면 적중 (중립 패턴은 적중률 없음)
+
+    Args:
+        masks: detect_pattern_masks 결과
+        close: 같은 shape의 종가 배열
+        horizon: 평가 기간 (봉)
+
+    Returns:
+        {pattern: {'count', 'hit_rate', 'avg_return'}} - 발생한 패턴만
+    """
+    close = np.asarray(close, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        forward = np.full_like(close, np.nan)
+        forward[..., :-horizon] = close[..., horizon:] / close[..., :-horizon] - 1
+
+    valid = ~np.isnan(forward)
+    results = {}
+    for name in PATTERNS:
+        hit_mask = ((masks & PATTERN_BITS[name]) != 0) & valid
+        count = int(hit_mask.sum())
+        if count == 0:
+            continue
+        returns = forward[hit_mask]
+        bias = PATTERN_BIAS[name]
+        results[name] = {
+            'count': count,
+            'hit_rate': round(float(np.mean(returns * bias > 0)), 4) if bias else None,
+            'avg_return': round(float(returns.mean()), 6),
+        }
+    return results
@@ -0,0 +1,342 @@
+"""
+차트 데이터 서비스
+/api/chart 응답 생성 + 압축 포맷 변환 (columnar JSON / packed float32 / Arrow IPC)
+"""
+
+import json
+import logging
+import random
+import struct
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from services import metrics, profiling, quote_service
+from services.provider_router import Provider, ProviderRouter
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ARROW_AVAILABLE = False
+
+logger = logging.getLogger("stock_radar")
+
+# 가격 시계열 컬럼 (packed/Arrow 포맷에 이 순서로 기록)
+SERIES_COLUMNS = ["prices", "ma5", "ma20", "ma60"]
+
+# packed float32 포맷 식별자
+BINARY_MAGIC = b"SRCH"
+BINARY_VERSION = 1
+
+
+class ChartDataNotFound(Exception):
+    """조회 가능한 차트 데이터 없음 (404)"""
+
+
+# ========== 데이터 수집 ==========
+
+def _kiwoom_bars(ticker: str) -> Optional[List[Dict[str, Any]]]:
+    """키움 일봉"""
+    return quote_service.get_kiwoom_client().get_daily_chart(ticker)
+
+
+def _yahoo_bars(ticker: str) -> Optional[List[Dict[str, Any]]]:
+    """YahooFinance 최근 130일 일봉 (한국 종목은 .KS)"""
+    import yfinance as yf
+
+    symbol = f"{ticker}.KS" if quote_service.is_korean_ticker(ticker) else ticker
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=130)
+
+    yf_data = metrics.call("yfinance", yf.download, symbol, start=start_date, end=end_date, progress=False)
+    if yf_data is None or len(yf_data) == 0:
+        return None
+
+    bars = []
+    for bar_date, row in yf_data.iterrows():
+        bars.append({
+            'date': bar_date.strftime('%Y-%m-%d'),
+            'open': float(row['Open']),
+            'high': float(row['High']),
+            'low': float(row['Low']),
+            'close': float(row['Close']),
+            'volume': int(row['Volume'])
+        })
+    return bars
+
+
+# 한국: 키움 → YahooFinance(.KS), 미국: YahooFinance - 순서는 공급자 상태에 따라 바뀜
+_CHART_ROUTERS = {
+    "KR": ProviderRouter("kr_chart", [
+        Provider("kiwoom", _kiwoom_bars, available=quote_service.kiwoom_available),
+        Provider("yfinance", _yahoo_bars, empty_is_error=False),
+    ]),
+    "US": ProviderRouter("us_chart", [
+        Provider("yfinance", _yahoo_bars, empty_is_error=False),
+    ]),
+}
+
+# 공급자 → 응답 data_source 라벨
+_DATA_SOURCE_LABELS = {"kiwoom": "키움 과거", "yfinance": "YahooFinance"}
+
+
+def _fetch_bars(ticker: str, is_korean_stock: bool):
+    """
+    일봉 조회 - 한국: 키움 (실패/차단 시 YahooFinance), 미국: YahooFinance
+
+    Returns:
+        (bars, data_source) - 실패 시 (None, None)
+    """
+    provider, bars = _CHART_ROUTERS["KR" if is_korean_stock else "US"].call(ticker)
+    if bars is None:
+        logger.warning(f"⚠️ 일봉 조회 실패 ({ticker}): 사용 가능한 공급자 없음")
+        return None, None
+
+    data_source = _DATA_SOURCE_LABELS[provider]
+    logger.info(f"✅ {data_source}: {ticker} ({len(bars)}일)")
+    return bars, data_source
+
+
+def _fallback_bars(ticker: str, is_korean_stock: bool, cached_price: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """API 실패 시 캐시 현재가 기반 120일 시계열 생성"""
+    current_price = cached_price.get('current_price', 0)
+    previous_close = cached_price.get('previous_close', current_price)
+
+    rng = random.Random(int(ticker) if is_korean_stock else hash(ticker) % 100)
+
+    bars = []
+    base_price = previous_close
+    for i in range(120):
+        bar_date = datetime(2026, 2, 23) - timedelta(days=120 - i)
+
+        if i < 119:
+            change = rng.uniform(-0.025, 0.025)
+            base_price = base_price * (1 + change)
+        else:
+            base_price = float(current_price)
+
+        bars.append({
+            "date": bar_date.strftime("%Y-%m-%d"),
+            "close": round(base_price, 2 if not is_korean_stock else 0)
+        })
+    return bars
+
+
+def _moving_average(prices: List[float], window: int) -> List[float]:
+    """이동평균 (기간 미달 구간은 종가 그대로)"""
+    result = []
+    for i in range(len(prices)):
+        if i >= window - 1:
+            result.append(sum(prices[i - window + 1:i + 1]) / window)
+        else:
+            result.append(prices[i])
+    return result
+
+
+def build_chart_payload(ticker: str) -> Dict[str, Any]:
+    """
+    차트 분석용 주가 데이터 + 지표 (기본 JSON 응답 형태)
+
+    Raises:
+        ChartDataNotFound: 캐시 폴백까지 모두 실패한 경우
+    """
+    is_korean_stock = quote_service.is_korean_ticker(ticker)
+    cached_price = quote_service.get_cached_entry(ticker)
+
+    with profiling.phase("chart.fetch"):
+        chart_data, data_source = _fetch_bars(ticker, is_korean_stock)
+
+    # ✅ 3단계: API 실패 시 캐시 기반 폴백
+    if not chart_data:
+        logger.info(f"📌 캐시 폴백: {ticker}")
+        if not cached_price:
+            raise ChartDataNotFound(f"No data for {ticker}")
+        chart_data = _fallback_bars(ticker, is_korean_stock, cached_price)
+        data_source = "캐시 폴백"
+
+    # ✅ 차트 데이터 처리
+    dates = [item.get('date', '') for item in chart_data]
+    prices = [float(item.get('close', 0)) for item in chart_data]
+
+    if not prices:
+        raise ChartDataNotFound(f"No valid price data for {ticker}")
+
+    with profiling.phase("chart.indicators"):
+        # ✅ MA 계산
+        ma5 = _moving_average(prices, 5)
+        ma20 = _moving_average(prices, 20)
+        ma60 = _moving_average(prices, 60)
+
+        # ✅ RSI 계산
+        gains = []
+        losses = []
+        for i in range(1, len(prices)):
+            change = prices[i] - prices[i - 1]
+            gains.append(max(change, 0))
+            losses.append(max(-change, 0))
+
+        avg_gain = sum(gains[-14:]) / 14 if len(gains) >= 14 else 50
+        avg_loss = sum(losses[-14:]) / 14 if len(losses) >= 14 else 50
+        rs = avg_gain / avg_loss if avg_loss != 0 else 1
+        rsi = 100 - (100 / (1 + rs))
+
+        # ✅ 지지선/저항선
+        support = min(prices[-20:]) if len(prices) >= 20 else min(prices)
+        resistance = max(prices[-20:]) if len(prices) >= 20 else max(prices)
+
+    # ✅ 주식 정보 (캐시)
+    stock_name = f'Stock {ticker}'
+    currency = 'KRW' if is_korean_stock else 'USD'
+    if cached_price:
+        stock_name = cached_price.get('name', stock_name)
+        currency = cached_price.get('currency', currency)
+
+    # ✅ 신호 생성
+    previous_close_val = prices[-2] if len(prices) > 1 else prices[-1]
+    macd_signal = "매수" if prices[-1] > previous_close_val else "매도"
+    short_trend = "상승" if prices[-1] > (prices[-5] if len(prices) >= 5 else prices[0]) else "하락"
+    mid_trend = "상승" if prices[-1] > (prices[-20] if len(prices) >= 20 else prices[0]) else "하락"
+
+    return {
+        "ticker": ticker,
+        "name": stock_name,
+        "currency": currency,
+        "dates": dates,
+        "prices": prices,
+        "ma5": ma5,
+        "ma20": ma20,
+        "ma60": ma60,
+        "indicators": {
+            "current_price": prices[-1],
+            "ma20": ma20[-1],
+            "ma60": ma60[-1],
+            "rsi": round(rsi, 2),
+            "macd": macd_signal,
+            "short_trend": short_trend,
+            "mid_trend": mid_trend,
+            "support": round(support, 2),
+            "resistance": round(resistance, 2),
+            "patterns": []
+        },
+        "signal": "BUY" if prices[-1] > previous_close_val else "HOLD",
+        "summary": f"{stock_name} - 현재: {int(prices[-1]) if is_korean_stock else round(prices[-1], 2)} {currency} (데이터: {data_source})"
+    }
+
+
+# ========== 증분 조회 / 포맷 변환 ==========
+
+def slice_since(payload: Dict[str, Any], since: str) -> Dict[str, Any]:
+    """
+    since(YYYY-MM-DD) 이후 봉만 남김 - 지표는 전체 기간 기준 그대로
+
+    Raises:
+        ValueError: 날짜 형식 오류
+    """
+    since_date = date.fromisoformat(since).isoformat()
+    start = len(payload["dates"])
+    for i, d in enumerate(payload["dates"]):
+        if d > since_date:
+            start = i
+            break
+
+    sliced = dict(payload)
+    sliced["dates"] = payload["dates"][start:]
+    for column in SERIES_COLUMNS:
+        sliced[column] = payload[column][start:]
+    sliced["since"] = since_date
+    return sliced
+
+
+def _date_offsets(dates: List[str]):
+    """날짜 문자열 → (기준일, 기준일로부터 경과 일수 목록)"""
+    if not dates:
+        return None, []
+    base = date.fromisoformat(dates[0])
+    return base.isoformat(), [(date.fromisoformat(d) - base).days for d in dates]
+
+
+def _meta(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """시계열을 제외한 응답 필드"""
+    return {k: v for k, v in payload.items() if k != "dates" and k not in SERIES_COLUMNS}
+
+
+def to_columnar(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    columnar JSON 포맷
+
+    - 날짜: base_date + 경과 일수(정수) 배열
+    - 가격: 표시 정밀도로 반올림 (KRW 정수, 그 외 소수 2자리)
+    """
+    base_date, offsets = _date_offsets(payload["dates"])
+    digits = 0 if payload.get("currency") == "KRW" else 2
+
+    def _round(values: List[float]):
+        if digits == 0:
+            return [int(round(v)) for v in values]
+        return [round(v, digits) for v in values]
+
+    return {
+        **_meta(payload),
+        "format": "columnar",
+        "length": len(offsets),
+        "base_date": base_date,
+        "date_offsets": offsets,
+        "columns": {column: _round(payload[column]) for column in SERIES_COLUMNS},
+    }
+
+
+def to_packed_binary(payload: Dict[str, Any]) -> bytes:
+    """
+    packed float32 바이너리 포맷 (little-endian)
+
+    레이아웃:
+        magic "SRCH"(4) | version u8 | padding(3) | header_len u32
+        | header JSON (UTF-8, 4바이트 정렬용 공백 패딩)
+        | int32[length] 날짜 경과 일수
+        | float32[length] × columns (header.columns 순서)
+
+    헤더 이후 배열이 4바이트 정렬이므로 브라우저에서
+    new Float32Array(buffer, offset, length)로 바로 읽을 수 있다.
+    """
+    base_date, offsets = _date_offsets(payload["dates"])
+    header = json.dumps({
+        **_meta(payload),
+        "format": "binary",
+        "length": len(offsets),
+        "base_date": base_date,
+        "columns": SERIES_COLUMNS,
+    }, ensure_ascii=False).encode("utf-8")
+    header += b" " * (-len(header) % 4)
+
+    parts = [BINARY_MAGIC, struct.pack("<B3xI", BINARY_VERSION, len(header)), header]
+    arrays = [array("i", offsets)] + [array("f", payload[column]) for column in SERIES_COLUMNS]
+    for values in arrays:
+        if sys.byteorder == "big":
+            values.byteswap()
+        parts.append(values.tobytes())
+    return b"".join(parts)
+
+
+def to_arrow_ipc(payload: Dict[str, Any]) -> bytes:
+    """
+    Arrow IPC stream 포맷 (pyarrow 필요)
+
+    date(date32) + float32 컬럼, 나머지 필드는 스키마 메타데이터 'meta'(JSON)
+    """
+    if not ARROW_AVAILABLE:
+        raise RuntimeError("pyarrow not installed")
+
+    columns = {"date": pa.array([date.fromisoformat(d) for d in payload["dates"]], type=pa.date32())}
+    for column in SERIES_COLUMNS:
+        columns[column] = pa.array(payload[column], type=pa.float32())
+
+    table = pa.table(columns).replace_schema_metadata({
+        "meta": json.dumps(_meta(payload), ensure_ascii=False)
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
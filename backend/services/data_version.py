@@ -0,0 +1,331 @@
+"""
+데이터 스냅샷 버전 관리
+스케줄러가 새 데이터를 게시(publish)하면 버전 ID가 바뀌고, 등록된 캐시에 무효화 알림
+
+게시마다 불변 에폭(epoch)이 하나씩 생긴다:
+    - 에폭 ID = 게시 ID, 감시 파일 사본은 data/epochs/<id>/ 에 보관
+    - 요청 처리 중에는 pinned()로 버전/에폭을 고정 → 요청 도중 게시가 있어도 일관된 키 사용
+    - DATA_EPOCH_RETENTION_DAYS보다 오래된 에폭은 게시 시 정리 (최신/고정 중인 에폭 제외)
+    - 고정은 프로세스마다 data/epochs/<id>/.leases/<host-pid> 임대 파일로 기록 →
+      다른 프로세스(스케줄러, 적재 스크립트)가 게시·정리해도 API 워커가 쓰는 에폭은 유지
+      (DATA_EPOCH_LEASE_SECONDS 동안 갱신되지 않은 임대 파일은 종료된 프로세스로 보고 무시)
+
+시점 재현 범위: 에폭이 보존하는 것은 캐시 키와 감시 파일(stock_prices.json) 사본뿐.
+DB 테이블(stock_prices, stock_features 등)은 제자리 갱신되므로 고정된 요청도 게시 이후 행을 읽을 수 있음
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+# 스케줄러가 기록하는 게시 정보 (프로세스 간 공유)
+VERSION_FILE = os.path.join(DATA_DIR, "data_version.json")
+
+# 게시 없이 교체될 수 있는 스냅샷 파일 (수동 스크립트 실행 등)
+# stock_prices_cache.json은 get_price가 수시로 갱신하므로 제외
+WATCHED_FILES = [
+    os.path.join(os.path.dirname(BASE_DIR), "stock_prices.json"),
+]
+
+# 에폭 보관소 (게시 이력 + 감시 파일 사본)
+EPOCHS_DIR = os.path.join(DATA_DIR, "epochs")
+EPOCH_INDEX_FILE = os.path.join(EPOCHS_DIR, "index.json")
+EPOCH_RETENTION_DAYS = int(os.getenv("DATA_EPOCH_RETENTION_DAYS", "7"))
+EPOCH_LEASE_SECONDS = float(os.getenv("DATA_EPOCH_LEASE_SECONDS", "3600"))
+
+_lock = threading.Lock()
+_subscribers: List[Callable[[str], None]] = []
+_last_seen: Optional[str] = None
+
+# 요청 단위 고정 (버전, 에폭) / 프로세스 내 에폭별 고정 횟수
+_pinned: contextvars.ContextVar[Optional[Tuple[str, str]]] = contextvars.ContextVar(
+    "data_version_pinned", default=None
+)
+_pin_counts: Dict[str, int] = {}
+_leased_at: Dict[str, float] = {}  # 에폭별 임대 파일 마지막 갱신 시각
+
+
+def _file_stamp(path: str) -> str:
+    """파일 변경 시각 스탬프 (없으면 '-')"""
+    try:
+        return str(os.stat(path).st_mtime_ns)
+    except OSError:
+        return "-"
+
+
+def _read_published() -> Dict[str, str]:
+    """마지막 게시 정보 조회"""
+    try:
+        with open(VERSION_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def current_version() -> str:
+    """
+    현재 데이터 스냅샷 버전 ID
+
+    게시 ID + 감시 파일 변경 시각을 조합한 해시.
+    직전 조회와 달라졌으면 구독자에게 알린다.
+    pinned() 안에서는 고정된 버전을 그대로 돌려준다.
+
+    Returns:
+        12자리 버전 문자열
+    """
+    pin = _pinned.get()
+    if pin is not None:
+        return pin[0]
+    return _compute_version(_read_published())
+
+
+def current_epoch() -> str:
+    """현재 에폭 ID (pinned() 안에서는 고정된 에폭, 게시 이력이 없으면 '')"""
+    pin = _pinned.get()
+    if pin is not None:
+        return pin[1]
+    return _read_published().get("id", "")
+
+
+def _compute_version(published: Dict) -> str:
+    """게시 정보 + 감시 파일 스탬프 → 버전 ID (변경 시 구독자 알림)"""
+    global _last_seen
+
+    parts = [published.get("id", "")] + [_file_stamp(p) for p in WATCHED_FILES]
+    version = hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+    with _lock:
+        changed = _last_seen is not None and version != _last_seen
+        _last_seen = version
+        subscribers = list(_subscribers) if changed else []
+
+    for callback in subscribers:
+        try:
+            callback(version)
+        except Exception as e:
+            print(f"⚠️ 데이터 버전 구독자 오류: {e}")
+
+    return version
+
+
+def publish(source: str, detail: Optional[Dict] = None) -> str:
+    """
+    새 데이터 게시 (스케줄러/수집 작업 완료 시 호출)
+
+    Args:
+        source: 게시 주체 (예: 'daily_chart_update')
+        detail: 추가 정보 (저장 건수 등)
+
+    Returns:
+        새 버전 ID
+    """
+    record = {
+        "id": uuid.uuid4().hex,
+        "source": source,
+        "published_at": datetime.now().isoformat(),
+        "detail": detail or {},
+    }
+
+    record["files"] = _snapshot_files(record["id"])
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    _write_json(VERSION_FILE, record)
+
+    with _lock:
+        epochs = [e for e in list_epochs() if e["id"] != record["id"]] + [record]
+        epochs = _prune_epochs(epochs)
+        _write_json(EPOCH_INDEX_FILE, epochs)
+
+    return _compute_version(record)
+
+
+def _write_json(path: str, data):
+    """임시 파일 + 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _snapshot_files(epoch_id: str) -> List[str]:
+    """감시 파일을 에폭 디렉토리로 복사 (게시 시점 내용 보존)"""
+    saved = []
+    epoch_dir = os.path.join(EPOCHS_DIR, epoch_id)
+    for path in WATCHED_FILES:
+        if not os.path.isfile(path):
+            continue
+        os.makedirs(epoch_dir, exist_ok=True)
+        shutil.copy2(path, os.path.join(epoch_dir, os.path.basename(path)))
+        saved.append(os.path.basename(path))
+    return saved
+
+
+def _prune_epochs(epochs: List[Dict]) -> List[Dict]:
+    """보관 기간이 지난 에폭 삭제 (최신 에폭, 어느 프로세스든 고정 중인 에폭은 유지)"""
+    cutoff = (datetime.now() - timedelta(days=EPOCH_RETENTION_DAYS)).isoformat()
+    kept = []
+    for i, epoch in enumerate(epochs):
+        is_latest = i == len(epochs) - 1
+        if (is_latest or epoch["published_at"] >= cutoff
+                or _pin_counts.get(epoch["id"]) or _has_live_lease(epoch["id"])):
+            kept.append(epoch)
+        else:
+            shutil.rmtree(os.path.join(EPOCHS_DIR, epoch["id"]), ignore_errors=True)
+    return kept
+
+
+# ========== 에폭 조회 / 고정 ==========
+
+def list_epochs() -> List[Dict]:
+    """보관 중인 에폭 목록 (오래된 순)"""
+    try:
+        with open(EPOCH_INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def get_epoch(epoch_id: str) -> Optional[Dict]:
+    """에폭 게시 정보 (보관 기간이 지났으면 None)"""
+    return next((e for e in list_epochs() if e["id"] == epoch_id), None)
+
+
+def epoch_file(epoch_id: str, filename: str) -> Optional[str]:
+    """
+    에폭 시점의 감시 파일 사본 경로 (재현 분석용)
+
+    Args:
+        epoch_id: 에폭 ID
+        filename: 감시 파일 이름 (예: 'stock_prices.json')
+
+    Returns:
+        파일 경로 (없으면 None)
+    """
+    path = os.path.join(EPOCHS_DIR, os.path.basename(epoch_id), os.path.basename(filename))
+    return path if os.path.isfile(path) else None
+
+
+@contextmanager
+def pinned() -> Iterator[Tuple[str, str]]:
+    """
+    현재 버전/에폭을 고정 (요청 1건 처리 동안 사용)
+
+        with data_version.pinned() as (version, epoch):
+            ...  # 이 안의 current_version()/current_epoch()는 고정값
+
+    Yields:
+        (버전 ID, 에폭 ID)
+    """
+    outer = _pinned.get()
+    if outer is not None:
+        yield outer
+        return
+
+    published = _read_published()
+    pin = (_compute_version(published), published.get("id", ""))
+    token = _pinned.set(pin)
+    hold(pin[1])
+    try:
+        yield pin
+    finally:
+        _pinned.reset(token)
+        release(pin[1])
+
+
+def _lease_path(epoch_id: str) -> str:
+    owner = f"{socket.gethostname()}-{os.getpid()}"
+    return os.path.join(EPOCHS_DIR, os.path.basename(epoch_id), ".leases", owner)
+
+
+def _has_live_lease(epoch_id: str) -> bool:
+    """다른 프로세스 포함, 최근 갱신된 임대 파일이 있는지"""
+    lease_dir = os.path.join(EPOCHS_DIR, os.path.basename(epoch_id), ".leases")
+    try:
+        names = os.listdir(lease_dir)
+    except OSError:
+        return False
+    now = time.time()
+    for name in names:
+        try:
+            if now - os.stat(os.path.join(lease_dir, name)).st_mtime < EPOCH_LEASE_SECONDS:
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def _write_lease(epoch_id: str):
+    """임대 파일 생성/갱신 (고정이 이어지는 동안 EPOCH_LEASE_SECONDS의 절반마다)"""
+    now = time.time()
+    if now - _leased_at.get(epoch_id, 0) < EPOCH_LEASE_SECONDS / 2:
+        return
+    path = _lease_path(epoch_id)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a'):
+            os.utime(path)
+        _leased_at[epoch_id] = now
+    except OSError as e:
+        print(f"⚠️ 에폭 임대 기록 실패 ({epoch_id}): {e}")
+
+
+def _remove_lease(epoch_id: str):
+    _leased_at.pop(epoch_id, None)
+    try:
+        os.remove(_lease_path(epoch_id))
+    except OSError:
+        pass
+
+
+def hold(epoch_id: str):
+    """
+    에폭 보관 유지 (release()까지 모든 프로세스의 정리 대상에서 제외)
+
+    pinned() 블록보다 오래 에폭을 써야 할 때 사용 (스트리밍 응답 본문 전송 등)
+    """
+    with _lock:
+        _pin_counts[epoch_id] = _pin_counts.get(epoch_id, 0) + 1
+        if epoch_id:
+            _write_lease(epoch_id)
+
+
+def release(epoch_id: str):
+    """hold() 1회 해제 (이 프로세스의 마지막 고정이면 임대 파일 삭제)"""
+    with _lock:
+        _pin_counts[epoch_id] -= 1
+        if not _pin_counts[epoch_id]:
+            del _pin_counts[epoch_id]
+            if epoch_id:
+                _remove_lease(epoch_id)
+
+
+def pin_stats() -> Dict:
+    """에폭 상태 (/api/status 용)"""
+    epochs = list_epochs()
+    with _lock:
+        pinned_now = dict(_pin_counts)
+    return {
+        "current_epoch": _read_published().get("id", ""),
+        "retained_epochs": len(epochs),
+        "retention_days": EPOCH_RETENTION_DAYS,
+        "pinned": pinned_now,
+    }
+
+
+def subscribe(callback: Callable[[str], None]):
+    """버전 변경 시 호출될 콜백 등록 (새 버전 ID 전달)"""
+    with _lock:
+        _subscribers.append(callback)
@@ -0,0 +1,232 @@
+"""
+Agent 입력 피처 저장소
+일봉 갱신 직후 stock_prices 전체 종목에서 MA20/60, ATR, 변동성, 지지/저항선을 계산해
+stock_features 테이블에 종목당 1행으로 저장 → Agent 요청은 키 조회만 수행
+
+    build_features(names={"005930": "삼성전자"})   # 스케줄러 (일봉 갱신 후)
+    get_features(["005930", "LMT"])               # AgentDataProvider
+"""
+
+import os
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from database import ReadSessionLocal, SessionLocal
+from models.stock import StockPrice, StockFeature
+from services import data_version, price_store
+
+# 피처 계산에 쓰는 기간 (달력 기준, 60거래일 + 여유)
+FEATURE_LOOKBACK_DAYS = int(os.getenv("FEATURE_LOOKBACK_DAYS", "120"))
+
+# 마지막 거래일이 이보다 오래된 피처는 사용하지 않음 (원본 조회로 대체)
+FEATURE_MAX_AGE_DAYS = int(os.getenv("FEATURE_MAX_AGE_DAYS", "5"))
+
+# 메모리 스냅샷 (데이터 버전이 바뀌면 다시 읽음)
+_lock = threading.Lock()
+_snapshot: Dict[str, Dict[str, Any]] = {}
+_snapshot_version: Optional[str] = None
+
+
+# ========== 계산 ==========
+
+def compute_features(high, low, close) -> Optional[Dict[str, float]]:
+    """
+    일봉 배열 → Agent 입력 피처 (AgentDataProvider의 실시간 계산과 같은 정의)
+
+    Args:
+        high, low, close: 날짜 오름차순 배열 (종가 없는 날은 제외된 상태)
+
+    Returns:
+        피처 dict (데이터 없으면 None)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if close.size == 0:
+        return None
+
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    last_close = float(close[-1])
+    # 60일 미만이면 MA20/변동성도 기본값 (AgentDataProvider 원래 정의 - 짧은 이력 종목 결과 유지)
+    closes = close[-60:] if close.size >= 60 else close[:0]
+
+    ma20 = float(closes[-20:].mean()) if closes.size >= 20 else last_close * 0.97
+    ma60 = float(closes.mean()) if closes.size >= 60 else last_close * 0.95
+
+    # ATR (간단 버전: 최근 20일 고가-저가 평균)
+    ranges = (high - low)[-20:]
+    ranges = ranges[~np.isnan(ranges)]
+    atr_20d = float(ranges.mean()) if close.size >= 20 and ranges.size else last_close * 0.03
+
+    # 변동성 (일간 수익률 RMS, %)
+    if closes.size >= 20:
+        returns = closes[1:] / closes[:-1] - 1
+        volatility = float(np.sqrt(np.mean(returns ** 2)) * 100)
+    else:
+        volatility = 3.0
+
+    return {
+        "current_price": last_close,
+        "ma20": ma20,
+        "ma60": ma60,
+        "atr_20d": atr_20d,
+        "volatility": volatility,
+        "support_1": last_close * 0.97,
+        "support_2": last_close * 0.94,
+        "resistance_1": last_close * 1.03,
+        "resistance_2": last_close * 1.06,
+        "bars": int(close.size),
+    }
+
+
+def _round_features(features: Dict[str, float], market: str) -> Dict[str, float]:
+    """시장별 가격 단위 반올림 (KR: 원 단위, US: 센트)"""
+    digits = 0 if market == "KR" else 2
+    rounded = {}
+    for key, value in features.items():
+        if key == "bars":
+            rounded[key] = value
+        elif key == "volatility":
+            rounded[key] = round(value, 1)
+        else:
+            rounded[key] = round(value, digits)
+    return rounded
+
+
+# ========== 빌드 ==========
+
+def build_features(names: Optional[Dict[str, str]] = None,
+                   end_date: Optional[date] = None, publish: bool = True) -> int:
+    """
+    전체 종목 피처 재계산 및 저장 (쿼리 1회 + 종목별 upsert)
+
+    Args:
+        names: {ticker: 종목명} (없으면 기존 행의 이름 유지)
+        end_date: 기준일 (기본: 오늘)
+        publish: 완료 후 데이터 버전 게시 여부
+
+    Returns:
+        저장한 종목 수
+    """
+    names = names or {}
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=FEATURE_LOOKBACK_DAYS)
+
+    db = SessionLocal()
+    try:
+        if price_store.timeseries_enabled():
+            rows = price_store.load_range(start_date, end_date)
+        else:
+            rows = db.query(
+                StockPrice.ticker, StockPrice.market, StockPrice.date,
+                StockPrice.high, StockPrice.low, StockPrice.close
+            ).filter(
+                StockPrice.date >= start_date,
+                StockPrice.date <= end_date,
+                StockPrice.close.isnot(None)
+            ).order_by(StockPrice.ticker, StockPrice.market, StockPrice.date).all()
+
+        grouped: Dict[tuple, List] = {}
+        for r in rows:
+            grouped.setdefault((r.ticker, r.market), []).append(r)
+
+        existing = {(f.ticker, f.market): f for f in db.query(StockFeature).all()}
+        saved = 0
+
+        for (ticker, market), bars in grouped.items():
+            features = compute_features(
+                [b.high if b.high is not None else np.nan for b in bars],
+                [b.low if b.low is not None else np.nan for b in bars],
+                [b.close for b in bars],
+            )
+            if features is None:
+                continue
+
+            values = _round_features(features, market)
+            values["as_of"] = bars[-1].date
+
+            feature = existing.get((ticker, market))
+            if feature is None:
+                feature = StockFeature(ticker=ticker, market=market)
+                db.add(feature)
+            for key, value in values.items():
+                setattr(feature, key, value)
+            if ticker in names:
+                feature.name = names[ticker]
+            saved += 1
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"✅ Agent 피처 저장: {saved}개 종목 (기준일 {end_date})")
+    if publish and saved:
+        data_version.publish("feature_build", {"tickers": saved})
+    return saved
+
+
+# ========== 조회 ==========
+
+def _row_to_dict(feature: StockFeature) -> Dict[str, Any]:
+    return {
+        "ticker": feature.ticker,
+        "market": feature.market,
+        "name": feature.name,
+        "as_of": feature.as_of,
+        "bars": feature.bars,
+        "current_price": feature.current_price,
+        "ma20": feature.ma20,
+        "ma60": feature.ma60,
+        "atr_20d": feature.atr_20d,
+        "volatility": feature.volatility,
+        "support_levels": [feature.support_1, feature.support_2],
+        "resistance_levels": [feature.resistance_1, feature.resistance_2],
+    }
+
+
+def _load_snapshot() -> Dict[str, Dict[str, Any]]:
+    """stock_features 전체 → {ticker: 피처} (종목 수가 적어 통째로 적재)"""
+    db = ReadSessionLocal()
+    try:
+        return {f.ticker: _row_to_dict(f) for f in db.query(StockFeature).all()}
+    finally:
+        db.close()
+
+
+def get_features(tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    종목별 피처 조회 (메모리 스냅샷, 데이터 버전 변경 시에만 DB 재조회)
+
+    Args:
+        tickers: 종목 코드 리스트
+
+    Returns:
+        {ticker: 피처} - 피처가 없거나 FEATURE_MAX_AGE_DAYS보다 오래된 종목은 제외
+    """
+    global _snapshot, _snapshot_version
+
+    version = data_version.current_version()
+    with _lock:
+        if version != _snapshot_version:
+            _snapshot = _load_snapshot()
+            _snapshot_version = version
+        snapshot = _snapshot
+
+    oldest = date.today() - timedelta(days=FEATURE_MAX_AGE_DAYS)
+    return {
+        t: snapshot[t] for t in tickers
+        if t in snapshot and snapshot[t]["as_of"] >= oldest
+    }
+
+
+if __name__ == "__main__":
+    # 사용법 (backend 디렉토리에서): python -m services.feature_store
+    from database import init_db
+
+    init_db()
+    build_features()
@@ -0,0 +1,185 @@
+"""
+요청 단위 업스트림 조회 메모 (분석 1회 동안 같은 조회는 한 번만)
+
+같은 분석 안에서 Stock Screener / Trade Plan Builder / Devil's Advocate가 같은 종목의
+네이버 개요, yfinance 일봉, 수급, 뉴스를 반복 조회하던 것을 (source, ticker, params) 키로 메모.
+기간/개수만 다른 조회는 가장 긴 결과 하나를 받아 잘라서 사용
+
+    with fetch_scope() as ctx:          # 분석 1회
+        provider.get_trade_data("005930")
+        provider.get_valuation_data("005930")
+        ctx.stats()                     # {'upstream_calls': 6, 'memo_hits': 3, 'by_source': {...}}
+
+    @scoped                             # 스코프 밖에서 호출돼도 메서드 1회 동안은 메모
+    def get_trade_data(self, ticker): ...
+"""
+
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
+_current: ContextVar[Optional["FetchContext"]] = ContextVar("fetch_context", default=None)
+
+
+class _Failure:
+    """실패한 조회 (같은 스코프에서 다시 호출하지 않고 같은 예외를 재발생)"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class FetchContext:
+    """분석 1회 동안의 업스트림 조회 메모 + 호출 수 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._memo: Dict[Tuple, Any] = {}
+        self._windows: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+        self._calls: Dict[str, int] = {}
+        self._hits: Dict[str, int] = {}
+
+    def _count(self, counter: Dict[str, int], source: str):
+        with self._lock:
+            counter[source] = counter.get(source, 0) + 1
+        metrics.cache_result("fetch_context", hit=counter is self._hits)
+
+    def fetch(self, source: str, ticker: str, params: Hashable,
+              loader: Callable[[], Any]) -> Any:
+        """
+        (source, ticker, params) 조회 결과 메모
+
+        Args:
+            source: 업스트림 이름 (예: 'naver.overview')
+            ticker: 종목 코드
+            params: 나머지 조회 인자 (해시 가능)
+            loader: 실제 업스트림 호출
+
+        Returns:
+            loader 결과 (실패했던 조회는 같은 예외 재발생)
+        """
+        key = (source, ticker, params)
+        if key in self._memo:
+            self._count(self._hits, source)
+            return self._unwrap(self._memo[key])
+
+        self._count(self._calls, source)
+        try:
+            value = loader()
+        except Exception as e:
+            self._memo[key] = _Failure(e)
+            raise
+        self._memo[key] = value
+        return value
+
+    def fetch_window(self, source: str, ticker: str, size: int,
+                     loader: Callable[[int], Any],
+                     slicer: Callable[[Any, int], Any]) -> Any:
+        """
+        기간/개수(size)만 다른 조회 - 이미 받은 가장 긴 결과를 잘라서 반환
+
+        Args:
+            size: 조회 길이 (일수, 건수 등)
+            loader: loader(size) → 업스트림 결과
+            slicer: slicer(result, size) → 더 긴 결과에서 size만큼 잘라낸 결과
+
+        Returns:
+            size 길이 결과
+        """
+        key = (source, ticker)
+        cached = self._windows.get(key)
+        if cached is not None and cached[0] >= size:
+            self._count(self._hits, source)
+            value = self._unwrap(cached[1])
+            return value if cached[0] == size else slicer(value, size)
+
+        self._count(self._calls, source)
+        try:
+            value = loader(size)
+        except Exception as e:
+            # 더 짧은 조회까지 실패로 막지 않도록, 긴 성공 결과가 있으면 유지
+            if cached is None or isinstance(cached[1], _Failure):
+                self._windows[key] = (size, _Failure(e))
+            raise
+        self._windows[key] = (size, value)
+        return value
+
+    @staticmethod
+    def _unwrap(value: Any) -> Any:
+        if isinstance(value, _Failure):
+            raise value.error
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """업스트림 호출 수 / 메모 적중 수 (소스별)"""
+        with self._lock:
+            sources = sorted(set(self._calls) | set(self._hits))
+            return {
+                "upstream_calls": sum(self._calls.values()),
+                "memo_hits": sum(self._hits.values()),
+                "by_source": {
+                    s: {"calls": self._calls.get(s, 0), "hits": self._hits.get(s, 0)} for s in sources
+                },
+            }
+
+
+def current() -> FetchContext:
+    """활성 스코프의 FetchContext (스코프 밖이면 메모 없는 1회용 컨텍스트)"""
+    return _current.get() or FetchContext()
+
+
+@contextmanager
+def fetch_scope(ctx: Optional[FetchContext] = None):
+    """
+    조회 메모 스코프 - 이미 활성 스코프가 있으면 그대로 공유 (중첩 호출)
+
+    Args:
+        ctx: 이어서 쓸 FetchContext (여러 스레드/단계에 걸친 분석 1회를 같은 메모로 묶을 때)
+
+    Yields:
+        FetchContext
+    """
+    active = _current.get()
+    if active is not None:
+        yield active
+        return
+
+    ctx = ctx or FetchContext()
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+
+
+def scoped(func: Callable) -> Callable:
+    """메서드 호출 동안 fetch_scope 적용 (바깥 스코프가 있으면 합류)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with fetch_scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# ========== 결과 자르기 ==========
+
+def slice_history(hist, days: int):
+    """
+    yfinance 일봉 DataFrame → 최근 days일 (history(period=f"{days}d")와 같은 기준: 현재 시각)
+    """
+    if hist is None or len(hist) == 0:
+        return hist
+    cutoff = datetime.now(hist.index.tz) - timedelta(days=days)
+    return hist[hist.index >= cutoff]
+
+
+def slice_list(items, size: int):
+    """최신순 리스트 → 앞에서 size개"""
+    return items[:size]
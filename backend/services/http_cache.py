@@ -0,0 +1,111 @@
+"""
+HTTP 조건부 요청 헬퍼 (ETag / If-None-Match / Cache-Control)
+읽기 위주 엔드포인트가 데이터 버전이 같으면 304로 응답하도록 지원
+"""
+
+import hashlib
+import os
+import stat
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+def strong_etag(*parts: Any) -> str:
+    """구성 요소 → strong ETag (따옴표 포함)"""
+    raw = "|".join(str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def content_etag(body: bytes) -> str:
+    """응답 본문 해시 → strong ETag"""
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def file_etag(path: str) -> Optional[str]:
+    """정적 파일 ETag (변경 시각 + 크기), 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return strong_etag(path, st.st_mtime_ns, st.st_size)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 비교 (RFC 9110 weak comparison)
+
+    '*' 또는 목록 중 하나라도 같은 태그면 True
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def cache_control(max_age: int, s_maxage: Optional[int] = None,
+                  stale_while_revalidate: Optional[int] = None) -> str:
+    """
+    Cache-Control 값 생성
+
+    Args:
+        max_age: 브라우저 캐시 시간 (0이면 매번 재검증)
+        s_maxage: CDN(공유 캐시) 캐시 시간
+        stale_while_revalidate: 만료 후 백그라운드 재검증 동안 허용할 시간
+    """
+    parts = ["public", f"max-age={max_age}"]
+    if max_age == 0:
+        parts.append("must-revalidate")
+    if s_maxage is not None:
+        parts.append(f"s-maxage={s_maxage}")
+    if stale_while_revalidate:
+        parts.append(f"stale-while-revalidate={stale_while_revalidate}")
+    return ", ".join(parts)
+
+
+class VersionedMemo:
+    """
+    버전별 응답 메모 (엔드포인트 결과를 데이터 버전이 같은 동안 재사용)
+
+    - 버전이 바뀌거나 TTL이 지나면 미스
+    - 항목 수 제한 (초과 시 가장 오래된 항목 제거)
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._items: Dict[str, Tuple[str, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: str) -> Optional[Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if not item:
+                return None
+            item_version, created_at, value = item
+            expired = self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+            if item_version != version or expired:
+                del self._items[key]
+                return None
+            return value
+
+    def set(self, key: str, version: str, value: Any):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = (version, time.time(), value)
+            while len(self._items) > self.max_entries:
+                self._items.pop(next(iter(self._items)))
+
+    def clear(self, *_args):
+        with self._lock:
+            self._items.clear()
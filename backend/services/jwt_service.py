@@ -4,6 +4,7 @@ JWT 토큰 생성 및 검증
 
 import jwt
 import os
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from dotenv import load_dotenv
@@ -37,9 +38,10 @@ class JWTService:
         expire = datetime.utcnow() + expires_delta
         
         payload = {
-            "sub": user_id,
+            "sub": str(user_id),  # PyJWT 2.10+는 sub을 문자열로 검증
             "exp": expire,
             "iat": datetime.utcnow(),
+            "jti": uuid.uuid4().hex,  # 로그아웃 시 폐기 목록 키
             "type": "access"
         }
         
@@ -60,9 +62,10 @@ class JWTService:
         expire = datetime.utcnow() + timedelta(days=7)  # 7일
         
         payload = {
-            "sub": user_id,
+            "sub": str(user_id),
             "exp": expire,
             "iat": datetime.utcnow(),
+            "jti": uuid.uuid4().hex,
             "type": "refresh"
         }
         
@@ -80,6 +83,20 @@ class JWTService:
         Returns:
             user_id 또는 None (검증 실패)
         """
+        claims = JWTService.verify_access_token(token)
+        return claims["user_id"] if claims else None
+    
+    @staticmethod
+    def verify_access_token(token: str) -> Optional[dict]:
+        """
+        액세스 토큰 검증 (DB 조회 없음)
+        
+        Args:
+            token: JWT 토큰
+            
+        Returns:
+            {"user_id", "jti", "expires_at"} 또는 None (검증 실패)
+        """
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             
@@ -87,17 +104,21 @@ class JWTService:
             if payload.get("type") != "access":
                 return None
             
-            user_id: int = payload.get("sub")
+            user_id = payload.get("sub")
             
             if user_id is None:
                 return None
             
-            return user_id
+            return {
+                "user_id": int(user_id),
+                "jti": payload.get("jti"),
+                "expires_at": datetime.utcfromtimestamp(payload["exp"])
+            }
         
         except jwt.ExpiredSignatureError:
             # 토큰 만료
             return None
-        except jwt.InvalidTokenError:
+        except (jwt.InvalidTokenError, ValueError):
             # 토큰 검증 실패
             return None
     
@@ -110,7 +131,7 @@ class JWTService:
                 token = token[7:]
             
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            return payload.get("sub")
+            return int(payload["sub"])
         except:
             return None
     
@@ -11,6 +11,11 @@ from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 import logging
 
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
 logger = logging.getLogger(__name__)
 
 class KiwoomOpenAPI:
@@ -77,7 +82,7 @@ class KiwoomOpenAPI:
         
         try:
             logger.debug(f"🔐 토큰 요청 중... ({self.host})")
-            response = requests.post(url, headers=headers, json=data, timeout=10)
+            response = metrics.call("kiwoom", requests.post, url, headers=headers, json=data, timeout=10)
             
             if response.status_code != 200:
                 error_msg = response.json() if response.headers.get('content-type') == 'application/json' else response.text
@@ -170,7 +175,7 @@ class KiwoomOpenAPI:
             
             logger.debug(f"요청: {json.dumps({'url': url, 'body': request_body}, ensure_ascii=False)}")
             
-            response = requests.post(url, headers=headers, json=request_body, timeout=15)
+            response = metrics.call("kiwoom", requests.post, url, headers=headers, json=request_body, timeout=15)
             
             if response.status_code != 200:
                 logger.warning(f"⚠️ HTTP {response.status_code}: {response.text[:100]}")
@@ -299,7 +304,7 @@ class KiwoomOpenAPI:
                     'upd_stkpc_tp': '1'
                 }
                 
-                response = requests.post(url, headers=headers, json=request_body, timeout=15)
+                response = metrics.call("kiwoom", requests.post, url, headers=headers, json=request_body, timeout=15)
                 
                 if response.status_code != 200:
                     logger.warning(f"⚠️ 요청 {request_count + 1}: HTTP {response.status_code}")
@@ -9,6 +9,11 @@ import time
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
 class KRXStockAPI:
     """한국거래소 Open API 래퍼 클래스"""
     
@@ -55,7 +60,7 @@ class KRXStockAPI:
                 'Referer': 'http://data.krx.co.kr'
             }
             
-            response = requests.get(self.base_url, params=params, headers=headers, timeout=10)
+            response = metrics.call("krx", requests.get, self.base_url, params=params, headers=headers, timeout=10)
             
             if response.status_code != 200:
                 raise Exception(f"HTTP {response.status_code}: {response.text}")
@@ -153,7 +158,7 @@ class KRXStockAPI:
                 'Referer': 'http://data.krx.co.kr'
             }
             
-            response = requests.get(self.base_url, params=params, headers=headers, timeout=10)
+            response = metrics.call("krx", requests.get, self.base_url, params=params, headers=headers, timeout=10)
             
             if response.status_code != 200:
                 return None
@@ -0,0 +1,240 @@
+"""
+스케줄러 리더 선출 (멀티 워커 배포에서 예약 작업을 한 프로세스만 실행)
+
+    SCHEDULER_LOCK=auto (기본) : PostgreSQL이면 advisory lock, 아니면 파일 잠금
+    SCHEDULER_LOCK=file        : data/scheduler.lock 파일 잠금 (같은 호스트의 워커끼리)
+    SCHEDULER_LOCK=postgres    : pg_try_advisory_lock (여러 호스트)
+    SCHEDULER_LOCK=none        : 잠금 없이 모든 프로세스가 리더 (단일 프로세스 개발용)
+
+    election = LeaderElection(on_elected=start_jobs, on_lost=stop_jobs)
+    election.start()        # 즉시 1회 시도, 이후 LEADER_RETRY_SECONDS마다 재시도/생존 확인
+"""
+
+import os
+import socket
+import threading
+from typing import Callable, Optional
+
+SCHEDULER_LOCK = os.getenv("SCHEDULER_LOCK", "auto").lower()
+SCHEDULER_LOCK_FILE = os.getenv(
+    "SCHEDULER_LOCK_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "scheduler.lock")
+)
+SCHEDULER_LOCK_KEY = int(os.getenv("SCHEDULER_LOCK_KEY", "7410421"))  # advisory lock 키 (앱 고유값)
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "30"))
+
+
+def process_id() -> str:
+    """host:pid (잠금 소유자/요청자 표시용)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class FileLeaderLock:
+    """OS 파일 잠금 - 프로세스가 죽으면 OS가 해제"""
+
+    backend = "file"
+
+    def __init__(self, path: str = SCHEDULER_LOCK_FILE):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def try_acquire(self) -> bool:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.name == "nt":
+                import msvcrt
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # 소유자 기록 (진단용)
+        os.ftruncate(fd, 0)
+        os.write(fd, process_id().encode())
+        self._fd = fd
+        return True
+
+    def is_held(self) -> bool:
+        return self._fd is not None
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class PostgresLeaderLock:
+    """
+    PostgreSQL 세션 advisory lock - 잠금을 잡은 커넥션을 계속 유지
+    (커넥션이 끊기면 서버가 잠금을 해제하므로 is_held()로 생존 확인)
+    """
+
+    backend = "postgres"
+
+    def __init__(self, key: int = SCHEDULER_LOCK_KEY):
+        self.key = key
+        self._conn = None
+
+    def try_acquire(self) -> bool:
+        from sqlalchemy import text
+        from database import engine
+
+        conn = engine.connect()
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            conn.commit()  # 세션 잠금은 트랜잭션과 무관 - idle in transaction 방지
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def is_held(self) -> bool:
+        if self._conn is None:
+            return False
+        from sqlalchemy import text
+        try:
+            self._conn.execute(text("SELECT 1"))
+            self._conn.commit()
+            return True
+        except Exception:
+            self._drop()
+            return False
+
+    def release(self):
+        if self._conn is None:
+            return
+        from sqlalchemy import text
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._conn.commit()
+        except Exception:
+            pass
+        self._drop()
+
+    def _drop(self):
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+class NoLock:
+    """잠금 없음 - 항상 리더"""
+
+    backend = "none"
+
+    def try_acquire(self) -> bool:
+        return True
+
+    def is_held(self) -> bool:
+        return True
+
+    def release(self):
+        pass
+
+
+def make_lock():
+    """SCHEDULER_LOCK 설정에 맞는 잠금 생성"""
+    backend = SCHEDULER_LOCK
+    if backend == "auto":
+        from database import engine
+        backend = "postgres" if engine.dialect.name == "postgresql" else "file"
+
+    if backend == "postgres":
+        return PostgresLeaderLock()
+    if backend == "none":
+        return NoLock()
+    return FileLeaderLock()
+
+
+class LeaderElection:
+    """
+    리더 잠금 획득 시 on_elected, 잃으면 on_lost 호출
+    팔로워는 LEADER_RETRY_SECONDS마다 재시도 → 리더 프로세스가 죽으면 승계
+    """
+
+    def __init__(self, on_elected: Callable[[], None], on_lost: Optional[Callable[[], None]] = None,
+                 lock=None, retry_seconds: float = LEADER_RETRY_SECONDS):
+        self.on_elected = on_elected
+        self.on_lost = on_lost
+        self.lock = lock or make_lock()
+        self.retry_seconds = retry_seconds
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """
+        즉시 1회 선출 시도 후 백그라운드 감시 시작
+
+        Returns:
+            이 프로세스가 리더인지 여부
+        """
+        self._tick()
+        if not isinstance(self.lock, NoLock) or not self.is_leader:
+            self._thread = threading.Thread(target=self._run, name="scheduler-leader", daemon=True)
+            self._thread.start()
+        return self.is_leader
+
+    def _run(self):
+        while not self._stop.wait(self.retry_seconds):
+            self._tick()
+
+    def _tick(self):
+        try:
+            if self.is_leader:
+                if not self.lock.is_held():
+                    print(f"⚠️  스케줄러 리더 잠금 상실 ({self.lock.backend})")
+                    self.is_leader = False
+                    if self.on_lost:
+                        self.on_lost()
+            elif self.lock.try_acquire():
+                self.is_leader = True
+                print(f"👑 스케줄러 리더 선출: {process_id()} ({self.lock.backend})")
+                self._elected()
+        except Exception as e:
+            print(f"⚠️  스케줄러 리더 선출 오류: {e}")
+
+    def _elected(self):
+        """on_elected 실패 시 잠금을 놓고 다음 주기에 재시도 (작업 없이 잠금만 쥔 리더 방지)"""
+        try:
+            self.on_elected()
+        except Exception as e:
+            print(f"⚠️  리더 작업 시작 실패 - 잠금 해제 후 재시도: {e}")
+            self.is_leader = False
+            try:
+                if self.on_lost:
+                    self.on_lost()
+            finally:
+                self.lock.release()
+
+    def stop(self):
+        """감시 중단 + 리더면 on_lost 호출 후 잠금 해제"""
+        self._stop.set()
+        if self.is_leader:
+            self.is_leader = False
+            if self.on_lost:
+                self.on_lost()
+        self.lock.release()
+
+    def status(self) -> dict:
+        return {"leader": self.is_leader, "lock": self.lock.backend, "process": process_id()}
@@ -8,6 +8,11 @@ from bs4 import BeautifulSoup
 from typing import Dict, Any
 from datetime import datetime
 
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
 
 class MarketBreadthCalculator:
     """시장 폭 계산기"""
@@ -34,7 +39,7 @@ class MarketBreadthCalculator:
             }
         """
         try:
-            response = requests.get(self.kospi_url, headers=self.headers, timeout=10)
+            response = metrics.call("naver", requests.get, self.kospi_url, headers=self.headers, timeout=10)
             response.encoding = 'utf-8'
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -126,7 +131,7 @@ class MarketBreadthCalculator:
         for ticker in sector_tickers:
             try:
                 url = f"https://finance.naver.com/item/main.nhn?code={ticker}"
-                response = requests.get(url, headers=self.headers, timeout=5)
+                response = metrics.call("naver", requests.get, url, headers=self.headers, timeout=5)
                 response.encoding = 'utf-8'
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
@@ -0,0 +1,130 @@
+"""
+거래소 세션 캘린더 (KRX / NYSE)
+exchange_calendars가 있으면 휴장일·단축/지연 개장까지 반영, 없으면 평일 정규장 + 휴장일 환경변수
+
+    market_calendar.is_open("KR")            # 지금 정규장인지
+    market_calendar.last_close("US")         # 가장 최근 장 마감 시각 (aware datetime)
+    market_calendar.market_of("005930")      # "KR"
+"""
+
+import importlib.util
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# exchange_calendars는 pandas를 끌어오므로 실제 사용 시점에 import (서버 import 시간 예산)
+CALENDAR_AVAILABLE = importlib.util.find_spec("exchange_calendars") is not None
+
+MARKETS = {
+    "KR": {"timezone": "Asia/Seoul", "open": time(9, 0), "close": time(15, 30), "calendar": "XKRX"},
+    "US": {"timezone": "America/New_York", "open": time(9, 30), "close": time(16, 0), "calendar": "XNYS"},
+}
+
+# exchange_calendars가 없을 때 사용할 휴장일 (YYYY-MM-DD, 쉼표 구분)
+_FALLBACK_HOLIDAYS = {
+    market: {d.strip() for d in os.getenv(f"MARKET_HOLIDAYS_{market}", "").split(",") if d.strip()}
+    for market in MARKETS
+}
+
+# 앞뒤로 세션을 찾을 최대 일수 (연휴 대비)
+_SEARCH_DAYS = 14
+
+_calendars: Dict[str, object] = {}
+_calendar_lock = threading.Lock()
+
+
+def market_of(ticker: str) -> str:
+    """6자리 숫자면 KR, 아니면 US"""
+    return "KR" if ticker.isdigit() and len(ticker) == 6 else "US"
+
+
+def _calendar(market: str):
+    """exchange_calendars 캘린더 (없거나 로드 실패 시 None)"""
+    if not CALENDAR_AVAILABLE:
+        return None
+    with _calendar_lock:
+        if market not in _calendars:
+            try:
+                import exchange_calendars as xcals
+                _calendars[market] = xcals.get_calendar(MARKETS[market]["calendar"])
+            except Exception as e:
+                print(f"⚠️ 거래소 캘린더 로드 실패 ({market}): {e}")
+                _calendars[market] = None
+        return _calendars[market]
+
+
+def session_bounds(market: str, day: date) -> Optional[Tuple[datetime, datetime]]:
+    """
+    해당 날짜의 정규장 (개장, 마감) - 휴장일이면 None
+
+    Args:
+        market: 'KR' / 'US'
+        day: 거래소 현지 날짜
+
+    Returns:
+        (개장, 마감) 거래소 시간대 aware datetime
+    """
+    config = MARKETS[market]
+    tz = ZoneInfo(config["timezone"])
+
+    cal = _calendar(market)
+    if cal is not None:
+        try:
+            label = day.isoformat()
+            if not cal.is_session(label):
+                return None
+            return (cal.session_open(label).to_pydatetime().astimezone(tz),
+                    cal.session_close(label).to_pydatetime().astimezone(tz))
+        except Exception:
+            pass  # 캘린더 범위 밖 → 기본 규칙
+
+    if day.weekday() >= 5 or day.isoformat() in _FALLBACK_HOLIDAYS[market]:
+        return None
+    return (datetime.combine(day, config["open"], tz), datetime.combine(day, config["close"], tz))
+
+
+def _local_now(market: str, now: Optional[datetime]) -> datetime:
+    tz = ZoneInfo(MARKETS[market]["timezone"])
+    return now.astimezone(tz) if now else datetime.now(tz)
+
+
+def is_open(market: str, now: Optional[datetime] = None) -> bool:
+    """정규장 진행 중 여부"""
+    now = _local_now(market, now)
+    bounds = session_bounds(market, now.date())
+    return bool(bounds) and bounds[0] <= now < bounds[1]
+
+
+def last_close(market: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """now 이전 가장 최근 정규장 마감 시각"""
+    now = _local_now(market, now)
+    for offset in range(_SEARCH_DAYS):
+        bounds = session_bounds(market, now.date() - timedelta(days=offset))
+        if bounds and bounds[1] <= now:
+            return bounds[1]
+    return None
+
+
+def next_open(market: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """now 이후 가장 가까운 정규장 개장 시각"""
+    now = _local_now(market, now)
+    for offset in range(_SEARCH_DAYS):
+        bounds = session_bounds(market, now.date() + timedelta(days=offset))
+        if bounds and bounds[0] > now:
+            return bounds[0]
+    return None
+
+
+def status(now: Optional[datetime] = None) -> Dict[str, Dict]:
+    """시장별 개장 여부 / 최근 마감 / 다음 개장 (모니터링용)"""
+    result = {}
+    for market in MARKETS:
+        closed_at, opens_at = last_close(market, now), next_open(market, now)
+        result[market] = {
+            "open": is_open(market, now),
+            "last_close": closed_at.isoformat() if closed_at else None,
+            "next_open": opens_at.isoformat() if opens_at else None,
+        }
+    return result
@@ -0,0 +1,234 @@
+"""
+Prometheus 텍스트 형식 메트릭 (외부 의존성 없음, GET /metrics로 로컬 스크레이프)
+
+- http_request_duration_seconds{method, route, status}  라우트별 응답 시간
+- upstream_request_duration_seconds{provider}           업스트림(Kiwoom, NH, KRX, yfinance, Naver, DART) 호출 시간
+- upstream_errors_total{provider}                       업스트림 예외 / HTTP 4xx·5xx
+- provider_calls_total{router, provider, outcome}       공급자 라우팅 결과 (success/failure/skipped/hedged)
+- cache_requests_total{cache, result}                   캐시 적중(hit) / 미스(miss)
+- agent_stage_duration_seconds{stage}                   AgentOrchestrator 단계별 시간
+
+값은 프로세스별 (워커가 여러 개면 워커마다 스크레이프).
+업스트림 호출 / Agent 단계 시간은 요청 중이면 Server-Timing 구간(upstream.*, agent.*)에도 기록
+
+    response = metrics.call("naver", requests.get, url, timeout=10)
+    metrics.cache_result("quote", hit=True)
+    with metrics.timer(metrics.AGENT_STAGE_SECONDS, stage="market_regime"): ...
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+try:
+    from services import profiling
+except ImportError:
+    from . import profiling
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위 기본 버킷 (API 응답 ~ 외부 호출 타임아웃)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """고정 버킷 히스토그램 (관측 1회 = bisect + 카운트 증가)"""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple, List] = {}  # 라벨 → [버킷별 개수..., +Inf 개수, 합계]
+
+    def observe(self, seconds: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            values = self._values.get(key)
+            if values is None:
+                values = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            values[index] += 1
+            values[-1] += seconds
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+
+        lines = []
+        for key, values in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """스크레이프 시점에 함수로 읽는 값"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, func: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.func = func
+
+    def _samples(self) -> List[str]:
+        try:
+            return [f"{self.name} {_format_value(self.func())}"]
+        except Exception:
+            return []
+
+
+# ========== 메트릭 정의 ==========
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route", "status")
+)
+UPSTREAM_SECONDS = Histogram(
+    "upstream_request_duration_seconds", "Upstream data provider call latency.", ("provider",)
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total", "Upstream data provider calls that raised or returned HTTP >= 400.", ("provider",)
+)
+PROVIDER_CALLS = Counter(
+    "provider_calls_total", "Provider router attempts by outcome (success/failure/skipped/hedged).",
+    ("router", "provider", "outcome")
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit/miss).", ("cache", "result")
+)
+AGENT_STAGE_SECONDS = Histogram(
+    "agent_stage_duration_seconds", "AgentOrchestrator pipeline stage latency.", ("stage",)
+)
+
+_started_at = time.time()
+Gauge("process_start_time_seconds", "Start time of the process since unix epoch in seconds.", lambda: _started_at)
+
+
+# ========== 기록 헬퍼 ==========
+
+@contextmanager
+def timer(histogram: Histogram, **labels):
+    """블록 실행 시간을 histogram에 기록 (예외가 나도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+def call(provider: str, func: Callable, *args, **kwargs):
+    """
+    업스트림 호출 1회 실행 + 시간/오류 기록
+
+    Args:
+        provider: 'kiwoom' / 'nh' / 'krx' / 'yfinance' / 'naver' / 'dart' / 'alphavantage'
+        func: 실제 호출 (requests.get, yf.download 등)
+
+    Returns:
+        func 결과 (예외는 기록 후 그대로 전파, status_code >= 400 응답도 오류로 집계)
+    """
+    started = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception:
+        UPSTREAM_ERRORS.inc(provider=provider)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        UPSTREAM_SECONDS.observe(elapsed, provider=provider)
+        profiling.record(f"upstream.{provider}", elapsed)
+    if getattr(result, "status_code", 0) >= 400:
+        UPSTREAM_ERRORS.inc(provider=provider)
+    return result
+
+
+def cache_result(cache: str, hit: bool):
+    """캐시 조회 결과 1건"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def observe_agent_stage(stage: str, seconds: float):
+    """AgentOrchestrator stage_observer 콜백"""
+    AGENT_STAGE_SECONDS.observe(seconds, stage=stage)
+    profiling.record(f"agent.{stage}", seconds)
+
+
+def render() -> str:
+    """Prometheus 텍스트 노출 형식"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
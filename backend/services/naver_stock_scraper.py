@@ -11,6 +11,11 @@ from typing import Dict, List, Any, Optional
 import re
 import time
 
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
 
 class NaverStockScraper:
     """네이버 금융 웹 크롤러"""
@@ -47,7 +52,7 @@ class NaverStockScraper:
         url = f"{self.base_url}/item/main.nhn?code={ticker}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = metrics.call("naver", requests.get, url, headers=self.headers, timeout=10)
             response.encoding = 'utf-8'
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -121,7 +126,7 @@ class NaverStockScraper:
         url = f"{self.base_url}/item/frgn.nhn?code={ticker}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = metrics.call("naver", requests.get, url, headers=self.headers, timeout=10)
             response.encoding = 'utf-8'
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -181,7 +186,7 @@ class NaverStockScraper:
         url = f"{self.base_url}/item/news.nhn?code={ticker}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = metrics.call("naver", requests.get, url, headers=self.headers, timeout=10)
             response.encoding = 'utf-8'
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -240,7 +245,7 @@ class NaverStockScraper:
         url = f"{self.base_url}/item/news_notice.nhn?code={ticker}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = metrics.call("naver", requests.get, url, headers=self.headers, timeout=10)
             response.encoding = 'utf-8'
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -14,6 +14,11 @@ from urllib3.poolmanager import PoolManager
 from urllib3.util.ssl_ import create_urllib3_context
 import urllib3
 
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
 
 class TLSAdapter(HTTPAdapter):
     """
@@ -85,7 +90,7 @@ class NHInvestmentAPI:
         }
         
         try:
-            response = self.session.post(url, headers=headers, data=data)
+            response = metrics.call("nh", self.session.post, url, headers=headers, data=data)
             response.raise_for_status()
             
             result = response.json()
@@ -134,7 +139,7 @@ class NHInvestmentAPI:
                 "market": "KRX"
             }
             
-            response = self.session.get(url, headers=headers, params=params)
+            response = metrics.call("nh", self.session.get, url, headers=headers, params=params)
             
             if response.status_code != 200:
                 raise Exception(f"HTTP {response.status_code}: {response.text}")
@@ -199,7 +204,7 @@ class NHInvestmentAPI:
             "period": "D"
         }
         
-        response = self.session.get(url, headers=headers, params=params)
+        response = metrics.call("nh", self.session.get, url, headers=headers, params=params)
         response.raise_for_status()
         
         data = response.json()
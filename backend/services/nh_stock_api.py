@@ -9,6 +9,11 @@ import time
 from datetime import datetime, timedelta
 from typing import Optional
 
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
 class NHStockAPI:
     """NH투자증권 Open API 래퍼 클래스"""
     
@@ -35,7 +40,7 @@ class NHStockAPI:
             "appsecretkey": self.app_secret
         }
         
-        response = self.session.post(url, headers=headers, data=data)
+        response = metrics.call("nh", self.session.post, url, headers=headers, data=data)
         response.raise_for_status()
         
         result = response.json()
@@ -81,7 +86,7 @@ class NHStockAPI:
                 "PDNO": ticker
             }
             
-            response = self.session.get(url, headers=headers, params=params)
+            response = metrics.call("nh", self.session.get, url, headers=headers, params=params)
             
             # 에러 체크
             if response.status_code != 200:
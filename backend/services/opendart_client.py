@@ -12,6 +12,11 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import os
 
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
 
 class OpenDARTClient:
     """공개정보 공시시스템(OpenDART) API 클라이언트"""
@@ -71,7 +76,7 @@ class OpenDARTClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = metrics.call("dart", requests.get, url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -131,7 +136,7 @@ class OpenDARTClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = metrics.call("dart", requests.get, url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -201,7 +206,7 @@ class OpenDARTClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = metrics.call("dart", requests.get, url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -254,7 +259,7 @@ class OpenDARTClient:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = metrics.call("dart", requests.get, url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
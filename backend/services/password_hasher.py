@@ -0,0 +1,46 @@
+"""
+비밀번호 해싱 작업 풀
+bcrypt 해싱/검증(수십~수백 ms CPU)을 이벤트 루프 밖의 제한된 스레드 풀에서 실행
+(bcrypt는 해싱 중 GIL을 해제하므로 스레드로 병렬 처리됨)
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 대기 중인 요청이 이보다 많으면 즉시 거절 (로그인 폭주 시 이벤트 루프/메모리 보호)
+MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(HASH_WORKERS * 16)))
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+_pending = 0
+
+
+class HashPoolBusy(Exception):
+    """해싱 대기열 초과"""
+
+
+async def run_in_pool(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    해싱이 포함된 동기 함수를 작업 풀에서 실행
+
+    Raises:
+        HashPoolBusy: 대기 중인 작업이 MAX_PENDING 이상
+    """
+    global _pending
+
+    if _pending >= MAX_PENDING:
+        raise HashPoolBusy(f"password hash queue full ({_pending})")
+
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+    finally:
+        _pending -= 1
+
+
+def stats() -> dict:
+    return {"workers": HASH_WORKERS, "pending": _pending, "max_pending": MAX_PENDING}
@@ -0,0 +1,62 @@
+"""
+저장된 일별 시세(stock_prices) → NumPy 행렬
+포트폴리오 상관관계 등 여러 종목을 한 번에 계산하는 용도
+"""
+
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from database import ReadSessionLocal
+from models.stock import StockPrice
+from services import price_store
+
+
+def load_close_matrix(tickers: List[str], days: int = 120,
+                      end_date: Optional[date] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    종목별 종가 행렬 조회 (쿼리 1회)
+
+    Args:
+        tickers: 종목 코드 리스트
+        days: 조회 기간 (달력 기준 일수)
+        end_date: 마지막 날짜 (기본: 오늘)
+
+    Returns:
+        (데이터가 있는 종목 리스트, 종가 행렬 (종목, 날짜)) - 없는 날짜는 NaN
+    """
+    if not tickers:
+        return [], np.empty((0, 0))
+
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=days)
+
+    if price_store.timeseries_enabled():
+        return price_store.load_close_matrix(tickers, start_date, end_date)
+
+    db = ReadSessionLocal()
+    try:
+        rows = db.query(StockPrice.ticker, StockPrice.date, StockPrice.close).filter(
+            StockPrice.ticker.in_(tickers),
+            StockPrice.date >= start_date,
+            StockPrice.date <= end_date
+        ).all()
+    finally:
+        db.close()
+
+    if not rows:
+        return [], np.empty((0, 0))
+
+    present = {r.ticker for r in rows}
+    found = [t for t in tickers if t in present]
+    row_index = {t: i for i, t in enumerate(found)}
+    dates = sorted({r.date for r in rows})
+    col_index = {d: j for j, d in enumerate(dates)}
+
+    closes = np.full((len(found), len(dates)), np.nan)
+    for r in rows:
+        if r.close is not None:
+            closes[row_index[r.ticker], col_index[r.date]] = r.close
+
+    return found, closes
@@ -0,0 +1,303 @@
+"""
+시계열 시세 저장소 (stock_prices_ts)
+ORM 객체를 만들지 않고 Core/SQL로 대량 적재하고, 종목 기간 조회 결과를 NumPy 배열로 바로 반환
+
+    PRICE_STORAGE=timeseries 이면 price_history / feature_store가 이 경로로 읽고,
+    적재 작업/스크립트도 stock_prices(ORM) 대신 이 테이블에만 씀
+
+    price_store.upsert_rows(rows)                       # [(ticker, market, date, o, h, l, c, v), ...]
+    price_store.upsert_rows(rows, conn=db.connection()) # 세션 트랜잭션 안에서 (db.commit() 때 함께 커밋)
+    price_store.load_ohlcv("005930", start, end)        # {'date': datetime64[D], 'close': float64, ...}
+    python -m services.price_store --migrate            # stock_prices → stock_prices_ts 복사
+"""
+
+import os
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Date, bindparam, text
+
+from database import engine, read_engine
+from models.stock import stock_prices_ts
+
+# orm (기존 stock_prices) | timeseries (stock_prices_ts)
+PRICE_STORAGE = os.getenv("PRICE_STORAGE", "orm").lower()
+
+# PostgreSQL 연도별 파티션 생성 범위 (범위 밖 날짜는 DEFAULT 파티션)
+PARTITION_FIRST_YEAR = int(os.getenv("PRICE_TS_FIRST_YEAR", "2010"))
+
+UPSERT_CHUNK_SIZE = 5000
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+_INSERT_COLUMNS = ("ticker", "market", "date") + OHLCV_COLUMNS
+
+Row = Tuple[str, str, date, Optional[float], Optional[float], Optional[float], Optional[float], Optional[int]]
+
+
+def timeseries_enabled() -> bool:
+    """시계열 저장 모드 사용 여부"""
+    return PRICE_STORAGE == "timeseries"
+
+
+def _is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def _date_range(sql: str):
+    """날짜 파라미터를 Date 타입으로 바인딩 (SQLite 문자열 저장 형식과 일치)"""
+    return text(sql).bindparams(bindparam("start", type_=Date), bindparam("end", type_=Date))
+
+
+# ========== 스키마 ==========
+
+def ensure_partitions(last_year: Optional[int] = None):
+    """
+    PostgreSQL: 연도별 RANGE 파티션 + DEFAULT 파티션 + date BRIN 인덱스 생성
+    (SQLite는 create_all의 WITHOUT ROWID 테이블로 충분 → 아무것도 하지 않음)
+
+    Args:
+        last_year: 파티션을 만들 마지막 연도 (기본: 내년)
+    """
+    if not _is_postgres():
+        return
+
+    last_year = last_year or date.today().year + 1
+    with engine.begin() as conn:
+        for year in range(PARTITION_FIRST_YEAR, last_year + 1):
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS stock_prices_ts_y{year} PARTITION OF stock_prices_ts "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            ))
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS stock_prices_ts_default PARTITION OF stock_prices_ts DEFAULT"
+        ))
+        # 날짜 순으로 적재되는 시계열 → BRIN이 B-tree보다 훨씬 작고 전 종목 날짜 범위 조회에 충분
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS brin_stock_prices_ts_date "
+            "ON stock_prices_ts USING brin (date)"
+        ))
+
+
+# ========== 쓰기 ==========
+
+def _upsert_statement():
+    """방언별 INSERT ... ON CONFLICT (ticker, market, date) DO UPDATE"""
+    if _is_postgres():
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(stock_prices_ts)
+    return stmt.on_conflict_do_update(
+        index_elements=["ticker", "market", "date"],
+        set_={col: stmt.excluded[col] for col in OHLCV_COLUMNS}
+    )
+
+
+def upsert_rows(rows: Iterable[Row], conn=None) -> int:
+    """
+    시세 대량 upsert (executemany, UPSERT_CHUNK_SIZE행 단위)
+
+    Args:
+        rows: (ticker, market, date, open, high, low, close, volume) 튜플
+        conn: 호출 측 트랜잭션의 Connection (None이면 자체 트랜잭션으로 바로 커밋)
+
+    Returns:
+        처리한 행 수
+    """
+    if conn is None:
+        with engine.begin() as conn:
+            return upsert_rows(rows, conn)
+
+    stmt = _upsert_statement()
+    total = 0
+    batch: List[Dict] = []
+
+    for row in rows:
+        batch.append(dict(zip(_INSERT_COLUMNS, row)))
+        if len(batch) >= UPSERT_CHUNK_SIZE:
+            conn.execute(stmt, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        conn.execute(stmt, batch)
+        total += len(batch)
+
+    return total
+
+
+def _as_date(value) -> date:
+    """date / datetime / 'YYYY-MM-DD...' 문자열 → date"""
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def make_row(ticker: str, market: str, values: Dict) -> Row:
+    """{'date', 'open', 'high', 'low', 'close', 'volume'} 딕셔너리 → upsert_rows 행 (date 문자열도 허용)"""
+    return (ticker, market, _as_date(values['date']),
+            values.get('open'), values.get('high'), values.get('low'),
+            values.get('close'), values.get('volume'))
+
+
+def orm_row(record) -> Row:
+    """StockPrice 객체 → upsert_rows 행 (date 문자열도 허용)"""
+    return (record.ticker, record.market, _as_date(record.date),
+            record.open, record.high, record.low, record.close, record.volume)
+
+
+def delete_tickers(tickers: Iterable[str], conn=None) -> int:
+    """종목 전체 삭제 (전체를 지우고 다시 쓰는 스크립트용, conn은 upsert_rows와 같음)"""
+    tickers = list(tickers)
+    if not tickers:
+        return 0
+    if conn is None:
+        with engine.begin() as conn:
+            return delete_tickers(tickers, conn)
+
+    sql = text("DELETE FROM stock_prices_ts WHERE ticker IN :tickers").bindparams(
+        bindparam("tickers", expanding=True)
+    )
+    return conn.execute(sql, {"tickers": tickers}).rowcount
+
+
+def has_row(ticker: str, market: str, day, conn=None) -> bool:
+    """(ticker, market, date) 행 존재 여부 - 적재 전 중복 확인용 (복제본 지연이 없도록 쓰기 DB에서 조회)"""
+    sql = text(
+        "SELECT 1 FROM stock_prices_ts WHERE ticker = :ticker AND market = :market AND date = :day"
+    ).bindparams(bindparam("day", type_=Date))
+    params = {"ticker": ticker, "market": market, "day": _as_date(day)}
+    if conn is None:
+        with engine.connect() as conn:
+            return conn.execute(sql, params).first() is not None
+    return conn.execute(sql, params).first() is not None
+
+
+def migrate_from_orm() -> int:
+    """기존 stock_prices → stock_prices_ts 복사 (INSERT ... SELECT 1회, 중복은 덮어씀)"""
+    columns = ", ".join(_INSERT_COLUMNS)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in OHLCV_COLUMNS)
+    # SQLite의 INSERT ... SELECT ... ON CONFLICT는 WHERE 절이 있어야 파싱 모호성이 없음
+    sql = (
+        f"INSERT INTO stock_prices_ts ({columns}) "
+        f"SELECT {columns} FROM stock_prices WHERE true "
+        f"ON CONFLICT (ticker, market, date) DO UPDATE SET {updates}"
+    )
+    with engine.begin() as conn:
+        result = conn.execute(text(sql))
+    return result.rowcount
+
+
+# ========== 읽기 (ORM 객체 생성 없음) ==========
+
+def _to_arrays(rows: Sequence[tuple], columns: Sequence[str]) -> Dict[str, np.ndarray]:
+    """DB 행 → 컬럼별 배열 (date는 datetime64[D], 값 컬럼은 float64, NULL은 NaN)"""
+    if not rows:
+        out = {"date": np.empty(0, dtype="datetime64[D]")}
+        out.update({c: np.empty(0) for c in columns})
+        return out
+
+    dates, *values = zip(*rows)
+    out = {"date": np.array([str(d)[:10] for d in dates], dtype="datetime64[D]")}
+    for col, vals in zip(columns, values):
+        out[col] = np.array(vals, dtype=np.float64)  # None → nan
+    return out
+
+
+def load_ohlcv(ticker: str, start_date: date, end_date: date,
+               market: Optional[str] = None,
+               columns: Sequence[str] = OHLCV_COLUMNS) -> Dict[str, np.ndarray]:
+    """
+    종목 1개 기간 조회 (PK 범위 스캔)
+
+    Args:
+        ticker: 종목 코드
+        start_date, end_date: 조회 기간 (양끝 포함)
+        market: 'KR' / 'US' (None이면 시장 무관)
+        columns: 읽을 값 컬럼 (OHLCV_COLUMNS 중)
+
+    Returns:
+        {'date': datetime64[D] 배열, <column>: float64 배열} - 날짜 오름차순
+    """
+    columns = [c for c in columns if c in OHLCV_COLUMNS]
+    market_clause = "AND market = :market " if market else ""
+    sql = _date_range(
+        f"SELECT date, {', '.join(columns)} FROM stock_prices_ts "
+        f"WHERE ticker = :ticker {market_clause}AND date >= :start AND date <= :end "
+        f"ORDER BY date"
+    )
+    params = {"ticker": ticker, "start": start_date, "end": end_date, "market": market}
+
+    with read_engine.connect() as conn:
+        rows = conn.execute(sql, params).all()
+    return _to_arrays(rows, columns)
+
+
+def load_range(start_date: date, end_date: date,
+               columns: Sequence[str] = ("high", "low", "close")) -> List[tuple]:
+    """
+    전 종목 기간 조회 (피처 계산 등 일괄 처리용)
+
+    Returns:
+        (ticker, market, date, <columns>...) 행 리스트 - 종목/시장/날짜 순, 종가 없는 행 제외
+    """
+    columns = [c for c in columns if c in OHLCV_COLUMNS]
+    sql = _date_range(
+        f"SELECT ticker, market, date, {', '.join(columns)} FROM stock_prices_ts "
+        f"WHERE date >= :start AND date <= :end AND close IS NOT NULL "
+        f"ORDER BY ticker, market, date"
+    ).columns(date=Date)  # SQLite 문자열 → date 객체
+    with read_engine.connect() as conn:
+        return conn.execute(sql, {"start": start_date, "end": end_date}).all()
+
+
+def load_close_matrix(tickers: List[str], start_date: date,
+                      end_date: date) -> Tuple[List[str], np.ndarray]:
+    """
+    여러 종목 종가 행렬 (쿼리 1회) - price_history.load_close_matrix와 같은 반환 형식
+
+    Returns:
+        (데이터가 있는 종목 리스트, 종가 행렬 (종목, 날짜)) - 없는 날짜는 NaN
+    """
+    if not tickers:
+        return [], np.empty((0, 0))
+
+    sql = _date_range(
+        "SELECT ticker, date, close FROM stock_prices_ts "
+        "WHERE ticker IN :tickers AND date >= :start AND date <= :end"
+    ).bindparams(bindparam("tickers", expanding=True))
+
+    with read_engine.connect() as conn:
+        rows = conn.execute(sql, {"tickers": list(tickers), "start": start_date, "end": end_date}).all()
+    if not rows:
+        return [], np.empty((0, 0))
+
+    row_tickers, row_dates, row_closes = zip(*rows)
+    present = set(row_tickers)
+    found = [t for t in tickers if t in present]
+    row_index = {t: i for i, t in enumerate(found)}
+
+    dates = np.array([str(d)[:10] for d in row_dates], dtype="datetime64[D]")
+    unique_dates, col = np.unique(dates, return_inverse=True)
+    row = np.fromiter((row_index[t] for t in row_tickers), dtype=np.intp, count=len(rows))
+
+    closes = np.full((len(found), len(unique_dates)), np.nan)
+    closes[row, col] = np.array(row_closes, dtype=np.float64)
+    return found, closes
+
+
+if __name__ == "__main__":
+    # 사용법 (backend 디렉토리에서): python -m services.price_store --migrate
+    import argparse
+
+    from database import init_db
+
+    parser = argparse.ArgumentParser(description='시계열 시세 저장소 관리')
+    parser.add_argument('--migrate', action='store_true', help='stock_prices → stock_prices_ts 복사')
+    args = parser.parse_args()
+
+    init_db()
+    if args.migrate:
+        copied = migrate_from_orm()
+        print(f"✅ stock_prices_ts 복사 완료: {copied}행")
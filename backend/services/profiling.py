@@ -0,0 +1,209 @@
+"""
+요청 단위 프로파일링
+
+1) Server-Timing: 요청 1건 동안 phase()로 감싼 구간 시간을 합산해 응답 헤더로 전송
+   (브라우저 개발자 도구 Network → Timing 탭에서 확인)
+
+    with profiling.phase("chart.fetch"):
+        bars = _fetch_bars(...)
+    # → Server-Timing: chart.fetch;dur=412.3, total;dur=431.0
+
+2) 샘플링 프로파일러 (관리자 opt-in): X-Profile 헤더 또는 ?profile= 에 PROFILE_KEY를 넣으면
+   요청 동안 PROFILE_INTERVAL_MS마다 스레드 스택을 수집해 folded stack 파일로 저장
+   (flamegraph.pl, speedscope, inferno에서 바로 열림)
+   프로세스 전체 스레드를 샘플링하므로 동시에 실행 중인 다른 요청도 함께 잡힘
+"""
+
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE_KEY = os.getenv("PROFILE_KEY", "")  # 비어 있으면 샘플링 프로파일러 비활성
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "data", "profiles"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))  # 보관할 프로파일 파일 수
+
+# 대기 중인 스레드 (스택 맨 위가 이 함수들이면 샘플에서 제외)
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+_timings: ContextVar[Optional["ServerTiming"]] = ContextVar("server_timing", default=None)
+
+
+# ========== Server-Timing ==========
+
+class ServerTiming:
+    """요청 1건의 구간별 시간 합계 (같은 이름은 누적, 호출 수 기록)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: Dict[str, List[float]] = {}  # 이름 → [ms 합계, 횟수]
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            phase = self._phases.setdefault(name, [0.0, 0])
+            phase[0] += seconds * 1000
+            phase[1] += 1
+
+    def header(self, total_seconds: Optional[float] = None) -> str:
+        """Server-Timing 헤더 값 (2회 이상 호출된 구간은 desc에 횟수)"""
+        with self._lock:
+            items = list(self._phases.items())
+        parts = []
+        for name, (ms, count) in items:
+            part = f"{name};dur={ms:.1f}"
+            if count > 1:
+                part += f';desc="{count}x"'
+            parts.append(part)
+        if total_seconds is not None:
+            parts.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(parts)
+
+
+@contextmanager
+def timing_scope():
+    """요청 1건의 Server-Timing 수집 범위 (threadpool로 넘긴 작업도 같은 컨텍스트 공유)"""
+    timing = ServerTiming()
+    token = _timings.set(timing)
+    try:
+        yield timing
+    finally:
+        _timings.reset(token)
+
+
+def record(name: str, seconds: float):
+    """구간 시간 1건 추가 (요청 밖이면 무시)"""
+    timing = _timings.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str):
+    """블록 실행 시간을 Server-Timing 구간으로 기록"""
+    if _timings.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+# ========== 샘플링 프로파일러 ==========
+
+def is_authorized(token: Optional[str]) -> bool:
+    """프로파일링 요청 권한 (PROFILE_KEY 일치)"""
+    # str끼리 비교하면 비ASCII 입력에서 TypeError → bytes로 비교
+    return bool(PROFILE_KEY) and bool(token) and hmac.compare_digest(token.encode(), PROFILE_KEY.encode())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """
+    백그라운드 스레드에서 sys._current_frames()를 주기적으로 읽어 스택별 샘플 수 집계
+    (대상 코드에 훅을 걸지 않으므로 샘플 간격만큼의 오버헤드만 발생)
+    """
+
+    _active = threading.Lock()  # 프로세스당 동시에 1개
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> bool:
+        """
+        샘플링 시작
+
+        Returns:
+            False면 다른 프로파일링이 진행 중
+        """
+        if not SamplingProfiler._active.acquire(blocking=False):
+            return False
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or _is_idle(frame):
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started
+        SamplingProfiler._active.release()
+
+    def folded(self) -> str:
+        """folded stack 형식 ("스레드;함수1;함수2 샘플수" 줄 단위)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def save(self, label: str) -> str:
+        """
+        PROFILE_DIR에 저장 (오래된 파일은 PROFILE_KEEP개만 남기고 삭제)
+
+        Returns:
+            파일 이름
+        """
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")[:60] or "request"
+        name = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{slug}.folded"
+        with open(os.path.join(PROFILE_DIR, name), "w", encoding="utf-8") as f:
+            f.write(self.folded())
+
+        files = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith(".folded"))
+        for old in files[:-PROFILE_KEEP]:
+            try:
+                os.remove(os.path.join(PROFILE_DIR, old))
+            except OSError:
+                pass
+        return name
+
+
+def profile_path(name: str) -> Optional[str]:
+    """저장된 프로파일 경로 (이름 검증, 없으면 None)"""
+    if os.path.basename(name) != name or not name.endswith(".folded"):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,328 @@
+"""
+시세 공급자 라우팅 (서킷 브레이커 + 상태 기반 순서 + 헤지 요청)
+
+공급자(Kiwoom, NH, KRX, yfinance 등)마다 서킷 브레이커 1개를 프로세스에서 공유.
+최근 BREAKER_WINDOW_SECONDS 동안 오류율이 BREAKER_ERROR_RATE 이상이면 열림(open) →
+BREAKER_OPEN_SECONDS 동안 호출하지 않고 다음 공급자로 넘어감 (장애 공급자의 타임아웃을 매 요청 기다리지 않음).
+이후 반열림(half-open)에서 요청 1건만 시험 호출해 성공하면 닫힘(closed), 실패하면 다시 열림
+
+호출 순서: 반열림 시험 → 닫힘 공급자 (최근 오류율, 지연 EWMA 구간 낮은 순 / 같으면 등록 순)
+헤지(hedge=True): 앞 공급자가 자기 최근 p90 지연 안에 응답하지 않으면 다음 공급자를 동시에 호출,
+먼저 성공한 결과 사용 (늦은 쪽 결과도 상태 기록에는 반영)
+
+    router = ProviderRouter("kr_quote", [
+        Provider("kiwoom", _kiwoom_quote, available=lambda: get_kiwoom_client() is not None),
+        Provider("yfinance", _yahoo_quote, empty_is_error=False),
+    ], hedge=PROVIDER_HEDGE)
+    name, quote = router.call("005930")      # 모두 실패/차단이면 (None, None)
+    provider_router.status()                 # 공급자별 상태 (모니터링)
+"""
+
+import contextvars
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
+BREAKER_WINDOW_SECONDS = float(os.getenv("BREAKER_WINDOW_SECONDS", "60"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))          # 이 호출 수 미만이면 열지 않음
+BREAKER_ERROR_RATE = float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+
+PROVIDER_HEDGE = os.getenv("PROVIDER_HEDGE", "0") == "1"
+PROVIDER_HEDGE_MIN_SAMPLES = int(os.getenv("PROVIDER_HEDGE_MIN_SAMPLES", "20"))  # p90 추정에 필요한 성공 수
+PROVIDER_HEDGE_MIN_MS = float(os.getenv("PROVIDER_HEDGE_MIN_MS", "50"))
+PROVIDER_HEDGE_WORKERS = int(os.getenv("PROVIDER_HEDGE_WORKERS", "8"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# 지연 EWMA 가중치 / p90 계산용 최근 성공 지연 수
+_EWMA_ALPHA = 0.2
+_LATENCY_SAMPLES = 100
+_LATENCY_BUCKET_MS = 100.0  # 이보다 빠른 공급자끼리는 지연으로 순서를 바꾸지 않음
+
+
+# ========== 공급자 상태 ==========
+
+class ProviderHealth:
+    """공급자 1개의 서킷 브레이커 + 지연 통계 (스레드 안전)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (시각, 성공 여부)
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self.ewma_ms: Optional[float] = None
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened_count = 0
+
+    def _trim(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > BREAKER_WINDOW_SECONDS:
+            self._outcomes.popleft()
+
+    def _current_state(self, now: float) -> str:
+        if self.state == OPEN and now - self._opened_at >= BREAKER_OPEN_SECONDS:
+            self.state = HALF_OPEN
+            self._probing = False
+        return self.state
+
+    def peek_state(self) -> str:
+        with self._lock:
+            return self._current_state(time.time())
+
+    def error_rate(self) -> float:
+        with self._lock:
+            self._trim(time.time())
+            if not self._outcomes:
+                return 0.0
+            return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def allow(self) -> bool:
+        """
+        호출 허용 여부 (반열림이면 시험 호출 1건만 허용 - 결과를 record()로 알려야 함)
+        """
+        with self._lock:
+            state = self._current_state(time.time())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, ok: bool, seconds: float):
+        """호출 결과 1건 (성공 지연만 EWMA / p90에 반영)"""
+        now = time.time()
+        with self._lock:
+            if ok:
+                ms = seconds * 1000
+                self._latencies.append(ms)
+                self.ewma_ms = ms if self.ewma_ms is None else (1 - _EWMA_ALPHA) * self.ewma_ms + _EWMA_ALPHA * ms
+
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                if ok:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open(now)
+                return
+            if state == OPEN:
+                return  # 열리기 전에 출발한 늦은 응답
+
+            self._outcomes.append((now, ok))
+            self._trim(now)
+            failures = sum(1 for _, success in self._outcomes if not success)
+            if len(self._outcomes) >= BREAKER_MIN_CALLS and failures / len(self._outcomes) >= BREAKER_ERROR_RATE:
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self._probing = False
+        self._outcomes.clear()
+        self.opened_count += 1
+        print(f"⚠️ 공급자 차단: {self.name} ({BREAKER_OPEN_SECONDS:.0f}초 후 시험 호출)")
+
+    def p90_ms(self) -> Optional[float]:
+        """최근 성공 지연 p90 (표본 부족하면 None)"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < PROVIDER_HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(len(samples) * 0.9) - 1)]
+
+    def status(self) -> Dict[str, Any]:
+        p90 = self.p90_ms()
+        with self._lock:
+            state = self._current_state(time.time())
+            self._trim(time.time())
+            calls = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": state,
+                "calls": calls,
+                "error_rate": round(failures / calls, 3) if calls else 0.0,
+                "latency_ewma_ms": round(self.ewma_ms, 1) if self.ewma_ms is not None else None,
+                "latency_p90_ms": round(p90, 1) if p90 is not None else None,
+                "opened_count": self.opened_count,
+            }
+
+
+_health: Dict[str, ProviderHealth] = {}
+_health_lock = threading.Lock()
+
+
+def health(name: str) -> ProviderHealth:
+    """공급자 상태 (공급자 이름당 1개, 라우터 간 공유)"""
+    with _health_lock:
+        if name not in _health:
+            _health[name] = ProviderHealth(name)
+        return _health[name]
+
+
+# ========== 라우터 ==========
+
+@dataclass
+class Provider:
+    """
+    라우터에 등록하는 공급자
+
+    Args:
+        name: 공급자 이름 (서킷 브레이커 키 - 'kiwoom', 'yfinance', ...)
+        fetch: 조회 함수 (실패 시 예외 또는 None)
+        available: False를 돌려주면 기록 없이 건너뜀 (API 키 미설정 등)
+        empty_is_error: None / 빈 결과를 장애로 집계 (오류를 None으로 삼키는 클라이언트용)
+    """
+    name: str
+    fetch: Callable[..., Any]
+    available: Optional[Callable[[], bool]] = None
+    empty_is_error: bool = True
+
+
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=PROVIDER_HEDGE_WORKERS, thread_name_prefix="provider-hedge")
+        return _hedge_pool
+
+
+def _is_empty(result: Any) -> bool:
+    if result is None:
+        return True
+    try:
+        return len(result) == 0
+    except TypeError:
+        return False
+
+
+class ProviderRouter:
+    """공급자 목록을 상태 순으로 시도 (서킷 브레이커 + 선택적 헤지)"""
+
+    def __init__(self, name: str, providers: List[Provider], hedge: bool = PROVIDER_HEDGE):
+        self.name = name
+        self.providers = providers
+        self.hedge = hedge
+
+    def order(self) -> List[Provider]:
+        """
+        시도 순서 (열린 공급자 제외)
+
+        반열림(시험 호출 대기)이 먼저 - 정상 공급자만 쓰면 복구 여부를 확인할 기회가 없음.
+        지연은 _LATENCY_BUCKET_MS 이상부터 2배 단위 구간으로 비교 (비슷하면 등록 순 유지 - 주 공급자가 오락가락하지 않도록),
+        지연 기록이 없는 공급자는 가장 빠른 구간과 같은 것으로 봄
+        """
+        candidates = []
+        for index, provider in enumerate(self.providers):
+            if provider.available is not None and not provider.available():
+                continue
+            state = health(provider.name)
+            current = state.peek_state()
+            if current == OPEN:
+                metrics.PROVIDER_CALLS.inc(router=self.name, provider=provider.name, outcome="skipped")
+                continue
+            latency_bucket = (math.floor(math.log2(max(state.ewma_ms, _LATENCY_BUCKET_MS) / _LATENCY_BUCKET_MS))
+                              if state.ewma_ms is not None else None)
+            candidates.append([
+                0 if current == HALF_OPEN else 1,
+                round(state.error_rate(), 1),
+                latency_bucket,
+                index,
+                provider,
+            ])
+
+        known = [c[2] for c in candidates if c[2] is not None]
+        for c in candidates:
+            if c[2] is None:
+                c[2] = min(known, default=0)
+        return [c[-1] for c in sorted(candidates, key=lambda c: c[:4])]
+
+    def _attempt(self, provider: Provider, args, kwargs) -> Tuple[bool, Any]:
+        """공급자 1회 호출 + 상태 기록 → (성공 여부, 결과)"""
+        state = health(provider.name)
+        if not state.allow():
+            metrics.PROVIDER_CALLS.inc(router=self.name, provider=provider.name, outcome="skipped")
+            return False, None
+
+        started = time.perf_counter()
+        try:
+            result = provider.fetch(*args, **kwargs)
+            error = provider.empty_is_error and _is_empty(result)
+        except Exception as e:
+            print(f"⚠️ {self.name}: {provider.name} 실패 - {str(e)[:80]}")
+            result, error = None, True
+        state.record(not error, time.perf_counter() - started)
+        metrics.PROVIDER_CALLS.inc(router=self.name, provider=provider.name, outcome="failure" if error else "success")
+        return (not error and not _is_empty(result)), result
+
+    def call(self, *args, **kwargs) -> Tuple[Optional[str], Any]:
+        """
+        건강한 공급자부터 조회
+
+        Returns:
+            (공급자 이름, 결과) - 모두 실패하거나 차단 중이면 (None, None)
+        """
+        order = self.order()
+        if not order:
+            return None, None
+        if self.hedge and len(order) > 1:
+            return self._call_hedged(order, args, kwargs)
+
+        for provider in order:
+            ok, result = self._attempt(provider, args, kwargs)
+            if ok:
+                return provider.name, result
+        return None, None
+
+    def _call_hedged(self, order: List[Provider], args, kwargs) -> Tuple[Optional[str], Any]:
+        """앞 공급자가 p90 안에 응답하지 않으면 다음 공급자 동시 호출 (먼저 성공한 결과)"""
+        pool = _pool()
+        pending = {}
+        queue = list(order)
+
+        def launch():
+            provider = queue.pop(0)
+            ctx = contextvars.copy_context()  # 요청 컨텍스트 (Server-Timing 등) 유지
+            pending[pool.submit(ctx.run, self._attempt, provider, args, kwargs)] = provider
+            return provider
+
+        last = launch()
+        while pending:
+            p90 = health(last.name).p90_ms() if queue else None
+            timeout = max(p90, PROVIDER_HEDGE_MIN_MS) / 1000 if p90 is not None else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                metrics.PROVIDER_CALLS.inc(router=self.name, provider=queue[0].name, outcome="hedged")
+                last = launch()
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                ok, result = future.result()
+                if ok:
+                    return provider.name, result  # 남은 호출은 백그라운드에서 끝나며 상태만 기록
+            if not pending and queue:
+                last = launch()
+        return None, None
+
+
+def status() -> Dict[str, Dict[str, Any]]:
+    """공급자별 브레이커 상태 / 오류율 / 지연 (모니터링용)"""
+    with _health_lock:
+        names = sorted(_health)
+    return {name: health(name).status() for name in names}
@@ -0,0 +1,197 @@
+"""
+실시간 시세 허브
+구독 중인 종목을 공유 폴러 1개가 주기적으로 조회하고, 바뀐 시세만 구독자에게 전달
+업스트림 호출 수 = 구독 종목 수 (접속자 수와 무관)
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger("stock_radar")
+
+
+class QuoteSubscription:
+    """
+    연결 1개의 구독 상태
+
+    - 전송 대기열은 크기 제한 (느린 클라이언트가 폴러를 막지 않음)
+    - 대기열이 가득 차면 가장 오래된 메시지를 버리고 최신 시세를 넣는다
+    """
+
+    def __init__(self, tickers: Iterable[str], queue_size: int):
+        self.tickers: Set[str] = set(tickers)
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, message: Dict[str, Any]):
+        """메시지 추가 (가득 차면 가장 오래된 메시지 폐기)"""
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                return
+            except asyncio.QueueFull:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+
+
+class QuoteHub:
+    """공유 시세 폴러 + 구독자 팬아웃"""
+
+    def __init__(self, fetcher: Callable[[str], Optional[Dict[str, Any]]],
+                 interval_seconds: float = 15.0, queue_size: int = 32, max_workers: int = 4):
+        """
+        Args:
+            fetcher: 종목 코드 → 시세 dict (동기 함수, 스레드풀에서 실행)
+            interval_seconds: 폴링 주기
+            queue_size: 연결별 전송 대기열 크기
+            max_workers: 동시 업스트림 조회 수
+        """
+        self.fetcher = fetcher
+        self.interval_seconds = interval_seconds
+        self.queue_size = queue_size
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quote-poller")
+        self._subscriptions: Set[QuoteSubscription] = set()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"polls": 0, "fetches": 0, "fetch_errors": 0, "broadcasts": 0}
+
+    # ========== 수명 주기 ==========
+
+    def start(self):
+        """폴러 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"✅ 시세 폴러 시작 (주기 {self.interval_seconds}초)")
+
+    async def stop(self):
+        """폴러 중지"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=False)
+
+    # ========== 구독 ==========
+
+    def subscribe(self, tickers: Iterable[str]) -> QuoteSubscription:
+        """구독 등록 - 이미 알고 있는 시세는 바로 전달"""
+        sub = QuoteSubscription(self._normalize(tickers), self.queue_size)
+        self._subscriptions.add(sub)
+        self._on_tickers_added(sub, sub.tickers)
+        return sub
+
+    def update(self, sub: QuoteSubscription, add: Iterable[str] = (), remove: Iterable[str] = ()):
+        """구독 종목 추가/해제"""
+        added = self._normalize(add) - sub.tickers
+        sub.tickers -= self._normalize(remove)
+        sub.tickers |= added
+        self._on_tickers_added(sub, added)
+
+    def unsubscribe(self, sub: QuoteSubscription):
+        """구독 해제 - 아무도 구독하지 않는 종목은 다음 주기부터 조회 중단"""
+        self._subscriptions.discard(sub)
+
+    def active_tickers(self) -> Set[str]:
+        """현재 구독 중인 종목 (중복 제거)"""
+        tickers: Set[str] = set()
+        for sub in self._subscriptions:
+            tickers |= sub.tickers
+        return tickers
+
+    def stats(self) -> Dict[str, Any]:
+        """허브 통계"""
+        return {
+            **self._stats,
+            "running": bool(self._task and not self._task.done()),
+            "interval_seconds": self.interval_seconds,
+            "connections": len(self._subscriptions),
+            "tickers": len(self.active_tickers()),
+            "dropped_messages": sum(s.dropped for s in self._subscriptions),
+        }
+
+    # ========== 내부 ==========
+
+    @staticmethod
+    def _normalize(tickers: Iterable[str]) -> Set[str]:
+        return {t.strip().upper() for t in tickers if t and t.strip()}
+
+    def _on_tickers_added(self, sub: QuoteSubscription, tickers: Set[str]):
+        missing = False
+        for ticker in tickers:
+            quote = self._latest.get(ticker)
+            if quote:
+                sub.offer(quote)
+            else:
+                missing = True
+        # 처음 보는 종목은 다음 주기를 기다리지 않고 바로 조회
+        if missing and self._wakeup:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await self._poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ 시세 폴링 오류: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _poll_once(self):
+        tickers = self.active_tickers()
+
+        # 구독이 끊긴 종목의 마지막 시세는 정리
+        for ticker in list(self._latest):
+            if ticker not in tickers:
+                del self._latest[ticker]
+
+        if not tickers:
+            return
+
+        self._stats["polls"] += 1
+        loop = asyncio.get_running_loop()
+        ordered = sorted(tickers)
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self.fetcher, t) for t in ordered),
+            return_exceptions=True
+        )
+        self._stats["fetches"] += len(ordered)
+
+        for ticker, quote in zip(ordered, results):
+            if isinstance(quote, Exception) or not quote:
+                if isinstance(quote, Exception):
+                    self._stats["fetch_errors"] += 1
+                    logger.warning(f"⚠️ 시세 조회 실패 ({ticker}): {str(quote)[:50]}")
+                continue
+
+            previous = self._latest.get(ticker)
+            if previous and (previous.get("price"), previous.get("previous_close")) == \
+                    (quote.get("price"), quote.get("previous_close")):
+                continue
+
+            message = {"type": "quote", **quote, "ticker": ticker, "ts": time.time()}
+            self._latest[ticker] = message
+            self._broadcast(ticker, message)
+
+    def _broadcast(self, ticker: str, message: Dict[str, Any]):
+        for sub in list(self._subscriptions):
+            if ticker in sub.tickers:
+                sub.offer(message)
+                self._stats["broadcasts"] += 1
@@ -0,0 +1,268 @@
+"""
+현재가 조회 서비스
+캐시(stock_prices_cache.json) → Kiwoom API → Yahoo Finance 순서로 폴백
+(업스트림 순서 / 장애 차단은 provider_router - 서킷 브레이커가 열린 공급자는 건너뜀)
+/api/price 엔드포인트와 실시간 시세 폴러(QuoteHub)가 공유
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from services import market_calendar, metrics
+from services.provider_router import Provider, ProviderRouter
+
+logger = logging.getLogger("stock_radar")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_FILE = os.path.join(BASE_DIR, "data", "stock_prices_cache.json")
+
+# 캐시 유효 시간 (분)
+DEFAULT_MAX_AGE_MINUTES = 30
+
+# 장 마감 후 이 시간이 지나 저장된 시세는 종가 확정분으로 보고 다음 개장까지 재조회하지 않음 (분)
+QUOTE_SETTLE_MINUTES = int(os.getenv("QUOTE_SETTLE_MINUTES", "10"))
+
+_cache_lock = threading.Lock()
+
+# Kiwoom 클라이언트는 토큰을 재사용하도록 프로세스당 1개만 생성
+_kiwoom_client = None
+_kiwoom_unavailable = False
+_kiwoom_lock = threading.Lock()
+
+
+def is_korean_ticker(ticker: str) -> bool:
+    """6자리 숫자면 한국 종목"""
+    return ticker.isdigit() and len(ticker) == 6
+
+
+def get_kiwoom_client():
+    """공유 Kiwoom 클라이언트 (키 미설정이면 None - 재시도하지 않음)"""
+    global _kiwoom_client, _kiwoom_unavailable
+
+    with _kiwoom_lock:
+        if _kiwoom_client is None and not _kiwoom_unavailable:
+            try:
+                from services.kiwoom_openapi import KiwoomOpenAPI
+                _kiwoom_client = KiwoomOpenAPI()
+            except ValueError as e:
+                logger.warning(f"⚠️ Kiwoom API 비활성화: {e}")
+                _kiwoom_unavailable = True
+        return _kiwoom_client
+
+
+def _read_cache() -> Dict[str, Any]:
+    """캐시 파일 전체 조회 (없거나 깨졌으면 빈 dict)"""
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"⚠️ Cache load error: {str(e)}")
+        return {}
+
+
+def get_cached_entry(ticker: str) -> Optional[Dict[str, Any]]:
+    """캐시 파일의 종목 항목 (name, current_price, previous_close, currency, timestamp)"""
+    if is_korean_ticker(ticker):
+        return _read_cache().get('korean_stocks', {}).get(ticker)
+    return _read_cache().get('us_stocks', {}).get(ticker)
+
+
+def _write_cache_entry(section: str, key: str, entry: Dict[str, Any]):
+    """캐시 항목 1개 갱신 (읽기-수정-쓰기를 잠금으로 보호, 원자적 교체)"""
+    with _cache_lock:
+        cache_data = _read_cache()
+        cache_data.setdefault(section, {})[key] = entry
+
+        tmp_path = CACHE_FILE + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, CACHE_FILE)
+
+
+def _cache_time(stock_data: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(stock_data.get('timestamp', '2000-01-01T00:00:00Z').replace('Z', '+00:00'))
+
+
+def _cache_age_minutes(stock_data: Dict[str, Any]) -> float:
+    cache_time = _cache_time(stock_data)
+    now = datetime.now(cache_time.tzinfo)
+    return (now - cache_time).total_seconds() / 60
+
+
+def _is_settled(stock_data: Dict[str, Any], ticker: str) -> bool:
+    """
+    장 마감 후 저장된 캐시인지 (다음 개장 전까지는 가격이 바뀌지 않으므로 나이와 무관하게 유효)
+    """
+    market = market_calendar.market_of(ticker)
+    if market_calendar.is_open(market):
+        return False
+    closed_at = market_calendar.last_close(market)
+    cache_time = _cache_time(stock_data)
+    return (closed_at is not None and cache_time.tzinfo is not None
+            and cache_time >= closed_at + timedelta(minutes=QUOTE_SETTLE_MINUTES))
+
+
+def get_quote(ticker: str, max_age_minutes: float = DEFAULT_MAX_AGE_MINUTES) -> Optional[Dict[str, Any]]:
+    """
+    현재가 조회 - 캐시 먼저, 오래되면 Kiwoom/Yahoo에서 갱신
+
+    Args:
+        ticker: 종목 코드 (한국 6자리 또는 미국 티커)
+        max_age_minutes: 이 시간 이내의 캐시는 그대로 사용
+
+    Returns:
+        {ticker, name, price, previous_close, currency, source} 또는 None (데이터 없음)
+    """
+    ticker_upper = ticker.upper()
+    is_korean_stock = is_korean_ticker(ticker)
+    section = 'korean_stocks' if is_korean_stock else 'us_stocks'
+    cache_key = ticker if is_korean_stock else ticker_upper
+
+    # ✅ 1단계: 캐시 파일 확인
+    stock_data = _read_cache().get(section, {}).get(cache_key)
+    if stock_data:
+        try:
+            age_minutes = _cache_age_minutes(stock_data)
+            if age_minutes < max_age_minutes or _is_settled(stock_data, ticker):
+                metrics.cache_result("quote", hit=True)
+                return {
+                    "ticker": ticker,
+                    "name": stock_data.get("name", ""),
+                    "price": stock_data.get("current_price"),
+                    "previous_close": stock_data.get("previous_close"),
+                    "currency": stock_data.get("currency", ""),
+                    "source": "Cache (KRX)" if is_korean_stock else "Cache (20분지연)"
+                }
+            logger.info(f"🔄 캐시 갱신: {ticker} (나이: {age_minutes:.0f}분)")
+        except Exception as e:
+            logger.warning(f"⚠️ Cache load error: {str(e)}")
+
+    # ✅ 2단계: 캐시 없거나 오래됨 → 공급자 라우터 (Kiwoom / Yahoo Finance)에서 조회
+    metrics.cache_result("quote", hit=False)
+    logger.info(f"📡 실시간 조회: {ticker}")
+
+    provider, fetched = _QUOTE_ROUTERS["KR" if is_korean_stock else "US"].call(ticker)
+
+    if fetched is None:
+        # 모든 공급자 실패/차단 시 캐시 반환
+        if stock_data:
+            return {
+                "ticker": ticker,
+                "name": stock_data.get("name", ""),
+                "price": stock_data.get("current_price"),
+                "previous_close": stock_data.get("previous_close"),
+                "currency": stock_data.get("currency", ""),
+                "source": "Cache (Fallback)"
+            }
+        return None
+
+    quote = {"ticker": ticker, "name": stock_data.get("name") if stock_data else None, **fetched}
+
+    if provider == "kiwoom":
+        if not stock_data:  # 종목명을 아는 경우만 저장 ("Unknown"으로 덮어쓰지 않음)
+            quote["name"] = "Unknown"
+            return quote
+    elif not quote["name"]:
+        # 기존 이름이 없으면 Yahoo 종목명
+        quote["name"] = _yahoo_name(ticker, cache_key)
+
+    # ✅ 3단계: 캐시 파일에 자동 저장
+    _save_quote(section, cache_key, quote)
+    return quote
+
+
+# ========== 시세 공급자 ==========
+
+def _yahoo_symbol(ticker: str) -> str:
+    return f"{ticker}.KS" if is_korean_ticker(ticker) else ticker.upper()
+
+
+def _kiwoom_quote(ticker: str) -> Optional[Dict[str, Any]]:
+    """Kiwoom 일봉 마지막 봉 기준 시세 (종목명 제외)"""
+    kiwoom_data = get_kiwoom_client().get_daily_chart(ticker.upper())
+    if not kiwoom_data:
+        return None
+    latest = kiwoom_data[-1]
+    return {
+        "price": float(latest.get('close', 0)),
+        "previous_close": float(latest.get('open', latest.get('close', 0))),
+        "currency": "KRW",
+        "source": "Kiwoom API"
+    }
+
+
+def _yahoo_quote(ticker: str) -> Optional[Dict[str, Any]]:
+    """Yahoo Finance 최근 5일 종가 기준 시세 (종목명 제외)"""
+    import yfinance as yf
+
+    is_korean_stock = is_korean_ticker(ticker)
+    hist = metrics.call("yfinance", yf.Ticker(_yahoo_symbol(ticker)).history, period='5d')
+    if hist.empty:
+        return None
+
+    current_price = float(hist['Close'].iloc[-1])
+    previous_close = float(hist['Close'].iloc[-2]) if len(hist) >= 2 else current_price
+
+    if is_korean_stock:
+        price, prev = int(current_price), int(previous_close)
+    else:
+        price, prev = round(current_price, 2), round(previous_close, 2)
+
+    return {
+        "price": price,
+        "previous_close": prev,
+        "currency": "KRW" if is_korean_stock else "USD",
+        "source": "Yahoo Finance (Updated)"
+    }
+
+
+def _yahoo_name(ticker: str, cache_key: str) -> str:
+    """Yahoo 종목명 (조회 실패 시 'Stock <코드>')"""
+    import yfinance as yf
+
+    fallback = f'Stock {cache_key}'
+    try:
+        info = metrics.call("yfinance", lambda: yf.Ticker(_yahoo_symbol(ticker)).info)
+        return info.get('longName', fallback)
+    except Exception as e:
+        logger.warning(f"⚠️ Yahoo 종목명 조회 실패 ({ticker}): {str(e)[:50]}")
+        return fallback
+
+
+def kiwoom_available() -> bool:
+    """Kiwoom 키 설정 여부 (라우터 available 콜백)"""
+    return get_kiwoom_client() is not None
+
+
+# 한국: Kiwoom → Yahoo(.KS), 미국: Yahoo - 순서는 공급자 상태에 따라 바뀜
+# Yahoo의 빈 결과는 상장폐지/오타 티커일 수 있어 장애로 집계하지 않음
+_QUOTE_ROUTERS = {
+    "KR": ProviderRouter("kr_quote", [
+        Provider("kiwoom", _kiwoom_quote, available=kiwoom_available),
+        Provider("yfinance", _yahoo_quote, empty_is_error=False),
+    ]),
+    "US": ProviderRouter("us_quote", [
+        Provider("yfinance", _yahoo_quote, empty_is_error=False),
+    ]),
+}
+
+
+def _save_quote(section: str, cache_key: str, quote: Dict[str, Any]):
+    """업스트림 조회 결과를 캐시 파일에 저장 (timestamp는 UTC)"""
+    try:
+        _write_cache_entry(section, cache_key, {
+            "name": quote["name"],
+            "current_price": quote["price"],
+            "previous_close": quote["previous_close"],
+            "currency": quote["currency"],
+            "timestamp": datetime.utcnow().isoformat() + 'Z'
+        })
+        logger.info(f"✅ 캐시 저장: {quote['ticker']}")
+    except Exception as e:
+        logger.warning(f"⚠️ Cache save error: {str(e)}")
@@ -0,0 +1,74 @@
+"""
+응답 직렬화/압축 헬퍼
+- JSON: orjson이 있으면 사용 (없으면 표준 json)
+- 압축: Accept-Encoding 협상 (br은 brotli 설치 시에만)
+"""
+
+import gzip
+import json
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# 이보다 작은 응답은 압축하지 않음 (헤더 오버헤드가 더 큼)
+MIN_COMPRESS_BYTES = 1024
+
+
+def dumps_json(obj: Any) -> bytes:
+    """JSON 직렬화 (UTF-8 bytes)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding 헤더 → 'br' | 'gzip' | None"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+
+    if BROTLI_AVAILABLE and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """
+    협상된 방식으로 압축
+
+    Returns:
+        (body, content_encoding) - 압축하지 않았으면 encoding은 None
+    """
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding == "br":
+        return brotli.compress(body, quality=5), "br"
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, None
@@ -0,0 +1,207 @@
+"""
+AI Agent 분석 결과 캐시
+정규화된 요청 + 데이터 스냅샷 버전을 키로 하는 2단 캐시 (메모리 LRU + 디스크)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from services import metrics
+
+# /api/agent/analyze 기본값 (server_v2와 동일)
+DEFAULT_SECTORS = ["반도체", "방산", "2차전지"]
+DEFAULT_TICKERS = ["005930", "000660", "012450"]
+DEFAULT_MAX_POSITIONS = 5    # 포트폴리오 최대 선정 종목 수
+MAX_POSITIONS_LIMIT = 100    # AgentOrchestrator.MAX_PLAN_CANDIDATES
+
+
+def normalize_analysis_request(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    분석 요청 정규화 (결과에 영향을 주는 필드만)
+
+    종목/섹터 순서는 결과 정렬에 영향을 주므로 유지한다.
+    """
+    tickers = body.get("tickers", DEFAULT_TICKERS) or []
+    sectors = body.get("sectors", DEFAULT_SECTORS) or []
+
+    try:
+        account_size = int(body.get("account_size") or 0)
+    except (TypeError, ValueError):
+        account_size = 0
+
+    try:
+        max_positions = int(body.get("max_positions") or DEFAULT_MAX_POSITIONS)
+    except (TypeError, ValueError):
+        max_positions = DEFAULT_MAX_POSITIONS
+    max_positions = min(max(max_positions, 1), MAX_POSITIONS_LIMIT)
+
+    return {
+        "tickers": [str(t).strip().upper() for t in tickers],
+        "sectors": [str(s).strip() for s in sectors],
+        "period": body.get("period", "단기"),
+        "risk_profile": body.get("risk_profile", "중립"),
+        "account_size": account_size,
+        "max_positions": max_positions,
+    }
+
+
+class AnalysisResultCache:
+    """
+    분석 결과 캐시
+
+    - 1단: 메모리 LRU (max_entries 초과 시 가장 오래 안 쓴 항목 제거)
+    - 2단: 디스크 JSON (선택, disk_dir 지정 시)
+    - 데이터 버전이 바뀌면 invalidate_all()로 전체 무효화
+    """
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: int = 600,
+                 disk_dir: Optional[str] = None, disk_max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits_memory": 0, "hits_disk": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(normalized_request: Dict[str, Any], data_version: str) -> str:
+        """요청 + 데이터 버전 → 캐시 키"""
+        raw = json.dumps(normalized_request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(f"{data_version}|{raw}".encode()).hexdigest()[:32]
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        캐시 조회
+
+        Returns:
+            (entry, tier) - tier는 'memory' | 'disk', 미스면 (None, None)
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry["created_at"] <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self._stats["hits_memory"] += 1
+                metrics.cache_result("analysis", hit=True)
+                return entry, "memory"
+            if entry:
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        if entry and now - entry["created_at"] <= self.ttl_seconds:
+            self._put_memory(key, entry)
+            with self._lock:
+                self._stats["hits_disk"] += 1
+            metrics.cache_result("analysis", hit=True)
+            return entry, "disk"
+
+        with self._lock:
+            self._stats["misses"] += 1
+        metrics.cache_result("analysis", hit=False)
+        return None, None
+
+    def set(self, key: str, result: Dict[str, Any], data_version: str,
+            saved_path: Optional[str] = None) -> Dict[str, Any]:
+        """캐시 저장"""
+        entry = {
+            "created_at": time.time(),
+            "data_version": data_version,
+            "saved_path": saved_path,
+            "result": result,
+        }
+        self._put_memory(key, entry)
+        self._write_disk(key, entry)
+        return entry
+
+    def mark_saved(self, key: str, saved_path: str):
+        """결과 파일 저장 경로 기록 (같은 결과의 중복 저장 방지)"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                entry["saved_path"] = saved_path
+        if entry:
+            self._write_disk(key, entry)
+
+    def invalidate_all(self, *_args):
+        """전체 무효화 (데이터 버전 변경 시)"""
+        with self._lock:
+            self._memory.clear()
+            self._stats["invalidations"] += 1
+
+        if self.disk_dir:
+            for filename in os.listdir(self.disk_dir):
+                if filename.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.disk_dir, filename))
+                    except OSError:
+                        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries_memory": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_enabled": bool(self.disk_dir),
+            }
+
+    # ========== 내부 헬퍼 ==========
+
+    def _put_memory(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]):
+        if not self.disk_dir:
+            return
+        try:
+            tmp_path = self._disk_path(key) + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self._disk_path(key))
+            self._prune_disk()
+        except OSError as e:
+            print(f"⚠️ 분석 캐시 디스크 저장 실패: {e}")
+
+    def _prune_disk(self):
+        """디스크 항목 수 제한 (오래된 파일부터 삭제)"""
+        files = [
+            os.path.join(self.disk_dir, f)
+            for f in os.listdir(self.disk_dir) if f.endswith(".json")
+        ]
+        if len(files) <= self.disk_max_entries:
+            return
+        files.sort(key=lambda p: os.path.getmtime(p))
+        for path in files[:len(files) - self.disk_max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,163 @@
+"""
+서버 기동 시간 관리 (단계별 시간 측정 + 무거운 서비스 지연 초기화)
+
+    profiler = StartupProfiler()
+    with profiler.phase("init_db"):
+        init_db()
+
+    agents = LazyService("ai_agents", _build_agents)   # import/생성은 첫 get() 때
+    start_warmup([agents])                              # STARTUP_WARMUP 모드에 따라 백그라운드 예열
+
+    STARTUP_WARMUP=background (기본) : 기동 직후 백그라운드 스레드에서 예열, 요청은 바로 받음
+    STARTUP_WARMUP=lazy              : 첫 요청에서 초기화 (서버리스 콜드 스타트 최소화)
+    STARTUP_WARMUP=eager             : 기동 단계에서 모두 초기화 (기존 동작)
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("stock_radar.startup")
+
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background").lower()
+
+# 초기화에 실패한 서비스를 다시 시도하기까지 대기 시간 (요청마다 재시도하지 않도록)
+STARTUP_RETRY_SECONDS = float(os.getenv("STARTUP_RETRY_SECONDS", "60"))
+
+COLD, WARMING, READY, FAILED = "cold", "warming", "ready", "failed"
+
+
+class StartupProfiler:
+    """기동 단계별 소요 시간 기록 (생성 시점 기준)"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+
+    def mark(self, name: str):
+        """생성 시점(또는 직전 mark)부터 지금까지를 한 단계로 기록"""
+        last_end = self.phases[-1]["end_s"] if self.phases else 0.0
+        now = time.perf_counter() - self.started_at
+        self.phases.append({"name": name, "seconds": round(now - last_end, 4), "end_s": round(now, 4)})
+
+    @contextmanager
+    def phase(self, name: str):
+        """with 블록 소요 시간 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            end_s = time.perf_counter() - self.started_at
+            self.phases.append({"name": name, "seconds": round(elapsed, 4), "end_s": round(end_s, 4)})
+            logger.info(f"⏱️ 기동 단계 {name}: {elapsed * 1000:.0f}ms")
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "warmup_mode": STARTUP_WARMUP,
+            "phases": list(self.phases),
+            "total_s": self.phases[-1]["end_s"] if self.phases else 0.0,
+        }
+
+
+class LazyService:
+    """
+    첫 사용 시 생성되는 서비스 (스레드 안전)
+
+    factory 안에서 무거운 모듈을 import하므로 서버 import 시점에는 비용이 없음.
+    생성 실패 시 None을 반환하고 STARTUP_RETRY_SECONDS 후 다시 시도
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._instance: Any = None
+        self._state = COLD
+        self._error: Optional[str] = None
+        self._failed_at = 0.0
+        self._init_seconds: Optional[float] = None
+
+    def get(self) -> Any:
+        """
+        인스턴스 반환 (없으면 생성, 다른 스레드가 생성 중이면 완료까지 대기)
+
+        Returns:
+            서비스 인스턴스 (생성 실패 시 None)
+        """
+        if self._state == READY:
+            return self._instance
+
+        with self._lock:
+            if self._state == READY:
+                return self._instance
+            if self._state == FAILED and time.monotonic() - self._failed_at < STARTUP_RETRY_SECONDS:
+                return None
+
+            self._state = WARMING
+            started = time.perf_counter()
+            try:
+                instance = self._factory()
+            except Exception as e:
+                self._state = FAILED
+                self._error = str(e)
+                self._failed_at = time.monotonic()
+                logger.error(f"⚠️ {self.name} 초기화 실패: {e}")
+                return None
+
+            self._init_seconds = round(time.perf_counter() - started, 4)
+            self._instance = instance
+            self._state = READY
+            logger.info(f"✅ {self.name} 초기화 완료 ({self._init_seconds * 1000:.0f}ms)")
+            return instance
+
+    def peek(self) -> Any:
+        """초기화를 일으키지 않고 현재 인스턴스 반환 (없으면 None)"""
+        return self._instance if self._state == READY else None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def status(self) -> Dict[str, Any]:
+        return {"state": self._state, "init_seconds": self._init_seconds, "error": self._error}
+
+
+def warm(services: Iterable[LazyService]):
+    """서비스 순서대로 초기화 (실패는 각 서비스 상태에 기록)"""
+    for service in services:
+        service.get()
+
+
+def start_warmup(services: Iterable[LazyService]) -> Optional[threading.Thread]:
+    """
+    STARTUP_WARMUP 모드에 따라 예열 시작
+
+    Returns:
+        background 모드의 예열 스레드 (다른 모드는 None)
+    """
+    services = list(services)
+    if STARTUP_WARMUP == "lazy":
+        return None
+    if STARTUP_WARMUP == "eager":
+        warm(services)
+        return None
+
+    thread = threading.Thread(target=warm, args=(services,), name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def overall_state(services: Iterable[LazyService]) -> str:
+    """서비스 묶음 상태: 하나라도 실패면 failed, 모두 준비면 ready, 그 외 warming/cold"""
+    states = {s.state for s in services}
+    if FAILED in states:
+        return FAILED
+    if states <= {READY}:
+        return READY
+    if WARMING in states or STARTUP_WARMUP != "lazy":
+        return WARMING
+    return COLD
@@ -9,6 +9,9 @@ import numpy as np
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from .nh_investment_api import NHInvestmentAPI
+from .candle_patterns import (
+    PATTERN_BIAS, detect_pattern_masks, decode_mask, stack_ohlc, pattern_hit_rates
+)
 
 class TechnicalAnalysisService:
     """
@@ -20,7 +23,7 @@ class TechnicalAnalysisService:
     3. RSI (Relative Strength Index)
     4. MACD
     5. 거래량 분석
-    6. 캔들 패턴 인식
+    6. 캔들 패턴 인식 (전체 히스토리 / 다종목 벡터화)
     7. 지지/저항선
     """
     
@@ -220,59 +223,50 @@ class TechnicalAnalysisService:
     
     def detect_candle_patterns(self, df: pd.DataFrame) -> List[str]:
         """
-        캔들 패턴 인식
+        캔들 패턴 인식 (최근 봉)
         
         Returns:
-            ['DOJI', 'HAMMER', 'SHOOTING_STAR', ...]
+            ['DOJI', 'HAMMER', 'SHOOTING_STAR', ...] - candle_patterns.PATTERNS 순서
         """
-        patterns = []
-        
         if len(df) < 3:
-            return patterns
+            return []
         
-        latest = df.iloc[-1]
-        prev = df.iloc[-2]
-        
-        open_price = latest['open']
-        close = latest['close']
-        high = latest['high']
-        low = latest['low']
-        
-        body = abs(close - open_price)
-        upper_shadow = high - max(open_price, close)
-        lower_shadow = min(open_price, close) - low
-        
-        # 도지 (Doji)
-        if body < (high - low) * 0.1:
-            patterns.append('DOJI')
-        
-        # 망치형 (Hammer)
-        if (lower_shadow > body * 2) and (upper_shadow < body * 0.5) and close > open_price:
-            patterns.append('HAMMER')
-        
-        # 역망치형 (Inverted Hammer)
-        if (upper_shadow > body * 2) and (lower_shadow < body * 0.5) and close > open_price:
-            patterns.append('INVERTED_HAMMER')
-        
-        # 유성형 (Shooting Star)
-        if (upper_shadow > body * 2) and (lower_shadow < body * 0.5) and close < open_price:
-            patterns.append('SHOOTING_STAR')
-        
-        # 강세 장악형 (Bullish Engulfing)
-        if (prev['close'] < prev['open'] and 
-            close > open_price and 
-            close > prev['open'] and 
-            open_price < prev['close']):
-            patterns.append('BULLISH_ENGULFING')
-        
-        # 약세 장악형 (Bearish Engulfing)
-        if (prev['close'] > prev['open'] and 
-            close < open_price and 
-            close < prev['open'] and 
-            open_price > prev['close']):
-            patterns.append('BEARISH_ENGULFING')
-        
-        return patterns
+        masks = detect_pattern_masks(df['open'], df['high'], df['low'], df['close'])
+        return decode_mask(masks[-1])
+    
+    def scan_patterns(self, tickers: List[str], days: int = 120) -> Dict:
+        """
+        여러 종목 캔들 패턴 일괄 스캔 + 패턴 적중률
+        
+        Returns:
+            {
+                'latest': {ticker: [패턴, ...]},   # 오늘 패턴이 있는 종목
+                'hit_rates': {패턴: {'count', 'hit_rate', 'avg_return'}},
+                'failed': [조회 실패 종목]
+            }
+        """
+        frames = {}
+        failed = []
+        for ticker in tickers:
+            try:
+                frames[ticker] = self.get_chart_data(ticker, days=days)
+            except Exception as e:
+                print(f"⚠️ {ticker} 차트 조회 실패: {e}")
+                failed.append(ticker)
+        
+        names, o, h, l, c = stack_ohlc(frames)
+        if not names:
+            return {'latest': {}, 'hit_rates': {}, 'failed': failed}
+        
+        masks = detect_pattern_masks(o, h, l, c)
+        return {
+            'latest': {
+                ticker: decode_mask(mask)
+                for ticker, mask in zip(names, masks[:, -1]) if mask
+            },
+            'hit_rates': pattern_hit_rates(masks, c),
+            'failed': failed
+        }
     
     def get_comprehensive_analysis(self, ticker: str) -> Dict:
         """
@@ -344,15 +338,9 @@ class TechnicalAnalysisService:
         elif momentum['macd_signal'] == 'BEARISH':
             score -= 2
         
-        # 캔들 패턴 점수
-        bullish_patterns = ['HAMMER', 'INVERTED_HAMMER', 'BULLISH_ENGULFING']
-        bearish_patterns = ['SHOOTING_STAR', 'BEARISH_ENGULFING']
-        
+        # 캔들 패턴 점수 (상승 +1, 하락 -1)
         for pattern in patterns:
-            if pattern in bullish_patterns:
-                score += 1
-            elif pattern in bearish_patterns:
-                score -= 1
+            score += PATTERN_BIAS.get(pattern, 0)
         
         # 최종 판단
         if score >= 5:
@@ -0,0 +1,368 @@
+"""
+매매 계획 몬테카를로 시뮬레이터
+저장된 일별 시세(stock_prices)의 일간 수익률을 블록 부트스트랩으로 재표본해
+분할 진입/손절/분할 익절 계획을 수천 개 경로에서 한 번에(NumPy 벡터화) 검증
+
+    returns = load_daily_returns("005930")
+    result = simulate_plan(plan, returns, n_paths=10000, horizon=60)
+
+체결 규칙 (일봉 종가 기준):
+    - 진입/추가: 종가가 지정가 이하가 된 날 그 종가에 체결
+    - 손절: 첫 진입 이후 종가가 손절가 이하가 된 날 그 종가에 전량 청산 (갭 손실 반영)
+    - 익절: 종가가 목표가 이상이 된 날 목표가에 (그날 보유 기준 체결 수량의) percent% 청산
+    - 기간 종료 시 남은 수량은 마지막 종가로 평가
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 수익률 표본이 이보다 짧으면 시뮬레이션하지 않음
+MIN_RETURN_OBSERVATIONS = int(os.getenv("SIM_MIN_OBSERVATIONS", "40"))
+DEFAULT_PATHS = int(os.getenv("SIM_DEFAULT_PATHS", "10000"))
+DEFAULT_HORIZON = 60
+DEFAULT_BLOCK_SIZE = 5
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# 같은 날 이벤트 처리 순서: 매수 → 손절 → 익절
+_BUY, _STOP, _SELL = 0, 1, 2
+
+# 최근 시뮬레이션 요약 (/trade_plan/stats 용)
+_history = deque(maxlen=int(os.getenv("SIM_HISTORY_SIZE", "500")))
+_history_lock = threading.Lock()
+
+
+# ========== 수익률 표본 ==========
+
+def load_daily_returns(ticker: str, days: int = 750) -> Optional[np.ndarray]:
+    """
+    stock_prices 테이블에서 일간 수익률 조회
+
+    Args:
+        ticker: 종목 코드
+        days: 조회 기간 (달력 기준 일수)
+
+    Returns:
+        일간 단순 수익률 배열 (표본 부족 시 None)
+    """
+    from services.price_history import load_close_matrix
+
+    found, closes = load_close_matrix([ticker], days=days)
+    if not found:
+        return None
+
+    close = closes[0]
+    close = close[~np.isnan(close)]
+    if len(close) < 2:
+        return None
+
+    returns = close[1:] / close[:-1] - 1
+    if len(returns) < MIN_RETURN_OBSERVATIONS:
+        return None
+    return returns
+
+
+def bootstrap_paths(returns: np.ndarray, n_paths: int, horizon: int,
+                    block_size: int = DEFAULT_BLOCK_SIZE,
+                    rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    블록 부트스트랩 수익률 경로 (변동성 군집/자기상관을 블록 단위로 보존)
+
+    Args:
+        returns: 과거 일간 수익률
+        n_paths: 경로 수
+        horizon: 경로 길이 (거래일)
+        block_size: 블록 길이 (1이면 단순 부트스트랩)
+
+    Returns:
+        (n_paths, horizon) 수익률 행렬
+    """
+    rng = rng or np.random.default_rng()
+    returns = np.asarray(returns, dtype=np.float64)
+    block_size = max(1, min(block_size, len(returns)))
+
+    n_blocks = -(-horizon // block_size)
+    starts = rng.integers(0, len(returns) - block_size + 1, size=(n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :horizon]
+    return returns[index]
+
+
+# ========== 계획 정규화 ==========
+
+def normalize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    매매 계획 → 시뮬레이션 입력
+
+    plan은 split_plan(TradePlanBuilder._generate_split_plan 형식:
+    action=진입/추가/손절/익절, percent, price)이 있으면 그것을 쓰고,
+    없으면 entry_price/stop_loss/target_1/target_2로 단기 계획(60/40, 50/50)을 구성
+
+    Returns:
+        {'start', 'entries': [(price, weight)], 'stop', 'exits': [(price, fraction)]}
+    """
+    split_plan = plan.get('split_plan') or []
+    entries, exits, stop = [], [], None
+
+    for step in split_plan:
+        action = step.get('action')
+        price = float(step.get('price', 0))
+        percent = float(step.get('percent', 0)) / 100
+        if action in ('진입', '추가'):
+            entries.append((price, percent))
+        elif action == '익절':
+            exits.append((price, percent))
+        elif action == '손절':
+            stop = price
+
+    if not entries:
+        entry = float(plan['entry_price'])
+        entries = [(entry, 0.6), (entry * 0.98, 0.4)]
+    if not exits:
+        exits = [(float(plan['target_1']), 0.5), (float(plan['target_2']), 0.5)]
+    if stop is None:
+        stop = float(plan['stop_loss'])
+
+    total = sum(w for _, w in entries)
+    if total <= 0:
+        raise ValueError("진입 비중 합계가 0입니다")
+
+    # 진입은 높은 가격부터(먼저 체결), 익절은 낮은 가격부터
+    entries = sorted(((p, w / total) for p, w in entries), key=lambda e: -e[0])
+    exits = sorted(exits, key=lambda e: e[0])
+    start = float(plan.get('current_price') or entries[0][0])
+
+    if stop >= entries[-1][0]:
+        raise ValueError("손절가는 마지막 진입가보다 낮아야 합니다")
+    if exits[0][0] <= entries[0][0]:
+        raise ValueError("목표가는 진입가보다 높아야 합니다")
+
+    return {'start': start, 'entries': entries, 'stop': float(stop), 'exits': exits}
+
+
+def _first_hit(mask: np.ndarray, horizon: int) -> np.ndarray:
+    """경로별 처음 True인 날 (없으면 horizon)"""
+    hit = mask.argmax(axis=1)
+    return np.where(mask.any(axis=1), hit, horizon)
+
+
+# ========== 시뮬레이션 ==========
+
+def simulate_plan(plan: Dict[str, Any], returns: np.ndarray,
+                  n_paths: int = DEFAULT_PATHS, horizon: int = DEFAULT_HORIZON,
+                  block_size: int = DEFAULT_BLOCK_SIZE,
+                  seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    매매 계획 1개 몬테카를로 시뮬레이션
+
+    Args:
+        plan: normalize_plan이 받는 형식의 매매 계획
+        returns: 과거 일간 수익률 (load_daily_returns)
+        n_paths: 경로 수
+        horizon: 보유 기간 (거래일)
+        block_size: 부트스트랩 블록 길이
+        seed: 난수 시드 (재현용)
+
+    Returns:
+        체결/목표 도달/손절 확률, 수익률·최대낙폭 분포 (수익률은 투입 금액 대비 %)
+    """
+    spec = normalize_plan(plan)
+    rng = np.random.default_rng(seed)
+
+    paths = spec['start'] * np.cumprod(1 + bootstrap_paths(returns, n_paths, horizon, block_size, rng), axis=1)
+    rows = np.arange(n_paths)
+
+    # ---------- 이벤트 시각 (경로, 이벤트) ----------
+    entry_t = [_first_hit(paths <= price, horizon) for price, _ in spec['entries']]
+    first_fill = entry_t[0]
+    after_fill = np.arange(horizon) >= first_fill[:, None]
+    stop_t = _first_hit((paths <= spec['stop']) & after_fill, horizon)
+    exit_t = [_first_hit((paths >= price) & after_fill, horizon) for price, _ in spec['exits']]
+
+    kinds = [_BUY] * len(entry_t) + [_STOP] + [_SELL] * len(exit_t)
+    times = np.stack(entry_t + [stop_t] + exit_t, axis=1)
+    order = np.argsort(times * 3 + np.array(kinds), axis=1, kind='stable')
+
+    # ---------- 이벤트 순서대로 처리 (루프는 이벤트 수만큼, 경로는 벡터) ----------
+    n_entries = len(entry_t)
+    held = np.zeros(n_paths)
+    filled = np.zeros(n_paths)
+    cost = np.zeros(n_paths)
+    proceeds = np.zeros(n_paths)
+    done = np.zeros(n_paths, dtype=bool)
+    hit_exit = np.zeros((n_paths, len(exit_t)), dtype=bool)
+    stopped = np.zeros(n_paths, dtype=bool)
+    position_delta = np.zeros((n_paths, horizon + 1))
+    cash_delta = np.zeros((n_paths, horizon + 1))
+
+    for rank in range(times.shape[1]):
+        event = order[:, rank]
+        t = times[rows, event]
+        active = (t < horizon) & ~done
+        t_clip = np.minimum(t, horizon - 1)
+        close = paths[rows, t_clip]
+
+        for k in range(n_entries):
+            m = active & (event == k)
+            qty = spec['entries'][k][1]
+            held[m] += qty
+            filled[m] += qty
+            cost[m] += qty * close[m]
+            position_delta[m, t[m]] += qty
+            cash_delta[m, t[m]] -= qty * close[m]
+
+        m = active & (event == n_entries)
+        proceeds[m] += held[m] * close[m]
+        position_delta[m, t[m]] -= held[m]
+        cash_delta[m, t[m]] += held[m] * close[m]
+        held[m] = 0
+        done |= m
+        stopped |= m
+
+        for j, (price, fraction) in enumerate(spec['exits']):
+            m = active & (event == n_entries + 1 + j)
+            qty = np.minimum(filled[m] * fraction, held[m])
+            proceeds[m] += qty * price
+            position_delta[m, t[m]] -= qty
+            cash_delta[m, t[m]] += qty * price
+            held[m] -= qty
+            hit_exit[m, j] = True
+
+    # ---------- 결과 ----------
+    entered = filled > 0
+    final_close = paths[:, -1]
+    pnl = proceeds + held * final_close - cost
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ret = np.where(entered, pnl / cost * 100, 0.0)
+
+        # 일별 평가손익 (현금흐름 + 보유수량 × 종가) 기준 최대낙폭, 투입 금액 대비 %
+        position = np.cumsum(position_delta[:, :horizon], axis=1)
+        cash = np.cumsum(cash_delta[:, :horizon], axis=1)
+        equity = cash + position * paths
+        drawdown = np.maximum.accumulate(np.maximum(equity, 0), axis=1) - equity
+        max_dd = np.where(entered, drawdown.max(axis=1) / cost * 100, 0.0)
+
+    traded = ret[entered]
+    wins, losses = traded[traded > 0], traded[traded < 0]
+    exit_labels = ['target_1', 'target_2', 'target_3', 'target_4'][:len(spec['exits'])]
+
+    return {
+        'paths': n_paths,
+        'horizon': horizon,
+        'block_size': block_size,
+        'observations': int(len(returns)),
+        'fill_rate': _pct(entered.mean()),
+        'full_fill_rate': _pct((filled >= 1 - 1e-9).mean()),
+        'hit_rates': {
+            **{label: _pct(hit_exit[:, j].mean()) for j, label in enumerate(exit_labels)},
+            'stop_loss': _pct(stopped.mean()),
+            'open_at_end': _pct((entered & ~stopped & (held > 1e-9)).mean()),
+        },
+        'expected_return': round(float(traded.mean()), 2) if traded.size else 0.0,
+        'prob_profit': _pct((traded > 0).mean()) if traded.size else 0.0,
+        'avg_win': round(float(wins.mean()), 2) if wins.size else 0.0,
+        'avg_loss': round(float(losses.mean()), 2) if losses.size else 0.0,
+        'return_percentiles': _percentiles(traded),
+        'max_drawdown_percentiles': _percentiles(max_dd[entered]),
+        # 계획 1주(진입 비중 합 1) 기준 평균 손익 (가격 단위)
+        'expected_pnl_per_share': round(float(pnl[entered].mean()), 2) if traded.size else 0.0,
+    }
+
+
+def _pct(x) -> float:
+    return round(float(x) * 100, 2)
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    if values.size == 0:
+        return {f"p{p}": 0.0 for p in PERCENTILES}
+    return {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+# ========== 여러 계획 일괄 처리 ==========
+
+def _simulate_job(args) -> Dict[str, Any]:
+    plan, returns, n_paths, horizon, block_size, seed = args
+    try:
+        return simulate_plan(plan, returns, n_paths, horizon, block_size, seed)
+    except ValueError as e:
+        return {'error': str(e)}
+
+
+def simulate_batch(plans: Sequence[Dict[str, Any]], returns: Sequence[np.ndarray],
+                   n_paths: int = DEFAULT_PATHS, horizon: int = DEFAULT_HORIZON,
+                   block_size: int = DEFAULT_BLOCK_SIZE, seed: Optional[int] = None,
+                   max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    여러 계획 시뮬레이션 (계획 단위로 프로세스 풀에 분산)
+
+    Args:
+        plans: 매매 계획 리스트
+        returns: 계획별 수익률 표본 (plans와 같은 순서)
+        seed: 기준 시드 (계획별 시드는 SeedSequence로 분기 → 워커 수와 무관하게 재현)
+        max_workers: 프로세스 수 (기본: CPU 수, 1이면 현재 프로세스에서 순차 실행)
+
+    Returns:
+        계획별 결과 (실패한 계획은 {'error': ...})
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(plans))
+    jobs = [
+        (plan, rets, n_paths, horizon, block_size, int(s.generate_state(1)[0]))
+        for plan, rets, s in zip(plans, returns, seeds)
+    ]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(jobs) < 2:
+        return [_simulate_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        return list(executor.map(_simulate_job, jobs))
+
+
+# ========== 통계 ==========
+
+def record_result(ticker: str, name: str, result: Dict[str, Any]):
+    """시뮬레이션 요약 저장 (최근 SIM_HISTORY_SIZE건)"""
+    with _history_lock:
+        _history.append({
+            'ticker': ticker,
+            'name': name,
+            'expected_return': result['expected_return'],
+            'prob_profit': result['prob_profit'],
+            'avg_win': result['avg_win'],
+            'avg_loss': result['avg_loss'],
+        })
+
+
+def get_stats() -> Dict[str, Any]:
+    """최근 시뮬레이션 집계 (승률/평균 수익률은 경로 기준 기대값의 평균)"""
+    with _history_lock:
+        records = list(_history)
+
+    if not records:
+        return {
+            'total_simulations': 0,
+            'win_rate': 0.0,
+            'avg_return': 0.0,
+            'profit_ratio': 0.0,
+            'best_trade': None,
+            'worst_trade': None,
+        }
+
+    avg_win = np.mean([r['avg_win'] for r in records])
+    avg_loss = abs(np.mean([r['avg_loss'] for r in records]))
+    best = max(records, key=lambda r: r['expected_return'])
+    worst = min(records, key=lambda r: r['expected_return'])
+
+    return {
+        'total_simulations': len(records),
+        'win_rate': round(float(np.mean([r['prob_profit'] for r in records])), 1),
+        'avg_return': round(float(np.mean([r['expected_return'] for r in records])), 1),
+        'profit_ratio': round(float(avg_win / avg_loss), 1) if avg_loss > 0 else 0.0,
+        'best_trade': {'ticker': best['ticker'], 'name': best['name'], 'return': best['expected_return']},
+        'worst_trade': {'ticker': worst['ticker'], 'name': worst['name'], 'return': worst['expected_return']},
+    }
@@ -9,6 +9,11 @@ import os
 from typing import Optional, List, Dict
 from datetime import datetime
 
+try:
+    from services import metrics
+except ImportError:
+    from . import metrics
+
 class USStockService:
     """
     미국 주식 데이터 수집 통합 서비스
@@ -44,7 +49,7 @@ class USStockService:
             }
         """
         stock = yf.Ticker(ticker)
-        info = stock.info
+        info = metrics.call("yfinance", lambda: stock.info)
         
         return {
             'ticker': ticker,
@@ -78,7 +83,7 @@ class USStockService:
             "apikey": self.alpha_vantage_key
         }
         
-        response = requests.get(self.alpha_vantage_base, params=params)
+        response = metrics.call("alphavantage", requests.get, self.alpha_vantage_base, params=params)
         response.raise_for_status()
         
         data = response.json()
@@ -134,7 +139,7 @@ class USStockService:
             ]
         """
         stock = yf.Ticker(ticker)
-        df = stock.history(period=period)
+        df = metrics.call("yfinance", stock.history, period=period)
         
         result = []
         for date, row in df.iterrows():
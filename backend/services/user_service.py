@@ -4,13 +4,14 @@
 
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 import re
 
 from models.user import User, UserSession
 from schemas.auth import UserResponse
 from services.jwt_service import JWTService
+from services.auth_cache import user_cache, revoked_tokens
 
 
 class UserService:
@@ -84,13 +85,14 @@ class UserService:
         if not user.is_active:
             return False, "비활성화된 계정입니다", None
         
-        # 비밀번호 검증
-        if not user.verify_password(password):
+        # 비밀번호 검증 (해시 설정이 바뀌었으면 재해싱)
+        if not user.verify_and_update_password(password):
             return False, "비밀번호가 올바르지 않습니다", None
         
         # 마지막 로그인 시간 업데이트
         user.last_login = datetime.utcnow()
         db.commit()
+        user_cache.invalidate(user.id)
         
         return True, "로그인 성공", user
     
@@ -136,6 +138,7 @@ class UserService:
             user.updated_at = datetime.utcnow()
             db.commit()
             db.refresh(user)
+            user_cache.invalidate(user_id)
             return True, "프로필 업데이트 성공", user
         except Exception as e:
             db.rollback()
@@ -169,6 +172,7 @@ class UserService:
         
         try:
             db.commit()
+            user_cache.invalidate(user_id)
             return True, "비밀번호 변경 성공"
         except Exception as e:
             db.rollback()
@@ -192,6 +196,7 @@ class UserService:
         
         try:
             db.commit()
+            user_cache.invalidate(user_id)
             return True, "계정이 비활성화되었습니다"
         except Exception as e:
             db.rollback()
@@ -206,12 +211,14 @@ class SessionService:
         db: Session,
         user_id: int,
         token: str,
-        expires_at: datetime
+        expires_at: datetime,
+        jti: Optional[str] = None
     ) -> bool:
         """세션 생성"""
         session = UserSession(
             user_id=user_id,
             token=token,
+            jti=jti,
             expires_at=expires_at
         )
         
@@ -248,6 +255,37 @@ class SessionService:
             db.rollback()
             return False
     
+    @staticmethod
+    def revoke_session(db: Session, jti: str, expires_at: datetime) -> bool:
+        """
+        jti 기준 세션 폐기 (로그아웃)
+        
+        메모리 폐기 목록에 먼저 반영하고 DB에 기록 (다른 워커는 주기 동기화로 반영)
+        """
+        revoked_tokens.revoke(jti, expires_at)
+        
+        session = db.query(UserSession).filter(UserSession.jti == jti).first()
+        if not session:
+            return False
+        
+        session.is_active = False
+        
+        try:
+            db.commit()
+            return True
+        except:
+            db.rollback()
+            return False
+    
+    @staticmethod
+    def get_revoked_jtis(db: Session) -> List[Tuple[str, datetime]]:
+        """아직 만료되지 않은 폐기 세션의 (jti, 만료 시각) 목록"""
+        return db.query(UserSession.jti, UserSession.expires_at).filter(
+            UserSession.is_active == False,
+            UserSession.jti.isnot(None),
+            UserSession.expires_at >= datetime.utcnow()
+        ).all()
+    
     @staticmethod
     def cleanup_expired_sessions(db: Session) -> int:
         """만료된 세션 정리"""
@@ -0,0 +1,22 @@
+"""
+backend 테스트 공통 설정
+
+backend 모듈은 import 시점에 환경변수로 DB / 잠금 파일 경로를 정하므로,
+import 전에 임시 디렉터리로 돌려 개발 DB(stock_radar.db)를 건드리지 않음
+
+    cd backend && python -m pytest -q tests
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+TEST_DIR = tempfile.mkdtemp(prefix="stock_radar_test_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}?check_same_thread=False"
+os.environ["DATABASE_READ_URL"] = os.environ["DATABASE_URL"]
+os.environ["SCHEDULER_LOCK"] = "file"
+os.environ["SCHEDULER_LOCK_FILE"] = os.path.join(TEST_DIR, "scheduler.lock")
@@ -0,0 +1,101 @@
+"""
+조회 빈도 집계 (services.access_stats)
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from services import access_stats
+from services.access_stats import DecayingTopK
+
+
+@pytest.fixture
+def stats_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(access_stats, "ACCESS_STATS_DIR", str(tmp_path))
+    monkeypatch.setattr(access_stats, "_counters", {k: DecayingTopK() for k in access_stats.KINDS})
+    return tmp_path
+
+
+def test_decaying_topk_halves_after_half_life():
+    counter = DecayingTopK(capacity=10, half_life=100)
+    t = counter._landmark
+    counter.add("A", now=t + 50)
+    assert counter.scores(now=t + 150)["A"] == pytest.approx(0.5)
+
+
+def test_decaying_topk_evicts_lowest_and_inherits_score():
+    counter = DecayingTopK(capacity=2, half_life=100)
+    t = counter._landmark
+    counter.add("A", 3, now=t)
+    counter.add("B", 1, now=t)
+    counter.add("C", 1, now=t)
+    scores = counter.scores(now=t)
+    assert set(scores) == {"A", "C"}
+    assert scores["C"] == pytest.approx(2.0)  # 내보낸 B 점수 승계
+
+
+def test_count_flushes_off_the_calling_thread(stats_dir, monkeypatch):
+    threads = []
+    done = threading.Event()
+    original = access_stats.flush
+
+    def tracking_flush():
+        threads.append(threading.current_thread())
+        original()
+        done.set()
+
+    monkeypatch.setattr(access_stats, "flush", tracking_flush)
+    monkeypatch.setattr(access_stats, "_last_flush", 0.0)
+
+    access_stats.record("005930")
+    assert done.wait(5)
+    assert threads and threads[0] is not threading.current_thread()
+    assert list(stats_dir.glob("*.json"))
+
+
+def test_status_reads_peer_files_once(stats_dir, monkeypatch):
+    now = time.time()
+    (stats_dir / "other-1.json").write_text(json.dumps({
+        "at": now,
+        "counters": {"ticker": {"AAPL": 5.0}, "endpoint": {"GET /x": 2.0}, "sector": {}},
+    }))
+    reads = []
+    original = access_stats._peer_files
+    monkeypatch.setattr(access_stats, "_peer_files", lambda t: reads.append(t) or original(t))
+
+    result = access_stats.status()
+
+    assert len(reads) == 1
+    assert result["ticker"][0][0] == "AAPL"
+    assert result["endpoint"][0][0] == "GET /x"
+
+
+def test_track_access_records_only_successful_responses(monkeypatch):
+    from fastapi import FastAPI, HTTPException
+    from fastapi.testclient import TestClient
+
+    import server_v2
+
+    recorded, counted = [], []
+    monkeypatch.setattr(access_stats, "record", recorded.append)
+    monkeypatch.setattr(access_stats, "count", lambda kind, key: counted.append((kind, key)))
+
+    app = FastAPI()
+    app.middleware("http")(server_v2.track_access)
+
+    @app.get("/api/price/{ticker}")
+    def price(ticker: str):
+        if ticker != "005930":
+            raise HTTPException(status_code=404)
+        return {"ticker": ticker}
+
+    client = TestClient(app)
+    assert client.get("/api/price/NOPE?sector=junk").status_code == 404
+    assert client.get("/api/price/005930?sector=반도체").status_code == 200
+
+    assert recorded == ["005930"]
+    assert ("sector", "junk") not in counted and ("sector", "반도체") in counted
+    assert counted.count(("endpoint", "GET /api/price/{ticker}")) == 2
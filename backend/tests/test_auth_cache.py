@@ -0,0 +1,28 @@
+"""
+토큰 폐기 목록 동기화 (services.auth_cache.RevokedTokens)
+"""
+
+from datetime import datetime, timedelta
+
+from services.auth_cache import RevokedTokens
+
+
+def test_load_keeps_local_revocations_missing_from_db():
+    """세션 행 없이 메모리에만 폐기된 토큰이 주기 동기화 후에도 폐기 상태 유지"""
+    tokens = RevokedTokens()
+    tokens.revoke("local-only", datetime.utcnow() + timedelta(hours=1))
+
+    tokens.load([("from-db", datetime.utcnow() + timedelta(hours=1))])
+
+    assert tokens.is_revoked("local-only")
+    assert tokens.is_revoked("from-db")
+
+
+def test_load_drops_expired_local_revocations():
+    tokens = RevokedTokens()
+    tokens.revoke("expired", datetime.utcnow() - timedelta(minutes=1))
+
+    tokens.load([])
+
+    assert not tokens.is_revoked("expired")
+    assert len(tokens) == 0
@@ -0,0 +1,125 @@
+"""
+캔들 패턴 엔진 (services.candle_patterns)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_candle_patterns import LEGACY_PATTERNS, legacy_patterns_at, make_universe
+from services.candle_patterns import (
+    PATTERN_BIAS, PATTERN_BITS, PATTERNS, decode_mask, detect_pattern_masks,
+    pattern_bias, pattern_hit_rates, scan_latest, stack_ohlc,
+)
+
+# 패턴별 최소 봉 구성 (open, high, low, close) - 마지막 봉에서 해당 패턴 발생
+CASES = {
+    'DOJI': [(100, 105, 95, 100.5)],
+    'HAMMER': [(100, 101.2, 94, 101)],
+    'INVERTED_HAMMER': [(100, 107, 99.8, 101)],
+    'SHOOTING_STAR': [(101, 107, 99.8, 100)],
+    'BULLISH_ENGULFING': [(105, 106, 99, 100), (99, 107, 98, 106)],
+    'BEARISH_ENGULFING': [(100, 106, 99, 105), (106, 107, 98, 99)],
+    'HANGING_MAN': [(89, 91, 88, 90), (92, 94, 91, 93), (95, 97, 94, 96),
+                    (98, 101, 97, 100), (101, 101.2, 94, 100)],
+    'BULLISH_HARAMI': [(110, 111, 99, 100), (102, 106, 101, 105)],
+    'BEARISH_HARAMI': [(100, 111, 99, 110), (108, 109, 101, 102)],
+    'PIERCING_LINE': [(110, 111, 100, 101), (99, 108, 98, 107)],
+    'DARK_CLOUD_COVER': [(100, 110, 99, 109), (111, 112, 103, 104)],
+    'MORNING_STAR': [(110, 111, 99, 100), (99, 100, 97, 99.5), (100, 107, 99, 106)],
+    'EVENING_STAR': [(100, 111, 99, 110), (111, 113, 110, 111.5), (110, 110.5, 102, 103)],
+    'THREE_WHITE_SOLDIERS': [(100, 106, 99, 105), (103, 109, 102, 108), (106, 112, 105, 111)],
+    'THREE_BLACK_CROWS': [(111, 112, 105, 106), (108, 109, 102, 103), (105, 106, 99, 100)],
+    'BULLISH_MARUBOZU': [(100, 110, 100, 110)],
+    'BEARISH_MARUBOZU': [(110, 110, 100, 100)],
+}
+
+
+def _latest(bars):
+    o, h, l, c = (np.array(col, dtype=float) for col in zip(*bars))
+    return decode_mask(detect_pattern_masks(o, h, l, c)[-1])
+
+
+def test_every_pattern_has_a_case_and_bias():
+    assert set(CASES) == set(PATTERNS) == set(PATTERN_BIAS)
+
+
+@pytest.mark.parametrize("name", PATTERNS)
+def test_pattern_detected_on_hand_built_bars(name):
+    assert name in _latest(CASES[name])
+
+
+def test_hanging_man_needs_prior_uptrend():
+    falling = [(111, 112, 109, 110), (108, 109, 106, 107), (105, 106, 103, 104),
+               (102, 103, 100, 101), (101, 101.2, 94, 100)]
+    assert 'HANGING_MAN' not in _latest(falling)
+
+
+def test_multi_bar_patterns_need_history():
+    """앞 봉이 없으면(NaN) 2·3봉 패턴은 발생하지 않음"""
+    for name in ('BULLISH_ENGULFING', 'MORNING_STAR', 'THREE_WHITE_SOLDIERS'):
+        assert name not in _latest(CASES[name][-1:])
+
+
+def test_legacy_six_patterns_match_scalar_implementation():
+    frames = make_universe(20, 120, seed=7)
+    tickers, o, h, l, c = stack_ohlc(frames)
+    masks = detect_pattern_masks(o, h, l, c)
+
+    for row, ticker in enumerate(tickers):
+        df = frames[ticker]
+        for i in range(1, len(df)):
+            got = [p for p in decode_mask(masks[row, i]) if p in LEGACY_PATTERNS]
+            assert got == legacy_patterns_at(df, i), (ticker, i)
+
+
+def test_stack_ohlc_right_aligns_and_pads_with_nan():
+    long = pd.DataFrame({k: [1.0, 2.0, 3.0, 4.0] for k in ('open', 'high', 'low', 'close')})
+    short = pd.DataFrame({k: [7.0, 8.0] for k in ('open', 'high', 'low', 'close')})
+    tickers, o, h, l, c = stack_ohlc({"A": long, "B": short, "EMPTY": pd.DataFrame()})
+
+    assert tickers == ["A", "B"]
+    assert c.shape == (2, 4)
+    assert np.isnan(c[1, :2]).all()
+    assert c[1, 2:].tolist() == [7.0, 8.0]
+
+    _, _, _, _, c3 = stack_ohlc({"A": long, "B": short}, length=3)
+    assert c3[0].tolist() == [2.0, 3.0, 4.0]
+    assert np.isnan(c3[1, 0])
+
+    # 패딩 칸은 패턴 없음
+    assert (detect_pattern_masks(o, h, l, c)[1, :2] == 0).all()
+
+
+def test_scan_latest_reports_only_tickers_with_patterns():
+    frames = {
+        "005930": pd.DataFrame(CASES['BULLISH_ENGULFING'], columns=['open', 'high', 'low', 'close']),
+        "000660": pd.DataFrame([(100, 110, 90, 105), (105, 112, 95, 108)],
+                               columns=['open', 'high', 'low', 'close']),
+    }
+    result = scan_latest(frames)
+    assert list(result) == ["005930"]
+    assert 'BULLISH_ENGULFING' in result["005930"]
+
+
+def test_pattern_bias_sums_direction():
+    assert pattern_bias(['HAMMER', 'BULLISH_ENGULFING', 'DOJI']) == 2
+    assert pattern_bias(['SHOOTING_STAR', 'HAMMER']) == 0
+
+
+def test_pattern_hit_rates_on_known_series():
+    close = np.array([100.0, 102.0, 104.0, 103.0, 105.0, 110.0])
+    masks = np.zeros(6, dtype=np.uint32)
+    for i in (0, 2, 4):  # 4는 horizon 이후 종가가 없어 제외
+        masks[i] |= PATTERN_BITS['HAMMER']
+    masks[1] |= PATTERN_BITS['SHOOTING_STAR']
+    masks[3] |= PATTERN_BITS['DOJI']
+
+    rates = pattern_hit_rates(masks, close, horizon=2)
+
+    assert set(rates) == {'HAMMER', 'SHOOTING_STAR', 'DOJI'}
+    assert rates['HAMMER']['count'] == 2
+    assert rates['HAMMER']['hit_rate'] == 1.0
+    assert rates['HAMMER']['avg_return'] == pytest.approx((0.04 + 105 / 104 - 1) / 2, abs=1e-6)
+    assert rates['SHOOTING_STAR']['hit_rate'] == 0.0   # 하락 신호인데 상승
+    assert rates['DOJI']['hit_rate'] is None           # 중립 패턴
@@ -0,0 +1,138 @@
+"""
+데이터 에폭 고정 / 정리 (services.data_version, server_v2.PinDataEpochMiddleware)
+"""
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from services import data_version
+
+
+@pytest.fixture
+def epochs(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    monkeypatch.setattr(data_version, "DATA_DIR", str(data_dir))
+    monkeypatch.setattr(data_version, "VERSION_FILE", str(data_dir / "data_version.json"))
+    monkeypatch.setattr(data_version, "EPOCHS_DIR", str(data_dir / "epochs"))
+    monkeypatch.setattr(data_version, "EPOCH_INDEX_FILE", str(data_dir / "epochs" / "index.json"))
+    monkeypatch.setattr(data_version, "WATCHED_FILES", [])
+    monkeypatch.setattr(data_version, "_pin_counts", {})
+    monkeypatch.setattr(data_version, "_leased_at", {})
+    return data_dir / "epochs"
+
+
+def _age_epochs(days=30):
+    """보관 기간이 지난 것처럼 게시 시각을 과거로"""
+    index = json.loads(open(data_version.EPOCH_INDEX_FILE).read())
+    for e in index:
+        e["published_at"] = (datetime.now() - timedelta(days=days)).isoformat()
+    data_version._write_json(data_version.EPOCH_INDEX_FILE, index)
+
+
+def _ids():
+    return [e["id"] for e in data_version.list_epochs()]
+
+
+def test_old_epoch_without_lease_is_pruned(epochs):
+    data_version.publish("first")
+    old = data_version.current_epoch()
+    _age_epochs()
+    data_version.publish("second")
+    assert old not in _ids()
+
+
+def test_lease_from_another_process_keeps_epoch(epochs):
+    data_version.publish("first")
+    old = data_version.current_epoch()
+    lease_dir = epochs / old / ".leases"
+    lease_dir.mkdir(parents=True)
+    (lease_dir / "api-host-4242").touch()  # 다른 워커가 고정 중
+
+    _age_epochs()
+    data_version.publish("second")
+    assert old in _ids()
+
+
+def test_stale_lease_is_ignored(epochs, monkeypatch):
+    monkeypatch.setattr(data_version, "EPOCH_LEASE_SECONDS", 60)
+    data_version.publish("first")
+    old = data_version.current_epoch()
+    lease = epochs / old / ".leases" / "crashed-1"
+    lease.parent.mkdir(parents=True)
+    lease.touch()
+    past = time.time() - 120
+    os.utime(lease, (past, past))
+
+    _age_epochs()
+    data_version.publish("second")
+    assert old not in _ids()
+
+
+def test_hold_writes_and_release_removes_lease(epochs):
+    data_version.publish("first")
+    epoch = data_version.current_epoch()
+
+    data_version.hold(epoch)
+    data_version.hold(epoch)
+    assert data_version._has_live_lease(epoch)
+    data_version.release(epoch)
+    assert data_version._has_live_lease(epoch)  # 아직 1건 고정 중
+    data_version.release(epoch)
+    assert not data_version._has_live_lease(epoch)
+    assert data_version._pin_counts == {}
+
+
+def _run(app, send):
+    from server_v2 import PinDataEpochMiddleware
+
+    requested = []
+
+    async def receive():
+        if requested:
+            await asyncio.sleep(3600)  # 클라이언트가 연결을 유지 (disconnect 없음)
+        requested.append(1)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""}
+    return asyncio.run(PinDataEpochMiddleware(app)(scope, receive, send))
+
+
+def test_middleware_releases_pin_when_sending_start_fails(epochs):
+    data_version.publish("first")
+
+    async def send(message):
+        raise OSError("client disconnected")
+
+    with pytest.raises(OSError):
+        _run(PlainTextResponse("ok"), send)
+    assert data_version._pin_counts == {}
+
+
+def test_middleware_holds_pin_until_stream_ends(epochs):
+    data_version.publish("first")
+    epoch = data_version.current_epoch()
+    seen = []
+
+    def body():
+        seen.append(dict(data_version._pin_counts))
+        yield b"a"
+        seen.append(dict(data_version._pin_counts))
+        yield b"b"
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    _run(StreamingResponse(body()), send)
+
+    assert seen == [{epoch: 1}, {epoch: 1}]
+    assert data_version._pin_counts == {}
+    headers = dict(messages[0]["headers"])
+    assert headers[b"x-data-epoch"] == epoch.encode()
@@ -0,0 +1,41 @@
+"""
+Agent 입력 피처 계산 (services.feature_store.compute_features)
+"""
+
+import numpy as np
+import pytest
+
+from services.feature_store import compute_features
+
+
+def _bars(n, start=100.0):
+    close = start * np.cumprod(np.full(n, 1.01))
+    return close * 1.02, close * 0.98, close
+
+
+def test_short_history_uses_default_ma20_and_volatility():
+    """60일 미만은 MA20 / MA60 / 변동성 기본값, ATR은 20일 이상이면 계산"""
+    high, low, close = _bars(40)
+    features = compute_features(high, low, close)
+    last = close[-1]
+
+    assert features["ma20"] == pytest.approx(last * 0.97)
+    assert features["ma60"] == pytest.approx(last * 0.95)
+    assert features["volatility"] == 3.0
+    assert features["atr_20d"] == pytest.approx(float((high - low)[-20:].mean()))
+
+
+def test_full_history_matches_inline_definition():
+    high, low, close = _bars(80)
+    features = compute_features(high, low, close)
+    closes = close[-60:]
+    returns = closes[1:] / closes[:-1] - 1
+
+    assert features["ma20"] == pytest.approx(closes[-20:].mean())
+    assert features["ma60"] == pytest.approx(closes.mean())
+    assert features["volatility"] == pytest.approx(np.sqrt(np.mean(returns ** 2)) * 100)
+    assert features["bars"] == 80
+
+
+def test_empty_history():
+    assert compute_features([], [], []) is None
@@ -0,0 +1,51 @@
+"""
+분석 1회 단위 업스트림 조회 메모 (services.fetch_context)
+"""
+
+from services.fetch_context import FetchContext, current, fetch_scope, scoped
+
+
+def _counting_loader(calls):
+    def load():
+        calls.append(1)
+        return {"close": 100}
+    return load
+
+
+def test_scope_memoizes_repeated_fetch():
+    calls = []
+    with fetch_scope() as ctx:
+        current().fetch("yfinance.daily", "AAPL", "3mo", _counting_loader(calls))
+        current().fetch("yfinance.daily", "AAPL", "3mo", _counting_loader(calls))
+    assert calls == [1]
+    assert ctx.stats()["upstream_calls"] == 1 and ctx.stats()["memo_hits"] == 1
+
+
+def test_no_scope_means_no_memo():
+    calls = []
+    current().fetch("yfinance.daily", "AAPL", "3mo", _counting_loader(calls))
+    current().fetch("yfinance.daily", "AAPL", "3mo", _counting_loader(calls))
+    assert calls == [1, 1]
+
+
+def test_given_context_is_shared_across_separate_scopes():
+    """스트리밍 분석처럼 로더마다 스코프를 따로 열어도 같은 메모 사용"""
+    calls = []
+    shared = FetchContext()
+    for _ in range(2):
+        with fetch_scope(shared):
+            current().fetch("yfinance.quote", "MSFT", None, _counting_loader(calls))
+    assert calls == [1]
+
+
+def test_scoped_joins_outer_scope():
+    calls = []
+
+    @scoped
+    def lookup():
+        return current().fetch("yfinance.quote", "NVDA", None, _counting_loader(calls))
+
+    with fetch_scope():
+        lookup()
+        lookup()
+    assert calls == [1]
@@ -0,0 +1,145 @@
+"""
+ETag / 조건부 요청 (services.http_cache, server_v2._versioned_json)
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from services import http_cache
+
+
+def test_strong_etag_is_quoted_and_stable():
+    etag = http_cache.strong_etag("regime", "v1")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == http_cache.strong_etag("regime", "v1")
+    assert etag != http_cache.strong_etag("regime", "v2")
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ("*", True),
+    ('"abc"', True),
+    ('W/"abc"', True),            # weak comparison
+    ('"x", W/"abc" , "y"', True),  # 목록
+    ('"abcd"', False),
+    ('"x", "y"', False),
+])
+def test_etag_matches(header, expected):
+    assert http_cache.etag_matches(header, '"abc"') is expected
+
+
+def test_etag_matches_weak_server_tag():
+    assert http_cache.etag_matches('"abc"', 'W/"abc"')
+
+
+def test_cache_control_revalidates_at_zero_max_age():
+    assert http_cache.cache_control(0, s_maxage=60, stale_while_revalidate=30) == \
+        "public, max-age=0, must-revalidate, s-maxage=60, stale-while-revalidate=30"
+
+
+@pytest.fixture
+def versioned_app(monkeypatch):
+    import server_v2
+    from services import data_version
+
+    state = {"version": "v1", "builds": 0}
+    monkeypatch.setattr(data_version, "current_version", lambda: state["version"])
+    server_v2.response_memo.clear()
+
+    def build():
+        state["builds"] += 1
+        return {"builds": state["builds"]}
+
+    app = FastAPI()
+
+    @app.get("/payload")
+    def payload(request: Request):
+        return server_v2._versioned_json(request, "test_payload", build)
+
+    @app.get("/live")
+    def live(request: Request):
+        return server_v2._versioned_json(request, "test_live", build, ttl_seconds=300)
+
+    return TestClient(app), state
+
+
+def test_versioned_json_returns_304_for_matching_etag(versioned_app):
+    client, state = versioned_app
+    first = client.get("/payload")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.get("/payload", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+    assert state["builds"] == 1
+
+    # If-None-Match 없이 다시 요청해도 같은 버전이면 메모한 본문 재사용
+    assert client.get("/payload").json() == {"builds": 1}
+
+
+def test_versioned_json_changes_etag_when_data_version_changes(versioned_app):
+    client, state = versioned_app
+    etag = client.get("/payload").headers["etag"]
+
+    state["version"] = "v2"
+    response = client.get("/payload", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json() == {"builds": 2}
+
+
+def test_versioned_json_ttl_bucket_expires_without_publish(versioned_app, monkeypatch):
+    import server_v2
+
+    client, state = versioned_app
+    now = [1_000_000.0]
+    monkeypatch.setattr(server_v2.time, "time", lambda: now[0])
+
+    etag = client.get("/live").headers["etag"]
+    assert client.get("/live", headers={"If-None-Match": etag}).status_code == 304
+
+    now[0] += 300
+    response = client.get("/live", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert state["builds"] == 2
+
+
+@pytest.fixture
+def chart_client(monkeypatch):
+    import server_v2
+
+    payload = {"ticker": "T1", "dates": ["2026-01-02", "2026-01-05"]}
+    payload.update({column: [1.0, 2.0] for column in server_v2.chart_service.SERIES_COLUMNS})
+    builds = []
+
+    def entry(ticker):
+        builds.append(ticker)
+        return payload, "chart-v1"
+
+    server_v2.chart_memo.clear()
+    monkeypatch.setattr(server_v2, "_chart_entry", entry)
+    yield TestClient(server_v2.app), builds
+    server_v2.chart_memo.clear()
+
+
+def test_chart_rejects_invalid_since_before_etag_check(chart_client):
+    client, builds = chart_client
+
+    response = client.get("/api/chart/T1?since=garbage", headers={"If-None-Match": "*"})
+    assert response.status_code == 400
+    assert builds == []  # 차트 조회 전에 거절
+
+
+def test_chart_since_shares_etag_with_normalized_date(chart_client):
+    client, _ = chart_client
+
+    response = client.get("/api/chart/T1?since=2026-01-02")
+    assert response.status_code == 200
+    assert response.json()["dates"] == ["2026-01-05"]
+
+    etag = response.headers["etag"]
+    assert client.get("/api/chart/T1?since=20260102", headers={"If-None-Match": etag}).status_code == 304
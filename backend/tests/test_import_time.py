@@ -0,0 +1,35 @@
+"""
+서버 import 시간 예산 (benchmarks/bench_import_time.py의 measure를 테스트로 실행)
+
+무거운 모듈(pandas, yfinance, AI Agent)은 import 시점이 아니라 첫 사용/예열 때 로드되어야 함.
+전체 시간은 실행 환경 속도에 크게 좌우되므로 IMPORT_BUDGET_MS를 지정한 환경(배포 대상)에서만 검사하고,
+기본으로는 프레임워크(fastapi, sqlalchemy)를 뺀 앱 자체 import 시간을 검사
+"""
+
+import os
+
+import pytest
+
+from benchmarks.bench_import_time import DEFAULT_BUDGET_MS, OWN_BUDGET_MS, measure
+
+
+@pytest.fixture(scope="module")
+def server_import():
+    runs = [measure("server_v2") for _ in range(3)]
+    return min(runs, key=lambda r: r["total_ms"])
+
+
+def test_server_import_defers_heavy_modules(server_import):
+    assert server_import["deferred_loaded"] == []
+
+
+def test_server_import_own_time_within_budget(server_import):
+    assert server_import["own_ms"] <= OWN_BUDGET_MS, (
+        f"import server_v2 앱 자체 {server_import['own_ms']:.0f}ms > 예산 {OWN_BUDGET_MS:.0f}ms "
+        f"(전체 {server_import['total_ms']:.0f}ms, 프레임워크 {server_import['framework_ms']:.0f}ms)"
+    )
+
+
+@pytest.mark.skipif("IMPORT_BUDGET_MS" not in os.environ, reason="전체 예산은 IMPORT_BUDGET_MS 지정 시 검사")
+def test_server_import_total_within_budget(server_import):
+    assert server_import["total_ms"] <= DEFAULT_BUDGET_MS
@@ -0,0 +1,106 @@
+"""
+스케줄러 리더 선출 / 승계 (services.leader_election, scheduler._start_leader_scheduler)
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.leader_election import FileLeaderLock, LeaderElection
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    return str(tmp_path / "scheduler.lock")
+
+
+def _election(lock_path, on_elected, on_lost=None):
+    return LeaderElection(on_elected=on_elected, on_lost=on_lost,
+                          lock=FileLeaderLock(lock_path), retry_seconds=3600)
+
+
+def test_follower_takes_over_when_leader_stops(lock_path):
+    elected = []
+    leader = _election(lock_path, lambda: elected.append("a"))
+    follower = _election(lock_path, lambda: elected.append("b"))
+
+    leader._tick()
+    follower._tick()
+    assert leader.is_leader and not follower.is_leader
+
+    leader.stop()
+    follower._tick()
+    assert follower.is_leader
+    assert elected == ["a", "b"]
+    follower.stop()
+
+
+def test_failed_on_elected_releases_lock_and_retries(lock_path):
+    attempts = []
+    lost = []
+
+    def on_elected():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("db down")
+
+    election = _election(lock_path, on_elected, on_lost=lambda: lost.append(1))
+    election._tick()
+    assert not election.is_leader
+    assert lost == [1]  # 일부만 시작된 작업 정리
+
+    # 잠금을 놓았으므로 다른 프로세스가 승계 가능
+    other = FileLeaderLock(lock_path)
+    assert other.try_acquire()
+    other.release()
+
+    election._tick()
+    assert election.is_leader
+    assert len(attempts) == 2
+    election.stop()
+
+
+def test_missed_cron_run_executes_once_after_failover(monkeypatch):
+    """리더 교체 중 도래한 예약 실행이 새 리더에서 1회 실행되고 다음 일정은 유지"""
+    import scheduler
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    from database import engine, init_db
+
+    if scheduler.SCHEDULER_JOBSTORE != "sqlalchemy":
+        pytest.skip("영속 작업 저장소 필요")
+    init_db()
+
+    # 이전 리더: 예약 작업 등록 후 종료
+    scheduler._start_leader_scheduler()
+    scheduler._stop_leader_scheduler()
+
+    # 리더가 없던 동안 18:00 실행 시각이 지남
+    store = SQLAlchemyJobStore(engine=engine)
+    store.start(None, "default")
+    job = store.lookup_job("daily_price_update")
+    overdue = datetime.now(job.next_run_time.tzinfo) - timedelta(minutes=2)
+    job.next_run_time = overdue
+    store.update_job(job)
+
+    ran = threading.Event()
+    calls = []
+
+    def fake_update():
+        calls.append(1)
+        ran.set()
+
+    # 저장된 작업은 텍스트 참조(scheduler:update_stock_prices)로 다시 읽힘
+    monkeypatch.setattr(scheduler, "update_stock_prices", fake_update)
+
+    scheduler._start_leader_scheduler()
+    try:
+        assert ran.wait(10), "놓친 실행이 새 리더에서 실행되지 않음"
+        next_run = scheduler._scheduler.get_job("daily_price_update").next_run_time
+        assert next_run > overdue + timedelta(minutes=2)
+    finally:
+        scheduler._stop_leader_scheduler()
+    assert calls == [1]
+
+    store.remove_all_jobs()
+    store.shutdown()
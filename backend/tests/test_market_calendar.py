@@ -0,0 +1,60 @@
+"""
+거래소 세션 캘린더 (services.market_calendar) - exchange_calendars 없는 기본 규칙
+"""
+
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from services import market_calendar
+
+SEOUL = ZoneInfo("Asia/Seoul")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+@pytest.fixture(autouse=True)
+def fallback_rules(monkeypatch):
+    monkeypatch.setattr(market_calendar, "CALENDAR_AVAILABLE", False)
+    monkeypatch.setattr(market_calendar, "_FALLBACK_HOLIDAYS", {"KR": {"2026-03-03"}, "US": set()})
+
+
+def test_market_of():
+    assert market_calendar.market_of("005930") == "KR"
+    assert market_calendar.market_of("AAPL") == "US"
+    assert market_calendar.market_of("12345") == "US"
+
+
+def test_is_open_regular_session():
+    assert market_calendar.is_open("KR", datetime(2026, 3, 2, 10, 0, tzinfo=SEOUL))
+    assert not market_calendar.is_open("KR", datetime(2026, 3, 2, 15, 30, tzinfo=SEOUL))  # 마감 시각은 장외
+    assert not market_calendar.is_open("KR", datetime(2026, 3, 2, 8, 59, tzinfo=SEOUL))
+
+
+def test_weekend_and_configured_holiday_are_closed():
+    assert market_calendar.session_bounds("KR", date(2026, 3, 7)) is None  # 토요일
+    assert market_calendar.session_bounds("KR", date(2026, 3, 3)) is None  # MARKET_HOLIDAYS_KR
+    assert market_calendar.session_bounds("US", date(2026, 3, 3)) is not None
+
+
+def test_is_open_converts_to_exchange_timezone():
+    # 서울 23:00 = 뉴욕 09:00 (개장 전), 서울 23:30 = 뉴욕 09:30 (개장)
+    assert not market_calendar.is_open("US", datetime(2026, 3, 2, 23, 0, tzinfo=SEOUL))
+    assert market_calendar.is_open("US", datetime(2026, 3, 2, 23, 30, tzinfo=SEOUL))
+
+
+def test_last_close_skips_weekend():
+    monday_morning = datetime(2026, 3, 9, 8, 0, tzinfo=SEOUL)
+    assert market_calendar.last_close("KR", monday_morning) == datetime(2026, 3, 6, 15, 30, tzinfo=SEOUL)
+
+
+def test_next_open_skips_holiday():
+    after_close = datetime(2026, 3, 2, 16, 0, tzinfo=SEOUL)
+    assert market_calendar.next_open("KR", after_close) == datetime(2026, 3, 4, 9, 0, tzinfo=SEOUL)
+
+
+def test_status_reports_both_markets():
+    result = market_calendar.status(datetime(2026, 3, 2, 10, 0, tzinfo=SEOUL))
+    assert result["KR"]["open"] is True
+    assert result["US"]["open"] is False
+    assert result["US"]["next_open"] == datetime(2026, 3, 2, 9, 30, tzinfo=NEW_YORK).isoformat()
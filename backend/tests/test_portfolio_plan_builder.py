@@ -0,0 +1,131 @@
+"""
+포트폴리오 매매 계획 (agents.portfolio_plan_builder)
+"""
+
+import numpy as np
+import pytest
+
+from agents.portfolio_plan_builder import PortfolioPlanBuilder
+from agents.trade_plan_builder import TradePlanBuilder
+
+
+def _candidate(ticker, sector, price=10000.0, stop_pct=0.07, **extra):
+    """ma20 < ma60, 지지선 없음 → 손절가 = 현재가 × 0.93 (ATR이 충분히 클 때)"""
+    data = {
+        "ticker": ticker, "name": ticker, "sector": sector, "current_price": price,
+        "ma20": price * 0.95, "ma60": price, "atr_20d": price * 0.1,
+        "support_levels": [], "resistance_levels": [], "volatility": 2.0,
+    }
+    data.update(extra)
+    return data
+
+
+def _random_candidate(rng, i):
+    price = float(rng.uniform(1000, 200000))
+    return {
+        "ticker": f"R{i:03d}", "name": f"R{i:03d}", "sector": f"S{i}",
+        "current_price": price,
+        "ma20": price * rng.uniform(0.85, 1.1),
+        "ma60": price * rng.uniform(0.85, 1.1),
+        "atr_20d": price * rng.uniform(0.005, 0.06),
+        "support_levels": sorted(price * rng.uniform(0.8, 0.99, rng.integers(0, 4)), reverse=True),
+        "resistance_levels": sorted(price * rng.uniform(1.01, 1.3, rng.integers(0, 4))),
+        "volatility": 2.0,
+    }
+
+
+@pytest.mark.parametrize("risk_profile", ["보수", "중립", "공격"])
+def test_levels_match_single_trade_plan_builder(risk_profile):
+    rng = np.random.default_rng(0)
+    builder, single = PortfolioPlanBuilder(), TradePlanBuilder()
+    profile = {"period": "단기", "risk_profile": risk_profile, "account_size": 0, "max_positions": 100}
+    checked = 0
+
+    for batch in range(20):
+        candidates = [_random_candidate(rng, batch * 3 + i) for i in range(3)]
+        for plan in builder.build_portfolio_plans(candidates, profile)["plans"]:
+            expected = single.build_trade_plan(next(c for c in candidates if c["ticker"] == plan["ticker"]), profile)
+            assert plan["stop_loss"] == pytest.approx(expected["stop_loss"])
+            assert plan["entry"] == pytest.approx(expected["entry"])
+            assert plan["targets"] == pytest.approx(expected["targets"])
+            checked += 1
+    assert checked == 60
+
+
+def test_risk_budget_limits_selection():
+    builder = PortfolioPlanBuilder()
+    candidates = [_candidate(f"T{i}", f"S{i}") for i in range(60)]
+    result = builder.build_portfolio_plans(
+        candidates, {"risk_profile": "보수", "account_size": 100_000_000, "max_positions": 100}
+    )
+    portfolio = result["portfolio"]
+
+    # 거래당 1% 리스크 × 5종목 = 예산 5%
+    assert portfolio["selected"] == 5
+    assert portfolio["total_risk_percent"] == pytest.approx(5.0, abs=0.01)
+    assert [p["ticker"] for p in result["plans"]] == ["T0", "T1", "T2", "T3", "T4"]
+
+
+def test_max_positions_limits_selection(monkeypatch):
+    from agents import portfolio_plan_builder
+
+    candidates = [_candidate(f"T{i}", f"S{i}") for i in range(10)]
+    profile = {"risk_profile": "보수", "account_size": 100_000_000}
+    builder = PortfolioPlanBuilder()
+
+    assert builder.build_portfolio_plans(candidates, {**profile, "max_positions": 3})["portfolio"]["selected"] == 3
+
+    monkeypatch.setattr(portfolio_plan_builder, "DEFAULT_MAX_POSITIONS", 2)
+    assert builder.build_portfolio_plans(candidates, profile)["portfolio"]["selected"] == 2
+
+
+def test_full_sector_is_skipped_for_lower_ranked_other_sector():
+    candidates = [_candidate(f"A{i}", "반도체") for i in range(4)] + [_candidate("B0", "방산")]
+    result = PortfolioPlanBuilder().build_portfolio_plans(
+        candidates, {"risk_profile": "중립", "account_size": 0, "max_positions": 100}
+    )
+    tickers = [p["ticker"] for p in result["plans"]]
+    exposure = result["portfolio"]["sector_exposure"]
+
+    # 기본 비중 25% → 반도체 25% + 15%(한도 40%까지), 나머지 반도체는 건너뛰고 방산 선정
+    assert tickers == ["A0", "A1", "B0"]
+    assert exposure == {"반도체": 40.0, "방산": 25.0}
+
+
+def test_gross_exposure_capped_at_100_percent():
+    candidates = [_candidate(f"T{i}", f"S{i}") for i in range(6)]
+    result = PortfolioPlanBuilder().build_portfolio_plans(
+        candidates, {"risk_profile": "중립", "account_size": 0, "max_positions": 100}
+    )
+    assert result["portfolio"]["selected"] == 4
+    assert result["portfolio"]["gross_exposure_percent"] == pytest.approx(100.0)
+
+
+def test_correlation_discount_uses_selected_names():
+    closes = np.cumprod(1 + np.random.default_rng(1).normal(0, 0.02, 60))
+
+    def loader(tickers):
+        return ["T0", "T1"], np.vstack([closes, closes * 2])  # 완전 상관
+
+    candidates = [_candidate("T0", "S0"), _candidate("T1", "S1"), _candidate("T2", "S2")]
+    result = PortfolioPlanBuilder(loader).build_portfolio_plans(
+        candidates, {"risk_profile": "보수", "account_size": 0, "max_positions": 100}
+    )
+    discounts = {p["ticker"]: p["allocation"]["correlation_discount"] for p in result["plans"]}
+
+    assert discounts == {"T0": 1.0, "T1": 0.5, "T2": 1.0}
+    assert result["portfolio"]["correlation_used"] is True
+
+
+def test_correlation_not_reported_without_enough_history():
+    candidates = [_candidate("T0", "S0"), _candidate("T1", "S1")]
+    result = PortfolioPlanBuilder(lambda tickers: (["T0"], np.ones((1, 60)))).build_portfolio_plans(
+        candidates, {"risk_profile": "중립", "account_size": 0}
+    )
+    assert result["portfolio"]["correlation_used"] is False
+    assert all(p["allocation"]["correlation_discount"] == 1.0 for p in result["plans"])
+
+
+def test_empty_candidates():
+    result = PortfolioPlanBuilder().build_portfolio_plans([], {"risk_profile": "중립"})
+    assert result["plans"] == [] and result["portfolio"]["selected"] == 0
@@ -0,0 +1,126 @@
+"""
+시계열 저장소 쓰기 경로 (services.price_store, 적재 스크립트, database 인덱스 정리)
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import func, inspect, text
+
+import load_sample_prices
+from database import SessionLocal, engine, init_db
+from models.stock import StockPrice
+from services import price_store
+
+SAMPLE_TICKERS = [stock["ticker"] for stock in load_sample_prices.SAMPLE_STOCKS]
+
+
+def _cleanup():
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM stock_prices WHERE ticker LIKE 'T%'"))
+        conn.execute(text("DELETE FROM stock_prices_ts WHERE ticker LIKE 'T%'"))
+    price_store.delete_tickers(SAMPLE_TICKERS)
+    db = SessionLocal()
+    db.query(StockPrice).filter(StockPrice.ticker.in_(SAMPLE_TICKERS)).delete()
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def timeseries(monkeypatch):
+    init_db()
+    monkeypatch.setattr(price_store, "PRICE_STORAGE", "timeseries")
+    yield
+    _cleanup()
+
+
+@pytest.fixture
+def orm(monkeypatch):
+    init_db()
+    monkeypatch.setattr(price_store, "PRICE_STORAGE", "orm")
+    yield
+    _cleanup()
+
+
+def _ts_closes(ticker):
+    arrays = price_store.load_ohlcv(ticker, date(2026, 1, 1), date(2026, 12, 31))
+    return arrays["close"].tolist()
+
+
+def _orm_count(tickers):
+    db = SessionLocal()
+    try:
+        return db.query(func.count(StockPrice.id)).filter(StockPrice.ticker.in_(tickers)).scalar()
+    finally:
+        db.close()
+
+
+def test_upsert_rows_overwrites_same_key(timeseries):
+    rows = [("T1", "KR", date(2026, 3, d), None, None, None, 100.0 + d, 1) for d in (2, 3)]
+    assert price_store.upsert_rows(rows) == 2
+    assert _ts_closes("T1") == [102.0, 103.0]
+
+    # 같은 (ticker, market, date)는 덮어씀
+    price_store.upsert_rows([("T1", "KR", date(2026, 3, 3), None, None, None, 99.0, 1)])
+    assert _ts_closes("T1") == [102.0, 99.0]
+
+
+def test_upsert_rows_joins_session_transaction(timeseries):
+    db = SessionLocal()
+    price_store.upsert_rows([("T2", "KR", date(2026, 3, 2), 1, 1, 1, 1.0, 1)], conn=db.connection())
+    assert price_store.has_row("T2", "KR", "2026-03-02", conn=db.connection())
+    db.rollback()
+    db.close()
+    assert _ts_closes("T2") == []
+
+    db = SessionLocal()
+    price_store.upsert_rows([("T2", "KR", date(2026, 3, 2), 1, 1, 1, 1.0, 1)], conn=db.connection())
+    db.commit()
+    db.close()
+    assert price_store.has_row("T2", "KR", date(2026, 3, 2))
+    assert not price_store.has_row("T2", "US", date(2026, 3, 2))
+
+
+def test_make_row_and_orm_row_accept_string_dates():
+    record = StockPrice(ticker="T3", market="KR", date="2026-03-04", close=1.0)
+    assert price_store.orm_row(record)[2] == date(2026, 3, 4)
+
+    values = {"date": "2026-03-04", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10, "source": "x"}
+    assert price_store.make_row("T3", "KR", values) == ("T3", "KR", date(2026, 3, 4), 1, 2, 0.5, 1.5, 10)
+
+
+def test_delete_tickers(timeseries):
+    price_store.upsert_rows([("T4", "KR", date(2026, 3, 2), 1, 1, 1, 1.0, 1)])
+    assert price_store.delete_tickers(["T4"]) == 1
+    assert price_store.delete_tickers([]) == 0
+    assert _ts_closes("T4") == []
+
+
+def test_loader_writes_only_timeseries_table_in_timeseries_mode(timeseries):
+    load_sample_prices.load_sample_data()
+    load_sample_prices.load_sample_data()  # 다시 적재해도 종목별로 교체
+
+    stock = load_sample_prices.SAMPLE_STOCKS[0]
+    arrays = price_store.load_ohlcv(stock["ticker"], date(2000, 1, 1), date(2100, 1, 1))
+    assert arrays["close"].tolist() == stock["prices"]
+    assert _orm_count(SAMPLE_TICKERS) == 0
+
+
+def test_loader_writes_only_orm_table_in_orm_mode(orm):
+    load_sample_prices.load_sample_data()
+
+    assert _orm_count(SAMPLE_TICKERS) == sum(len(s["prices"]) for s in load_sample_prices.SAMPLE_STOCKS)
+    stock = load_sample_prices.SAMPLE_STOCKS[0]
+    assert price_store.load_ohlcv(stock["ticker"], date(2000, 1, 1), date(2100, 1, 1))["close"].size == 0
+
+
+def test_init_db_drops_retired_indexes():
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_ticker_date ON stock_prices (ticker, date)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_stock_prices_ticker ON stock_prices (ticker)"))
+
+    init_db()
+
+    names = {i["name"] for i in inspect(engine).get_indexes("stock_prices")}
+    assert not names & {"idx_ticker_date", "ix_stock_prices_ticker"}
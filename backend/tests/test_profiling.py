@@ -0,0 +1,22 @@
+"""
+프로파일링 요청 권한 (services.profiling.is_authorized)
+"""
+
+from services import profiling
+
+
+def test_is_authorized(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_KEY", "secret")
+    assert profiling.is_authorized("secret")
+    assert not profiling.is_authorized("wrong")
+    assert not profiling.is_authorized(None)
+
+
+def test_non_ascii_token_is_rejected_not_raised(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_KEY", "secret")
+    assert not profiling.is_authorized("한글")
+
+
+def test_disabled_without_key(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_KEY", "")
+    assert not profiling.is_authorized("")
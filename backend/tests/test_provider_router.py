@@ -0,0 +1,166 @@
+"""
+시세 공급자 라우팅 (services.provider_router - 서킷 브레이커 / 순서 / 헤지)
+"""
+
+import threading
+import time
+
+import pytest
+
+from services import provider_router
+from services.provider_router import CLOSED, HALF_OPEN, OPEN, Provider, ProviderRouter, health
+
+
+@pytest.fixture(autouse=True)
+def fresh_health(monkeypatch):
+    """공급자 상태는 프로세스 전역 - 테스트마다 비움"""
+    monkeypatch.setattr(provider_router, "_health", {})
+    monkeypatch.setattr(provider_router, "BREAKER_MIN_CALLS", 3)
+    monkeypatch.setattr(provider_router, "BREAKER_ERROR_RATE", 0.5)
+    monkeypatch.setattr(provider_router, "BREAKER_OPEN_SECONDS", 60)
+
+
+def _failing(*args):
+    raise RuntimeError("upstream down")
+
+
+def test_breaker_opens_after_min_calls_and_skips_provider():
+    calls = []
+
+    def primary(ticker):
+        calls.append(ticker)
+        raise RuntimeError("timeout")
+
+    only_primary = ProviderRouter("test_quote", [Provider("primary", primary)])
+    for _ in range(3):
+        assert only_primary.call("005930") == (None, None)
+    assert health("primary").peek_state() == OPEN
+
+    # 열린 동안은 호출하지 않고 바로 다음 공급자 (브레이커는 라우터 간 공유)
+    router = ProviderRouter("test_quote_chain", [
+        Provider("primary", primary),
+        Provider("fallback", lambda ticker: {"close": 1}),
+    ])
+    assert [p.name for p in router.order()] == ["fallback"]
+    assert only_primary.call("005930") == (None, None)
+    assert router.call("005930") == ("fallback", {"close": 1})
+    assert len(calls) == 3
+
+
+def test_breaker_stays_closed_below_min_calls():
+    state = health("flaky")
+    state.record(False, 0.01)
+    state.record(False, 0.01)
+    assert state.peek_state() == CLOSED
+
+
+def test_half_open_allows_one_probe_and_closes_on_success(monkeypatch):
+    state = health("recovering")
+    for _ in range(3):
+        state.record(False, 0.01)
+    assert state.peek_state() == OPEN
+
+    monkeypatch.setattr(provider_router, "BREAKER_OPEN_SECONDS", 0)
+    assert state.peek_state() == HALF_OPEN
+    assert state.allow()
+    assert not state.allow()  # 시험 호출은 1건만
+
+    state.record(True, 0.01)
+    assert state.peek_state() == CLOSED
+    assert state.allow()
+
+
+def test_failed_probe_reopens(monkeypatch):
+    state = health("still_down")
+    for _ in range(3):
+        state.record(False, 0.01)
+    monkeypatch.setattr(provider_router, "BREAKER_OPEN_SECONDS", 0)
+    assert state.allow()
+
+    monkeypatch.setattr(provider_router, "BREAKER_OPEN_SECONDS", 60)
+    state.record(False, 0.01)
+    assert state.peek_state() == OPEN
+    assert state.opened_count == 2
+
+
+def test_half_open_provider_is_tried_first(monkeypatch):
+    for _ in range(3):
+        health("secondary").record(False, 0.01)
+    monkeypatch.setattr(provider_router, "BREAKER_OPEN_SECONDS", 0)
+
+    router = ProviderRouter("test_order", [
+        Provider("primary", lambda: 1),
+        Provider("secondary", lambda: 2),
+    ])
+    assert [p.name for p in router.order()] == ["secondary", "primary"]
+
+
+def test_order_demotes_erroring_provider(monkeypatch):
+    monkeypatch.setattr(provider_router, "BREAKER_MIN_CALLS", 100)  # 열리지 않게
+    flaky = health("flaky")
+    for ok in (False, False, True, True, True):
+        flaky.record(ok, 0.01)
+
+    router = ProviderRouter("test_order", [
+        Provider("flaky", lambda: 1),
+        Provider("steady", lambda: 2),
+    ])
+    assert [p.name for p in router.order()] == ["steady", "flaky"]
+
+
+def test_unavailable_and_empty_results():
+    router = ProviderRouter("test_empty", [
+        Provider("no_key", _failing, available=lambda: False),
+        Provider("empty", lambda: None),
+        Provider("last", lambda: [1]),
+    ])
+    assert router.call() == ("last", [1])
+    assert "no_key" not in provider_router.status()
+    assert provider_router.status()["empty"]["error_rate"] == 1.0
+
+
+def test_all_failing_returns_none():
+    router = ProviderRouter("test_none", [Provider("a", _failing), Provider("b", _failing)])
+    assert router.call() == (None, None)
+
+
+def test_hedge_calls_fallback_when_primary_exceeds_p90(monkeypatch):
+    monkeypatch.setattr(provider_router, "PROVIDER_HEDGE_MIN_SAMPLES", 1)
+    monkeypatch.setattr(provider_router, "PROVIDER_HEDGE_MIN_MS", 20)
+    health("slow").record(True, 0.01)  # p90 = 10ms
+
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "slow"
+
+    router = ProviderRouter("test_hedge", [
+        Provider("slow", slow),
+        Provider("fast", lambda: "fast"),
+    ], hedge=True)
+
+    started = time.perf_counter()
+    try:
+        assert router.call() == ("fast", "fast")
+        assert time.perf_counter() - started < 1
+    finally:
+        release.set()
+
+
+def test_hedge_waits_without_latency_history(monkeypatch):
+    """p90 표본이 없으면 헤지하지 않고 주 공급자 응답을 기다림"""
+    monkeypatch.setattr(provider_router, "PROVIDER_HEDGE_MIN_SAMPLES", 5)
+    fallback_calls = []
+
+    def fallback():
+        fallback_calls.append(1)
+        return "fallback"
+
+    router = ProviderRouter("test_hedge", [
+        Provider("primary", lambda: (time.sleep(0.1), "primary")[1]),
+        Provider("fallback", fallback),
+    ], hedge=True)
+
+    assert router.call() == ("primary", "primary")
+    assert fallback_calls == []
@@ -0,0 +1,59 @@
+"""
+수동 갱신 큐 (scheduler.enqueue_task / process_task_queue)
+"""
+
+import pytest
+
+import scheduler
+from database import engine, init_db
+from models.scheduler import SchedulerTask
+
+
+class _Unavailable:
+    """초기화에 실패한 LazyService 대역"""
+
+    def get(self):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def task_table():
+    init_db()
+    yield
+    with engine.begin() as conn:
+        conn.execute(SchedulerTask.__table__.delete())
+
+
+def _run(job):
+    task = scheduler.enqueue_task(job)
+    scheduler.process_task_queue()
+    return scheduler.get_task(task["id"])
+
+
+def test_completed_job_is_done(monkeypatch):
+    calls = []
+    monkeypatch.setitem(scheduler.QUEUE_JOBS, "price_update", lambda: calls.append(1))
+
+    task = _run("price_update")
+    assert task["status"] == "done" and task["error"] is None
+    assert calls == [1]
+
+
+def test_daily_chart_fails_when_kiwoom_unavailable(monkeypatch):
+    monkeypatch.setattr(scheduler, "kiwoom_service", _Unavailable())
+
+    task = _run("daily_chart")
+    assert task["status"] == "failed"
+    assert "키움 API 사용 불가" in task["error"]
+
+
+def test_price_update_fails_when_no_provider_available(monkeypatch):
+    published = []
+    monkeypatch.setattr(scheduler, "us_stock_service", _Unavailable())
+    monkeypatch.setattr(scheduler, "KR_PRICE_SERVICES", (("nh", _Unavailable()),))
+    monkeypatch.setattr(scheduler.data_version, "publish", lambda *a, **k: published.append(a))
+
+    task = _run("price_update")
+    assert task["status"] == "failed"
+    assert "사용 불가" in task["error"]
+    assert published == []  # 빈 시세로 새 버전을 게시하지 않음
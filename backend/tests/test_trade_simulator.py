@@ -0,0 +1,63 @@
+"""
+매매 계획 몬테카를로 시뮬레이션 (services.trade_simulator)
+"""
+
+import numpy as np
+import pytest
+
+from services.trade_simulator import bootstrap_paths, normalize_plan, simulate_plan
+
+PLAN = {"current_price": 100.0, "entry_price": 100.0, "stop_loss": 90.0,
+        "target_1": 110.0, "target_2": 120.0}
+
+
+def test_bootstrap_paths_keeps_blocks_contiguous():
+    returns = np.arange(100, dtype=np.float64)
+    paths = bootstrap_paths(returns, n_paths=50, horizon=12, block_size=4,
+                            rng=np.random.default_rng(0))
+
+    assert paths.shape == (50, 12)
+    blocks = paths.reshape(50, 3, 4)
+    assert (np.diff(blocks, axis=2) == 1).all()  # 블록 안은 연속된 날
+
+
+def test_bootstrap_block_size_is_clamped_to_history():
+    returns = np.array([0.01, 0.02, 0.03])
+    paths = bootstrap_paths(returns, n_paths=5, horizon=7, block_size=10,
+                            rng=np.random.default_rng(0))
+    assert paths.shape == (5, 7)
+    assert np.allclose(paths[:, :3], returns)
+
+
+def test_normalize_plan_builds_default_split_and_validates():
+    spec = normalize_plan(PLAN)
+    assert spec["entries"] == [(100.0, 0.6), (98.0, 0.4)]
+    assert spec["exits"] == [(110.0, 0.5), (120.0, 0.5)]
+
+    with pytest.raises(ValueError):
+        normalize_plan({**PLAN, "stop_loss": 99.0})
+
+
+def test_rising_prices_hit_both_targets():
+    returns = np.full(60, -0.005)
+    returns[::2] = 0.03  # 하루 빠졌다가(추가 진입) 크게 오르는 패턴
+    result = simulate_plan(PLAN, returns, n_paths=200, horizon=40, block_size=2, seed=1)
+
+    assert result["hit_rates"]["stop_loss"] == 0
+    assert result["hit_rates"]["target_2"] > 0
+    assert result["expected_return"] > 0
+
+
+def test_falling_prices_stop_out():
+    result = simulate_plan(PLAN, np.full(60, -0.01), n_paths=100, horizon=30, seed=1)
+
+    assert result["fill_rate"] == 100
+    assert result["hit_rates"]["stop_loss"] == 100
+    assert result["hit_rates"]["target_1"] == 0
+    assert result["expected_return"] < 0
+
+
+def test_seed_makes_results_reproducible():
+    returns = np.random.default_rng(7).normal(0, 0.02, 250)
+    first = simulate_plan(PLAN, returns, n_paths=500, seed=42)
+    assert simulate_plan(PLAN, returns, n_paths=500, seed=42) == first
@@ -18,9 +18,19 @@ DATA_DIR.mkdir(exist_ok=True)
 (DATA_DIR / "output").mkdir(exist_ok=True)
 
 
+# 후보 CSV 컬럼 (후보가 없어도 같은 헤더로 기록)
+CANDIDATE_COLUMNS = [
+    "ticker", "name", "theme", "chain", "score_total", "score_news", "score_flow",
+    "score_price", "score_risk", "entry_price", "stop", "t1", "t2",
+]
+
+
 # ========== Helpers ==========
 def _to_dt(x) -> pd.Timestamp:
-    return pd.to_datetime(x).tz_localize(None)
+    dt = pd.to_datetime(x)
+    if isinstance(dt, pd.Series):
+        return dt.dt.tz_localize(None)  # Series.tz_localize는 인덱스를 변환
+    return dt.tz_localize(None)
 
 
 def ma(series: pd.Series, n: int) -> pd.Series:
@@ -403,7 +413,7 @@ def run_monthly(asof: str | None = None):
     
     # Write output
     out_path = out_dir / f"candidates_{asof_dt:%Y%m}.csv"
-    out = pd.DataFrame(rows).sort_values(
+    out = pd.DataFrame(rows, columns=CANDIDATE_COLUMNS).sort_values(
         ["score_total", "score_news", "score_flow"], ascending=False
     )
     out.to_csv(out_path, index=False, encoding="utf-8-sig")